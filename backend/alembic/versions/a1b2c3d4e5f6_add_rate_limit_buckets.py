@@ -0,0 +1,28 @@
+"""add unlogged rate_limit_buckets table
+
+Revision ID: a1b2c3d4e5f6
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = 'a1b2c3d4e5f6'
+down_revision: str = 'f8a9b0c1d2e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Shared GCRA state for RATE_LIMIT_BACKEND=postgres; losing it on a crash only resets limits.
+    op.execute(
+        "CREATE UNLOGGED TABLE rate_limit_buckets ("
+        "key text PRIMARY KEY, "
+        "tat double precision NOT NULL)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rate_limit_buckets')
@@ -0,0 +1,32 @@
+"""order change events by transaction
+
+Revision ID: a4b5c6d7e8f9
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = 'a4b5c6d7e8f9'
+down_revision: str = 'f2a3b4c5d6e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'change_events',
+        sa.Column(
+            'xact_id', sa.BigInteger(), nullable=False,
+            server_default=sa.text('pg_current_xact_id()::text::bigint'),
+        ),
+    )
+    op.create_index('ix_change_events_xact_id_id', 'change_events', ['xact_id', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_change_events_xact_id_id', table_name='change_events')
+    op.drop_column('change_events', 'xact_id')
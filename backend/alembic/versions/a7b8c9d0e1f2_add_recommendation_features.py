@@ -0,0 +1,81 @@
+"""add recommendation features
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = 'a7b8c9d0e1f2'
+down_revision: str = 'f6a7b8c9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLES = ['TOP', 'JUNGLE', 'MIDDLE', 'BOTTOM', 'UTILITY']
+ACTIVITIES = ['SCRIMS', 'TOURNOIS', 'LAN', 'FLEX', 'CLASH']
+
+
+def _role_bits(column: str) -> str:
+    whens = " ".join(f"WHEN '{role}' THEN {1 << i}" for i, role in enumerate(ROLES))
+    return f"(CASE {column} {whens} ELSE 0 END)"
+
+
+def _array_mask(column: str, values: list[str]) -> str:
+    return " + ".join(f"(CASE WHEN '{value}' = ANY({column}) THEN {1 << i} ELSE 0 END)" for i, value in enumerate(values))
+
+
+def _mask_column(name: str, expression: str) -> sa.Column:
+    return sa.Column(name, sa.SmallInteger(), sa.Computed(expression, persisted=True), nullable=False)
+
+
+def upgrade() -> None:
+    op.add_column('players', _mask_column(
+        'role_mask', f"{_role_bits('primary_role')} + {_role_bits('secondary_role')} * 32",
+    ))
+    op.add_column('players', _mask_column('activity_mask', _array_mask('activities', ACTIVITIES)))
+    op.add_column('teams', _mask_column('wanted_role_mask', _array_mask('wanted_roles', ROLES)))
+    op.add_column('teams', _mask_column('activity_mask', _array_mask('activities', ACTIVITIES)))
+
+    op.drop_index('idx_players_lft_browse', table_name='players')
+    op.create_index(
+        'idx_players_lft_browse', 'players', [sa.text('updated_at DESC')],
+        postgresql_include=[
+            'primary_role', 'secondary_role', 'rank_solo_score',
+            'id', 'role_mask', 'activity_mask', 'ambiance', 'frequency_min', 'frequency_max',
+        ],
+        postgresql_where=sa.text('is_lft IS true'),
+    )
+    op.drop_index('idx_teams_lfp_browse', table_name='teams')
+    op.create_index(
+        'idx_teams_lfp_browse', 'teams', [sa.text('updated_at DESC')],
+        postgresql_include=[
+            'min_rank_score', 'max_rank_score',
+            'id', 'captain_discord_id', 'wanted_role_mask', 'activity_mask', 'ambiance', 'frequency_min',
+            'frequency_max',
+        ],
+        postgresql_where=sa.text('is_lfp IS true'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_teams_lfp_browse', table_name='teams')
+    op.create_index(
+        'idx_teams_lfp_browse', 'teams', [sa.text('updated_at DESC')],
+        postgresql_include=['min_rank_score', 'max_rank_score'],
+        postgresql_where=sa.text('is_lfp IS true'),
+    )
+    op.drop_index('idx_players_lft_browse', table_name='players')
+    op.create_index(
+        'idx_players_lft_browse', 'players', [sa.text('updated_at DESC')],
+        postgresql_include=['primary_role', 'secondary_role', 'rank_solo_score'],
+        postgresql_where=sa.text('is_lft IS true'),
+    )
+
+    op.drop_column('teams', 'activity_mask')
+    op.drop_column('teams', 'wanted_role_mask')
+    op.drop_column('players', 'activity_mask')
+    op.drop_column('players', 'role_mask')
@@ -0,0 +1,46 @@
+"""replace action_tokens with consumed_tokens
+
+Revision ID: b2c3d4e5f6a7
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'b2c3d4e5f6a7'
+down_revision: str = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Action tokens are now signed and self-contained; only used one-time nonces are stored.
+    op.drop_table('action_tokens')
+    op.create_table(
+        'consumed_tokens',
+        sa.Column('nonce', sa.String(16), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('nonce'),
+    )
+    op.create_index('ix_consumed_tokens_expires_at', 'consumed_tokens', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_consumed_tokens_expires_at', table_name='consumed_tokens')
+    op.drop_table('consumed_tokens')
+    op.create_table(
+        'action_tokens',
+        sa.Column('token', sa.String(32), nullable=False),
+        sa.Column('action', sa.String(20), nullable=False),
+        sa.Column('discord_user_id', sa.String(20), nullable=False),
+        sa.Column('discord_username', sa.String(100), nullable=False),
+        sa.Column('game_name', sa.String(50), nullable=True),
+        sa.Column('tag_line', sa.String(10), nullable=True),
+        sa.Column('slug', sa.String(100), nullable=True),
+        sa.Column('team_name', sa.String(100), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('token'),
+    )
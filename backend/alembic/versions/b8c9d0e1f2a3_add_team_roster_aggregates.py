@@ -0,0 +1,65 @@
+"""add team roster aggregates
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = 'b8c9d0e1f2a3'
+down_revision: str = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('teams', sa.Column('roster_size', sa.SmallInteger(), server_default='0', nullable=False))
+    op.add_column('teams', sa.Column('roster_rank_avg', sa.SmallInteger(), nullable=True))
+    op.add_column('teams', sa.Column('roster_rank_median', sa.SmallInteger(), nullable=True))
+    op.add_column('teams', sa.Column('roster_rank_max', sa.SmallInteger(), nullable=True))
+    op.add_column('teams', sa.Column('roster_role_mask', sa.SmallInteger(), server_default='0', nullable=False))
+
+    op.execute("""
+        UPDATE teams SET
+            roster_size = s.size,
+            roster_rank_avg = s.avg,
+            roster_rank_median = s.median,
+            roster_rank_max = s.max,
+            roster_role_mask = s.role_mask
+        FROM (
+            SELECT
+                teams.id AS team_id,
+                count(team_members.id) AS size,
+                CAST(round(avg(players.rank_solo_score)) AS SMALLINT) AS avg,
+                percentile_disc(0.5) WITHIN GROUP (ORDER BY players.rank_solo_score) AS median,
+                max(players.rank_solo_score) AS max,
+                coalesce(bit_or(CASE team_members.role
+                    WHEN 'TOP' THEN 1 WHEN 'JUNGLE' THEN 2 WHEN 'MIDDLE' THEN 4
+                    WHEN 'BOTTOM' THEN 8 WHEN 'UTILITY' THEN 16 ELSE 0 END), 0) AS role_mask
+            FROM teams
+            LEFT OUTER JOIN team_members ON team_members.team_id = teams.id
+            LEFT OUTER JOIN players ON players.id = team_members.player_id
+            GROUP BY teams.id
+        ) AS s
+        WHERE teams.id = s.team_id
+    """)
+    op.alter_column('teams', 'roster_size', server_default=None)
+    op.alter_column('teams', 'roster_role_mask', server_default=None)
+
+    op.create_index(
+        'idx_teams_roster_rank', 'teams', ['roster_rank_avg'],
+        postgresql_include=['roster_role_mask', 'roster_size', 'is_lfp'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_teams_roster_rank', table_name='teams')
+    op.drop_column('teams', 'roster_role_mask')
+    op.drop_column('teams', 'roster_rank_max')
+    op.drop_column('teams', 'roster_rank_median')
+    op.drop_column('teams', 'roster_rank_avg')
+    op.drop_column('teams', 'roster_size')
@@ -0,0 +1,27 @@
+"""add gin indexes on array columns
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = 'c3d4e5f6a7b8'
+down_revision: str = 'b2c3d4e5f6a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_players_activities', 'players', ['activities'], postgresql_using='gin')
+    op.create_index('idx_teams_activities', 'teams', ['activities'], postgresql_using='gin')
+    op.create_index('idx_teams_wanted_roles', 'teams', ['wanted_roles'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_teams_wanted_roles', table_name='teams')
+    op.drop_index('idx_teams_activities', table_name='teams')
+    op.drop_index('idx_players_activities', table_name='players')
@@ -0,0 +1,51 @@
+"""add scrim archive
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = 'c9d0e1f2a3b4'
+down_revision: str = 'b8c9d0e1f2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scrim_archive',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('team_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('captain_discord_id', sa.String(length=20), nullable=False),
+        sa.Column('min_rank', sa.String(length=15), nullable=True),
+        sa.Column('max_rank', sa.String(length=15), nullable=True),
+        sa.Column('scheduled_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('format', sa.String(length=10), nullable=True),
+        sa.Column('game_count', sa.Integer(), nullable=True),
+        sa.Column('fearless', sa.Boolean(), nullable=True),
+        sa.Column('status', sa.String(length=10), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('idx_scrim_archive_team', 'scrim_archive', ['team_id', 'scheduled_at'])
+    op.create_index('idx_scrims_scheduled', 'scrims', ['scheduled_at'])
+    op.create_index(
+        'idx_scrims_active_team', 'scrims', ['team_id'],
+        postgresql_where=sa.text('is_active IS true'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_scrims_active_team', table_name='scrims')
+    op.drop_index('idx_scrims_scheduled', table_name='scrims')
+    op.drop_index('idx_scrim_archive_team', table_name='scrim_archive')
+    op.drop_table('scrim_archive')
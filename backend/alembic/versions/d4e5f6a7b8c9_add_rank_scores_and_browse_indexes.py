@@ -0,0 +1,91 @@
+"""add rank scores and browse indexes
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = 'd4e5f6a7b8c9'
+down_revision: str = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rank_score(column: str) -> str:
+    return (
+        f"CASE {column} WHEN 'IRON' THEN 0 WHEN 'BRONZE' THEN 1 WHEN 'SILVER' THEN 2 WHEN 'GOLD' THEN 3 "
+        "WHEN 'PLATINUM' THEN 4 WHEN 'EMERALD' THEN 5 WHEN 'DIAMOND' THEN 6 WHEN 'MASTER' THEN 7 "
+        "WHEN 'GRANDMASTER' THEN 8 WHEN 'CHALLENGER' THEN 9 END"
+    )
+
+
+def upgrade() -> None:
+    op.add_column('players', sa.Column(
+        'rank_solo_score', sa.SmallInteger(), sa.Computed(_rank_score('rank_solo_tier'), persisted=True),
+    ))
+    op.add_column('teams', sa.Column(
+        'min_rank_score', sa.SmallInteger(), sa.Computed(_rank_score('min_rank'), persisted=True),
+    ))
+    op.add_column('teams', sa.Column(
+        'max_rank_score', sa.SmallInteger(), sa.Computed(_rank_score('max_rank'), persisted=True),
+    ))
+
+    op.drop_index('idx_players_lft', table_name='players')
+    op.drop_index('idx_players_role', table_name='players')
+    op.drop_index('idx_players_rank', table_name='players')
+    op.create_index(
+        'idx_players_lft_browse', 'players', [sa.text('updated_at DESC')],
+        postgresql_include=['primary_role', 'secondary_role', 'rank_solo_score'],
+        postgresql_where=sa.text('is_lft IS true'),
+    )
+    op.create_index(
+        'idx_players_lft_primary_rank', 'players', ['primary_role', 'rank_solo_score'],
+        postgresql_where=sa.text('is_lft IS true'),
+    )
+    op.create_index(
+        'idx_players_lft_secondary_rank', 'players', ['secondary_role', 'rank_solo_score'],
+        postgresql_where=sa.text('is_lft IS true'),
+    )
+
+    op.drop_index('idx_teams_lfp', table_name='teams')
+    op.create_index(
+        'idx_teams_lfp_browse', 'teams', [sa.text('updated_at DESC')],
+        postgresql_include=['min_rank_score', 'max_rank_score'],
+        postgresql_where=sa.text('is_lfp IS true'),
+    )
+
+    op.drop_index('idx_scrims_active_scheduled', table_name='scrims')
+    op.create_index(
+        'idx_scrims_active_upcoming', 'scrims', ['scheduled_at'],
+        postgresql_include=['format', 'game_count', 'min_rank', 'max_rank'],
+        postgresql_where=sa.text('is_active IS true'),
+    )
+    op.create_index(
+        'idx_scrims_active_format', 'scrims', ['format', 'scheduled_at'],
+        postgresql_where=sa.text('is_active IS true'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_scrims_active_format', table_name='scrims')
+    op.drop_index('idx_scrims_active_upcoming', table_name='scrims')
+    op.create_index('idx_scrims_active_scheduled', 'scrims', ['is_active', 'scheduled_at'])
+
+    op.drop_index('idx_teams_lfp_browse', table_name='teams')
+    op.create_index('idx_teams_lfp', 'teams', ['is_lfp'], postgresql_where=sa.text('is_lfp = true'))
+
+    op.drop_index('idx_players_lft_secondary_rank', table_name='players')
+    op.drop_index('idx_players_lft_primary_rank', table_name='players')
+    op.drop_index('idx_players_lft_browse', table_name='players')
+    op.create_index('idx_players_rank', 'players', ['rank_solo_tier'])
+    op.create_index('idx_players_role', 'players', ['primary_role'])
+    op.create_index('idx_players_lft', 'players', ['is_lft'], postgresql_where=sa.text('is_lft = true'))
+
+    op.drop_column('teams', 'max_rank_score')
+    op.drop_column('teams', 'min_rank_score')
+    op.drop_column('players', 'rank_solo_score')
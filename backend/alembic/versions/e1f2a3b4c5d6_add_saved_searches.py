@@ -0,0 +1,66 @@
+"""add saved searches
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = 'e1f2a3b4c5d6'
+down_revision: str = 'd0e1f2a3b4c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rank_score(column: str) -> str:
+    return (
+        f"CASE {column} WHEN 'IRON' THEN 0 WHEN 'BRONZE' THEN 1 WHEN 'SILVER' THEN 2 WHEN 'GOLD' THEN 3 "
+        "WHEN 'PLATINUM' THEN 4 WHEN 'EMERALD' THEN 5 WHEN 'DIAMOND' THEN 6 WHEN 'MASTER' THEN 7 "
+        "WHEN 'GRANDMASTER' THEN 8 WHEN 'CHALLENGER' THEN 9 END"
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        'saved_searches',
+        sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column('discord_user_id', sa.String(length=20), nullable=False),
+        sa.Column('target', sa.String(length=10), nullable=False),
+        sa.Column('role', sa.String(length=10), nullable=True),
+        sa.Column('min_rank', sa.String(length=15), nullable=True),
+        sa.Column('max_rank', sa.String(length=15), nullable=True),
+        sa.Column('format', sa.String(length=10), nullable=True),
+        sa.Column('min_rank_score', sa.SmallInteger(), sa.Computed(_rank_score('min_rank'), persisted=True)),
+        sa.Column('max_rank_score', sa.SmallInteger(), sa.Computed(_rank_score('max_rank'), persisted=True)),
+        sa.Column('match_keys', postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_saved_searches_discord_user_id', 'saved_searches', ['discord_user_id'])
+    op.create_index('idx_saved_searches_match_keys', 'saved_searches', ['match_keys'], postgresql_using='gin')
+    op.create_table(
+        'saved_search_matches',
+        sa.Column('search_id', sa.BigInteger(), nullable=False),
+        sa.Column('entity_id', sa.UUID(), nullable=False),
+        sa.Column('matched_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('notified_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['search_id'], ['saved_searches.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('search_id', 'entity_id'),
+    )
+    op.create_index(
+        'idx_saved_search_matches_pending', 'saved_search_matches', ['matched_at'],
+        postgresql_where=sa.text('notified_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_saved_search_matches_pending', table_name='saved_search_matches')
+    op.drop_table('saved_search_matches')
+    op.drop_index('idx_saved_searches_match_keys', table_name='saved_searches')
+    op.drop_index('ix_saved_searches_discord_user_id', table_name='saved_searches')
+    op.drop_table('saved_searches')
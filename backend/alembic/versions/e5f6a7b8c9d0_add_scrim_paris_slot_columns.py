@@ -0,0 +1,44 @@
+"""add scrim paris slot columns
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = 'e5f6a7b8c9d0'
+down_revision: str = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARIS_SCHEDULED_AT = "(scheduled_at AT TIME ZONE 'Europe/Paris')"
+
+
+def upgrade() -> None:
+    op.add_column('scrims', sa.Column(
+        'paris_date', sa.Date(), sa.Computed(f"{PARIS_SCHEDULED_AT}::date", persisted=True),
+    ))
+    op.add_column('scrims', sa.Column(
+        'paris_hour', sa.SmallInteger(),
+        sa.Computed(f"EXTRACT(HOUR FROM {PARIS_SCHEDULED_AT})::smallint", persisted=True),
+    ))
+    op.add_column('scrims', sa.Column(
+        'paris_weekday', sa.SmallInteger(),
+        sa.Computed(f"EXTRACT(ISODOW FROM {PARIS_SCHEDULED_AT})::smallint", persisted=True),
+    ))
+    op.create_index(
+        'idx_scrims_active_paris_slot', 'scrims', ['paris_date', 'paris_hour'],
+        postgresql_include=['scheduled_at'],
+        postgresql_where=sa.text('is_active IS true'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_scrims_active_paris_slot', table_name='scrims')
+    op.drop_column('scrims', 'paris_weekday')
+    op.drop_column('scrims', 'paris_hour')
+    op.drop_column('scrims', 'paris_date')
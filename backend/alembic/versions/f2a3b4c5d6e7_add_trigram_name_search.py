@@ -0,0 +1,41 @@
+"""add trigram name search
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = 'f2a3b4c5d6e7'
+down_revision: str = 'e1f2a3b4c5d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('players', sa.Column(
+        'search_name', sa.String(length=22),
+        sa.Computed("lower(riot_game_name || '#' || riot_tag_line)", persisted=True),
+    ))
+    op.add_column('teams', sa.Column('search_name', sa.String(length=50), sa.Computed('lower(name)', persisted=True)))
+    op.create_index(
+        'idx_players_search_name_trgm', 'players', ['search_name'],
+        postgresql_using='gin', postgresql_ops={'search_name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'idx_teams_search_name_trgm', 'teams', ['search_name'],
+        postgresql_using='gin', postgresql_ops={'search_name': 'gin_trgm_ops'},
+        postgresql_where=sa.text('is_lfp IS true'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_teams_search_name_trgm', table_name='teams')
+    op.drop_index('idx_players_search_name_trgm', table_name='players')
+    op.drop_column('teams', 'search_name')
+    op.drop_column('players', 'search_name')
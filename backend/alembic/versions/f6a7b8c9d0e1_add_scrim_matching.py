@@ -0,0 +1,61 @@
+"""add scrim matching
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = 'f6a7b8c9d0e1'
+down_revision: str = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rank_score(column: str) -> str:
+    return (
+        f"CASE {column} WHEN 'IRON' THEN 0 WHEN 'BRONZE' THEN 1 WHEN 'SILVER' THEN 2 WHEN 'GOLD' THEN 3 "
+        "WHEN 'PLATINUM' THEN 4 WHEN 'EMERALD' THEN 5 WHEN 'DIAMOND' THEN 6 WHEN 'MASTER' THEN 7 "
+        "WHEN 'GRANDMASTER' THEN 8 WHEN 'CHALLENGER' THEN 9 END"
+    )
+
+
+def upgrade() -> None:
+    low, high = _rank_score('min_rank'), _rank_score('max_rank')
+    op.add_column('scrims', sa.Column(
+        'rank_window', postgresql.INT4RANGE(),
+        sa.Computed(
+            f"CASE WHEN ({low}) > ({high}) THEN int4range({high}, {low}, '[]') "
+            f"ELSE int4range({low}, {high}, '[]') END",
+            persisted=True,
+        ),
+    ))
+    op.create_index(
+        'idx_scrims_active_rank_window', 'scrims', ['rank_window'],
+        postgresql_using='gist', postgresql_where=sa.text('is_active IS true'),
+    )
+    op.create_index('idx_team_members_team', 'team_members', ['team_id'])
+
+    op.create_table(
+        'scrim_matches',
+        sa.Column('scrim_id', sa.UUID(), nullable=False),
+        sa.Column('opponent_scrim_id', sa.UUID(), nullable=False),
+        sa.Column('notified_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['scrim_id'], ['scrims.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['opponent_scrim_id'], ['scrims.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('scrim_id', 'opponent_scrim_id'),
+    )
+    op.create_index(op.f('ix_scrim_matches_opponent_scrim_id'), 'scrim_matches', ['opponent_scrim_id'])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_scrim_matches_opponent_scrim_id'), table_name='scrim_matches')
+    op.drop_table('scrim_matches')
+    op.drop_index('idx_team_members_team', table_name='team_members')
+    op.drop_index('idx_scrims_active_rank_window', table_name='scrims')
+    op.drop_column('scrims', 'rank_window')
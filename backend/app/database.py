@@ -1,14 +1,172 @@
+import time
 from collections.abc import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
+from app.dependencies import bot_secret_matches
+from app.services.token_store import decode_token
 
-engine = create_async_engine(settings.database_url)
+WAIT_SAMPLES = 1000
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Sent by the bot with the Discord user an API call is made for.
+DISCORD_USER_HEADER = "X-Discord-User-Id"
+MAX_PINS = 10_000
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection and how often they time out."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_times: list[float] = []
+        self.timeouts = 0
+        self.peak_checked_out = 0
+
+    def _do_get(self):
+        """Check out a connection, timing the wait."""
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_times.append(time.perf_counter() - start)
+            del self.wait_times[:-WAIT_SAMPLES]
+        self.peak_checked_out = max(self.peak_checked_out, self.checkedout())
+        return conn
+
+    def recreate(self) -> "MeteredQueuePool":
+        """Recreate the pool (e.g. on dispose), keeping the collected metrics."""
+        new = super().recreate()
+        new.wait_times, new.timeouts, new.peak_checked_out = self.wait_times, self.timeouts, self.peak_checked_out
+        return new
+
+    def stats(self) -> dict:
+        """Return pool occupancy and connection wait metrics."""
+        waits = sorted(self.wait_times)
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "peak_checked_out": self.peak_checked_out,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(sum(waits) / len(waits) * 1000, 2) if waits else None,
+            "p99_wait_ms": round(waits[int(len(waits) * 0.99)] * 1000, 2) if waits else None,
+            "max_wait_ms": round(waits[-1] * 1000, 2) if waits else None,
+        }
+
+
+def create_engine(
+    url: str,
+    *,
+    pool_size: int = settings.db_pool_size,
+    max_overflow: int = settings.db_max_overflow,
+    pool_timeout: float = settings.db_pool_timeout,
+    pool_recycle: int = settings.db_pool_recycle,
+    statement_cache_size: int = settings.db_statement_cache_size,
+) -> AsyncEngine:
+    """Create an async engine with an explicitly sized, metered connection pool."""
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        # Set to 0 when running behind a transaction-pooling PgBouncer.
+        connect_args["statement_cache_size"] = statement_cache_size
+    return create_async_engine(
+        url,
+        poolclass=MeteredQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+    )
+
+
+def pool_stats(target: AsyncEngine | None = None) -> dict:
+    """Return connection pool metrics for an engine (the primary by default)."""
+    pool = (target or engine).pool
+    if isinstance(pool, MeteredQueuePool):
+        return pool.stats()
+    return {"status": pool.status()}
+
+
+engine = create_engine(settings.database_url)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
+if settings.database_read_url:
+    read_engine = create_engine(settings.database_read_url)
+    async_read_session = async_sessionmaker(read_engine, expire_on_commit=False)
+else:
+    read_engine = engine
+    async_read_session = async_session
+
+
+# Discord user ID -> monotonic time until which that user's reads go to the primary,
+# in expiry order (re-pinning moves a user to the end). Only visible to this process,
+# so reads use it with the in-process rate limit backend only; see ``pins_are_local``.
+_primary_pins: dict[str, float] = {}
 
-async def get_db() -> AsyncGenerator[AsyncSession]:
-    """Yield an async SQLAlchemy session, closing it on exit."""
+
+def request_identity(request: Request) -> str | None:
+    """The Discord user a request acts for: its action token's subject, or the user named by the bot."""
+    token = request.query_params.get("token")
+    if token and (data := decode_token(token)) is not None:
+        return data.discord_user_id
+    if bot_secret_matches(request.headers.get("x-bot-secret")):
+        return request.headers.get(DISCORD_USER_HEADER) or None
+    return None
+
+
+def pin_to_primary(identity: str, now: float | None = None) -> None:
+    """Route ``identity``'s reads to the primary for the read-your-writes window."""
+    now = time.monotonic() if now is None else now
+    _primary_pins.pop(identity, None)
+    # Entries are in expiry order: drop expired ones, then the oldest while at the cap.
+    while _primary_pins:
+        oldest, until = next(iter(_primary_pins.items()))
+        if until > now and len(_primary_pins) < MAX_PINS:
+            break
+        del _primary_pins[oldest]
+    _primary_pins[identity] = now + settings.read_your_writes_window
+
+
+def is_pinned(identity: str | None, now: float | None = None) -> bool:
+    """Whether ``identity`` wrote within the read-your-writes window."""
+    until = _primary_pins.get(identity) if identity else None
+    return until is not None and until > (time.monotonic() if now is None else now)
+
+
+def pins_are_local() -> bool:
+    """Whether every request is served by this process, so in-process pins see all writes.
+
+    The ``shm`` and ``postgres`` rate limit backends exist for multi-worker and
+    multi-host deployments, where a write may land on another worker.
+    """
+    return settings.rate_limit_backend == "memory"
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession]:
+    """Yield a primary session; a write also pins its user's reads to the primary for a short window."""
+    if request.method not in SAFE_METHODS and read_engine is not engine and pins_are_local():
+        identity = request_identity(request)
+        if identity:
+            pin_to_primary(identity)
     async with async_session() as session:
         yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession]:
+    """Yield a read-replica session, or a primary one if this user wrote recently or no replica is set.
+
+    Without in-process pins (several workers), every read goes to the primary.
+    """
+    pinned = read_engine is not engine and (not pins_are_local() or is_pinned(request_identity(request)))
+    factory = async_session if pinned else async_read_session
+    async with factory() as session:
+        yield session
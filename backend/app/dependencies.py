@@ -1,16 +1,28 @@
+import hmac
+
 from fastapi import Header, HTTPException, Request
 
 from app.config import settings
 from shared.riot_client import RiotClient
 
 
+def bot_secret_matches(value: str | None) -> bool:
+    """Constant-time check of an X-Bot-Secret value against the configured secret."""
+    return hmac.compare_digest((value or "").encode(), settings.bot_api_secret.encode())
+
+
 async def verify_bot_secret(x_bot_secret: str = Header(...)) -> str:
     """Validate the X-Bot-Secret header against the configured secret."""
-    if x_bot_secret != settings.bot_api_secret:
+    if not bot_secret_matches(x_bot_secret):
         raise HTTPException(403, "Invalid bot secret")
     return x_bot_secret
 
 
+async def is_bot(x_bot_secret: str | None = Header(None)) -> bool:
+    """Whether the request carries the bot secret, for public endpoints that give the bot more."""
+    return bot_secret_matches(x_bot_secret)
+
+
 def get_riot_client(request: Request) -> RiotClient:
     """Return the shared RiotClient from app state, or create a temporary one."""
     client = getattr(request.app.state, "riot_client", None)
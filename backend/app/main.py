@@ -1,21 +1,40 @@
 import asyncio
 import logging
 from contextlib import asynccontextmanager
+from datetime import UTC, datetime
 
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.database import async_session, engine, get_db, pool_stats, read_engine
 from app.dependencies import verify_bot_secret
 from app.middleware.rate_limit import RateLimitMiddleware
-from app.routers import guild_settings, players, riot, scrims, teams, tokens
+from app.middleware.rate_limit_backends import create_limiters
+from app.routers import guild_settings, players, riot, saved_searches, scrims, search, teams, tokens
 from app.routers.og import router as og_router
+from app.schemas.saved_search import SavedSearchMatchList
+from app.schemas.scrim import ScrimMatchPairList
+from app.services.events import event_broker, purge_old_events, stream_events
+from app.services.og_assets import asset_manager
+from app.services.og_render_queue import render_queue
+from app.services.saved_searches import collect_pending_matches
+from app.services.scrim_archive import archive_past_scrims
+from app.services.scrim_matching import collect_new_matches
 from app.services.sync import deactivate_inactive, sync_active_ranks
+from app.services.token_store import check_secret_key, purge_expired_tokens
 from shared.riot_client import RiotClient
 
 logger = logging.getLogger("riftteam")
 
 SYNC_INTERVAL = 12 * 3600
+TOKEN_PURGE_INTERVAL = 3600
+SCRIM_ARCHIVE_INTERVAL = 900
+
+rate_limiters = create_limiters(settings.rate_limit_backend, async_session)
 
 
 async def _rank_sync_loop(app: FastAPI) -> None:
@@ -28,21 +47,65 @@ async def _rank_sync_loop(app: FastAPI) -> None:
         await asyncio.sleep(SYNC_INTERVAL)
 
 
+async def _token_purge_loop() -> None:
+    """Background loop that drops expired one-time token records and stale change events every hour."""
+    while True:
+        try:
+            async with async_session() as db:
+                purged = await purge_expired_tokens(db)
+                events = await purge_old_events(db)
+            if purged:
+                logger.info("Purged %d expired token records", purged)
+            if events:
+                logger.info("Purged %d old change events", events)
+        except Exception:
+            logger.exception("Token purge loop error")
+        await asyncio.sleep(TOKEN_PURGE_INTERVAL)
+
+
+async def _scrim_archive_loop() -> None:
+    """Background loop that moves past scrims to the archive table every 15 minutes."""
+    while True:
+        try:
+            async with async_session() as db:
+                archived = await archive_past_scrims(db, now=datetime.now(UTC))
+            if archived:
+                logger.info("Archived %d past scrims", archived)
+        except Exception:
+            logger.exception("Scrim archive loop error")
+        await asyncio.sleep(SCRIM_ARCHIVE_INTERVAL)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize the Riot client and start the periodic rank sync task."""
+    """Initialize the Riot client and start the rank sync, token purge, scrim archive, event listener, OG render and rate limit tasks."""
+    check_secret_key(settings.secret_key)
     if settings.riot_api_key:
         app.state.riot_client = RiotClient(settings.riot_api_key)
     else:
         app.state.riot_client = None
     task = asyncio.create_task(_rank_sync_loop(app))
+    purge_task = asyncio.create_task(_token_purge_loop())
+    archive_task = asyncio.create_task(_scrim_archive_loop())
+    event_broker.start(engine)
+    await asset_manager.start()
+    render_queue.start()
+    for limiter in rate_limiters.values():
+        await limiter.start()
     yield
     task.cancel()
+    purge_task.cancel()
+    archive_task.cancel()
+    await event_broker.stop()
+    for limiter in rate_limiters.values():
+        await limiter.close()
+    await render_queue.stop()
+    await asset_manager.close()
 
 
 app = FastAPI(title="RiftTeam API", version="0.1.0", lifespan=lifespan)
 
-app.add_middleware(RateLimitMiddleware)
+app.add_middleware(RateLimitMiddleware, limiters=rate_limiters, bot_secret=settings.bot_api_secret)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[settings.app_url],
@@ -57,18 +120,16 @@ app.include_router(scrims.router, prefix="/api")
 app.include_router(riot.router, prefix="/api")
 app.include_router(tokens.router, prefix="/api")
 app.include_router(guild_settings.router, prefix="/api")
+app.include_router(saved_searches.router, prefix="/api")
+app.include_router(search.router, prefix="/api")
 app.include_router(og_router)
 
 
 @app.get("/api/health")
-async def health():
+async def health(db: AsyncSession = Depends(get_db)):
     """Return API and database health status."""
-    from sqlalchemy import text
-
-    from app.database import async_session
     try:
-        async with async_session() as session:
-            await session.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         return {"status": "ok", "database": "ok"}
     except Exception:
         logger.exception("Health check DB failure")
@@ -80,3 +141,48 @@ async def maintenance_deactivate(_: str = Depends(verify_bot_secret)):
     """Deactivate inactive players and teams (bot-only, authenticated)."""
     result = await deactivate_inactive()
     return result
+
+
+@app.post("/api/maintenance/scrim-matches", response_model=ScrimMatchPairList)
+async def maintenance_scrim_matches(_: str = Depends(verify_bot_secret), db: AsyncSession = Depends(get_db)):
+    """Record and return compatible scrim pairs not notified yet, for the bot to DM both captains (bot-only)."""
+    pairs = await collect_new_matches(db, now=datetime.now(UTC))
+    return {"matches": [{"scrim": a, "opponent": b} for a, b in pairs]}
+
+
+@app.post("/api/maintenance/saved-search-matches", response_model=SavedSearchMatchList)
+async def maintenance_saved_search_matches(_: str = Depends(verify_bot_secret), db: AsyncSession = Depends(get_db)):
+    """Return a batch of queued saved search matches and mark them notified, for the bot to DM (bot-only)."""
+    return {"matches": await collect_pending_matches(db, now=datetime.now(UTC))}
+
+
+@app.get("/api/events/stream")
+async def events_stream(
+    _: str = Depends(verify_bot_secret),
+    after: int | None = Query(None, ge=0),
+    last_event_id: int | None = Header(None),
+):
+    """Server-sent stream of change events (bot-only).
+
+    Resumes after ``Last-Event-ID`` (sent by reconnecting clients) or ``after``; without either,
+    only events published from now on are streamed.
+    """
+    cursor = last_event_id if last_event_id is not None else after
+    return StreamingResponse(
+        stream_events(async_session, event_broker, after=cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/maintenance/og-queue")
+async def maintenance_og_queue(_: str = Depends(verify_bot_secret)):
+    """Return OG pre-render queue depth, render timings and icon cache stats (bot-only, authenticated)."""
+    return {**render_queue.stats(), "assets": asset_manager.stats()}
+
+
+@app.get("/api/maintenance/db-pool")
+async def maintenance_db_pool(_: str = Depends(verify_bot_secret)):
+    """Return database connection pool occupancy and wait metrics (bot-only, authenticated)."""
+    replica = pool_stats(read_engine) if read_engine is not engine else None
+    return {**pool_stats(), "replica": replica}
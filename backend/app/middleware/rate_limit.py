@@ -1,74 +1,218 @@
+import hmac
+import math
+import re
 import time
-from collections import defaultdict
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from typing import NamedTuple, Protocol
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 MAX_REQUESTS = 60
 WINDOW_SECONDS = 60
-CLEANUP_INTERVAL = 300
+CLEANUP_BATCH = 4
 CLEANUP_MAX_ENTRIES = 10_000
-
-_buckets: dict[str, list[float]] = defaultdict(list)
-_last_cleanup = time.monotonic()
-
-
-def _cleanup() -> None:
-    """Periodically purge expired and excess IP buckets."""
-    global _last_cleanup
-    now = time.monotonic()
-    if now - _last_cleanup < CLEANUP_INTERVAL:
-        return
-    _last_cleanup = now
-    cutoff = now - WINDOW_SECONDS
-    expired = [ip for ip, ts_list in _buckets.items() if not ts_list or ts_list[-1] < cutoff]
-    for ip in expired:
-        del _buckets[ip]
-    if len(_buckets) > CLEANUP_MAX_ENTRIES:
-        by_age = sorted(_buckets.items(), key=lambda item: item[1][-1] if item[1] else 0)
-        for ip, _ in by_age[: len(_buckets) - CLEANUP_MAX_ENTRIES]:
-            del _buckets[ip]
-
-
-def _get_client_ip(request: Request) -> str:
+# Tolerance for float rounding when a burst lands exactly on the window boundary.
+EPSILON = 1e-6
+EXEMPT_METHODS = frozenset({"HEAD", "OPTIONS"})
+EXEMPT_PATHS = frozenset({"/api/health"})
+BOT_BUDGET = "bot"
+
+# Budget name -> (requests, window seconds). Each budget is tracked separately per client.
+BUDGETS: dict[str, tuple[int, float]] = {
+    "riot": (20, 60),
+    "render": (60, 60),
+    "write": (MAX_REQUESTS, WINDOW_SECONDS),
+    "read": (600, 60),
+    BOT_BUDGET: (6000, 60),
+}
+
+
+class RouteCost(NamedTuple):
+    """Budget and cost charged to requests matching a path pattern and, optionally, a method set."""
+
+    budget: str
+    pattern: re.Pattern[str]
+    methods: frozenset[str] | None = None
+    cost: float = 1
+
+
+def _route(budget: str, pattern: str, methods: str | None = None, cost: float = 1) -> RouteCost:
+    """Build a RouteCost from a regex and a space-separated method list."""
+    return RouteCost(budget, re.compile(pattern), frozenset(methods.split()) if methods else None, cost)
+
+
+# First match wins. Riot-backed routes spend Riot API budget, PNG routes spend render CPU.
+ROUTE_COSTS: tuple[RouteCost, ...] = (
+    _route("riot", r"^/api/riot/check/"),
+    _route("riot", r"^/api/players$", "POST", cost=3),
+    _route("riot", r"^/api/players/[^/]+/refresh$", "POST", cost=3),
+    _route("riot", r"^/api/teams/[^/]+/members$", "POST", cost=2),
+    _route("render", r"^/api/og/(players|teams)/page\.png$", "GET", cost=3),
+    _route("render", r"^/api/og/.+\.png$", "GET"),
+    _route("read", r"^/api/", "GET"),
+    _route("read", r"^/api/(players|teams):batch$", "POST"),
+    _route("write", r"^/api/"),
+)
+
+
+class RateLimiter(Protocol):
+    """Limiter interface used by the middleware; ``hit`` must not block on I/O."""
+
+    def hit(self, key: str, cost: float = 1, now: float | None = None) -> float: ...
+
+    async def start(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class GcraLimiter:
+    """Fixed-memory GCRA limiter: ``limit`` requests per ``window`` seconds, one float per key.
+
+    Each key stores its theoretical arrival time (TAT). A request is allowed while
+    the TAT stays within one window of now, which permits bursts of up to ``limit``
+    requests and then one request every ``window / limit`` seconds. Keys are kept in
+    least-recently-hit order so a few expired ones can be dropped on every call.
+    """
+
+    def __init__(
+        self,
+        limit: int = MAX_REQUESTS,
+        window: float = WINDOW_SECONDS,
+        max_entries: int = CLEANUP_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.limit = limit
+        self.window = window
+        self.interval = window / limit
+        self.max_entries = max_entries
+        self.clock = clock
+        self._tats: OrderedDict[str, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._tats
+
+    def clear(self) -> None:
+        """Forget every key."""
+        self._tats.clear()
+
+    async def start(self) -> None:
+        """Nothing to start for the in-process limiter."""
+
+    async def close(self) -> None:
+        """Nothing to release for the in-process limiter."""
+
+    def hit(self, key: str, cost: float = 1, now: float | None = None) -> float:
+        """Charge ``cost`` requests to a key; return 0 if allowed, else seconds until it would be."""
+        if now is None:
+            now = self.clock()
+        tats = self._tats
+        tat = max(tats.get(key, now), now) + cost * self.interval
+        retry_after = tat - now - self.window
+        if retry_after > EPSILON:
+            self._cleanup(now)
+            return retry_after
+        tats[key] = tat
+        tats.move_to_end(key)
+        self._cleanup(now)
+        return 0.0
+
+    def _cleanup(self, now: float) -> None:
+        """Drop a bounded number of expired keys from the cold end, and enforce the size cap."""
+        tats = self._tats
+        for _ in range(CLEANUP_BATCH):
+            if not tats:
+                return
+            key, tat = next(iter(tats.items()))
+            if tat > now:
+                break
+            del tats[key]
+        while len(tats) > self.max_entries:
+            tats.popitem(last=False)
+
+
+def default_limiters() -> dict[str, GcraLimiter]:
+    """Build one in-process limiter per budget."""
+    return {name: GcraLimiter(limit, window) for name, (limit, window) in BUDGETS.items()}
+
+
+def _get_client_ip(scope: Scope) -> str:
     """Extract the client IP from X-Forwarded-For or the direct connection."""
-    forwarded = request.headers.get("x-forwarded-for")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
-
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Per-IP sliding-window rate limiter for non-GET /api/ endpoints."""
-
-    async def dispatch(self, request: Request, call_next) -> Response:
-        if request.method != "GET":
-            return await call_next(request)
-
-        path = request.url.path
-        if not path.startswith("/api/"):
-            return await call_next(request)
-
-        if path == "/api/health":
-            return await call_next(request)
-
-        ip = _get_client_ip(request)
-        now = time.monotonic()
-        cutoff = now - WINDOW_SECONDS
-
-        timestamps = _buckets[ip]
-        while timestamps and timestamps[0] < cutoff:
-            timestamps.pop(0)
-
-        if len(timestamps) >= MAX_REQUESTS:
-            _cleanup()
-            return JSONResponse(
+    for name, value in scope.get("headers", ()):
+        if name == b"x-forwarded-for":
+            return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _match_route(method: str, path: str, routes: tuple[RouteCost, ...]) -> RouteCost | None:
+    """Return the first route rule matching a request, or None if it is not limited."""
+    for route in routes:
+        if (route.methods is None or method in route.methods) and route.pattern.match(path):
+            return route
+    return None
+
+
+def _is_bot(scope: Scope, bot_secret: str | None) -> bool:
+    """Return True if the request carries the configured X-Bot-Secret."""
+    if not bot_secret:
+        return False
+    for name, value in scope.get("headers", ()):
+        if name == b"x-bot-secret":
+            return hmac.compare_digest(value, bot_secret.encode())
+    return False
+
+
+class RateLimitMiddleware:
+    """Cost-weighted GCRA rate limiter for /api/ endpoints, as plain ASGI middleware.
+
+    Each request is matched against ``routes`` to find the budget it draws from and
+    its cost; clients are keyed by IP within each budget. Requests authenticated
+    with the bot secret are charged to a single shared bot budget instead.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiters: Mapping[str, RateLimiter] | None = None,
+        routes: tuple[RouteCost, ...] = ROUTE_COSTS,
+        bot_secret: str | None = None,
+    ) -> None:
+        self.app = app
+        self.limiters = limiters if limiters is not None else default_limiters()
+        self.routes = routes
+        self.bot_secret = bot_secret
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in EXEMPT_METHODS
+            or not scope["path"].startswith("/api/")
+            or scope["path"] in EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        route = _match_route(scope["method"], scope["path"], self.routes)
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+
+        if _is_bot(scope, self.bot_secret):
+            retry_after = self.limiters[BOT_BUDGET].hit(BOT_BUDGET, route.cost)
+        else:
+            retry_after = self.limiters[route.budget].hit(_get_client_ip(scope), route.cost)
+        if retry_after:
+            response = JSONResponse(
                 status_code=429,
                 content={"detail": "Too many requests. Try again later."},
-                headers={"Retry-After": str(WINDOW_SECONDS)},
+                headers={"Retry-After": str(math.ceil(retry_after))},
             )
+            await response(scope, receive, send)
+            return
 
-        timestamps.append(now)
-        _cleanup()
-        return await call_next(request)
+        await self.app(scope, receive, send)
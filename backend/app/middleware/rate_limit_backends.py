@@ -0,0 +1,221 @@
+import asyncio
+import contextlib
+import fcntl
+import logging
+import os
+import tempfile
+import time
+import zlib
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.middleware.rate_limit import (
+    BUDGETS,
+    EPSILON,
+    MAX_REQUESTS,
+    WINDOW_SECONDS,
+    GcraLimiter,
+    RateLimiter,
+    default_limiters,
+)
+
+logger = logging.getLogger("riftteam.rate_limit")
+
+SHM_NAME = "riftteam_ratelimit"
+SHM_SLOTS = 65_536
+# Slots are guarded by this many byte-range locks on a lock file next to the segment.
+SHM_LOCK_STRIPES = 1024
+FLUSH_INTERVAL = 1.0
+PURGE_EVERY = 60
+
+_UPSERT_SQL = text("""
+    INSERT INTO rate_limit_buckets AS b (key, tat)
+    SELECT k, extract(epoch FROM now()) + c * :interval
+    FROM unnest(CAST(:keys AS text[]), CAST(:costs AS float8[])) AS u(k, c)
+    ON CONFLICT (key) DO UPDATE
+    SET tat = GREATEST(b.tat, extract(epoch FROM now())) + (excluded.tat - extract(epoch FROM now()))
+    RETURNING key, tat
+""")
+_PURGE_SQL = text("DELETE FROM rate_limit_buckets WHERE tat < extract(epoch FROM now())")
+
+
+class SharedMemoryLimiter:
+    """GCRA limiter whose TATs live in a fixed shared-memory table used by every worker on the host.
+
+    Keys hash into ``slots`` float64 cells, so the table never grows and needs no
+    cleanup; two keys landing in the same cell share a budget. Each read-modify-write
+    of a cell holds an ``fcntl`` lock on one of ``SHM_LOCK_STRIPES`` bytes of a lock
+    file, so concurrent workers never lose each other's charges. Timestamps come from
+    ``time.monotonic``, which is system-wide on Linux. The segment outlives worker
+    restarts and is only reset by a reboot or ``unlink()``.
+    """
+
+    def __init__(
+        self, name: str = SHM_NAME, limit: int = MAX_REQUESTS, window: float = WINDOW_SECONDS, slots: int = SHM_SLOTS,
+    ) -> None:
+        self.window = window
+        self.interval = window / limit
+        self.slots = slots
+        self.name = name
+        try:
+            self._shm = SharedMemory(name=name, create=True, size=slots * 8)
+        except FileExistsError:
+            self._shm = SharedMemory(name=name)
+            if self._shm.size < slots * 8:
+                self._shm.close()
+                raise ValueError(f"Shared memory segment {name!r} is smaller than {slots} slots") from None
+        # The segment is shared by all workers; stop this process's tracker from unlinking it on exit.
+        with contextlib.suppress(Exception):
+            resource_tracker.unregister(self._tracked_name, "shared_memory")
+        self._tats = self._shm.buf.cast("d")
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._lock_fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    @property
+    def _tracked_name(self) -> str:
+        """Name the resource tracker knows the segment by (POSIX names carry a leading slash)."""
+        return f"/{self.name}" if os.name == "posix" else self.name
+
+    def _slot(self, key: str) -> int:
+        """Map a key to its cell with a hash that is stable across processes."""
+        return zlib.crc32(key.encode()) % self.slots
+
+    def hit(self, key: str, cost: float = 1, now: float | None = None) -> float:
+        """Charge ``cost`` requests to a key; return 0 if allowed, else seconds until it would be."""
+        if now is None:
+            now = time.monotonic()
+        slot = self._slot(key)
+        stripe = slot % SHM_LOCK_STRIPES
+        fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, stripe)
+        try:
+            tat = max(self._tats[slot], now) + cost * self.interval
+            retry_after = tat - now - self.window
+            if retry_after > EPSILON:
+                return retry_after
+            self._tats[slot] = tat
+            return 0.0
+        finally:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, stripe)
+
+    async def start(self) -> None:
+        """Nothing to start: the segment is attached in the constructor."""
+
+    async def close(self) -> None:
+        """Detach this process from the segment."""
+        self._tats.release()
+        self._shm.close()
+        os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """Destroy the segment for every process (use when resetting all limits)."""
+        resource_tracker.register(self._tracked_name, "shared_memory")
+        self._shm.unlink()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self._lock_path)
+
+
+class PostgresSyncedLimiter(GcraLimiter):
+    """Local GCRA limiter whose charges are merged across hosts through an UNLOGGED Postgres table.
+
+    Requests are decided from the in-process state only. Allowed charges are
+    accumulated per key and flushed every ``flush_interval`` seconds in a single
+    upsert, whose returned TATs (which include other hosts' charges) are folded
+    back into the local state. A host can therefore over-admit by at most one
+    flush interval's worth of traffic per key. Timestamps are epoch seconds so
+    they compare across machines. Stored keys are prefixed with ``namespace`` so
+    several budgets can share the table.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        limit: int = MAX_REQUESTS,
+        window: float = WINDOW_SECONDS,
+        flush_interval: float = FLUSH_INTERVAL,
+        namespace: str = "",
+    ) -> None:
+        super().__init__(limit, window, clock=time.time)
+        self.session_factory = session_factory
+        self.namespace = f"{namespace}:" if namespace else ""
+        self.flush_interval = flush_interval
+        self._pending: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+        self._flushes = 0
+
+    def hit(self, key: str, cost: float = 1, now: float | None = None) -> float:
+        """Decide locally and queue the charge for the next flush."""
+        retry_after = super().hit(key, cost, now)
+        if not retry_after:
+            self._pending[key] = self._pending.get(key, 0) + cost
+        return retry_after
+
+    async def flush(self) -> None:
+        """Push pending charges to Postgres and adopt the shared TATs it returns."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        params = {
+            "interval": self.interval,
+            "keys": [self.namespace + key for key in pending],
+            "costs": list(pending.values()),
+        }
+        try:
+            async with self.session_factory() as session:
+                rows = (await session.execute(_UPSERT_SQL, params)).all()
+                self._flushes += 1
+                if self._flushes % PURGE_EVERY == 0:
+                    await session.execute(_PURGE_SQL)
+                await session.commit()
+        except Exception:
+            logger.warning("Rate limit flush failed, retrying next interval", exc_info=True)
+            for key, cost in pending.items():
+                self._pending[key] = self._pending.get(key, 0) + cost
+            return
+        for stored_key, tat in rows:
+            key = stored_key.removeprefix(self.namespace)
+            if key not in self._tats or tat > self._tats[key]:
+                self._tats[key] = tat
+
+    async def _flush_loop(self) -> None:
+        """Flush pending charges on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self) -> None:
+        """Start the background flush loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """Stop the flush loop and push any remaining charges."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+
+def create_limiters(
+    backend: str, session_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> dict[str, RateLimiter]:
+    """Build one limiter per budget for a ``RATE_LIMIT_BACKEND`` value: ``memory``, ``shm`` or ``postgres``."""
+    if backend == "memory":
+        return default_limiters()
+    if backend == "shm":
+        return {
+            name: SharedMemoryLimiter(f"{SHM_NAME}_{name}", limit, window)
+            for name, (limit, window) in BUDGETS.items()
+        }
+    if backend == "postgres":
+        if session_factory is None:
+            raise ValueError("The postgres rate limit backend needs a session factory")
+        return {
+            name: PostgresSyncedLimiter(session_factory, limit, window, namespace=name)
+            for name, (limit, window) in BUDGETS.items()
+        }
+    raise ValueError(f"Unknown rate limit backend: {backend!r}")
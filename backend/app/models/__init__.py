@@ -1,12 +1,15 @@
-from app.models.action_token import ActionToken
 from app.models.champion import PlayerChampion
+from app.models.change_event import ChangeEvent
+from app.models.consumed_token import ConsumedToken
 from app.models.guild_settings import GuildSettings
 from app.models.player import Base, Player
-from app.models.scrim import Scrim
+from app.models.saved_search import SavedSearch, SavedSearchMatch
+from app.models.scrim import Scrim, ScrimArchive, ScrimMatch
 from app.models.snapshot import ChampionSnapshot, RankSnapshot
 from app.models.team import Team, TeamMember
 
 __all__ = [
     "Base", "Player", "PlayerChampion", "RankSnapshot", "ChampionSnapshot",
-    "Team", "TeamMember", "Scrim", "ActionToken", "GuildSettings",
+    "Team", "TeamMember", "Scrim", "ScrimMatch", "ScrimArchive", "ConsumedToken", "GuildSettings",
+    "ChangeEvent", "SavedSearch", "SavedSearchMatch",
 ]
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Identity, Index, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.player import Base, utc_now
+
+
+class ChangeEvent(Base):
+    """A published change (LFT toggled, team created, scrim posted...); the id is the stream cursor.
+
+    Streams deliver events in ``(xact_id, id)`` order, which follows commit order closely enough
+    that a cursor never passes an event whose transaction was still running.
+    """
+
+    __tablename__ = "change_events"
+    __table_args__ = (Index("ix_change_events_xact_id_id", "xact_id", "id"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(30), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # Writing transaction's ID, filled in by the database.
+    xact_id: Mapped[int] = mapped_column(
+        BigInteger, server_default=text("pg_current_xact_id()::text::bigint"), nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, index=True)
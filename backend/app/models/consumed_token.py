@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.player import Base
+
+
+class ConsumedToken(Base):
+    """Nonce of a one-time action token that has already been used."""
+
+    __tablename__ = "consumed_tokens"
+
+    nonce: Mapped[str] = mapped_column(String(16), primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
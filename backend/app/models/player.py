@@ -1,15 +1,47 @@
 import uuid
-from datetime import datetime
+from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text
+from sqlalchemy import DDL, Boolean, Computed, DateTime, Index, Integer, SmallInteger, String, Text, event
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from shared.constants import ACTIVITY_LABELS, RANK_ORDER, ROLE_NAMES
+
+ROLE_BITS = {role: 1 << i for i, role in enumerate(ROLE_NAMES)}
+ACTIVITY_BITS = {activity: 1 << i for i, activity in enumerate(ACTIVITY_LABELS)}
+SECONDARY_ROLE_SHIFT = len(ROLE_BITS)
+
 
 class Base(DeclarativeBase):
     """Shared declarative base for all SQLAlchemy models."""
 
 
+# Trigram indexes (fuzzy name search) need pg_trgm; migrations create it too.
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
+def utc_now() -> datetime:
+    """Return the current time as an aware UTC datetime (column default)."""
+    return datetime.now(UTC)
+
+
+def rank_score_sql(tier_column: str) -> str:
+    """SQL for a generated column mapping a tier name to its RANK_ORDER value, so rank ranges are range scans."""
+    whens = " ".join(f"WHEN '{tier}' THEN {value}" for tier, value in RANK_ORDER.items())
+    return f"CASE {tier_column} {whens} END"
+
+
+def role_bits_sql(role_column: str) -> str:
+    """SQL mapping a role name to its ROLE_BITS flag (0 when unset)."""
+    whens = " ".join(f"WHEN '{role}' THEN {bit}" for role, bit in ROLE_BITS.items())
+    return f"(CASE {role_column} {whens} ELSE 0 END)"
+
+
+def array_mask_sql(array_column: str, bits: dict[str, int]) -> str:
+    """SQL for a generated bitmask holding the flag of every value present in an array column."""
+    return " + ".join(f"(CASE WHEN '{value}' = ANY({array_column}) THEN {bit} ELSE 0 END)" for value, bit in bits.items())
+
+
 class Player(Base):
     """A registered player profile linked to a Riot account."""
 
@@ -22,12 +54,17 @@ class Player(Base):
     riot_tag_line: Mapped[str] = mapped_column(String(5), nullable=False)
     region: Mapped[str] = mapped_column(String(10), default="EUW1")
     slug: Mapped[str] = mapped_column(String(25), unique=True, nullable=False, index=True)
+    # Lowercased "name#tag", trigram-indexed for fuzzy Riot ID search.
+    search_name: Mapped[str] = mapped_column(
+        String(22), Computed("lower(riot_game_name || '#' || riot_tag_line)", persisted=True),
+    )
 
     rank_solo_tier: Mapped[str | None] = mapped_column(String(15))
     rank_solo_division: Mapped[str | None] = mapped_column(String(5))
     rank_solo_lp: Mapped[int | None] = mapped_column(Integer)
     rank_solo_wins: Mapped[int | None] = mapped_column(Integer)
     rank_solo_losses: Mapped[int | None] = mapped_column(Integer)
+    rank_solo_score: Mapped[int | None] = mapped_column(SmallInteger, Computed(rank_score_sql("rank_solo_tier"), persisted=True))
     rank_flex_tier: Mapped[str | None] = mapped_column(String(15))
     rank_flex_division: Mapped[str | None] = mapped_column(String(5))
     rank_flex_lp: Mapped[int | None] = mapped_column(Integer)
@@ -48,18 +85,39 @@ class Player(Base):
     ambiance: Mapped[str | None] = mapped_column(String(10))
     frequency_min: Mapped[int | None] = mapped_column(Integer)
     frequency_max: Mapped[int | None] = mapped_column(Integer)
+    # Compact recommendation features: primary role flag in the low bits, secondary role flag above them.
+    role_mask: Mapped[int] = mapped_column(SmallInteger, Computed(
+        f"{role_bits_sql('primary_role')} + {role_bits_sql('secondary_role')} * {1 << SECONDARY_ROLE_SHIFT}",
+        persisted=True,
+    ))
+    activity_mask: Mapped[int] = mapped_column(SmallInteger, Computed(array_mask_sql("activities", ACTIVITY_BITS), persisted=True))
 
     is_lft: Mapped[bool] = mapped_column(Boolean, default=True)
     last_riot_sync: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, onupdate=utc_now)
 
     champions = relationship("PlayerChampion", back_populates="player", cascade="all, delete-orphan")
 
     __table_args__ = (
-        Index("idx_players_lft", "is_lft", postgresql_where=is_lft.is_(True)),
-        Index("idx_players_role", "primary_role"),
-        Index("idx_players_rank", "rank_solo_tier"),
+        # Browse: LFT players, newest first; the included columns let counts and recommendation
+        # scoring run as index-only scans.
+        Index(
+            "idx_players_lft_browse", updated_at.desc(),
+            postgresql_include=[
+                "primary_role", "secondary_role", "rank_solo_score",
+                "id", "role_mask", "activity_mask", "ambiance", "frequency_min", "frequency_max",
+            ],
+            postgresql_where=is_lft.is_(True),
+        ),
+        # Role (primary OR secondary) + rank range: combined with a BitmapOr.
+        Index("idx_players_lft_primary_rank", "primary_role", "rank_solo_score", postgresql_where=is_lft.is_(True)),
+        Index("idx_players_lft_secondary_rank", "secondary_role", "rank_solo_score", postgresql_where=is_lft.is_(True)),
+        Index("idx_players_activities", "activities", postgresql_using="gin"),
+        Index(
+            "idx_players_search_name_trgm", "search_name",
+            postgresql_using="gin", postgresql_ops={"search_name": "gin_trgm_ops"},
+        ),
     )
 
     @staticmethod
@@ -0,0 +1,49 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Computed, DateTime, ForeignKey, Identity, Index, SmallInteger, String
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.player import Base, rank_score_sql, utc_now
+
+
+class SavedSearch(Base):
+    """A player, team or scrim search a Discord user wants to be notified about."""
+
+    __tablename__ = "saved_searches"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    discord_user_id: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    target: Mapped[str] = mapped_column(String(10), nullable=False)
+    role: Mapped[str | None] = mapped_column(String(10))
+    min_rank: Mapped[str | None] = mapped_column(String(15))
+    max_rank: Mapped[str | None] = mapped_column(String(15))
+    format: Mapped[str | None] = mapped_column(String(10))
+    min_rank_score: Mapped[int | None] = mapped_column(SmallInteger, Computed(rank_score_sql("min_rank"), persisted=True))
+    max_rank_score: Mapped[int | None] = mapped_column(SmallInteger, Computed(rank_score_sql("max_rank"), persisted=True))
+    # Inverted index keys "target:role:rank bucket:format" (see app.services.saved_searches.search_keys).
+    match_keys: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now)
+
+    __table_args__ = (
+        Index("idx_saved_searches_match_keys", "match_keys", postgresql_using="gin"),
+    )
+
+
+class SavedSearchMatch(Base):
+    """A player, team or scrim matching a saved search, queued for DM delivery until ``notified_at`` is set."""
+
+    __tablename__ = "saved_search_matches"
+
+    search_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("saved_searches.id", ondelete="CASCADE"), primary_key=True,
+    )
+    # Player, team or scrim id depending on the search target.
+    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    matched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now)
+    notified_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("idx_saved_search_matches_pending", "matched_at", postgresql_where=notified_at.is_(None)),
+    )
@@ -1,11 +1,19 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, Computed, Date, DateTime, ForeignKey, Index, Integer, SmallInteger, String
+from sqlalchemy.dialects.postgresql import INT4RANGE, UUID, Range
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.player import Base
+from app.models.player import Base, rank_score_sql, utc_now
+
+PARIS_SCHEDULED_AT = "(scheduled_at AT TIME ZONE 'Europe/Paris')"
+
+
+def rank_window_sql() -> str:
+    """SQL for the accepted opponent rank window as a closed int4range (bounds swapped if inverted)."""
+    low, high = rank_score_sql("min_rank"), rank_score_sql("max_rank")
+    return f"CASE WHEN ({low}) > ({high}) THEN int4range({high}, {low}, '[]') ELSE int4range({low}, {high}, '[]') END"
 
 
 class Scrim(Base):
@@ -23,11 +31,74 @@ class Scrim(Base):
     game_count: Mapped[int | None] = mapped_column(Integer)
     fearless: Mapped[bool] = mapped_column(Boolean, default=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    rank_window: Mapped[Range[int] | None] = mapped_column(INT4RANGE, Computed(rank_window_sql(), persisted=True))
+    # Paris wall-clock slot of scheduled_at, stored so date/hour filters are plain range predicates.
+    paris_date: Mapped[date | None] = mapped_column(Date, Computed(f"{PARIS_SCHEDULED_AT}::date", persisted=True))
+    paris_hour: Mapped[int | None] = mapped_column(
+        SmallInteger, Computed(f"EXTRACT(HOUR FROM {PARIS_SCHEDULED_AT})::smallint", persisted=True),
+    )
+    paris_weekday: Mapped[int | None] = mapped_column(
+        SmallInteger, Computed(f"EXTRACT(ISODOW FROM {PARIS_SCHEDULED_AT})::smallint", persisted=True),
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, onupdate=utc_now)
 
     team = relationship("Team")
 
     __table_args__ = (
-        Index("idx_scrims_active_scheduled", "is_active", "scheduled_at"),
+        Index(
+            "idx_scrims_active_upcoming", "scheduled_at",
+            postgresql_include=["format", "game_count", "min_rank", "max_rank"],
+            postgresql_where=is_active.is_(True),
+        ),
+        Index("idx_scrims_active_format", "format", "scheduled_at", postgresql_where=is_active.is_(True)),
+        Index(
+            "idx_scrims_active_paris_slot", "paris_date", "paris_hour",
+            postgresql_include=["scheduled_at"],
+            postgresql_where=is_active.is_(True),
+        ),
+        Index("idx_scrims_active_rank_window", "rank_window", postgresql_using="gist", postgresql_where=is_active.is_(True)),
+        # create_scrim: the team's open scrim(s) to supersede.
+        Index("idx_scrims_active_team", "team_id", postgresql_where=is_active.is_(True)),
+        # Archive sweeper: past scrims, active or not.
+        Index("idx_scrims_scheduled", "scheduled_at"),
+    )
+
+
+class ScrimArchive(Base):
+    """A past scrim moved out of the scrims table by the archive sweeper."""
+
+    __tablename__ = "scrim_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    team_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+    captain_discord_id: Mapped[str] = mapped_column(String(20), nullable=False)
+    min_rank: Mapped[str | None] = mapped_column(String(15))
+    max_rank: Mapped[str | None] = mapped_column(String(15))
+    scheduled_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    format: Mapped[str | None] = mapped_column(String(10))
+    game_count: Mapped[int | None] = mapped_column(Integer)
+    fearless: Mapped[bool] = mapped_column(Boolean, default=False)
+    # EXPIRED: still open when its time passed; CANCELLED: cancelled or superseded beforehand.
+    status: Mapped[str] = mapped_column(String(10), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now)
+
+    __table_args__ = (
+        Index("idx_scrim_archive_team", "team_id", "scheduled_at"),
+    )
+
+
+class ScrimMatch(Base):
+    """A compatible pair of scrims whose captains have been notified (scrim_id < opponent_scrim_id)."""
+
+    __tablename__ = "scrim_matches"
+
+    scrim_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("scrims.id", ondelete="CASCADE"), primary_key=True,
+    )
+    opponent_scrim_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("scrims.id", ondelete="CASCADE"), primary_key=True, index=True,
     )
+    notified_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now)
@@ -1,11 +1,22 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.player import Base
+from app.models.player import ACTIVITY_BITS, ROLE_BITS, Base, array_mask_sql, rank_score_sql, utc_now
 
 
 class Team(Base):
@@ -16,6 +27,8 @@ class Team(Base):
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(50), nullable=False)
     slug: Mapped[str] = mapped_column(String(55), unique=True, nullable=False, index=True)
+    # Lowercased name, trigram-indexed for fuzzy team name search.
+    search_name: Mapped[str] = mapped_column(String(50), Computed("lower(name)", persisted=True))
     captain_discord_id: Mapped[str] = mapped_column(String(20), unique=True, nullable=False)
     captain_discord_name: Mapped[str | None] = mapped_column(String(50))
     description: Mapped[str | None] = mapped_column(Text)
@@ -26,14 +39,45 @@ class Team(Base):
     wanted_roles: Mapped[list[str] | None] = mapped_column(ARRAY(String), default=[])
     min_rank: Mapped[str | None] = mapped_column(String(15))
     max_rank: Mapped[str | None] = mapped_column(String(15))
+    min_rank_score: Mapped[int | None] = mapped_column(SmallInteger, Computed(rank_score_sql("min_rank"), persisted=True))
+    max_rank_score: Mapped[int | None] = mapped_column(SmallInteger, Computed(rank_score_sql("max_rank"), persisted=True))
+    wanted_role_mask: Mapped[int] = mapped_column(SmallInteger, Computed(array_mask_sql("wanted_roles", ROLE_BITS), persisted=True))
+    activity_mask: Mapped[int] = mapped_column(SmallInteger, Computed(array_mask_sql("activities", ACTIVITY_BITS), persisted=True))
+    # Roster aggregates, maintained by app.services.team_stats on roster and rank changes.
+    roster_size: Mapped[int] = mapped_column(SmallInteger, default=0)
+    roster_rank_avg: Mapped[int | None] = mapped_column(SmallInteger)
+    roster_rank_median: Mapped[int | None] = mapped_column(SmallInteger)
+    roster_rank_max: Mapped[int | None] = mapped_column(SmallInteger)
+    roster_role_mask: Mapped[int] = mapped_column(SmallInteger, default=0)
     is_lfp: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, onupdate=utc_now)
 
     members = relationship("TeamMember", back_populates="team", cascade="all, delete-orphan")
 
     __table_args__ = (
-        Index("idx_teams_lfp", "is_lfp", postgresql_where=is_lfp.is_(True)),
+        # Browse and recommendation scoring (see idx_players_lft_browse).
+        Index(
+            "idx_teams_lfp_browse", updated_at.desc(),
+            postgresql_include=[
+                "min_rank_score", "max_rank_score",
+                "id", "captain_discord_id", "wanted_role_mask", "activity_mask", "ambiance", "frequency_min",
+                "frequency_max",
+            ],
+            postgresql_where=is_lfp.is_(True),
+        ),
+        # Roster strength + open role ("teams around Emerald without a jungler"), for team and scrim search.
+        Index(
+            "idx_teams_roster_rank", "roster_rank_avg",
+            postgresql_include=["roster_role_mask", "roster_size", "is_lfp"],
+        ),
+        Index("idx_teams_activities", "activities", postgresql_using="gin"),
+        Index("idx_teams_wanted_roles", "wanted_roles", postgresql_using="gin"),
+        Index(
+            "idx_teams_search_name_trgm", "search_name",
+            postgresql_using="gin", postgresql_ops={"search_name": "gin_trgm_ops"},
+            postgresql_where=is_lfp.is_(True),
+        ),
     )
 
     @staticmethod
@@ -57,4 +101,5 @@ class TeamMember(Base):
 
     __table_args__ = (
         UniqueConstraint("player_id", name="uq_team_members_player"),
+        Index("idx_team_members_team", "team_id"),
     )
@@ -1,42 +1,90 @@
+import asyncio
+import hashlib
 import time
+from collections.abc import Awaitable
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse, Response
-from sqlalchemy import select
+from sqlalchemy import Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.config import settings
-from app.database import get_db
+from app.database import async_session, get_db, get_read_db
+from app.models.champion import PlayerChampion
 from app.models.player import Player
 from app.models.team import Team, TeamMember
-from app.services.og_generator import generate_og_image, generate_team_og_image
+from app.services.og_cache import (
+    CACHE_TTL,
+    TILE_CACHE_MAX_SIZE,
+    CrawlerPage,
+    evict,
+    evict_html_cache,
+    evict_og_cache,
+    html_cache,
+    og_cache,
+    tile_cache,
+)
+from app.services.og_generator import (
+    compose_tile_page,
+    generate_og_image,
+    generate_player_tile,
+    generate_team_og_image,
+    generate_team_tile,
+)
+from app.services.og_render_queue import render_queue
+from app.services.single_flight import single_flight
 from shared.constants import ACTIVITY_LABELS, RANK_COLORS, ROLE_NAMES
 from shared.format import format_rank, format_win_rate
 
 router = APIRouter()
 
 CRAWLER_AGENTS = ("Discordbot", "Twitterbot", "facebookexternalhit", "Slackbot", "TelegramBot")
-CACHE_TTL = 6 * 3600
-CACHE_MAX_SIZE = 500
-_og_cache: dict[str, tuple[bytes, float]] = {}
+PAGE_MAX_AGE = 300
+MAX_PAGE_TILES = 10
+_inflight: dict[str, asyncio.Future] = {}
 
+_PLAYER_PAGE_COLUMNS = (
+    Player.id,
+    Player.slug,
+    Player.riot_game_name,
+    Player.riot_tag_line,
+    Player.rank_solo_tier,
+    Player.rank_solo_division,
+    Player.rank_solo_wins,
+    Player.rank_solo_losses,
+    Player.primary_role,
+    Player.activities,
+    Player.updated_at,
+)
+_TEAM_PAGE_COLUMNS = (Team.id, Team.slug, Team.name, Team.min_rank, Team.max_rank, Team.wanted_roles, Team.updated_at)
 
-def _evict_cache() -> None:
-    """Remove expired and excess entries from the OG image cache."""
-    now = time.time()
-    expired = [k for k, (_, ts) in _og_cache.items() if now - ts >= CACHE_TTL]
-    for k in expired:
-        del _og_cache[k]
-    if len(_og_cache) > CACHE_MAX_SIZE:
-        by_age = sorted(_og_cache.items(), key=lambda item: item[1][1])
-        for k, _ in by_age[: len(_og_cache) - CACHE_MAX_SIZE]:
-            del _og_cache[k]
+
+async def _prerender_player(slug: str) -> None:
+    """Render a player's OG card into the cache ahead of the first crawler hit."""
+    async with async_session() as db:
+        await _render_and_cache(slug, _render_player_card(db, slug))
+
+
+async def _prerender_team(slug: str) -> None:
+    """Render a team's OG card into the cache ahead of the first crawler hit."""
+    async with async_session() as db:
+        await _render_and_cache(f"team_{slug}", _render_team_card(db, slug))
+
+
+render_queue.register("player", _prerender_player)
+render_queue.register("team", _prerender_team)
 
 
-def invalidate_og_cache(slug: str) -> None:
-    """Remove a specific player's OG image from cache."""
-    _og_cache.pop(slug, None)
+async def _render_and_cache(cache_key: str, render: Awaitable[bytes | None]) -> bytes | None:
+    """Await a card render and store the PNG in the OG cache."""
+    png_bytes = await render
+    if png_bytes is not None:
+        evict_og_cache()
+        og_cache[cache_key] = (png_bytes, time.time())
+    return png_bytes
 
 
 def _is_crawler(user_agent: str) -> bool:
@@ -45,6 +93,60 @@ def _is_crawler(user_agent: str) -> bool:
     return any(bot.lower() in ua_lower for bot in CRAWLER_AGENTS)
 
 
+def _as_utc(stamp: datetime) -> datetime:
+    """Return a timestamp as an aware UTC datetime (naive values are stored in UTC)."""
+    return stamp.replace(tzinfo=UTC) if stamp.tzinfo is None else stamp.astimezone(UTC)
+
+
+def _cached_page(key: str, version: datetime) -> CrawlerPage | None:
+    """Return the cached crawler page for a key if it was built from this version of the entity."""
+    page = html_cache.get(key)
+    if page is None or page.last_modified != _as_utc(version) or time.time() - page.built_at >= CACHE_TTL:
+        return None
+    return page
+
+
+def _store_page(key: str, html: str, version: datetime) -> CrawlerPage:
+    """Cache a freshly built crawler page together with its ETag and version stamp."""
+    etag = f'"{hashlib.sha256(html.encode()).hexdigest()[:20]}"'
+    page = CrawlerPage(html, etag, _as_utc(version), time.time())
+    evict_html_cache()
+    html_cache[key] = page
+    return page
+
+
+def _is_not_modified(request: Request, page: CrawlerPage) -> bool:
+    """Return True if the request's conditional headers match the cached page."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or page.etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=UTC)
+        return page.last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def _crawler_response(request: Request, page: CrawlerPage | None) -> Response:
+    """Serve a cached crawler page, honouring If-None-Match / If-Modified-Since."""
+    if page is None:
+        return Response(status_code=404, content="Not found")
+    headers = {
+        "ETag": page.etag,
+        "Last-Modified": format_datetime(page.last_modified, usegmt=True),
+        "Cache-Control": f"public, max-age={PAGE_MAX_AGE}",
+    }
+    if _is_not_modified(request, page):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(page.html, headers=headers)
+
+
 
 
 def _theme_color(tier: str | None) -> str:
@@ -53,8 +155,8 @@ def _theme_color(tier: str | None) -> str:
     return f"#{hex_int:06x}"
 
 
-def _build_og_html(player: Player) -> str:
-    """Build a minimal HTML page with OpenGraph meta tags for a player profile."""
+def _build_og_html(player: Row, top_champions: list[str]) -> str:
+    """Build a minimal HTML page with OpenGraph meta tags from a player page projection row."""
     riot_id = f"{player.riot_game_name}#{player.riot_tag_line}"
     rank = format_rank(player.rank_solo_tier, player.rank_solo_division)
     role = ROLE_NAMES.get(player.primary_role or "", "")
@@ -67,9 +169,8 @@ def _build_og_html(player: Player) -> str:
     wr = format_win_rate(player.rank_solo_wins, player.rank_solo_losses)
     if wr:
         desc_parts.append(wr)
-    top_champs = sorted(player.champions, key=lambda c: c.games_played, reverse=True)[:3]
-    if top_champs:
-        desc_parts.append(", ".join(c.champion_name for c in top_champs))
+    if top_champions:
+        desc_parts.append(", ".join(top_champions))
     if player.activities:
         desc_parts.append(", ".join(ACTIVITY_LABELS.get(a, a) for a in player.activities))
     description = " · ".join(desc_parts) if desc_parts else "Profil joueur LoL"
@@ -101,23 +202,20 @@ def _build_og_html(player: Player) -> str:
 </html>"""
 
 
-@router.get("/api/og/{slug}.png")
-async def og_image(slug: str, db: AsyncSession = Depends(get_db)):
-    """Generate and cache a 1200x630 PNG OG card for a player."""
-    slug_clean = slug.removesuffix(".png") if slug.endswith(".png") else slug
-    cached = _og_cache.get(slug_clean)
-    if cached:
-        data, ts = cached
-        if time.time() - ts < CACHE_TTL:
-            return Response(content=data, media_type="image/png",
-                            headers={"Cache-Control": f"public, max-age={CACHE_TTL}"})
-
-    stmt = select(Player).options(selectinload(Player.champions)).where(Player.slug == slug_clean)
+async def _render_player_card(db: AsyncSession, slug: str) -> bytes | None:
+    """Load a player with champions and render their OG card, or return None if missing."""
+    stmt = select(Player).options(selectinload(Player.champions)).where(Player.slug == slug)
     result = await db.execute(stmt)
     player = result.scalar_one_or_none()
     if not player:
-        return Response(status_code=404, content="Not found")
+        return None
+
+    player_dict, champs = _player_card_data(player)
+    return await generate_og_image(player_dict, champs)
 
+
+def _player_card_data(player: Player) -> tuple[dict, list[dict]]:
+    """Extract the player fields and champion list used by the card renderers."""
     player_dict = {
         "riot_game_name": player.riot_game_name,
         "riot_tag_line": player.riot_tag_line,
@@ -147,32 +245,65 @@ async def og_image(slug: str, db: AsyncSession = Depends(get_db)):
         }
         for c in player.champions
     ]
+    return player_dict, champs
+
+
+@router.get("/api/og/{slug}.png")
+async def og_image(slug: str, db: AsyncSession = Depends(get_db)):
+    """Generate and cache a 1200x630 PNG OG card for a player."""
+    slug_clean = slug.removesuffix(".png") if slug.endswith(".png") else slug
+    cached = og_cache.get(slug_clean)
+    if cached:
+        data, ts = cached
+        if time.time() - ts < CACHE_TTL:
+            return Response(content=data, media_type="image/png",
+                            headers={"Cache-Control": f"public, max-age={CACHE_TTL}"})
 
-    png_bytes = await generate_og_image(player_dict, champs)
-    _evict_cache()
-    _og_cache[slug_clean] = (png_bytes, time.time())
+    png_bytes = await single_flight(
+        _inflight,
+        f"png:{slug_clean}",
+        lambda: _render_and_cache(slug_clean, _render_player_card(db, slug_clean)),
+    )
+    if png_bytes is None:
+        return Response(status_code=404, content="Not found")
 
     return Response(content=png_bytes, media_type="image/png",
                     headers={"Cache-Control": f"public, max-age={CACHE_TTL}"})
 
 
+async def _player_og_html(db: AsyncSession, slug: str) -> CrawlerPage | None:
+    """Return a player's crawler page, rebuilding it only if the profile changed since it was cached."""
+    stmt = select(*_PLAYER_PAGE_COLUMNS).where(Player.slug == slug)
+    player = (await db.execute(stmt)).one_or_none()
+    if player is None:
+        return None
+    key = f"p:{slug}"
+    page = _cached_page(key, player.updated_at)
+    if page is not None:
+        return page
+    champs_stmt = (
+        select(PlayerChampion.champion_name)
+        .where(PlayerChampion.player_id == player.id)
+        .order_by(PlayerChampion.games_played.desc())
+        .limit(3)
+    )
+    top_champions = list((await db.execute(champs_stmt)).scalars().all())
+    return _store_page(key, _build_og_html(player, top_champions), player.updated_at)
+
+
 @router.get("/p/{slug}")
-async def profile_page(slug: str, request: Request, db: AsyncSession = Depends(get_db)):
+async def profile_page(slug: str, request: Request, db: AsyncSession = Depends(get_read_db)):
     """Serve OG meta tags to crawlers, redirect browsers to the SPA."""
     ua = request.headers.get("user-agent", "")
     if _is_crawler(ua):
-        stmt = select(Player).options(selectinload(Player.champions)).where(Player.slug == slug)
-        result = await db.execute(stmt)
-        player = result.scalar_one_or_none()
-        if not player:
-            return Response(status_code=404, content="Not found")
-        return HTMLResponse(_build_og_html(player))
+        page = await single_flight(_inflight, f"html:p:{slug}", lambda: _player_og_html(db, slug))
+        return _crawler_response(request, page)
 
     return RedirectResponse(f"{settings.app_url}/p/{slug}", status_code=302)
 
 
-def _build_team_og_html(team: Team) -> str:
-    """Build a minimal HTML page with OpenGraph meta tags for a team profile."""
+def _build_team_og_html(team: Row) -> str:
+    """Build a minimal HTML page with OpenGraph meta tags from a team page projection row."""
     title = f"{team.name} — Équipe LFP"
 
     desc_parts = []
@@ -186,8 +317,7 @@ def _build_team_og_html(team: Team) -> str:
     if team.wanted_roles:
         role_names = [ROLE_NAMES.get(r, r) for r in team.wanted_roles]
         desc_parts.append(", ".join(role_names))
-    roster_count = len(team.members) if team.members else 0
-    desc_parts.append(f"{roster_count}/5 joueurs")
+    desc_parts.append(f"{team.member_count}/5 joueurs")
     description = " · ".join(desc_parts) if desc_parts else "Équipe LoL"
 
     og_image = f"{settings.api_url}/api/og/team/{team.slug}.png"
@@ -219,29 +349,24 @@ def _build_team_og_html(team: Team) -> str:
 </html>"""
 
 
-@router.get("/api/og/team/{slug}.png")
-async def team_og_image(slug: str, db: AsyncSession = Depends(get_db)):
-    """Generate and cache a 1200x630 PNG OG card for a team."""
-    slug_clean = slug.removesuffix(".png") if slug.endswith(".png") else slug
-    cache_key = f"team_{slug_clean}"
-    cached = _og_cache.get(cache_key)
-    if cached:
-        data, ts = cached
-        if time.time() - ts < CACHE_TTL:
-            return Response(content=data, media_type="image/png",
-                            headers={"Cache-Control": f"public, max-age={CACHE_TTL}"})
-
+async def _render_team_card(db: AsyncSession, slug: str) -> bytes | None:
+    """Load a team with its roster and render its OG card, or return None if missing."""
     stmt = (
         select(Team)
         .options(selectinload(Team.members).selectinload(TeamMember.player))
-        .where(Team.slug == slug_clean)
+        .where(Team.slug == slug)
     )
     result = await db.execute(stmt)
     team = result.scalar_one_or_none()
     if not team:
-        return Response(status_code=404, content="Not found")
+        return None
+
+    return await generate_team_og_image(_team_card_data(team))
 
-    team_dict = {
+
+def _team_card_data(team: Team) -> dict:
+    """Extract the team fields and roster used by the card renderers."""
+    return {
         "name": team.name,
         "min_rank": team.min_rank,
         "max_rank": team.max_rank,
@@ -260,28 +385,129 @@ async def team_og_image(slug: str, db: AsyncSession = Depends(get_db)):
         ],
     }
 
-    png_bytes = await generate_team_og_image(team_dict)
-    _evict_cache()
-    _og_cache[cache_key] = (png_bytes, time.time())
+
+@router.get("/api/og/team/{slug}.png")
+async def team_og_image(slug: str, db: AsyncSession = Depends(get_db)):
+    """Generate and cache a 1200x630 PNG OG card for a team."""
+    slug_clean = slug.removesuffix(".png") if slug.endswith(".png") else slug
+    cache_key = f"team_{slug_clean}"
+    cached = og_cache.get(cache_key)
+    if cached:
+        data, ts = cached
+        if time.time() - ts < CACHE_TTL:
+            return Response(content=data, media_type="image/png",
+                            headers={"Cache-Control": f"public, max-age={CACHE_TTL}"})
+
+    png_bytes = await single_flight(
+        _inflight,
+        f"png:{cache_key}",
+        lambda: _render_and_cache(cache_key, _render_team_card(db, slug_clean)),
+    )
+    if png_bytes is None:
+        return Response(status_code=404, content="Not found")
 
     return Response(content=png_bytes, media_type="image/png",
                     headers={"Cache-Control": f"public, max-age={CACHE_TTL}"})
 
 
+async def _team_og_html(db: AsyncSession, slug: str) -> CrawlerPage | None:
+    """Return a team's crawler page, rebuilding it only if the team changed since it was cached."""
+    member_count = (
+        select(func.count(TeamMember.id))
+        .where(TeamMember.team_id == Team.id)
+        .scalar_subquery()
+        .label("member_count")
+    )
+    stmt = select(*_TEAM_PAGE_COLUMNS, member_count).where(Team.slug == slug)
+    team = (await db.execute(stmt)).one_or_none()
+    if team is None:
+        return None
+    key = f"t:{slug}"
+    return _cached_page(key, team.updated_at) or _store_page(key, _build_team_og_html(team), team.updated_at)
+
+
 @router.get("/t/{slug}")
-async def team_page(slug: str, request: Request, db: AsyncSession = Depends(get_db)):
+async def team_page(slug: str, request: Request, db: AsyncSession = Depends(get_read_db)):
     """Serve OG meta tags to crawlers, redirect browsers to the SPA."""
     ua = request.headers.get("user-agent", "")
     if _is_crawler(ua):
+        page = await single_flight(_inflight, f"html:t:{slug}", lambda: _team_og_html(db, slug))
+        return _crawler_response(request, page)
+
+    return RedirectResponse(f"{settings.app_url}/t/{slug}", status_code=302)
+
+
+def _cached_tiles(prefix: str, slugs: list[str]) -> tuple[dict[str, bytes], list[str]]:
+    """Split requested slugs into fresh cached tiles and slugs that still need rendering."""
+    now = time.time()
+    found: dict[str, bytes] = {}
+    missing: list[str] = []
+    for slug in slugs:
+        cached = tile_cache.get(f"{prefix}:{slug}")
+        if cached and now - cached[1] < CACHE_TTL:
+            found[slug] = cached[0]
+        else:
+            missing.append(slug)
+    return found, missing
+
+
+def _store_tile(prefix: str, slug: str, data: bytes) -> None:
+    """Cache a rendered listing tile."""
+    evict(tile_cache, TILE_CACHE_MAX_SIZE)
+    tile_cache[f"{prefix}:{slug}"] = (data, time.time())
+
+
+def _page_slugs(slugs: list[str]) -> list[str]:
+    """Deduplicate requested slugs (keeping order) and enforce the page size limit."""
+    unique = list(dict.fromkeys(slugs))
+    if len(unique) > MAX_PAGE_TILES:
+        raise HTTPException(400, f"Maximum {MAX_PAGE_TILES} entries per page")
+    return unique
+
+
+def _page_response(tiles: list[bytes]) -> Response:
+    """Compose tiles into one PNG page card response."""
+    if not tiles:
+        return Response(status_code=404, content="Not found")
+    return Response(content=compose_tile_page(tiles), media_type="image/png",
+                    headers={"Cache-Control": f"public, max-age={CACHE_TTL}"})
+
+
+@router.get("/api/og/players/page.png")
+async def players_page_image(slugs: list[str] = Query(...), db: AsyncSession = Depends(get_db)):
+    """Render a composite listing card for several players, one cached tile per player."""
+    slugs = _page_slugs(slugs)
+    tiles, missing = _cached_tiles("p", slugs)
+
+    if missing:
+        stmt = select(Player).options(selectinload(Player.champions)).where(Player.slug.in_(missing))
+        result = await db.execute(stmt)
+        players = list(result.scalars().all())
+        rendered = await asyncio.gather(*[generate_player_tile(*_player_card_data(p)) for p in players])
+        for player, data in zip(players, rendered, strict=True):
+            _store_tile("p", player.slug, data)
+            tiles[player.slug] = data
+
+    return _page_response([tiles[s] for s in slugs if s in tiles])
+
+
+@router.get("/api/og/teams/page.png")
+async def teams_page_image(slugs: list[str] = Query(...), db: AsyncSession = Depends(get_db)):
+    """Render a composite listing card for several teams, one cached tile per team."""
+    slugs = _page_slugs(slugs)
+    tiles, missing = _cached_tiles("t", slugs)
+
+    if missing:
         stmt = (
             select(Team)
             .options(selectinload(Team.members).selectinload(TeamMember.player))
-            .where(Team.slug == slug)
+            .where(Team.slug.in_(missing))
         )
         result = await db.execute(stmt)
-        team = result.scalar_one_or_none()
-        if not team:
-            return Response(status_code=404, content="Not found")
-        return HTMLResponse(_build_team_og_html(team))
+        teams = list(result.scalars().all())
+        rendered = await asyncio.gather(*[generate_team_tile(_team_card_data(t)) for t in teams])
+        for team, data in zip(teams, rendered, strict=True):
+            _store_tile("t", team.slug, data)
+            tiles[team.slug] = data
 
-    return RedirectResponse(f"{settings.app_url}/t/{slug}", status_code=302)
+    return _page_response([tiles[s] for s in slugs if s in tiles])
@@ -8,26 +8,33 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.database import async_session, get_db
-from app.dependencies import get_riot_client, verify_bot_secret
+from app.database import get_db, get_read_db
+from app.dependencies import get_riot_client, is_bot, verify_bot_secret
 from app.models.player import Player
-from app.routers.og import invalidate_og_cache
 from app.schemas.player import (
+    PlayerBatchRequest,
+    PlayerBatchResponse,
     PlayerCreate,
     PlayerListResponse,
     PlayerResponse,
     PlayerUpdate,
 )
+from app.schemas.team import TeamRecommendation, TeamRecommendationList
+from app.services.events import publish_event, publish_lft_change
+from app.services.og_cache import invalidate_og_cache, schedule_og_render, schedule_team_og_render
 from app.services.player_helpers import (
     apply_riot_data,
     create_player_from_riot_data,
     populate_champions,
     refresh_champions,
 )
-from app.services.query_helpers import apply_rank_filters
+from app.services.query_helpers import apply_profile_filters, apply_rank_range
+from app.services.recommendations import recommend_teams
 from app.services.riot_api import fetch_full_profile
+from app.services.saved_searches import match_player
 from app.services.snapshots import record_champion_snapshot, record_rank_snapshot, update_peak_rank
 from app.services.sync import _sync_player_rank
+from app.services.team_stats import refresh_player_team_stats
 from app.services.token_store import consume_token, validate_token
 from shared.riot_client import RiotAPIError, RiotClient
 
@@ -91,6 +98,7 @@ async def create_player(
         raise HTTPException(502, f"Riot API error: {e.message}") from e
 
     now = datetime.now(UTC)
+    was_lft = bool(existing and existing.is_lft)
 
     if existing and existing.discord_user_id is None:
         player = existing
@@ -134,43 +142,41 @@ async def create_player(
         db, player.id, riot_data["champions"],
         riot_data["primary_role"], riot_data["secondary_role"], recorded_at=now,
     )
+    await publish_lft_change(db, player, was_lft)
+    await match_player(db, player)
 
     try:
         await db.commit()
     except IntegrityError:
         await db.rollback()
         raise HTTPException(409, "Profile already exists for this Riot ID") from None
-    await db.refresh(player)
-    stmt = select(Player).options(selectinload(Player.champions)).where(Player.id == player.id)
-    result = await db.execute(stmt)
-    player = result.scalar_one()
+    schedule_og_render(player.slug)
     return player
 
 
 _refreshing_players: set = set()
 
 
-async def _lazy_rank_refresh(player_id, slug: str, riot_client: RiotClient) -> None:
-    """Background task: refresh a player's rank if data is older than 6 hours."""
+async def _lazy_rank_refresh(player: Player, riot_client: RiotClient) -> None:
+    """Background task: refresh a player's rank if data is older than 6 hours.
+
+    Uses the already-loaded (detached) player so no connection is held while the
+    Riot API is queried; ``_sync_player_rank`` opens its own session for the write.
+    """
     try:
-        async with async_session() as db:
-            stmt = select(Player).where(Player.id == player_id)
-            result = await db.execute(stmt)
-            player = result.scalar_one_or_none()
-            if player:
-                try:
-                    await _sync_player_rank(player, riot_client)
-                except Exception:
-                    logger.exception("Lazy rank refresh failed for %s", slug)
+        await _sync_player_rank(player, riot_client)
+        schedule_og_render(player.slug)
+    except Exception:
+        logger.exception("Lazy rank refresh failed for %s", player.slug)
     finally:
-        _refreshing_players.discard(player_id)
+        _refreshing_players.discard(player.id)
 
 
 @router.get("/players/by-discord/{discord_user_id}", response_model=PlayerResponse)
 async def get_player_by_discord(
     discord_user_id: str,
     _: str = Depends(verify_bot_secret),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Look up a player by Discord user ID (bot-only)."""
     stmt = select(Player).options(selectinload(Player.champions)).where(Player.discord_user_id == discord_user_id)
@@ -181,12 +187,30 @@ async def get_player_by_discord(
     return player
 
 
+@router.post("/players:batch", response_model=PlayerBatchResponse)
+async def get_players_batch(
+    body: PlayerBatchRequest,
+    bot: bool = Depends(is_bot),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Load many players in one round trip (lookups by Discord ID are bot-only)."""
+    if body.discord_user_ids and not bot:
+        raise HTTPException(403, "Invalid bot secret")
+    keys = ((Player.slug, body.slugs), (Player.riot_puuid, body.puuids), (Player.discord_user_id, body.discord_user_ids))
+    conditions = [column.in_(values) for column, values in keys if values]
+    if not conditions:
+        return {"players": []}
+    stmt = select(Player).options(selectinload(Player.champions)).where(or_(*conditions)).order_by(Player.slug)
+    result = await db.execute(stmt)
+    return {"players": result.scalars().all()}
+
+
 @router.get("/players/{slug}", response_model=PlayerResponse)
 async def get_player(
     slug: str,
     request: Request,
     background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Return a player profile, triggering a lazy rank refresh if data is stale."""
     player = await _get_player_or_404(slug, db)
@@ -197,33 +221,55 @@ async def get_player(
             client = getattr(request.app.state, "riot_client", None)
             if client:
                 _refreshing_players.add(player.id)
-                background_tasks.add_task(_lazy_rank_refresh, player.id, player.slug, client)
+                # The session is only closed after background tasks run: release its connection now.
+                await db.close()
+                background_tasks.add_task(_lazy_rank_refresh, player, client)
 
     return player
 
 
+def _browse_players_query(
+    *, is_lft=None, role=None, min_rank=None, max_rank=None,
+    activities=None, ambiance=None, frequency_min=None, frequency_max=None,
+):
+    """Build the filtered player listing and count statements (unordered, unpaginated)."""
+    stmt = select(Player).options(selectinload(Player.champions))
+    count_stmt = select(func.count()).select_from(Player)
+
+    if is_lft is not None:
+        # Literal IS TRUE/FALSE so the planner can match the partial browse indexes.
+        stmt = stmt.where(Player.is_lft.is_(is_lft))
+        count_stmt = count_stmt.where(Player.is_lft.is_(is_lft))
+    if role:
+        role_filter = or_(Player.primary_role == role.upper(), Player.secondary_role == role.upper())
+        stmt = stmt.where(role_filter)
+        count_stmt = count_stmt.where(role_filter)
+    stmt, count_stmt = apply_rank_range(stmt, count_stmt, min_rank, max_rank, Player.rank_solo_score)
+    return apply_profile_filters(
+        stmt, count_stmt, Player,
+        activities=activities, ambiance=ambiance, frequency_min=frequency_min, frequency_max=frequency_max,
+    )
+
+
 @router.get("/players", response_model=PlayerListResponse)
 async def list_players(
     is_lft: bool | None = Query(None),
     role: str | None = Query(None),
     min_rank: str | None = Query(None),
     max_rank: str | None = Query(None),
+    activities: list[str] | None = Query(None),
+    ambiance: str | None = Query(None),
+    frequency_min: int | None = Query(None, ge=0),
+    frequency_max: int | None = Query(None, ge=0),
     limit: int = Query(20, le=100),
     offset: int = Query(0, ge=0),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List players with optional LFT, role and rank filters."""
-    stmt = select(Player).options(selectinload(Player.champions))
-    count_stmt = select(func.count(Player.id))
-
-    if is_lft is not None:
-        stmt = stmt.where(Player.is_lft == is_lft)
-        count_stmt = count_stmt.where(Player.is_lft == is_lft)
-    if role:
-        role_filter = or_(Player.primary_role == role.upper(), Player.secondary_role == role.upper())
-        stmt = stmt.where(role_filter)
-        count_stmt = count_stmt.where(role_filter)
-    stmt, count_stmt = apply_rank_filters(stmt, count_stmt, min_rank, max_rank, Player.rank_solo_tier)
+    """List players with optional LFT, role, rank, activity, ambiance and frequency filters."""
+    stmt, count_stmt = _browse_players_query(
+        is_lft=is_lft, role=role, min_rank=min_rank, max_rank=max_rank,
+        activities=activities, ambiance=ambiance, frequency_min=frequency_min, frequency_max=frequency_max,
+    )
 
     total_result = await db.execute(count_stmt)
     total = total_result.scalar_one()
@@ -235,6 +281,20 @@ async def list_players(
     return PlayerListResponse(players=players, total=total)
 
 
+@router.get("/players/{slug}/recommended-teams", response_model=TeamRecommendationList)
+async def recommended_teams(
+    slug: str,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Return the LFP teams most compatible with a player, best match first."""
+    player = await _get_player_or_404(slug, db)
+    recommendations = await recommend_teams(db, player, limit=limit)
+    return TeamRecommendationList(
+        teams=[TeamRecommendation(team=team, score=score) for team, score in recommendations],
+    )
+
+
 @router.patch("/players/{slug}", response_model=PlayerResponse)
 async def update_player(
     slug: str,
@@ -248,22 +308,23 @@ async def update_player(
         raise HTTPException(403, "Token invalide ou expiré")
 
     player = await _get_player_or_404(slug, db)
+    was_lft = player.is_lft
     update_data = body.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(player, field, value)
     player.updated_at = datetime.now(UTC)
+    await publish_lft_change(db, player, was_lft)
+    await match_player(db, player)
     await db.commit()
-    await db.refresh(player)
-    stmt = select(Player).options(selectinload(Player.champions)).where(Player.id == player.id)
-    result = await db.execute(stmt)
-    return result.scalar_one()
+    schedule_og_render(slug)
+    return player
 
 
 @router.get("/players/{slug}/export")
 async def export_player(
     slug: str,
     token: str = Query(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Download the full player profile as a JSON file."""
     token_data = await validate_token(db, token)
@@ -290,8 +351,14 @@ async def delete_player(
         raise HTTPException(403, "Token invalide ou expiré")
 
     player = await _get_player_or_404(slug, db)
+    team_slug = await refresh_player_team_stats(db, player.id, leaving=True)
+    if player.is_lft:
+        await publish_event(db, "player.lft_off", slug=slug)
     await db.delete(player)
     await db.commit()
+    invalidate_og_cache(slug)
+    if team_slug:
+        schedule_team_og_render(team_slug)
 
 
 @router.post("/players/{slug}/refresh", response_model=PlayerResponse)
@@ -317,6 +384,7 @@ async def refresh_player(
         raise HTTPException(502, f"Riot API error: {e.message}") from e
 
     now = datetime.now(UTC)
+    tier_changed = player.rank_solo_tier != riot_data["rank_solo_tier"]
     apply_riot_data(player, riot_data)
     player.last_riot_sync = now
     player.updated_at = now
@@ -330,13 +398,13 @@ async def refresh_player(
         db, player.id, riot_data["champions"],
         riot_data["primary_role"], riot_data["secondary_role"], recorded_at=now,
     )
+    team_slug = await refresh_player_team_stats(db, player.id) if tier_changed else None
 
     await db.commit()
-    invalidate_og_cache(slug)
-    await db.refresh(player)
-    stmt = select(Player).options(selectinload(Player.champions)).where(Player.id == player.id)
-    result = await db.execute(stmt)
-    return result.scalar_one()
+    schedule_og_render(slug)
+    if team_slug:
+        schedule_team_og_render(team_slug)
+    return player
 
 
 @router.post("/players/{slug}/reactivate", status_code=200)
@@ -353,7 +421,11 @@ async def reactivate_player(
     if player.discord_user_id != discord_user_id:
         raise HTTPException(403, "Not authorized")
 
+    was_lft = player.is_lft
     player.is_lft = True
     player.updated_at = datetime.now(UTC)
+    await publish_lft_change(db, player, was_lft)
+    if not was_lft:
+        await match_player(db, player)
     await db.commit()
     return {"status": "reactivated"}
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.dependencies import verify_bot_secret
+from app.models.saved_search import SavedSearch
+from app.schemas.saved_search import SavedSearchCreate, SavedSearchListResponse, SavedSearchResponse
+from app.services.saved_searches import MAX_SAVED_SEARCHES, search_keys
+
+router = APIRouter(tags=["saved-searches"])
+
+
+@router.post("/saved-searches", response_model=SavedSearchResponse, status_code=201)
+async def create_saved_search(
+    body: SavedSearchCreate,
+    _: str = Depends(verify_bot_secret),
+    db: AsyncSession = Depends(get_db),
+):
+    """Save a search for a Discord user, who is then DMed each new match (bot-only)."""
+    count = await db.execute(
+        select(func.count()).select_from(SavedSearch).where(SavedSearch.discord_user_id == body.discord_user_id)
+    )
+    if count.scalar_one() >= MAX_SAVED_SEARCHES:
+        raise HTTPException(409, f"Limite de {MAX_SAVED_SEARCHES} recherches sauvegardées atteinte")
+
+    search = SavedSearch(
+        **body.model_dump(),
+        match_keys=search_keys(
+            body.target, role=body.role, min_rank=body.min_rank, max_rank=body.max_rank, format=body.format,
+        ),
+    )
+    db.add(search)
+    await db.commit()
+    return search
+
+
+@router.get("/saved-searches", response_model=SavedSearchListResponse)
+async def list_saved_searches(
+    discord_user_id: str = Query(...),
+    _: str = Depends(verify_bot_secret),
+    db: AsyncSession = Depends(get_db),
+):
+    """List a Discord user's saved searches, oldest first (bot-only)."""
+    result = await db.execute(
+        select(SavedSearch).where(SavedSearch.discord_user_id == discord_user_id).order_by(SavedSearch.id)
+    )
+    return {"searches": result.scalars().all()}
+
+
+@router.delete("/saved-searches/{search_id}", status_code=204)
+async def delete_saved_search(
+    search_id: int,
+    discord_user_id: str = Query(...),
+    _: str = Depends(verify_bot_secret),
+    db: AsyncSession = Depends(get_db),
+):
+    """Delete one of a Discord user's saved searches and its queued matches (bot-only)."""
+    result = await db.execute(
+        delete(SavedSearch).where(SavedSearch.id == search_id, SavedSearch.discord_user_id == discord_user_id)
+    )
+    if result.rowcount == 0:
+        raise HTTPException(404, "Saved search not found")
+    await db.commit()
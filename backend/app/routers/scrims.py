@@ -1,17 +1,19 @@
-from datetime import UTC, date, datetime, time, timedelta
-from zoneinfo import ZoneInfo
+from datetime import UTC, date, datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import extract, func, select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import verify_bot_secret
 from app.models.scrim import Scrim
 from app.models.team import Team, TeamMember
 from app.schemas.scrim import ScrimCreate, ScrimListResponse, ScrimResponse
-from app.services.query_helpers import apply_rank_filters
+from app.services.events import publish_events
+from app.services.query_helpers import apply_rank_filters, roster_filters
+from app.services.saved_searches import match_scrim
+from app.services.scrim_matching import find_matches
 
 router = APIRouter(tags=["scrims"])
 
@@ -56,11 +58,14 @@ async def create_scrim(
     previous = await db.execute(
         select(Scrim).where(Scrim.team_id == team.id, Scrim.is_active.is_(True))
     )
+    events = []
     for old in previous.scalars().all():
         old.is_active = False
         old.updated_at = now
+        events.append(("scrim.cancelled", {"id": str(old.id), "team_slug": team.slug}))
     scrim = Scrim(
         team_id=team.id,
+        team=team,
         captain_discord_id=body.captain_discord_id,
         min_rank=body.min_rank,
         max_rank=body.max_rank,
@@ -72,63 +77,67 @@ async def create_scrim(
         updated_at=now,
     )
     db.add(scrim)
+    await db.flush()
+    events.append(("scrim.posted", {"id": str(scrim.id), "team_slug": team.slug}))
+    await publish_events(db, events)
+    await match_scrim(db, scrim)
     await db.commit()
-
-    stmt = (
-        select(Scrim)
-        .options(selectinload(Scrim.team).selectinload(Team.members).selectinload(TeamMember.player))
-        .where(Scrim.id == scrim.id)
-    )
-    result = await db.execute(stmt)
-    return result.scalar_one()
+    return scrim
 
 
-PARIS_TZ = ZoneInfo("Europe/Paris")
+def _parse_iso_date(value: str) -> date:
+    """Parse a YYYY-MM-DD query parameter, or raise 400."""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(400, "Format de date invalide (attendu : YYYY-MM-DD)") from None
 
 
-@router.get("/scrims", response_model=ScrimListResponse)
-async def list_scrims(
-    min_rank: str | None = Query(None),
-    max_rank: str | None = Query(None),
-    scheduled_date: str | None = Query(None),
-    format: str | None = Query(None),
-    hour_min: int | None = Query(None, ge=0, le=23),
-    hour_max: int | None = Query(None, ge=0, le=23),
-    limit: int = Query(20, le=100),
-    offset: int = Query(0, ge=0),
-    db: AsyncSession = Depends(get_db),
+def _browse_scrims_query(
+    now: datetime, *, min_rank=None, max_rank=None, scheduled_date=None, date_from=None, date_to=None,
+    weekdays=None, format=None, hour_min=None, hour_max=None,
+    roster_min_rank=None, roster_max_rank=None, open_role=None,
 ):
-    """List upcoming active scrims with optional date, time, rank and format filters."""
-    now = datetime.now(UTC)
+    """Build the upcoming-scrim listing and count statements (unordered, unpaginated).
+
+    Date, weekday and hour filters apply to the stored Paris-local slot columns, so a window such as
+    "Saturday to Sunday, 19h-23h" is a single range scan on idx_scrims_active_paris_slot.
+    """
     base_filter = [Scrim.is_active.is_(True), Scrim.scheduled_at >= now]
 
     stmt = (
         select(Scrim)
         .options(selectinload(Scrim.team).selectinload(Team.members).selectinload(TeamMember.player))
     )
-    count_stmt = select(func.count(Scrim.id))
-
-    for f in base_filter:
-        stmt = stmt.where(f)
-        count_stmt = count_stmt.where(f)
+    count_stmt = select(func.count()).select_from(Scrim)
 
     if scheduled_date:
-        try:
-            d = date.fromisoformat(scheduled_date)
-        except ValueError:
-            raise HTTPException(400, "Format de date invalide (attendu : YYYY-MM-DD)") from None
-        day_start = datetime.combine(d, time.min, tzinfo=PARIS_TZ)
-        day_end = datetime.combine(d + timedelta(days=1), time.min, tzinfo=PARIS_TZ)
-        stmt = stmt.where(Scrim.scheduled_at >= day_start, Scrim.scheduled_at < day_end)
-        count_stmt = count_stmt.where(Scrim.scheduled_at >= day_start, Scrim.scheduled_at < day_end)
-
-    paris_hour = extract("hour", func.timezone("Europe/Paris", Scrim.scheduled_at))
+        date_from = date_to = scheduled_date
+    start = _parse_iso_date(date_from) if date_from else None
+    end = _parse_iso_date(date_to) if date_to else None
+    if start and end and end < start:
+        raise HTTPException(400, "La date de fin doit être postérieure à la date de début")
+
+    if start:
+        base_filter.append(Scrim.paris_date >= start)
+    if end:
+        base_filter.append(Scrim.paris_date <= end)
+    days = sorted({d for d in weekdays or [] if 1 <= d <= 7})
+    if days:
+        base_filter.append(Scrim.paris_weekday.in_(days))
     if hour_min is not None:
-        stmt = stmt.where(paris_hour >= hour_min)
-        count_stmt = count_stmt.where(paris_hour >= hour_min)
+        base_filter.append(Scrim.paris_hour >= hour_min)
     if hour_max is not None:
-        stmt = stmt.where(paris_hour <= hour_max)
-        count_stmt = count_stmt.where(paris_hour <= hour_max)
+        base_filter.append(Scrim.paris_hour <= hour_max)
+    roster_conds = roster_filters(
+        Team, roster_min_rank=roster_min_rank, roster_max_rank=roster_max_rank, open_role=open_role,
+    )
+    if roster_conds:
+        base_filter.append(Scrim.team_id.in_(select(Team.id).where(*roster_conds)))
+
+    for f in base_filter:
+        stmt = stmt.where(f)
+        count_stmt = count_stmt.where(f)
 
     if format:
         if format.startswith("G") and format[1:].isdigit():
@@ -140,6 +149,34 @@ async def list_scrims(
 
     stmt, count_stmt = apply_rank_filters(stmt, count_stmt, min_rank, None, Scrim.max_rank, allow_null=True)
     stmt, count_stmt = apply_rank_filters(stmt, count_stmt, None, max_rank, Scrim.min_rank, allow_null=True)
+    return stmt, count_stmt
+
+
+@router.get("/scrims", response_model=ScrimListResponse)
+async def list_scrims(
+    min_rank: str | None = Query(None),
+    max_rank: str | None = Query(None),
+    scheduled_date: str | None = Query(None),
+    date_from: str | None = Query(None),
+    date_to: str | None = Query(None),
+    weekdays: list[int] | None = Query(None),
+    format: str | None = Query(None),
+    hour_min: int | None = Query(None, ge=0, le=23),
+    hour_max: int | None = Query(None, ge=0, le=23),
+    roster_min_rank: str | None = Query(None),
+    roster_max_rank: str | None = Query(None),
+    open_role: str | None = Query(None),
+    limit: int = Query(20, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List upcoming active scrims with optional date window, weekday, time, rank, format and roster filters."""
+    stmt, count_stmt = _browse_scrims_query(
+        datetime.now(UTC), min_rank=min_rank, max_rank=max_rank, scheduled_date=scheduled_date,
+        date_from=date_from, date_to=date_to, weekdays=weekdays,
+        format=format, hour_min=hour_min, hour_max=hour_max,
+        roster_min_rank=roster_min_rank, roster_max_rank=roster_max_rank, open_role=open_role,
+    )
 
     total_result = await db.execute(count_stmt)
     total = total_result.scalar_one()
@@ -151,6 +188,27 @@ async def list_scrims(
     return ScrimListResponse(scrims=scrims, total=total)
 
 
+@router.get("/scrims/{scrim_id}", response_model=ScrimResponse)
+async def get_scrim(scrim_id: str, db: AsyncSession = Depends(get_read_db)):
+    """Retrieve a scrim with its team and roster by ID."""
+    return await _get_scrim_or_404(scrim_id, db)
+
+
+@router.get("/scrims/{scrim_id}/matches", response_model=ScrimListResponse)
+async def list_scrim_matches(
+    scrim_id: str,
+    tolerance_minutes: int = Query(60, ge=0, le=360),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List active scrims compatible with a scrim: same format, fearless setting, mutual rank windows, close start time."""
+    scrim = await _get_scrim_or_404(scrim_id, db)
+    matches = await find_matches(
+        db, scrim, now=datetime.now(UTC), tolerance=timedelta(minutes=tolerance_minutes), limit=limit,
+    )
+    return ScrimListResponse(scrims=matches, total=len(matches))
+
+
 @router.delete("/scrims/by-team/{team_slug}", status_code=200)
 async def cancel_team_scrims(
     team_slug: str,
@@ -169,13 +227,14 @@ async def cancel_team_scrims(
     active = await db.execute(
         select(Scrim).where(Scrim.team_id == team.id, Scrim.is_active.is_(True))
     )
-    count = 0
+    events = []
     for s in active.scalars().all():
         s.is_active = False
         s.updated_at = now
-        count += 1
+        events.append(("scrim.cancelled", {"id": str(s.id), "team_slug": team.slug}))
+    await publish_events(db, events)
     await db.commit()
-    return {"cancelled": count}
+    return {"cancelled": len(events)}
 
 
 @router.delete("/scrims/{scrim_id}", status_code=204)
@@ -187,6 +246,9 @@ async def cancel_scrim(
     """Deactivate a single scrim by ID (bot-only)."""
 
     scrim = await _get_scrim_or_404(scrim_id, db)
+    was_active = scrim.is_active
     scrim.is_active = False
     scrim.updated_at = datetime.now(UTC)
+    if was_active:
+        await publish_events(db, [("scrim.cancelled", {"id": str(scrim.id), "team_slug": scrim.team.slug})])
     await db.commit()
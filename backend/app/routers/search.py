@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db
+from app.dependencies import verify_bot_secret
+from app.schemas.search import NameIndexResponse, PlayerSearchResponse, TeamSearchResponse
+from app.services.name_search import (
+    SEARCH_LIMIT,
+    player_index_query,
+    player_search_query,
+    team_index_query,
+    team_search_query,
+)
+
+router = APIRouter(tags=["search"])
+
+
+@router.get("/search/players", response_model=PlayerSearchResponse)
+async def search_players(
+    q: str = Query(..., min_length=1, max_length=30),
+    limit: int = Query(SEARCH_LIMIT, ge=1, le=25),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Fuzzy search on player Riot IDs (prefix or typo-tolerant), for autocomplete."""
+    result = await db.execute(player_search_query(q, limit=limit))
+    return {"players": result.mappings().all()}
+
+
+@router.get("/search/teams", response_model=TeamSearchResponse)
+async def search_teams(
+    q: str = Query(..., min_length=1, max_length=50),
+    limit: int = Query(SEARCH_LIMIT, ge=1, le=25),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Fuzzy search on LFP team names (prefix or typo-tolerant), for autocomplete."""
+    result = await db.execute(team_search_query(q, limit=limit))
+    return {"teams": result.mappings().all()}
+
+
+@router.get("/search/index", response_model=NameIndexResponse)
+async def name_index(
+    _: str = Depends(verify_bot_secret),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Names of all LFT players and LFP teams, loaded by the bot to answer autocomplete locally."""
+    players = await db.execute(player_index_query())
+    teams = await db.execute(team_index_query())
+    return {"players": players.mappings().all(), "teams": teams.mappings().all()}
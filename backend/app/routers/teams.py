@@ -2,25 +2,33 @@ from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import JSONResponse
-from sqlalchemy import func, select
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
-from app.dependencies import get_riot_client, verify_bot_secret
+from app.database import get_db, get_read_db
+from app.dependencies import get_riot_client, is_bot, verify_bot_secret
 from app.models.player import Player
 from app.models.team import Team, TeamMember
+from app.schemas.player import PlayerRecommendation, PlayerRecommendationList
 from app.schemas.team import (
     RosterAddRequest,
+    TeamBatchRequest,
+    TeamBatchResponse,
     TeamCreate,
     TeamListResponse,
     TeamResponse,
     TeamUpdate,
 )
+from app.services.events import publish_event
+from app.services.og_cache import invalidate_team_og_cache, schedule_team_og_render
 from app.services.player_helpers import create_player_from_riot_data, populate_champions
-from app.services.query_helpers import apply_rank_filters
+from app.services.query_helpers import apply_profile_filters, apply_rank_range, roster_filters
+from app.services.recommendations import recommend_players
 from app.services.riot_api import fetch_full_profile
-from app.services.token_store import consume_token, validate_token
+from app.services.saved_searches import match_team
+from app.services.team_stats import apply_roster_stats
+from app.services.token_store import TokenData, consume_token, validate_token
 from shared.riot_client import RiotAPIError
 
 router = APIRouter(tags=["teams"])
@@ -38,6 +46,15 @@ async def _get_team_or_404(slug: str, db: AsyncSession) -> Team:
     return team
 
 
+def _can_edit_team(token_data: TokenData | None, team: Team) -> bool:
+    """Return True if a team_edit token was issued to this team's captain (so it survives renames)."""
+    return (
+        token_data is not None
+        and token_data.action == "team_edit"
+        and token_data.discord_user_id == team.captain_discord_id
+    )
+
+
 @router.post("/teams", response_model=TeamResponse, status_code=201)
 async def create_team(
     body: TeamCreate,
@@ -79,20 +96,22 @@ async def create_team(
         is_lfp=body.is_lfp,
         created_at=now,
         updated_at=now,
+        members=[],
     )
     db.add(team)
+    await db.flush()
+    await publish_event(db, "team.created", slug=team.slug, is_lfp=team.is_lfp)
+    await match_team(db, team)
     await db.commit()
-
-    stmt = select(Team).options(selectinload(Team.members).selectinload(TeamMember.player)).where(Team.id == team.id)
-    result = await db.execute(stmt)
-    return result.scalar_one()
+    schedule_team_og_render(team.slug)
+    return team
 
 
 @router.get("/teams/by-captain/{discord_user_id}", response_model=TeamResponse)
 async def get_team_by_captain(
     discord_user_id: str,
     _: str = Depends(verify_bot_secret),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Look up a team by its captain's Discord user ID (bot-only)."""
     stmt = (
@@ -111,41 +130,104 @@ async def get_team_by_captain(
 async def get_team(
     slug: str,
     token: str | None = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Return a team profile (hidden teams require a valid edit token)."""
     team = await _get_team_or_404(slug, db)
 
     if not team.is_lfp:
         token_data = (await validate_token(db, token)) if token else None
-        if not token_data or token_data.action != "team_edit" or token_data.slug != slug:
+        if not _can_edit_team(token_data, team):
             raise HTTPException(404, "Team not found")
 
     return team
 
 
+@router.post("/teams:batch", response_model=TeamBatchResponse)
+async def get_teams_batch(
+    body: TeamBatchRequest,
+    bot: bool = Depends(is_bot),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Load many teams with their rosters in one round trip.
+
+    Lookups by captain Discord ID are bot-only, and only the bot sees teams that are not LFP.
+    """
+    if body.captain_discord_ids and not bot:
+        raise HTTPException(403, "Invalid bot secret")
+    keys = ((Team.slug, body.slugs), (Team.captain_discord_id, body.captain_discord_ids))
+    conditions = [column.in_(values) for column, values in keys if values]
+    if not conditions:
+        return {"teams": []}
+    stmt = (
+        select(Team)
+        .options(selectinload(Team.members).selectinload(TeamMember.player))
+        .where(or_(*conditions))
+        .order_by(Team.slug)
+    )
+    if not bot:
+        stmt = stmt.where(Team.is_lfp.is_(True))
+    result = await db.execute(stmt)
+    return {"teams": result.scalars().all()}
+
+
+def _browse_teams_query(
+    *, is_lfp=None, role=None, min_rank=None, max_rank=None,
+    activities=None, ambiance=None, frequency_min=None, frequency_max=None,
+    roster_min_rank=None, roster_max_rank=None, open_role=None,
+):
+    """Build the filtered team listing and count statements (unordered, unpaginated).
+
+    Roster filters read the stored aggregates, so "around Emerald with no jungler" is a range
+    scan on idx_teams_roster_rank instead of a roster load per team.
+    """
+    stmt = select(Team).options(selectinload(Team.members).selectinload(TeamMember.player))
+    count_stmt = select(func.count()).select_from(Team)
+
+    if is_lfp is not None:
+        # Literal IS TRUE/FALSE so the planner can match the partial browse index.
+        stmt = stmt.where(Team.is_lfp.is_(is_lfp))
+        count_stmt = count_stmt.where(Team.is_lfp.is_(is_lfp))
+    if role:
+        # @> rather than = ANY(...) so the GIN index on wanted_roles can be used.
+        stmt = stmt.where(Team.wanted_roles.contains([role.upper()]))
+        count_stmt = count_stmt.where(Team.wanted_roles.contains([role.upper()]))
+    stmt, count_stmt = apply_rank_range(stmt, count_stmt, min_rank, None, Team.min_rank_score, allow_null=True)
+    stmt, count_stmt = apply_rank_range(stmt, count_stmt, None, max_rank, Team.max_rank_score, allow_null=True)
+    for cond in roster_filters(
+        Team, roster_min_rank=roster_min_rank, roster_max_rank=roster_max_rank, open_role=open_role,
+    ):
+        stmt = stmt.where(cond)
+        count_stmt = count_stmt.where(cond)
+    return apply_profile_filters(
+        stmt, count_stmt, Team,
+        activities=activities, ambiance=ambiance, frequency_min=frequency_min, frequency_max=frequency_max,
+    )
+
+
 @router.get("/teams", response_model=TeamListResponse)
 async def list_teams(
     is_lfp: bool | None = Query(None),
     role: str | None = Query(None),
     min_rank: str | None = Query(None),
     max_rank: str | None = Query(None),
+    activities: list[str] | None = Query(None),
+    ambiance: str | None = Query(None),
+    frequency_min: int | None = Query(None, ge=0),
+    frequency_max: int | None = Query(None, ge=0),
+    roster_min_rank: str | None = Query(None),
+    roster_max_rank: str | None = Query(None),
+    open_role: str | None = Query(None),
     limit: int = Query(20, le=100),
     offset: int = Query(0, ge=0),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List teams with optional LFP, wanted role and rank filters."""
-    stmt = select(Team).options(selectinload(Team.members).selectinload(TeamMember.player))
-    count_stmt = select(func.count(Team.id))
-
-    if is_lfp is not None:
-        stmt = stmt.where(Team.is_lfp == is_lfp)
-        count_stmt = count_stmt.where(Team.is_lfp == is_lfp)
-    if role:
-        stmt = stmt.where(Team.wanted_roles.any(role.upper()))
-        count_stmt = count_stmt.where(Team.wanted_roles.any(role.upper()))
-    stmt, count_stmt = apply_rank_filters(stmt, count_stmt, min_rank, None, Team.min_rank, allow_null=True)
-    stmt, count_stmt = apply_rank_filters(stmt, count_stmt, None, max_rank, Team.max_rank, allow_null=True)
+    """List teams with optional LFP, wanted role, rank, activity, ambiance, frequency and roster filters."""
+    stmt, count_stmt = _browse_teams_query(
+        is_lfp=is_lfp, role=role, min_rank=min_rank, max_rank=max_rank,
+        activities=activities, ambiance=ambiance, frequency_min=frequency_min, frequency_max=frequency_max,
+        roster_min_rank=roster_min_rank, roster_max_rank=roster_max_rank, open_role=open_role,
+    )
 
     total_result = await db.execute(count_stmt)
     total = total_result.scalar_one()
@@ -157,11 +239,32 @@ async def list_teams(
     return TeamListResponse(teams=teams, total=total)
 
 
+@router.get("/teams/{slug}/recommended-players", response_model=PlayerRecommendationList)
+async def recommended_players(
+    slug: str,
+    token: str | None = Query(None),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Return the LFT players most compatible with a team, best match first."""
+    team = await _get_team_or_404(slug, db)
+
+    if not team.is_lfp:
+        token_data = (await validate_token(db, token)) if token else None
+        if not _can_edit_team(token_data, team):
+            raise HTTPException(404, "Team not found")
+
+    recommendations = await recommend_players(db, team, limit=limit)
+    return PlayerRecommendationList(
+        players=[PlayerRecommendation(player=player, score=score) for player, score in recommendations],
+    )
+
+
 @router.get("/teams/check-name/{name}")
 async def check_team_name(
     name: str,
     exclude_slug: str | None = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Check whether a team name (slug) is available."""
     slug = Team.make_slug(name)
@@ -181,10 +284,12 @@ async def update_team(
 ):
     """Partially update team settings including name (requires edit token)."""
     token_data = await validate_token(db, token)
-    if token_data is None or token_data.action != "team_edit" or token_data.slug != slug:
+    if token_data is None or token_data.action != "team_edit":
         raise HTTPException(403, "Token invalide ou expiré")
 
     team = await _get_team_or_404(slug, db)
+    if not _can_edit_team(token_data, team):
+        raise HTTPException(403, "Token invalide ou expiré")
     update_data = body.model_dump(exclude_unset=True)
 
     new_name = update_data.pop("name", None)
@@ -195,31 +300,35 @@ async def update_team(
             if conflict.scalar_one_or_none():
                 raise HTTPException(409, "Une équipe avec ce nom existe déjà")
             team.slug = new_slug
-            token_data.slug = new_slug
         team.name = new_name
 
     for field, value in update_data.items():
         setattr(team, field, value)
     team.updated_at = datetime.now(UTC)
+    renamed = {"old_slug": slug} if team.slug != slug else {}
+    await publish_event(db, "team.updated", slug=team.slug, is_lfp=team.is_lfp, **renamed)
+    await match_team(db, team)
     await db.commit()
-
-    stmt = select(Team).options(selectinload(Team.members).selectinload(TeamMember.player)).where(Team.id == team.id)
-    result = await db.execute(stmt)
-    return result.scalar_one()
+    if team.slug != slug:
+        invalidate_team_og_cache(slug)
+    schedule_team_og_render(team.slug)
+    return team
 
 
 @router.get("/teams/{slug}/export")
 async def export_team(
     slug: str,
     token: str = Query(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Download the full team profile as a JSON file."""
     token_data = await validate_token(db, token)
-    if token_data is None or token_data.action != "team_edit" or token_data.slug != slug:
+    if token_data is None or token_data.action != "team_edit":
         raise HTTPException(403, "Token invalide ou expiré")
 
     team = await _get_team_or_404(slug, db)
+    if not _can_edit_team(token_data, team):
+        raise HTTPException(403, "Token invalide ou expiré")
     data = TeamResponse.model_validate(team).model_dump(mode="json")
     return JSONResponse(
         content=data,
@@ -235,12 +344,17 @@ async def delete_team(
 ):
     """Delete a team permanently (requires edit token)."""
     token_data = await validate_token(db, token)
-    if token_data is None or token_data.action != "team_edit" or token_data.slug != slug:
+    if token_data is None or token_data.action != "team_edit":
         raise HTTPException(403, "Token invalide ou expiré")
 
     team = await _get_team_or_404(slug, db)
+    if not _can_edit_team(token_data, team):
+        raise HTTPException(403, "Token invalide ou expiré")
+    if team.is_lfp:
+        await publish_event(db, "team.deleted", slug=slug)
     await db.delete(team)
     await db.commit()
+    invalidate_team_og_cache(slug)
 
 
 @router.post("/teams/{slug}/members", response_model=TeamResponse)
@@ -300,14 +414,13 @@ async def add_member(
     if existing_membership.scalar_one_or_none():
         raise HTTPException(409, "Ce joueur est déjà membre d'une équipe")
 
-    member = TeamMember(team_id=team.id, player_id=player.id, role=body.role.upper())
-    db.add(member)
+    team.members.append(TeamMember(team_id=team.id, player_id=player.id, player=player, role=body.role.upper()))
+    apply_roster_stats(team)
     team.updated_at = datetime.now(UTC)
+    await publish_event(db, "team.updated", slug=team.slug, is_lfp=team.is_lfp)
     await db.commit()
-
-    stmt = select(Team).options(selectinload(Team.members).selectinload(TeamMember.player)).where(Team.id == team.id)
-    result = await db.execute(stmt)
-    return result.scalar_one()
+    schedule_team_og_render(team.slug)
+    return team
 
 
 @router.delete("/teams/{slug}/members/{player_slug}", status_code=204)
@@ -338,8 +451,11 @@ async def remove_member(
         raise HTTPException(404, "Ce joueur n'est pas dans l'équipe")
 
     await db.delete(member)
+    apply_roster_stats(team, [m for m in team.members if m.player_id != player.id])
     team.updated_at = datetime.now(UTC)
+    await publish_event(db, "team.updated", slug=team.slug, is_lfp=team.is_lfp)
     await db.commit()
+    schedule_team_og_render(team.slug)
 
 
 @router.post("/teams/{slug}/reactivate", status_code=200)
@@ -356,7 +472,11 @@ async def reactivate_team(
     if team.captain_discord_id != discord_user_id:
         raise HTTPException(403, "Seul le capitaine peut réactiver l'équipe")
 
+    was_lfp = team.is_lfp
     team.is_lfp = True
     team.updated_at = datetime.now(UTC)
+    await publish_event(db, "team.updated", slug=team.slug, is_lfp=True)
+    if not was_lfp:
+        await match_team(db, team)
     await db.commit()
     return {"status": "reactivated"}
@@ -2,11 +2,13 @@ from typing import Literal
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.database import get_db
 from app.dependencies import verify_bot_secret
+from app.models.team import Team
 from app.services.token_store import create_token, validate_token
 
 router = APIRouter(tags=["tokens"])
@@ -46,12 +48,10 @@ class TokenValidateResponse(BaseModel):
 async def create_token_endpoint(
     body: TokenCreateRequest,
     _: str = Depends(verify_bot_secret),
-    db: AsyncSession = Depends(get_db),
 ):
     """Generate an action token and return it with the frontend redirect URL."""
 
-    data = await create_token(
-        db,
+    data = create_token(
         action=body.action,
         discord_user_id=body.discord_user_id,
         discord_username=body.discord_username,
@@ -80,11 +80,17 @@ async def validate_token_endpoint(token: str, db: AsyncSession = Depends(get_db)
     if data is None:
         raise HTTPException(404, "Token invalide ou expiré")
 
+    slug = data.slug
+    if data.action == "team_edit":
+        # Team edit tokens follow the captain's team, so report its current slug after renames.
+        result = await db.execute(select(Team.slug).where(Team.captain_discord_id == data.discord_user_id))
+        slug = result.scalar_one_or_none() or slug
+
     return TokenValidateResponse(
         action=data.action,
         discord_username=data.discord_username,
         game_name=data.game_name,
         tag_line=data.tag_line,
-        slug=data.slug,
+        slug=slug,
         team_name=data.team_name,
     )
@@ -3,6 +3,9 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+# Most keys a single batch lookup may ask for, per key kind.
+BATCH_LIMIT = 100
+
 
 class ChampionResponse(BaseModel):
     """Serialized champion mastery and recent match stats."""
@@ -89,6 +92,20 @@ class PlayerResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class PlayerBatchRequest(BaseModel):
+    """Players to load in one request, by any mix of slugs, PUUIDs and Discord user IDs."""
+
+    slugs: list[str] = Field(default=[], max_length=BATCH_LIMIT)
+    puuids: list[str] = Field(default=[], max_length=BATCH_LIMIT)
+    discord_user_ids: list[str] = Field(default=[], max_length=BATCH_LIMIT)
+
+
+class PlayerBatchResponse(BaseModel):
+    """Players found by a batch lookup; keys matching nothing are left out."""
+
+    players: list[PlayerResponse]
+
+
 class PlayerListResponse(BaseModel):
     """Paginated list of player profiles."""
 
@@ -96,6 +113,19 @@ class PlayerListResponse(BaseModel):
     total: int
 
 
+class PlayerRecommendation(BaseModel):
+    """A player recommended to a team, with their compatibility score (0-100)."""
+
+    player: PlayerResponse
+    score: int
+
+
+class PlayerRecommendationList(BaseModel):
+    """Players recommended to a team, best match first."""
+
+    players: list[PlayerRecommendation]
+
+
 class RiotCheckResponse(BaseModel):
     """Result of verifying a Riot ID exists via the API."""
 
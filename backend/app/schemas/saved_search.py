@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+from shared.constants import RANK_ORDER
+
+ROLE_PATTERN = r"^(TOP|JUNGLE|MIDDLE|BOTTOM|UTILITY)$"
+RANK_PATTERN = rf"^({'|'.join(RANK_ORDER)})$"
+
+
+class SavedSearchCreate(BaseModel):
+    """Filters of a search to save; ``role`` applies to players and teams, ``format`` to scrims."""
+
+    discord_user_id: str
+    target: Literal["players", "teams", "scrims"]
+    role: str | None = Field(default=None, pattern=ROLE_PATTERN)
+    min_rank: str | None = Field(default=None, pattern=RANK_PATTERN)
+    max_rank: str | None = Field(default=None, pattern=RANK_PATTERN)
+    format: str | None = Field(default=None, pattern=r"^(BO1|BO3|BO5|G([1-9]|1[0-9]|20))$")
+
+    @model_validator(mode="after")
+    def _check_filters(self):
+        if self.role and self.target == "scrims":
+            raise ValueError("role does not apply to scrim searches")
+        if self.format and self.target != "scrims":
+            raise ValueError("format only applies to scrim searches")
+        if self.min_rank and self.max_rank and RANK_ORDER[self.min_rank] > RANK_ORDER[self.max_rank]:
+            raise ValueError("min_rank is above max_rank")
+        return self
+
+
+class SavedSearchResponse(BaseModel):
+    """A saved search."""
+
+    id: int
+    discord_user_id: str
+    target: str
+    role: str | None = None
+    min_rank: str | None = None
+    max_rank: str | None = None
+    format: str | None = None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class SavedSearchListResponse(BaseModel):
+    """A user's saved searches."""
+
+    searches: list[SavedSearchResponse]
+
+
+class SavedSearchMatchResponse(BaseModel):
+    """A new result for a saved search: ``ref`` is the player or team slug, or the scrim id."""
+
+    search: SavedSearchResponse
+    ref: str
+
+
+class SavedSearchMatchList(BaseModel):
+    """Saved search results to DM, oldest first."""
+
+    matches: list[SavedSearchMatchResponse]
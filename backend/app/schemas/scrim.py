@@ -44,3 +44,16 @@ class ScrimListResponse(BaseModel):
 
     scrims: list[ScrimResponse]
     total: int
+
+
+class ScrimMatchPair(BaseModel):
+    """Two compatible scrims whose captains are notified of each other."""
+
+    scrim: ScrimResponse
+    opponent: ScrimResponse
+
+
+class ScrimMatchPairList(BaseModel):
+    """Newly found compatible scrim pairs."""
+
+    matches: list[ScrimMatchPair]
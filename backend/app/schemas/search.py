@@ -0,0 +1,42 @@
+from pydantic import BaseModel
+
+
+class PlayerSearchResult(BaseModel):
+    """A player matching a name search."""
+
+    slug: str
+    riot_game_name: str
+    riot_tag_line: str
+    rank_solo_tier: str | None = None
+    primary_role: str | None = None
+    is_lft: bool
+
+    model_config = {"from_attributes": True}
+
+
+class TeamSearchResult(BaseModel):
+    """An LFP team matching a name search."""
+
+    slug: str
+    name: str
+
+    model_config = {"from_attributes": True}
+
+
+class PlayerSearchResponse(BaseModel):
+    """Best player matches, closest first."""
+
+    players: list[PlayerSearchResult]
+
+
+class TeamSearchResponse(BaseModel):
+    """Best team matches, closest first."""
+
+    teams: list[TeamSearchResult]
+
+
+class NameIndexResponse(BaseModel):
+    """All LFT players and LFP teams, to seed the bot's autocomplete index."""
+
+    players: list[PlayerSearchResult]
+    teams: list[TeamSearchResult]
@@ -3,6 +3,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from app.schemas.player import BATCH_LIMIT
+
 
 class PlayerSummary(BaseModel):
     """Lightweight player info embedded in team member responses."""
@@ -75,6 +77,10 @@ class TeamResponse(BaseModel):
     min_rank: str | None = None
     max_rank: str | None = None
     is_lfp: bool
+    roster_size: int = 0
+    roster_rank_avg: int | None = None
+    roster_rank_median: int | None = None
+    roster_rank_max: int | None = None
     created_at: datetime
     updated_at: datetime
     members: list[TeamMemberResponse] = []
@@ -82,6 +88,19 @@ class TeamResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class TeamBatchRequest(BaseModel):
+    """Teams to load in one request, by any mix of slugs and captain Discord IDs."""
+
+    slugs: list[str] = Field(default=[], max_length=BATCH_LIMIT)
+    captain_discord_ids: list[str] = Field(default=[], max_length=BATCH_LIMIT)
+
+
+class TeamBatchResponse(BaseModel):
+    """Teams found by a batch lookup; keys matching nothing are left out."""
+
+    teams: list[TeamResponse]
+
+
 class TeamListResponse(BaseModel):
     """Paginated list of teams."""
 
@@ -89,6 +108,19 @@ class TeamListResponse(BaseModel):
     total: int
 
 
+class TeamRecommendation(BaseModel):
+    """A team recommended to a player, with its compatibility score (0-100)."""
+
+    team: TeamResponse
+    score: int
+
+
+class TeamRecommendationList(BaseModel):
+    """Teams recommended to a player, best match first."""
+
+    teams: list[TeamRecommendation]
+
+
 class RosterAddRequest(BaseModel):
     """Request body to add a player to a team roster."""
 
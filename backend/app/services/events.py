@@ -0,0 +1,188 @@
+import asyncio
+import contextlib
+import json
+import logging
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import BigInteger, Text, delete, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.models.change_event import ChangeEvent
+
+logger = logging.getLogger("riftteam.events")
+
+EVENT_CHANNEL = "riftteam_events"
+EVENT_RETENTION = timedelta(days=7)
+STREAM_BATCH_SIZE = 100
+KEEPALIVE_INTERVAL = 15.0
+LISTEN_RETRY_DELAY = 5.0
+# How soon a stream looks again when committed events wait behind a still-running transaction.
+HORIZON_RETRY_DELAY = 1.0
+
+# Every transaction below this ID has committed or rolled back, so its events are final.
+_HORIZON = func.pg_snapshot_xmin(func.pg_current_snapshot()).cast(Text).cast(BigInteger)
+_STREAM_ORDER = (ChangeEvent.xact_id, ChangeEvent.id)
+
+
+async def publish_events(db: AsyncSession, events: list[tuple[str, dict]]) -> None:
+    """Record change events in the current transaction; stream subscribers are woken when it commits."""
+    if not events:
+        return
+    await db.execute(select(func.pg_notify(EVENT_CHANNEL, "")))
+    db.add_all([ChangeEvent(kind=kind, payload=payload) for kind, payload in events])
+
+
+async def publish_event(db: AsyncSession, kind: str, **payload) -> None:
+    """Record a single change event in the current transaction."""
+    await publish_events(db, [(kind, payload)])
+
+
+async def purge_old_events(db: AsyncSession) -> int:
+    """Delete change events older than the replay window."""
+    cutoff = datetime.now(UTC) - EVENT_RETENTION
+    result = await db.execute(delete(ChangeEvent).where(ChangeEvent.created_at < cutoff))
+    await db.commit()
+    return result.rowcount
+
+
+def format_sse(event: ChangeEvent) -> str:
+    """Serialize an event as a server-sent event frame."""
+    return f"id: {event.id}\nevent: {event.kind}\ndata: {json.dumps(event.payload, separators=(',', ':'))}\n\n"
+
+
+class EventBroker:
+    """Holds one LISTEN connection and wakes every stream subscriber on each notification.
+
+    Subscribers always read the events themselves from ``change_events``, so a missed or
+    coalesced notification only delays delivery until the next keepalive tick.
+    """
+
+    def __init__(self) -> None:
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self, engine: AsyncEngine) -> None:
+        """Start listening on the event channel."""
+        self._task = asyncio.create_task(self._listen(engine))
+
+    async def stop(self) -> None:
+        """Stop listening and release the connection."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def ticket(self) -> asyncio.Event:
+        """Return the event set by the next notification; take it *before* reading new rows."""
+        return self._wake
+
+    async def wait(self, ticket: asyncio.Event, timeout: float) -> bool:
+        """Wait for the notification a ticket stands for; False on timeout."""
+        try:
+            await asyncio.wait_for(ticket.wait(), timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    def _notify(self, *_) -> None:
+        """asyncpg listener callback: wake current waiters and hand out a fresh ticket."""
+        self._wake.set()
+        self._wake = asyncio.Event()
+
+    async def _listen(self, engine: AsyncEngine) -> None:
+        """Keep a LISTEN connection open, checking it every keepalive interval and reconnecting on failure."""
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    raw = (await conn.get_raw_connection()).driver_connection
+                    await raw.add_listener(EVENT_CHANNEL, self._notify)
+                    try:
+                        while True:
+                            await asyncio.sleep(KEEPALIVE_INTERVAL)
+                            await raw.execute("SELECT 1")
+                    finally:
+                        await raw.remove_listener(EVENT_CHANNEL, self._notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event listener connection lost")
+            self._notify()
+            await asyncio.sleep(LISTEN_RETRY_DELAY)
+
+
+async def _latest_key(db: AsyncSession) -> tuple[int, int]:
+    """Stream position of the newest final event, as ``(xact_id, id)`` (zeros when there is none)."""
+    stmt = (
+        select(*_STREAM_ORDER).where(ChangeEvent.xact_id < _HORIZON)
+        .order_by(ChangeEvent.xact_id.desc(), ChangeEvent.id.desc()).limit(1)
+    )
+    row = (await db.execute(stmt)).first()
+    return (row.xact_id, row.id) if row else (0, 0)
+
+
+async def latest_event_id(db: AsyncSession) -> int:
+    """Return the id of the newest final event (0 when there is none)."""
+    return (await _latest_key(db))[1]
+
+
+async def _resume_key(db: AsyncSession, after: int) -> tuple[int, int]:
+    """Stream position just past event ``after``; 0 means the start of the retained events."""
+    if after == 0:
+        return (0, 0)
+    xact_id = (await db.execute(select(ChangeEvent.xact_id).where(ChangeEvent.id == after))).scalar_one_or_none()
+    if xact_id is not None:
+        return (xact_id, after)
+    # The cursor event was purged: resume at the oldest event published after it.
+    oldest = (await db.execute(select(func.min(ChangeEvent.xact_id)).where(ChangeEvent.id > after))).scalar_one()
+    return (oldest, 0) if oldest is not None else await _latest_key(db)
+
+
+async def stream_events(
+    session_factory: async_sessionmaker, broker: EventBroker, *, after: int | None = None,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for events after the ``after`` cursor (default: from now on), forever.
+
+    Events go out in ``(xact_id, id)`` order, and only once every transaction that could still
+    add an earlier one has finished, so resuming after an event id never skips a late commit.
+    A leading ``ready`` frame carries the starting cursor, so a client that subscribed "from now"
+    can still resume without gaps if it disconnects before the first real event. Each read uses a
+    short-lived session so an idle subscriber does not hold a pooled connection.
+    """
+    async with session_factory() as db:
+        key = await (_latest_key(db) if after is None else _resume_key(db, after))
+    yield f"id: {key[1] if after is None else after}\nevent: ready\ndata: {{}}\n\n"
+    idle = 0.0
+    while True:
+        ticket = broker.ticket()
+        async with session_factory() as db:
+            rows = (await db.execute(
+                select(ChangeEvent, _HORIZON).where(tuple_(*_STREAM_ORDER) > key)
+                .order_by(*_STREAM_ORDER).limit(STREAM_BATCH_SIZE)
+            )).all()
+        held_back = False
+        for event, horizon in rows:
+            if event.xact_id >= horizon:
+                held_back = True
+                break
+            yield format_sse(event)
+            key = (event.xact_id, event.id)
+            idle = 0.0
+        if len(rows) == STREAM_BATCH_SIZE and not held_back:
+            continue
+        timeout = HORIZON_RETRY_DELAY if held_back else KEEPALIVE_INTERVAL
+        if not await broker.wait(ticket, timeout):
+            idle += timeout
+            if idle >= KEEPALIVE_INTERVAL:
+                yield ": keepalive\n\n"
+                idle = 0.0
+
+
+event_broker = EventBroker()
+
+
+async def publish_lft_change(db: AsyncSession, player, was_lft: bool) -> None:
+    """Publish ``player.lft_on`` / ``player.lft_off`` if the player's LFT flag flipped."""
+    if bool(player.is_lft) != was_lft:
+        await publish_event(db, "player.lft_on" if player.is_lft else "player.lft_off", slug=player.slug)
@@ -0,0 +1,52 @@
+from sqlalchemy import func, or_, select
+
+from app.models.player import Player
+from app.models.team import Team
+
+SEARCH_LIMIT = 10
+
+_PLAYER_COLUMNS = (
+    Player.slug, Player.riot_game_name, Player.riot_tag_line, Player.rank_solo_tier, Player.primary_role, Player.is_lft,
+)
+_TEAM_COLUMNS = (Team.slug, Team.name)
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fuzzy_search(stmt, column, query: str, limit: int):
+    """Filter and order a statement by how well ``column`` (a lowercased, trigram-indexed name) matches ``query``.
+
+    Prefix matches come first, then names containing a word close to the query
+    (``%>``: word similarity above pg_trgm's threshold, which tolerates typos such as
+    "fakr" for "faker#kr1"). Both predicates are served by the GIN trigram index.
+    """
+    query = query.strip().lower()
+    prefix = column.like(f"{_escape_like(query)}%", escape="\\")
+    return (
+        stmt.where(or_(prefix, column.op("%>")(query)))
+        .order_by(prefix.desc(), func.word_similarity(query, column).desc(), func.similarity(column, query).desc(), column)
+        .limit(limit)
+    )
+
+
+def player_search_query(query: str, *, limit: int = SEARCH_LIMIT):
+    """Players whose Riot ID (``name#tag``) best matches a partial or misspelt query."""
+    return _fuzzy_search(select(*_PLAYER_COLUMNS), Player.search_name, query, limit)
+
+
+def team_search_query(query: str, *, limit: int = SEARCH_LIMIT):
+    """LFP teams whose name best matches a partial or misspelt query."""
+    stmt = select(*_TEAM_COLUMNS).where(Team.is_lfp.is_(True))
+    return _fuzzy_search(stmt, Team.search_name, query, limit)
+
+
+def player_index_query():
+    """Every LFT player's search result row, for the bot's local autocomplete index."""
+    return select(*_PLAYER_COLUMNS).where(Player.is_lft.is_(True))
+
+
+def team_index_query():
+    """Every LFP team's search result row, for the bot's local autocomplete index."""
+    return select(*_TEAM_COLUMNS).where(Team.is_lfp.is_(True))
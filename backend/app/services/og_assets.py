@@ -0,0 +1,312 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+
+import aiohttp
+from PIL import Image
+
+from app.services.single_flight import single_flight
+
+logger = logging.getLogger("riftteam.og_assets")
+
+ICON_DIR = Path(os.environ.get("ICON_CACHE_DIR", "/tmp/riftteam_icons"))
+ASSET_PACK_DIR = os.environ.get("OG_ASSET_PACK_DIR", "")
+DDRAGON_VERSIONS_URL = "https://ddragon.leagueoflegends.com/api/versions.json"
+RANK_ICON_URL = "https://raw.communitydragon.org/latest/plugins/rcp-fe-lol-static-assets/global/default/images/ranked-mini-crests/{name}.png"
+ROLE_ICON_URL = "https://raw.communitydragon.org/latest/plugins/rcp-fe-lol-clash/global/default/assets/images/position-selector/positions/icon-position-{name}.png"
+CHAMPION_ICON_URL = "https://ddragon.leagueoflegends.com/cdn/{version}/img/champion/{name}.png"
+
+ICON_CACHE_MAX_ENTRIES = 512
+VERSION_REFRESH_INTERVAL = 6 * 3600
+DOWNLOAD_TIMEOUT = 5
+MAX_CONNECTIONS = 8
+
+
+class IconLRU:
+    """Bounded least-recently-used map of decoded RGBA images."""
+
+    def __init__(self, max_entries: int = ICON_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._items: OrderedDict[tuple[str, int | None], Image.Image] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: tuple[str, int | None]) -> bool:
+        return key in self._items
+
+    def get(self, key: tuple[str, int | None]) -> Image.Image | None:
+        """Return a cached image and mark it as recently used."""
+        img = self._items.get(key)
+        if img is not None:
+            self._items.move_to_end(key)
+        return img
+
+    def put(self, key: tuple[str, int | None], img: Image.Image) -> None:
+        """Store an image, evicting the least recently used entries beyond the bound."""
+        self._items[key] = img
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+    def filenames(self) -> set[str]:
+        """Return the distinct source filenames currently cached."""
+        return {name for name, _ in self._items}
+
+
+def _decode(data: bytes) -> Image.Image:
+    """Decode PNG bytes into a fully loaded RGBA image."""
+    img = Image.open(BytesIO(data))
+    img.load()
+    return img.convert("RGBA")
+
+
+def _champion_safe_name(champion_name: str) -> str:
+    """Return the Data Dragon asset name for a champion display name."""
+    return champion_name.replace(" ", "").replace("'", "")
+
+
+class AssetManager:
+    """Decoded icon cache for OG cards, backed by disk, an optional asset pack and the CDNs.
+
+    Icons are kept decoded and pre-resized in bounded in-memory LRUs. Misses fall
+    back to the on-disk cache, then to a single shared HTTP session; concurrent
+    misses for the same file share one download. Champion icons are tied to a
+    Data Dragon version: when a newer version is published the known champions
+    are fetched into a fresh cache which then replaces the old one in one step.
+
+    An asset pack is a directory holding ``manifest.json`` (``{"ddragon_version": "..."}``)
+    and PNGs named like the disk cache (``rank_gold.png``, ``role_top.png``,
+    ``champ_Ahri.png``). It is decoded into memory at startup so cards render
+    without any network access.
+    """
+
+    def __init__(self, icon_dir: Path = ICON_DIR, max_entries: int = ICON_CACHE_MAX_ENTRIES) -> None:
+        self.icon_dir = icon_dir
+        self._static = IconLRU(max_entries)
+        self._champions: tuple[str | None, IconLRU] = (None, IconLRU(max_entries))
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._session: aiohttp.ClientSession | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._pack_version: str | None = None
+
+    @property
+    def ddragon_version(self) -> str | None:
+        """The Data Dragon version champion icons are currently served from."""
+        return self._champions[0]
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared pooled HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS),
+                timeout=aiohttp.ClientTimeout(total=DOWNLOAD_TIMEOUT),
+            )
+        return self._session
+
+    async def start(self, pack_dir: str = ASSET_PACK_DIR) -> None:
+        """Load the offline asset pack if configured and start the version refresh loop."""
+        if pack_dir:
+            try:
+                self.load_asset_pack(Path(pack_dir))
+            except Exception:
+                logger.exception("Failed to load OG asset pack from %s", pack_dir)
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._version_refresh_loop())
+
+    async def close(self) -> None:
+        """Stop the refresh loop and close the shared HTTP session."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresh_task
+            self._refresh_task = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def load_asset_pack(self, pack_dir: Path) -> int:
+        """Decode every PNG of an asset pack into memory, returning the number loaded."""
+        manifest_path = pack_dir / "manifest.json"
+        version = None
+        if manifest_path.exists():
+            version = json.loads(manifest_path.read_text()).get("ddragon_version")
+
+        champions = IconLRU(self._static.max_entries)
+        loaded = 0
+        for path in sorted(pack_dir.glob("*.png")):
+            try:
+                img = _decode(path.read_bytes())
+            except Exception:
+                logger.warning("Skipping unreadable asset %s", path.name)
+                continue
+            if path.name.startswith("champ_"):
+                if version is None:
+                    continue
+                champions.put((path.name, None), img)
+            else:
+                self._static.put((path.name, None), img)
+            loaded += 1
+
+        if version is not None:
+            self._pack_version = version
+            self._champions = (version, champions)
+        logger.info("Loaded %d OG assets from pack %s (ddragon %s)", loaded, pack_dir, version)
+        return loaded
+
+    async def _fetch_latest_version(self) -> str:
+        """Ask Data Dragon for its latest published version."""
+        async with self._get_session().get(DDRAGON_VERSIONS_URL) as resp:
+            resp.raise_for_status()
+            versions = await resp.json()
+        return versions[0]
+
+    async def get_ddragon_version(self) -> str:
+        """Return the current Data Dragon version, fetching it on first use."""
+        version = self._champions[0]
+        if version:
+            return version
+        await self.refresh_ddragon_version()
+        return self._champions[0] or ""
+
+    async def refresh_ddragon_version(self) -> bool:
+        """Switch to the latest Data Dragon version, returning True if it changed.
+
+        Champions already in memory are downloaded for the new version into a
+        separate cache first, so renders keep using the old icons until the new
+        set is complete.
+        """
+        latest = await self._fetch_latest_version()
+        current_version, current_cache = self._champions
+        if latest == current_version:
+            return False
+
+        new_cache = IconLRU(current_cache.max_entries)
+        for filename in current_cache.filenames():
+            safe_name = filename.removeprefix("champ_").removesuffix(".png")
+            img = await self._load(
+                CHAMPION_ICON_URL.format(version=latest, name=safe_name),
+                filename,
+                disk_name=f"champ_{latest}_{safe_name}.png",
+            )
+            if img is not None:
+                new_cache.put((filename, None), img)
+
+        self._champions = (latest, new_cache)
+        logger.info("Data Dragon version %s -> %s (%d champions prefetched)", current_version, latest, len(new_cache))
+        return True
+
+    async def _version_refresh_loop(self) -> None:
+        """Periodically check for a newer Data Dragon version."""
+        while True:
+            try:
+                await self.refresh_ddragon_version()
+            except Exception:
+                logger.warning("Data Dragon version refresh failed", exc_info=True)
+            await asyncio.sleep(VERSION_REFRESH_INTERVAL)
+
+    async def _download(self, url: str) -> bytes | None:
+        """Download raw bytes through the shared session, returning None on failure."""
+        try:
+            async with self._get_session().get(url) as resp:
+                if resp.status != 200:
+                    return None
+                return await resp.read()
+        except Exception:
+            return None
+
+    async def _load_uncached(self, url: str, disk_name: str) -> Image.Image | None:
+        """Load a source image from disk, or download and persist it."""
+        cache_path = self.icon_dir / disk_name
+        if cache_path.exists():
+            try:
+                return _decode(cache_path.read_bytes())
+            except Exception:
+                cache_path.unlink(missing_ok=True)
+        data = await self._download(url)
+        if data is None:
+            return None
+        try:
+            img = _decode(data)
+        except Exception:
+            return None
+        try:
+            self.icon_dir.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(data)
+        except OSError:
+            logger.warning("Could not write icon cache file %s", cache_path)
+        return img
+
+    async def _load(self, url: str, filename: str, disk_name: str | None = None) -> Image.Image | None:
+        """Load a source image, sharing one fetch between concurrent callers."""
+        disk_name = disk_name or filename
+        return await single_flight(self._inflight, disk_name, lambda: self._load_uncached(url, disk_name))
+
+    async def _get(
+        self, cache: IconLRU, url: str, filename: str, size: int | None, disk_name: str | None = None,
+    ) -> Image.Image | None:
+        """Return a decoded icon, resized to ``size`` when given, from memory when possible."""
+        resized = cache.get((filename, size))
+        if resized is not None:
+            return resized
+
+        source = cache.get((filename, None))
+        if source is None:
+            source = await self._load(url, filename, disk_name)
+            if source is None:
+                return None
+            cache.put((filename, None), source)
+
+        if size is None or source.size == (size, size):
+            return source
+        resized = source.resize((size, size), Image.LANCZOS)
+        cache.put((filename, size), resized)
+        return resized
+
+    async def rank_icon(self, tier: str, size: int | None = None) -> Image.Image | None:
+        """Return the rank crest icon for a tier."""
+        name = tier.lower()
+        return await self._get(self._static, RANK_ICON_URL.format(name=name), f"rank_{name}.png", size)
+
+    async def role_icon(self, role: str, size: int | None = None) -> Image.Image | None:
+        """Return the position icon for a role."""
+        name = role.lower()
+        return await self._get(self._static, ROLE_ICON_URL.format(name=name), f"role_{name}.png", size)
+
+    async def champion_icon(self, champion_name: str, size: int | None = None) -> Image.Image | None:
+        """Return the square icon of a champion for the current Data Dragon version."""
+        safe_name = _champion_safe_name(champion_name)
+        version, cache = self._champions
+        if version is None:
+            try:
+                await self.get_ddragon_version()
+            except Exception:
+                logger.warning("Data Dragon version unavailable", exc_info=True)
+                return None
+            version, cache = self._champions
+        return await self._get(
+            cache,
+            CHAMPION_ICON_URL.format(version=version, name=safe_name),
+            f"champ_{safe_name}.png",
+            size,
+            disk_name=f"champ_{version}_{safe_name}.png",
+        )
+
+    def stats(self) -> dict:
+        """Return cache sizes and the active Data Dragon version."""
+        version, champions = self._champions
+        return {
+            "ddragon_version": version,
+            "pack_version": self._pack_version,
+            "static_entries": len(self._static),
+            "champion_entries": len(champions),
+            "downloads_in_flight": len(self._inflight),
+        }
+
+
+asset_manager = AssetManager()
@@ -0,0 +1,79 @@
+import time
+from datetime import datetime
+from typing import NamedTuple
+
+from app.services.og_render_queue import render_queue
+
+CACHE_TTL = 6 * 3600
+CACHE_MAX_SIZE = 500
+TILE_CACHE_MAX_SIZE = 2000
+HTML_CACHE_MAX_SIZE = 2000
+
+
+class CrawlerPage(NamedTuple):
+    """Prebuilt crawler HTML with its validators; ``last_modified`` is the entity's ``updated_at``."""
+
+    html: str
+    etag: str
+    last_modified: datetime
+    built_at: float
+
+
+og_cache: dict[str, tuple[bytes, float]] = {}
+tile_cache: dict[str, tuple[bytes, float]] = {}
+html_cache: dict[str, CrawlerPage] = {}
+
+
+def evict(cache: dict[str, tuple[bytes, float]], max_size: int) -> None:
+    """Remove expired and excess entries from a timestamped bytes cache."""
+    now = time.time()
+    expired = [k for k, (_, ts) in cache.items() if now - ts >= CACHE_TTL]
+    for k in expired:
+        del cache[k]
+    if len(cache) > max_size:
+        by_age = sorted(cache.items(), key=lambda item: item[1][1])
+        for k, _ in by_age[: len(cache) - max_size]:
+            del cache[k]
+
+
+def evict_og_cache() -> None:
+    """Remove expired and excess entries from the OG image cache."""
+    evict(og_cache, CACHE_MAX_SIZE)
+
+
+def evict_html_cache() -> None:
+    """Remove expired and excess entries from the crawler page cache."""
+    now = time.time()
+    expired = [k for k, page in html_cache.items() if now - page.built_at >= CACHE_TTL]
+    for k in expired:
+        del html_cache[k]
+    if len(html_cache) > HTML_CACHE_MAX_SIZE:
+        by_age = sorted(html_cache.items(), key=lambda item: item[1].built_at)
+        for k, _ in by_age[: len(html_cache) - HTML_CACHE_MAX_SIZE]:
+            del html_cache[k]
+
+
+def invalidate_og_cache(slug: str) -> None:
+    """Remove a specific player's OG image, listing tile and crawler page from cache."""
+    og_cache.pop(slug, None)
+    tile_cache.pop(f"p:{slug}", None)
+    html_cache.pop(f"p:{slug}", None)
+
+
+def invalidate_team_og_cache(slug: str) -> None:
+    """Remove a specific team's OG image, listing tile and crawler page from cache."""
+    og_cache.pop(f"team_{slug}", None)
+    tile_cache.pop(f"t:{slug}", None)
+    html_cache.pop(f"t:{slug}", None)
+
+
+def schedule_og_render(slug: str) -> None:
+    """Drop a player's cached OG card and queue a background re-render."""
+    invalidate_og_cache(slug)
+    render_queue.enqueue("player", slug)
+
+
+def schedule_team_og_render(slug: str) -> None:
+    """Drop a team's cached OG card and queue a background re-render."""
+    invalidate_team_og_cache(slug)
+    render_queue.enqueue("team", slug)
@@ -1,11 +1,11 @@
 import asyncio
-import os
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 
-import aiohttp
 from PIL import Image, ImageDraw, ImageFont
 
+from app.services.og_assets import asset_manager
 from shared.constants import ACTIVITY_LABELS, AMBIANCE_LABELS, RANK_COLORS
 from shared.format import format_rank, format_win_rate
 
@@ -18,8 +18,6 @@ ROLE_LABELS_SHORT: dict[str, str] = {
 }
 
 CARD_W, CARD_H = 1200, 630
-ICON_DIR = Path(os.environ.get("ICON_CACHE_DIR", "/tmp/riftteam_icons"))
-DDRAGON_VERSION: str | None = None
 
 
 def _hex_to_rgb(hex_int: int) -> tuple[int, int, int]:
@@ -34,6 +32,7 @@ def _rank_rgb(tier: str | None) -> tuple[int, int, int]:
     return _hex_to_rgb(RANK_COLORS.get(tier.upper(), 0x6B6B6B))
 
 
+@lru_cache(maxsize=32)
 def _load_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
     """Load a DejaVu font from common system paths, falling back to the default."""
     names = (
@@ -49,70 +48,40 @@ def _load_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
     return ImageFont.load_default(size)
 
 
-async def _get_ddragon_version() -> str:
-    """Fetch and cache the latest Data Dragon version string."""
-    global DDRAGON_VERSION
-    if DDRAGON_VERSION:
-        return DDRAGON_VERSION
-    async with aiohttp.ClientSession() as session, session.get("https://ddragon.leagueoflegends.com/api/versions.json") as resp:
-        versions = await resp.json()
-    DDRAGON_VERSION = versions[0]
-    return DDRAGON_VERSION
-
-
-async def _download_icon(url: str, filename: str) -> Image.Image | None:
-    """Download an image and cache it on disk, returning None on failure."""
-    ICON_DIR.mkdir(parents=True, exist_ok=True)
-    cache_path = ICON_DIR / filename
-    if cache_path.exists():
-        try:
-            return Image.open(cache_path).convert("RGBA")
-        except Exception:
-            cache_path.unlink(missing_ok=True)
-    try:
-        async with aiohttp.ClientSession() as session, session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-            if resp.status != 200:
-                return None
-            data = await resp.read()
-        cache_path.write_bytes(data)
-        return Image.open(BytesIO(data)).convert("RGBA")
-    except Exception:
-        return None
-
-
-async def _get_rank_icon(tier: str) -> Image.Image | None:
+async def _get_rank_icon(tier: str, size: int | None = None) -> Image.Image | None:
     """Fetch the rank crest icon from CommunityDragon."""
-    tier_lower = tier.lower()
-    url = f"https://raw.communitydragon.org/latest/plugins/rcp-fe-lol-static-assets/global/default/images/ranked-mini-crests/{tier_lower}.png"
-    return await _download_icon(url, f"rank_{tier_lower}.png")
+    return await asset_manager.rank_icon(tier, size)
 
 
-async def _get_role_icon(role: str) -> Image.Image | None:
+async def _get_role_icon(role: str, size: int | None = None) -> Image.Image | None:
     """Fetch a role/position icon from CommunityDragon."""
-    role_lower = role.lower()
-    url = f"https://raw.communitydragon.org/latest/plugins/rcp-fe-lol-clash/global/default/assets/images/position-selector/positions/icon-position-{role_lower}.png"
-    return await _download_icon(url, f"role_{role_lower}.png")
+    return await asset_manager.role_icon(role, size)
 
 
-async def _get_champion_icon(champion_name: str) -> Image.Image | None:
+async def _get_champion_icon(champion_name: str, size: int | None = None) -> Image.Image | None:
     """Fetch a champion square icon from Data Dragon."""
-    version = await _get_ddragon_version()
-    safe_name = champion_name.replace(" ", "").replace("'", "")
-    url = f"https://ddragon.leagueoflegends.com/cdn/{version}/img/champion/{safe_name}.png"
-    return await _download_icon(url, f"champ_{safe_name}.png")
+    return await asset_manager.champion_icon(champion_name, size)
 
 
-def _paste_rounded(dst: Image.Image, src: Image.Image, pos: tuple[int, int], size: int, radius: int) -> None:
-    """Paste an image with rounded-rectangle clipping onto a destination."""
-    src = src.resize((size, size), Image.LANCZOS)
+@lru_cache(maxsize=16)
+def _rounded_mask(size: int, radius: int) -> Image.Image:
+    """Return a cached rounded-rectangle alpha mask."""
     mask = Image.new("L", (size, size), 0)
     ImageDraw.Draw(mask).rounded_rectangle([0, 0, size, size], radius=radius, fill=255)
-    dst.paste(src, pos, mask)
+    return mask
+
+
+def _paste_rounded(dst: Image.Image, src: Image.Image, pos: tuple[int, int], size: int, radius: int) -> None:
+    """Paste an image with rounded-rectangle clipping onto a destination."""
+    if src.size != (size, size):
+        src = src.resize((size, size), Image.LANCZOS)
+    dst.paste(src, pos, _rounded_mask(size, radius))
 
 
 def _paste_icon(dst: Image.Image, src: Image.Image, pos: tuple[int, int], size: int) -> None:
     """Resize and paste an icon, preserving alpha transparency."""
-    src = src.resize((size, size), Image.LANCZOS)
+    if src.size != (size, size):
+        src = src.resize((size, size), Image.LANCZOS)
     if src.mode == "RGBA":
         dst.paste(src, pos, src)
     else:
@@ -179,7 +148,7 @@ async def generate_og_image(player: dict, champions: list[dict]) -> bytes:
         roles.append(primary)
     if secondary:
         roles.append(secondary)
-    role_icons = await asyncio.gather(*[_get_role_icon(r) for r in roles]) if roles else []
+    role_icons = await asyncio.gather(*[_get_role_icon(r, 38) for r in roles]) if roles else []
 
     icon_size = 38
     icon_gap = 4
@@ -229,7 +198,7 @@ async def generate_og_image(player: dict, champions: list[dict]) -> bytes:
     rank_y = 140
 
     if rank_tier:
-        rank_img = await _get_rank_icon(rank_tier)
+        rank_img = await _get_rank_icon(rank_tier, rank_icon_size)
         if rank_img:
             _paste_icon(img, rank_img, (left_x, rank_y), rank_icon_size)
 
@@ -247,11 +216,11 @@ async def generate_og_image(player: dict, champions: list[dict]) -> bytes:
 
     top_champs = sorted(champions, key=lambda c: c.get("games_played", 0), reverse=True)[:6]
     if top_champs:
+        icon_size = 110
         champ_icons = await asyncio.gather(
-            *[_get_champion_icon(c.get("champion_name", "")) for c in top_champs]
+            *[_get_champion_icon(c.get("champion_name", ""), icon_size) for c in top_champs]
         )
 
-        icon_size = 110
         gap = 16
         grid_w = 3 * icon_size + 2 * gap
         grid_x = CARD_W - 60 - grid_w
@@ -339,8 +308,8 @@ async def generate_team_og_image(team: dict) -> bytes:
             parts_w += rank_icon_size + 6 + (max_bbox[2] - max_bbox[0])
 
         rank_icons = await asyncio.gather(
-            _get_rank_icon(min_r) if min_r else asyncio.sleep(0),
-            _get_rank_icon(max_r) if max_r else asyncio.sleep(0),
+            _get_rank_icon(min_r, rank_icon_size) if min_r else asyncio.sleep(0),
+            _get_rank_icon(max_r, rank_icon_size) if max_r else asyncio.sleep(0),
         )
         min_rank_icon = rank_icons[0] if min_r else None
         max_rank_icon = rank_icons[1] if max_r else None
@@ -380,9 +349,9 @@ async def generate_team_og_image(team: dict) -> bytes:
         member_by_role[m.get("role", "")] = player
 
     role_rank_icons = await asyncio.gather(
-        *[_get_rank_icon(member_by_role[r]["rank_solo_tier"]) if r in member_by_role and member_by_role[r].get("rank_solo_tier") else asyncio.sleep(0) for r in all_roles]
+        *[_get_rank_icon(member_by_role[r]["rank_solo_tier"], 70) if r in member_by_role and member_by_role[r].get("rank_solo_tier") else asyncio.sleep(0) for r in all_roles]
     )
-    role_position_icons = await asyncio.gather(*[_get_role_icon(r) for r in all_roles])
+    role_position_icons = await asyncio.gather(*[_get_role_icon(r, 28) for r in all_roles])
 
     for i, role in enumerate(all_roles):
         x = slot_x + i * slot_gap
@@ -464,3 +433,136 @@ async def generate_team_og_image(team: dict) -> bytes:
     buf = BytesIO()
     img.save(buf, format="PNG", optimize=True)
     return buf.getvalue()
+
+
+TILE_W, TILE_H = 800, 112
+TILE_GAP = 8
+
+
+def _encode_png(img: Image.Image) -> bytes:
+    """Encode an image as PNG bytes."""
+    buf = BytesIO()
+    img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def _new_tile(accent: tuple[int, int, int]) -> tuple[Image.Image, ImageDraw.ImageDraw]:
+    """Create an empty listing tile with a rounded panel and a left accent bar."""
+    img = Image.new("RGB", (TILE_W, TILE_H), (24, 24, 32))
+    draw = ImageDraw.Draw(img)
+    draw.rounded_rectangle([0, 0, TILE_W - 1, TILE_H - 1], radius=14, fill=(32, 32, 44))
+    draw.rounded_rectangle([0, 0, 8, TILE_H - 1], radius=4, fill=accent)
+    return img, draw
+
+
+async def generate_player_tile(player: dict, champions: list[dict]) -> bytes:
+    """Render an 800x112 PNG listing tile for a player (rank, roles, top champions)."""
+    tier = player.get("rank_solo_tier")
+    rank_color = _rank_rgb(tier)
+    img, draw = _new_tile(rank_color)
+
+    font_name = _load_font(30, bold=True)
+    font_rank = _load_font(22, bold=True)
+    font_role = _load_font(20, bold=True)
+
+    rank_size = 80
+    roles = [r for r in (player.get("primary_role"), player.get("secondary_role")) if r]
+    top_champs = sorted(champions, key=lambda c: c.get("games_played", 0), reverse=True)[:3]
+    champ_size = 64
+    rank_img, role_icons, champ_icons = await asyncio.gather(
+        _get_rank_icon(tier, rank_size) if tier else asyncio.sleep(0),
+        asyncio.gather(*[_get_role_icon(r, 24) for r in roles]),
+        asyncio.gather(*[_get_champion_icon(c.get("champion_name", ""), champ_size) for c in top_champs]),
+    )
+
+    if rank_img:
+        _paste_icon(img, rank_img, (22, (TILE_H - rank_size) // 2), rank_size)
+
+    text_x = 22 + rank_size + 18
+    riot_id = f"{player.get('riot_game_name', '')}#{player.get('riot_tag_line', '')}"
+    draw.text((text_x, 14), riot_id, fill=(255, 255, 255), font=font_name)
+    rank_text = format_rank(tier, player.get("rank_solo_division"), player.get("rank_solo_lp"))
+    draw.text((text_x, 52), rank_text, fill=rank_color, font=font_rank)
+
+    role_x = text_x
+    for i, role in enumerate(roles):
+        icon = role_icons[i]
+        if icon:
+            _paste_icon(img, icon, (role_x, 80), 24)
+        role_x += 28
+        label = ROLE_LABELS_SHORT.get(role, role)
+        draw.text((role_x, 80), label, fill=(100, 180, 255) if i == 0 else (80, 130, 190), font=font_role)
+        bbox = draw.textbbox((0, 0), label, font=font_role)
+        role_x += bbox[2] - bbox[0] + 16
+
+    gap = 10
+    x = TILE_W - 20 - len(top_champs) * (champ_size + gap) + gap
+    for i in range(len(top_champs)):
+        y = (TILE_H - champ_size) // 2
+        icon = champ_icons[i]
+        if icon:
+            _paste_rounded(img, icon, (x, y), champ_size, 10)
+        else:
+            draw.rounded_rectangle([x, y, x + champ_size, y + champ_size], radius=10, fill=(40, 40, 55))
+        x += champ_size + gap
+
+    return _encode_png(img)
+
+
+async def generate_team_tile(team: dict) -> bytes:
+    """Render an 800x112 PNG listing tile for a team (name, elo range, roster slots)."""
+    min_r = team.get("min_rank")
+    max_r = team.get("max_rank")
+    img, draw = _new_tile(_rank_rgb(min_r))
+
+    font_name = _load_font(30, bold=True)
+    font_sub = _load_font(22, bold=True)
+
+    all_roles = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+    wanted_roles = team.get("wanted_roles") or []
+    member_by_role = {m.get("role", ""): m.get("player", m) for m in team.get("members", [])}
+    slot_size = 44
+    role_icons, slot_rank_icons = await asyncio.gather(
+        asyncio.gather(*[_get_role_icon(r, 22) for r in all_roles]),
+        asyncio.gather(*[
+            _get_rank_icon(member_by_role[r]["rank_solo_tier"], slot_size)
+            if r in member_by_role and member_by_role[r].get("rank_solo_tier") else asyncio.sleep(0)
+            for r in all_roles
+        ]),
+    )
+
+    draw.text((28, 14), team.get("name", ""), fill=(255, 255, 255), font=font_name)
+    if min_r or max_r:
+        parts = [r.capitalize() for r in (min_r, max_r) if r]
+        draw.text((28, 56), " → ".join(parts), fill=_rank_rgb(min_r or max_r), font=font_sub)
+    draw.text((28, 82), f"{len(member_by_role)}/5 joueurs", fill=(160, 160, 180), font=_load_font(18))
+
+    slot_w = 64
+    x = TILE_W - 20 - len(all_roles) * slot_w
+    for i, role in enumerate(all_roles):
+        cx = x + i * slot_w + slot_w // 2
+        if role_icons[i]:
+            _paste_icon(img, role_icons[i], (cx - 11, 10), 22)
+        box = [cx - slot_size // 2, 40, cx + slot_size // 2, 40 + slot_size]
+        if role in member_by_role:
+            draw.rounded_rectangle(box, radius=8, fill=(40, 40, 55))
+            if slot_rank_icons[i]:
+                _paste_icon(img, slot_rank_icons[i], (box[0], box[1]), slot_size)
+        elif role in wanted_roles:
+            draw.rounded_rectangle(box, radius=8, outline=(100, 180, 255), width=2)
+            q_bbox = draw.textbbox((0, 0), "?", font=font_sub)
+            draw.text((cx - (q_bbox[2] - q_bbox[0]) // 2, box[1] + 8), "?", fill=(100, 180, 255), font=font_sub)
+        else:
+            draw.rounded_rectangle(box, radius=8, fill=(30, 30, 40))
+
+    return _encode_png(img)
+
+
+def compose_tile_page(tiles: list[bytes]) -> bytes:
+    """Stack pre-rendered listing tiles vertically into a single PNG page card."""
+    height = len(tiles) * TILE_H + max(0, len(tiles) - 1) * TILE_GAP
+    page = Image.new("RGB", (TILE_W, max(height, 1)), (24, 24, 32))
+    for i, data in enumerate(tiles):
+        tile = Image.open(BytesIO(data))
+        page.paste(tile, (0, i * (TILE_H + TILE_GAP)))
+    return _encode_png(page)
@@ -0,0 +1,126 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger("riftteam.og_queue")
+
+COALESCE_DELAY = 2.0
+RENDER_TIME_WINDOW = 100
+
+Renderer = Callable[[str], Awaitable[None]]
+
+
+class OgRenderQueue:
+    """Deduplicated background queue that pre-renders OG cards after profile or team changes.
+
+    Jobs are keyed by (kind, slug). Enqueuing a key that is already pending only
+    pushes back its due time, so a burst of edits collapses into a single render.
+    A key enqueued while it is being rendered is rendered again afterwards.
+    """
+
+    def __init__(self, coalesce_delay: float = COALESCE_DELAY) -> None:
+        self.coalesce_delay = coalesce_delay
+        self._renderers: dict[str, Renderer] = {}
+        self._pending: dict[tuple[str, str], float] = {}
+        self._in_flight: set[tuple[str, str]] = set()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._render_times: list[float] = []
+        self._rendered = 0
+        self._failed = 0
+        self._coalesced = 0
+
+    def register(self, kind: str, renderer: Renderer) -> None:
+        """Register the coroutine used to render cards of the given kind."""
+        self._renderers[kind] = renderer
+
+    def enqueue(self, kind: str, slug: str) -> None:
+        """Schedule a re-render of a card, merging with any pending job for the same key."""
+        if kind not in self._renderers:
+            return
+        key = (kind, slug)
+        if key in self._pending:
+            self._coalesced += 1
+        self._pending[key] = time.monotonic() + self.coalesce_delay
+        self._wakeup.set()
+
+    def discard(self, kind: str, slug: str) -> None:
+        """Drop a pending job (e.g. when the entity was deleted or renamed)."""
+        self._pending.pop((kind, slug), None)
+
+    def start(self) -> None:
+        """Start the background worker if it is not already running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background worker and wait for it to exit."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def stats(self) -> dict:
+        """Return queue depth and render timing metrics."""
+        times = self._render_times
+        return {
+            "depth": len(self._pending),
+            "in_flight": len(self._in_flight),
+            "rendered": self._rendered,
+            "failed": self._failed,
+            "coalesced": self._coalesced,
+            "last_render_ms": round(times[-1] * 1000, 1) if times else None,
+            "avg_render_ms": round(sum(times) / len(times) * 1000, 1) if times else None,
+            "max_render_ms": round(max(times) * 1000, 1) if times else None,
+        }
+
+    def _pop_due(self) -> tuple[list[tuple[str, str]], float | None]:
+        """Remove and return keys whose coalesce delay has elapsed, plus the next wait time."""
+        now = time.monotonic()
+        due = [k for k, at in self._pending.items() if at <= now and k not in self._in_flight]
+        for k in due:
+            del self._pending[k]
+        waiting = [at for k, at in self._pending.items() if k not in self._in_flight]
+        next_wait = max(0.0, min(waiting) - now) if waiting else None
+        return due, next_wait
+
+    async def _render(self, key: tuple[str, str]) -> None:
+        """Run the renderer for one key and record its timing."""
+        kind, slug = key
+        self._in_flight.add(key)
+        start = time.perf_counter()
+        try:
+            await self._renderers[kind](slug)
+            self._rendered += 1
+        except Exception:
+            self._failed += 1
+            logger.exception("OG pre-render failed for %s %s", kind, slug)
+        finally:
+            self._in_flight.discard(key)
+            self._render_times.append(time.perf_counter() - start)
+            del self._render_times[:-RENDER_TIME_WINDOW]
+
+    async def drain(self) -> None:
+        """Render every due job once, sequentially."""
+        due, _ = self._pop_due()
+        for key in due:
+            await self._render(key)
+
+    async def _run(self) -> None:
+        """Worker loop: sleep until the next job is due, then render it."""
+        while True:
+            due, next_wait = self._pop_due()
+            for key in due:
+                await self._render(key)
+            if due:
+                continue
+            self._wakeup.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=next_wait)
+
+
+render_queue = OgRenderQueue()
@@ -74,7 +74,6 @@ def create_player_from_riot_data(riot_data: dict, slug: str, **extra_fields) ->
 
 async def refresh_champions(db: AsyncSession, player: Player, champions_data: list[dict]) -> None:
     """Delete existing champion rows and replace them with fresh data."""
-    for champ in player.champions:
-        await db.delete(champ)
+    player.champions.clear()
     await db.flush()
     populate_champions(player, champions_data)
@@ -1,4 +1,5 @@
-from shared.constants import RANK_ORDER
+from app.models.player import ROLE_BITS
+from shared.constants import ACTIVITY_LABELS, AMBIANCE_LABELS, RANK_ORDER
 
 
 def apply_rank_filters(stmt, count_stmt, min_rank, max_rank, column, *, allow_null=False):
@@ -20,3 +21,53 @@ def apply_rank_filters(stmt, count_stmt, min_rank, max_rank, column, *, allow_nu
         stmt = stmt.where(cond)
         count_stmt = count_stmt.where(cond)
     return stmt, count_stmt
+
+
+def apply_rank_range(stmt, count_stmt, min_rank, max_rank, score_column, *, allow_null=False):
+    """Add WHERE clauses keeping rows whose numeric rank score lies within a rank range."""
+    conds = []
+    if min_rank and min_rank.upper() in RANK_ORDER:
+        conds.append(score_column >= RANK_ORDER[min_rank.upper()])
+    if max_rank and max_rank.upper() in RANK_ORDER:
+        conds.append(score_column <= RANK_ORDER[max_rank.upper()])
+    for cond in conds:
+        if allow_null:
+            cond = cond | score_column.is_(None)
+        stmt = stmt.where(cond)
+        count_stmt = count_stmt.where(cond)
+    return stmt, count_stmt
+
+
+def apply_profile_filters(
+    stmt, count_stmt, model, *, activities=None, ambiance=None, frequency_min=None, frequency_max=None,
+):
+    """Add WHERE clauses on declared activities (any of), ambiance and weekly frequency overlap.
+
+    Activities use the array overlap operator (``&&``) so the GIN index on the column can serve them.
+    """
+    conds = []
+    wanted = sorted({a.upper() for a in activities or [] if a.upper() in ACTIVITY_LABELS})
+    if wanted:
+        conds.append(model.activities.overlap(wanted))
+    if ambiance and ambiance.upper() in AMBIANCE_LABELS:
+        conds.append(model.ambiance == ambiance.upper())
+    if frequency_min is not None:
+        conds.append(model.frequency_max >= frequency_min)
+    if frequency_max is not None:
+        conds.append(model.frequency_min <= frequency_max)
+    for cond in conds:
+        stmt = stmt.where(cond)
+        count_stmt = count_stmt.where(cond)
+    return stmt, count_stmt
+
+
+def roster_filters(model, *, roster_min_rank=None, roster_max_rank=None, open_role=None) -> list:
+    """WHERE clauses on a team's stored roster aggregates: average rank range and a role no member plays yet."""
+    conds = []
+    if roster_min_rank and roster_min_rank.upper() in RANK_ORDER:
+        conds.append(model.roster_rank_avg >= RANK_ORDER[roster_min_rank.upper()])
+    if roster_max_rank and roster_max_rank.upper() in RANK_ORDER:
+        conds.append(model.roster_rank_avg <= RANK_ORDER[roster_max_rank.upper()])
+    if open_role and open_role.upper() in ROLE_BITS:
+        conds.append(model.roster_role_mask.bitwise_and(ROLE_BITS[open_role.upper()]) == 0)
+    return conds
@@ -0,0 +1,190 @@
+import math
+from functools import reduce
+from operator import add
+
+from sqlalchemy import and_, case, exists, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.player import ACTIVITY_BITS, ROLE_BITS, SECONDARY_ROLE_SHIFT, Player
+from app.models.team import Team, TeamMember
+from shared.constants import RANK_ORDER
+
+# Points per criterion; a perfect match scores 100.
+WEIGHTS = {"role": 40, "rank": 30, "activities": 15, "ambiance": 10, "frequency": 5}
+SECONDARY_ROLE_FIT = 0.6
+# Fit given when one side left a criterion blank.
+NEUTRAL_FIT = 0.5
+# Tiers outside the team's window at which the rank fit drops to zero.
+RANK_TOLERANCE = 3
+PRIMARY_ROLE_MASK = (1 << SECONDARY_ROLE_SHIFT) - 1
+
+
+def _mask(values, bits: dict[str, int]) -> int:
+    return sum(bits.get((value or "").upper(), 0) for value in set(values or []))
+
+
+def player_role_mask(player: Player) -> int:
+    """The player's role_mask, computed from the loaded object (same encoding as the generated column)."""
+    return _mask([player.primary_role], ROLE_BITS) + (_mask([player.secondary_role], ROLE_BITS) << SECONDARY_ROLE_SHIFT)
+
+
+def _popcount(mask):
+    """SQL bit count of a role/activity mask column."""
+    return reduce(add, (mask.bitwise_rshift(i).bitwise_and(1) for i in range(len(ACTIVITY_BITS))))
+
+
+def _role_fit_for_team(wanted: int, role_mask):
+    if not wanted:
+        return literal(1.0)
+    return case(
+        (role_mask.bitwise_and(wanted) != 0, 1.0),
+        (role_mask.bitwise_rshift(SECONDARY_ROLE_SHIFT).bitwise_and(wanted) != 0, SECONDARY_ROLE_FIT),
+        (role_mask == 0, NEUTRAL_FIT),
+        else_=0.0,
+    )
+
+
+def _role_fit_for_player(role_mask: int, wanted):
+    primary, secondary = role_mask & PRIMARY_ROLE_MASK, role_mask >> SECONDARY_ROLE_SHIFT
+    whens = [(wanted == 0, 1.0)]
+    if primary:
+        whens.append((wanted.bitwise_and(primary) != 0, 1.0))
+    if secondary:
+        whens.append((wanted.bitwise_and(secondary) != 0, SECONDARY_ROLE_FIT))
+    return case(*whens, else_=0.0 if role_mask else NEUTRAL_FIT)
+
+
+def _rank_fit(distance):
+    """Full fit inside the window, decreasing linearly to zero RANK_TOLERANCE tiers away."""
+    return func.greatest(0.0, 1.0 - distance / float(RANK_TOLERANCE))
+
+
+def _rank_fit_for_team(low: int | None, high: int | None, score):
+    gaps = ([low - score] if low is not None else []) + ([score - high] if high is not None else [])
+    if not gaps:
+        return literal(1.0)
+    return func.coalesce(_rank_fit(func.greatest(0, *gaps)), NEUTRAL_FIT)
+
+
+def _rank_fit_for_player(score: int | None, low, high):
+    if score is None:
+        return literal(NEUTRAL_FIT)
+    return _rank_fit(func.greatest(0, func.coalesce(low - score, 0), func.coalesce(score - high, 0)))
+
+
+def _activity_fit(mask: int, candidate_mask):
+    """Jaccard overlap of two activity masks."""
+    if not mask:
+        return literal(NEUTRAL_FIT)
+    shared = reduce(add, (candidate_mask.bitwise_rshift(i).bitwise_and(1) for i in range(mask.bit_length()) if mask >> i & 1))
+    union = mask.bit_count() + _popcount(candidate_mask) - shared
+    return case((candidate_mask == 0, NEUTRAL_FIT), else_=shared / union)
+
+
+def _ambiance_fit(ambiance: str | None, column):
+    if ambiance is None:
+        return literal(NEUTRAL_FIT)
+    return case((column.is_(None), NEUTRAL_FIT), (column == ambiance, 1.0), else_=0.0)
+
+
+def _frequency_fit(frequency_min: int | None, frequency_max: int | None, min_column, max_column):
+    """1 when the weekly frequency ranges overlap (a single bound counts as a one-value range)."""
+    if frequency_min is None and frequency_max is None:
+        return literal(NEUTRAL_FIT)
+    low = frequency_min if frequency_min is not None else frequency_max
+    high = frequency_max if frequency_max is not None else frequency_min
+    other_low, other_high = func.coalesce(min_column, max_column), func.coalesce(max_column, min_column)
+    return case((other_low.is_(None), NEUTRAL_FIT), (and_(other_low <= high, other_high >= low), 1.0), else_=0.0)
+
+
+def _weighted(fits: dict):
+    return reduce(add, (WEIGHTS[name] * fit for name, fit in fits.items())).label("score")
+
+
+def player_score_sql(team: Team):
+    """Compatibility score (0-100) of every player row with a loaded team."""
+    return _weighted({
+        "role": _role_fit_for_team(_mask(team.wanted_roles, ROLE_BITS), Player.role_mask),
+        "rank": _rank_fit_for_team(
+            RANK_ORDER.get((team.min_rank or "").upper()), RANK_ORDER.get((team.max_rank or "").upper()),
+            Player.rank_solo_score,
+        ),
+        "activities": _activity_fit(_mask(team.activities, ACTIVITY_BITS), Player.activity_mask),
+        "ambiance": _ambiance_fit(team.ambiance, Player.ambiance),
+        "frequency": _frequency_fit(team.frequency_min, team.frequency_max, Player.frequency_min, Player.frequency_max),
+    })
+
+
+def team_score_sql(player: Player):
+    """Compatibility score (0-100) of every team row with a loaded player."""
+    return _weighted({
+        "role": _role_fit_for_player(player_role_mask(player), Team.wanted_role_mask),
+        "rank": _rank_fit_for_player(
+            RANK_ORDER.get((player.rank_solo_tier or "").upper()), Team.min_rank_score, Team.max_rank_score,
+        ),
+        "activities": _activity_fit(_mask(player.activities, ACTIVITY_BITS), Team.activity_mask),
+        "ambiance": _ambiance_fit(player.ambiance, Team.ambiance),
+        "frequency": _frequency_fit(player.frequency_min, player.frequency_max, Team.frequency_min, Team.frequency_max),
+    })
+
+
+def recommended_players_query(team: Team, *, limit: int = 10):
+    """Build the query for the ids and scores of the best LFT players for a team.
+
+    Scores are computed from the compact feature columns included in idx_players_lft_browse,
+    so ranking every LFT profile is an index-only scan feeding a top-N sort. Players already
+    on a roster are skipped.
+    """
+    score = player_score_sql(team)
+    rostered = exists().where(TeamMember.player_id == Player.id)
+    return (
+        select(Player.id, score)
+        .where(Player.is_lft.is_(True), ~rostered)
+        .order_by(score.desc(), Player.updated_at.desc())
+        .limit(limit)
+    )
+
+
+def recommended_teams_query(player: Player, *, limit: int = 10):
+    """Build the query for the ids and scores of the best LFP teams for a player.
+
+    Same approach as recommended_players_query, over idx_teams_lfp_browse. The player's own
+    team (as member or captain) is skipped.
+    """
+    score = team_score_sql(player)
+    conditions = [
+        Team.is_lfp.is_(True),
+        ~exists().where(TeamMember.team_id == Team.id, TeamMember.player_id == player.id),
+    ]
+    if player.discord_user_id:
+        conditions.append(Team.captain_discord_id != player.discord_user_id)
+    return (
+        select(Team.id, score)
+        .where(*conditions)
+        .order_by(score.desc(), Team.updated_at.desc())
+        .limit(limit)
+    )
+
+
+async def _load_ranked(db: AsyncSession, stmt, entity, *options) -> list[tuple]:
+    """Run a ranking query, then load the ranked rows in order, paired with their score rounded half up."""
+    ranked = (await db.execute(stmt)).all()
+    if not ranked:
+        return []
+    result = await db.execute(select(entity).options(*options).where(entity.id.in_([row.id for row in ranked])))
+    by_id = {obj.id: obj for obj in result.scalars().all()}
+    return [(by_id[row.id], math.floor(row.score + 0.5)) for row in ranked if row.id in by_id]
+
+
+async def recommend_players(db: AsyncSession, team: Team, *, limit: int = 10) -> list[tuple[Player, int]]:
+    """Return the LFT players most compatible with a team, best first, with their score."""
+    return await _load_ranked(db, recommended_players_query(team, limit=limit), Player, selectinload(Player.champions))
+
+
+async def recommend_teams(db: AsyncSession, player: Player, *, limit: int = 10) -> list[tuple[Team, int]]:
+    """Return the LFP teams most compatible with a player, best first, with their score."""
+    return await _load_ranked(
+        db, recommended_teams_query(player, limit=limit), Team,
+        selectinload(Team.members).selectinload(TeamMember.player),
+    )
@@ -0,0 +1,150 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import literal, or_, select
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.player import Player
+from app.models.saved_search import SavedSearch, SavedSearchMatch
+from app.models.scrim import Scrim
+from app.models.team import Team
+from app.services.events import publish_event
+from app.services.scrim_matching import rank_bounds
+from shared.constants import RANK_ORDER
+
+ANY = "*"
+MAX_SAVED_SEARCHES = 10
+DELIVERY_BATCH_SIZE = 100
+LOWEST_RANK, HIGHEST_RANK = min(RANK_ORDER.values()), max(RANK_ORDER.values())
+
+
+def _keys(target: str, roles, buckets, formats) -> list[str]:
+    return [f"{target}:{role}:{bucket}:{fmt}" for role in roles for bucket in buckets for fmt in formats]
+
+
+def search_keys(target: str, *, role=None, min_rank=None, max_rank=None, format=None) -> list[str]:
+    """Inverted index keys of a saved search: one per role × rank bucket × format it accepts (``*`` = any).
+
+    Team rank filters are containment checks on the team's own range rather than a single
+    bucket, so team searches are keyed on ``*`` and their ranks checked by ``match_team``.
+    """
+    buckets = [ANY]
+    if target != "teams" and (min_rank or max_rank):
+        low = RANK_ORDER[min_rank] if min_rank else LOWEST_RANK
+        high = RANK_ORDER[max_rank] if max_rank else HIGHEST_RANK
+        buckets = [str(score) for score in range(low, high + 1)]
+    return _keys(target, [role or ANY], buckets, [format or ANY])
+
+
+def player_keys(player: Player) -> list[str]:
+    """Keys under which saved searches can match a player: its roles and solo rank bucket, each or ``*``."""
+    roles = dict.fromkeys(r for r in (player.primary_role, player.secondary_role) if r)
+    score = RANK_ORDER.get(player.rank_solo_tier or "")
+    buckets = [str(score)] if score is not None else []
+    return _keys("players", [*roles, ANY], [*buckets, ANY], [ANY])
+
+
+def team_keys(team: Team) -> list[str]:
+    """Keys under which saved searches can match a team: each wanted role, or ``*``."""
+    return _keys("teams", [*dict.fromkeys(team.wanted_roles or []), ANY], [ANY], [ANY])
+
+
+def scrim_keys(scrim: Scrim) -> list[str]:
+    """Keys under which saved searches can match a scrim: every rank bucket of its window and its format."""
+    low, high = rank_bounds(scrim)
+    buckets = [str(score) for score in range(LOWEST_RANK if low is None else low, (HIGHEST_RANK if high is None else high) + 1)]
+    formats = [f for f in (scrim.format, f"G{scrim.game_count}" if scrim.game_count else None) if f]
+    return _keys("scrims", [ANY], [*buckets, ANY], [*formats, ANY])
+
+
+async def _queue_matches(db: AsyncSession, target: str, entity_id: uuid.UUID, keys: list[str], owner, *conds) -> int:
+    """Queue the entity for every saved search indexed under one of ``keys``; return how many were new.
+
+    A single INSERT ... SELECT probes the GIN index, so the cost depends on the number of
+    candidate searches, not on the total number of saved searches. A search already matched
+    with this entity is not queued again.
+    """
+    candidates = select(SavedSearch.id, literal(entity_id, UUID(as_uuid=True))).where(
+        SavedSearch.match_keys.overlap(keys),
+        SavedSearch.discord_user_id.is_distinct_from(owner),
+        *conds,
+    )
+    stmt = (
+        insert(SavedSearchMatch)
+        .from_select(["search_id", "entity_id"], candidates)
+        .on_conflict_do_nothing()
+        .returning(SavedSearchMatch.search_id)
+    )
+    queued = len((await db.execute(stmt)).scalars().all())
+    if queued:
+        await publish_event(db, "search.matched", target=target, id=str(entity_id))
+    return queued
+
+
+async def match_player(db: AsyncSession, player: Player) -> int:
+    """Queue a (flushed) LFT player for the saved player searches it satisfies."""
+    if not player.is_lft:
+        return 0
+    return await _queue_matches(db, "players", player.id, player_keys(player), player.discord_user_id)
+
+
+async def match_team(db: AsyncSession, team: Team) -> int:
+    """Queue a (flushed) LFP team for the saved team searches it satisfies."""
+    if not team.is_lfp:
+        return 0
+    conds = []
+    team_min, team_max = RANK_ORDER.get(team.min_rank or ""), RANK_ORDER.get(team.max_rank or "")
+    # Same semantics as the browse filters: an unset team bound passes.
+    if team_min is not None:
+        conds.append(or_(SavedSearch.min_rank_score.is_(None), SavedSearch.min_rank_score <= team_min))
+    if team_max is not None:
+        conds.append(or_(SavedSearch.max_rank_score.is_(None), SavedSearch.max_rank_score >= team_max))
+    return await _queue_matches(db, "teams", team.id, team_keys(team), team.captain_discord_id, *conds)
+
+
+async def match_scrim(db: AsyncSession, scrim: Scrim) -> int:
+    """Queue a (flushed) active scrim for the saved scrim searches it satisfies."""
+    if not scrim.is_active:
+        return 0
+    return await _queue_matches(db, "scrims", scrim.id, scrim_keys(scrim), scrim.captain_discord_id)
+
+
+async def collect_pending_matches(db: AsyncSession, *, now: datetime, limit: int = DELIVERY_BATCH_SIZE) -> list[dict]:
+    """Mark a batch of queued matches as notified and return the ones still worth a DM.
+
+    Matches whose player, team or scrim has since been deleted or gone inactive are
+    dropped. Rows are locked with SKIP LOCKED, so concurrent callers get disjoint batches.
+    """
+    rows = (await db.execute(
+        select(SavedSearchMatch, SavedSearch)
+        .join(SavedSearch, SavedSearch.id == SavedSearchMatch.search_id)
+        .where(SavedSearchMatch.notified_at.is_(None))
+        .order_by(SavedSearchMatch.matched_at)
+        .limit(limit)
+        .with_for_update(of=SavedSearchMatch, skip_locked=True)
+    )).all()
+    if not rows:
+        return []
+
+    ids: dict[str, list[uuid.UUID]] = {}
+    for match, search in rows:
+        ids.setdefault(search.target, []).append(match.entity_id)
+    refs: dict[uuid.UUID, str] = {}
+    if "players" in ids:
+        stmt = select(Player.id, Player.slug).where(Player.id.in_(ids["players"]), Player.is_lft.is_(True))
+        refs.update((await db.execute(stmt)).tuples().all())
+    if "teams" in ids:
+        stmt = select(Team.id, Team.slug).where(Team.id.in_(ids["teams"]), Team.is_lfp.is_(True))
+        refs.update((await db.execute(stmt)).tuples().all())
+    if "scrims" in ids:
+        stmt = select(Scrim.id).where(Scrim.id.in_(ids["scrims"]), Scrim.is_active.is_(True))
+        refs.update((scrim_id, str(scrim_id)) for scrim_id in (await db.execute(stmt)).scalars().all())
+
+    pending = []
+    for match, search in rows:
+        match.notified_at = now
+        if match.entity_id in refs:
+            pending.append({"search": search, "ref": refs[match.entity_id]})
+    await db.commit()
+    return pending
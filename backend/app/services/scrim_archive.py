@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from sqlalchemy import case, delete, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.scrim import Scrim, ScrimArchive
+
+ARCHIVE_BATCH_SIZE = 500
+
+_MOVED_COLUMNS = (
+    "id", "team_id", "captain_discord_id", "min_rank", "max_rank", "scheduled_at",
+    "format", "game_count", "fearless", "created_at", "updated_at",
+)
+
+
+def archive_batch(now: datetime, *, batch_size: int = ARCHIVE_BATCH_SIZE):
+    """Build one sweeper step: move up to ``batch_size`` past scrims into scrim_archive.
+
+    A single statement (DELETE ... RETURNING feeding an INSERT) so a batch never half-moves.
+    Rows locked by a concurrent writer are skipped and picked up by the next sweep; their
+    scrim_matches rows go with them through the foreign key cascade.
+    """
+    doomed = (
+        select(Scrim.id)
+        .where(Scrim.scheduled_at < now)
+        .order_by(Scrim.scheduled_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        delete(Scrim)
+        .where(Scrim.id.in_(doomed.scalar_subquery()))
+        .returning(*(getattr(Scrim, name) for name in _MOVED_COLUMNS), Scrim.is_active)
+        .cte("moved")
+    )
+    rows = select(
+        *(moved.c[name] for name in _MOVED_COLUMNS),
+        case((moved.c.is_active.is_(True), "EXPIRED"), else_="CANCELLED"),
+        literal(now, ScrimArchive.archived_at.type),
+    )
+    return insert(ScrimArchive).from_select([*_MOVED_COLUMNS, "status", "archived_at"], rows)
+
+
+async def archive_past_scrims(db: AsyncSession, *, now: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Move every scrim scheduled before ``now`` to the archive, one committed batch at a time."""
+    total = 0
+    while True:
+        result = await db.execute(archive_batch(now, batch_size=batch_size))
+        await db.commit()
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
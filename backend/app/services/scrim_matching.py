@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import Integer, and_, exists, func, literal, literal_column, null, select
+from sqlalchemy.dialects.postgresql import INT4RANGE
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, selectinload
+
+from app.models.scrim import Scrim, ScrimMatch
+from app.models.team import Team, TeamMember
+from shared.constants import RANK_ORDER
+
+MATCH_TOLERANCE = timedelta(hours=1)
+
+
+def _roster_load(entity):
+    """Loader option for a scrim's team, roster and players."""
+    return selectinload(entity.team).selectinload(Team.members).selectinload(TeamMember.player)
+
+
+def _team_score_sql(team_id_column):
+    """Correlated subquery: the stored average solo rank score of a team's roster."""
+    return select(Team.roster_rank_avg).where(Team.id == team_id_column).scalar_subquery()
+
+
+def rank_bounds(scrim: Scrim) -> tuple[int | None, int | None]:
+    """The RANK_ORDER bounds of the opponent window a scrim accepts (None = open, inverted bounds swapped)."""
+    low = RANK_ORDER.get((scrim.min_rank or "").upper())
+    high = RANK_ORDER.get((scrim.max_rank or "").upper())
+    if low is not None and high is not None and low > high:
+        low, high = high, low
+    return low, high
+
+
+def _rank_window_sql(scrim: Scrim):
+    """The scrim's accepted opponent window as an int4range expression (NULL bounds are open)."""
+    low, high = (null() if bound is None else literal(bound, Integer) for bound in rank_bounds(scrim))
+    return func.int4range(low, high, literal_column("'[]'"), type_=INT4RANGE)
+
+
+def _same_setting(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def matches_query(scrim: Scrim, team_score: int | None, *, now: datetime, tolerance: timedelta = MATCH_TOLERANCE):
+    """Build the query for active scrims compatible with ``scrim``, closest start time first.
+
+    Candidates are found through index range lookups rather than by comparing every pair:
+    the start-time window uses the btree on scheduled_at and the rank check uses the GiST
+    index on rank_window. Both sides must accept the other's roster average; a team with
+    no ranked player is accepted by any window.
+    """
+    conditions = [
+        Scrim.is_active.is_(True),
+        Scrim.id != scrim.id,
+        Scrim.team_id != scrim.team_id,
+        Scrim.scheduled_at >= max(now, scrim.scheduled_at - tolerance),
+        Scrim.scheduled_at <= scrim.scheduled_at + tolerance,
+        _same_setting(Scrim.format, scrim.format),
+        _same_setting(Scrim.game_count, scrim.game_count),
+        Scrim.fearless.is_(bool(scrim.fearless)),
+        func.coalesce(_rank_window_sql(scrim).contains(_team_score_sql(Scrim.team_id)), True),
+    ]
+    if team_score is not None:
+        conditions.append(Scrim.rank_window.contains(team_score))
+
+    time_gap = func.abs(func.extract("epoch", Scrim.scheduled_at - scrim.scheduled_at))
+    return select(Scrim).options(_roster_load(Scrim)).where(*conditions).order_by(time_gap, Scrim.created_at)
+
+
+async def find_matches(
+    db: AsyncSession, scrim: Scrim, *, now: datetime, tolerance: timedelta = MATCH_TOLERANCE, limit: int = 10,
+) -> list[Scrim]:
+    """Return the active scrims compatible with a loaded scrim (team roster included)."""
+    stmt = matches_query(scrim, scrim.team.roster_rank_avg, now=now, tolerance=tolerance).limit(limit)
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
+
+
+def new_pairs_query(*, now: datetime, tolerance: timedelta = MATCH_TOLERANCE):
+    """Build the query for compatible pairs of active scrims that have not been notified yet.
+
+    The self-join probes the scheduled_at / rank_window indexes once per open scrim, so the
+    cost grows with n log n rather than n².
+    """
+    a, b = aliased(Scrim), aliased(Scrim)
+    score_a, score_b = _team_score_sql(a.team_id), _team_score_sql(b.team_id)
+    pair = and_(
+        a.id < b.id,
+        a.team_id != b.team_id,
+        b.is_active.is_(True),
+        b.scheduled_at >= now,
+        b.scheduled_at.between(a.scheduled_at - tolerance, a.scheduled_at + tolerance),
+        b.format.is_not_distinct_from(a.format),
+        b.game_count.is_not_distinct_from(a.game_count),
+        b.fearless == a.fearless,
+    )
+    notified = exists().where(ScrimMatch.scrim_id == a.id, ScrimMatch.opponent_scrim_id == b.id)
+    return (
+        select(a, b)
+        .join(b, pair)
+        .options(_roster_load(a), _roster_load(b))
+        .where(
+            a.is_active.is_(True),
+            a.scheduled_at >= now,
+            func.coalesce(b.rank_window.contains(score_a), True),
+            func.coalesce(a.rank_window.contains(score_b), True),
+            ~notified,
+        )
+        .order_by(a.scheduled_at)
+    )
+
+
+async def collect_new_matches(
+    db: AsyncSession, *, now: datetime, tolerance: timedelta = MATCH_TOLERANCE,
+) -> list[tuple[Scrim, Scrim]]:
+    """Find compatible scrim pairs not yet notified, record them and return them."""
+    result = await db.execute(new_pairs_query(now=now, tolerance=tolerance))
+    pairs = [(a, b) for a, b in result.all()]
+    for a, b in pairs:
+        db.add(ScrimMatch(scrim_id=a.id, opponent_scrim_id=b.id, notified_at=now))
+    await db.commit()
+    return pairs
@@ -0,0 +1,42 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+async def single_flight(
+    inflight: dict[Hashable, asyncio.Future], key: Hashable, factory: Callable[[], Awaitable[T]],
+) -> T:
+    """Run ``factory()`` at most once per key at a time; concurrent callers await the same result.
+
+    ``inflight`` holds the pending futures and is owned by the caller, so separate
+    caches never share keys. If the caller that started the work is cancelled (e.g.
+    the client disconnected), waiting callers retry instead of failing with it.
+    """
+    pending = inflight.get(key)
+    if pending is not None:
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if pending.cancelled() and current is not None and not current.cancelling():
+                return await single_flight(inflight, key, factory)
+            raise
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    inflight[key] = future
+    try:
+        result = await factory()
+    except Exception as exc:
+        future.set_exception(exc)
+        future.exception()
+        raise
+    except BaseException:
+        future.cancel()
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        inflight.pop(key, None)
@@ -7,7 +7,10 @@ from app.config import settings
 from app.database import async_session
 from app.models.player import Player
 from app.models.team import Team
+from app.services.events import publish_events
+from app.services.og_cache import schedule_team_og_render
 from app.services.snapshots import record_rank_snapshot, update_peak_rank
+from app.services.team_stats import refresh_player_team_stats
 from shared.riot_client import RiotAPIError, RiotClient
 
 logger = logging.getLogger("riftteam.sync")
@@ -43,7 +46,7 @@ async def sync_active_ranks(client: RiotClient | None = None) -> int:
 
 
 async def _sync_player_rank(player: Player, client: RiotClient) -> None:
-    """Fetch and persist updated rank data for a single player."""
+    """Fetch and persist updated rank data for a single player; a new tier also re-renders their team's card."""
     summoner = await client.get_summoner_by_puuid(player.riot_puuid)
     entries = await client.get_league_entries(player.riot_puuid)
 
@@ -79,6 +82,7 @@ async def _sync_player_rank(player: Player, client: RiotClient) -> None:
         if not p:
             return
 
+        tier_changed = p.rank_solo_tier != rank_solo_tier
         p.rank_solo_tier = rank_solo_tier
         p.rank_solo_division = rank_solo_division
         p.rank_solo_lp = rank_solo_lp
@@ -106,8 +110,11 @@ async def _sync_player_rank(player: Player, client: RiotClient) -> None:
         }
         await record_rank_snapshot(db, p.id, rank_data)
         update_peak_rank(p, rank_solo_tier, rank_solo_division, rank_solo_lp)
+        team_slug = await refresh_player_team_stats(db, p.id) if tier_changed else None
 
         await db.commit()
+    if team_slug:
+        schedule_team_og_render(team_slug)
 
 
 INACTIVITY_THRESHOLD = timedelta(days=14)
@@ -140,6 +147,10 @@ async def deactivate_inactive() -> dict[str, list[str]]:
             t.is_lfp = False
             deactivated_teams.append(t.captain_discord_id)
 
+        await publish_events(db, [
+            *(("player.lft_off", {"slug": p.slug}) for p in players),
+            *(("team.updated", {"slug": t.slug, "is_lfp": False}) for t in teams),
+        ])
         await db.commit()
 
     logger.info(
@@ -0,0 +1,86 @@
+import math
+import uuid
+
+from sqlalchemy import SmallInteger, and_, case, func, literal_column, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.player import ROLE_BITS, Player
+from app.models.team import Team, TeamMember
+from shared.constants import RANK_ORDER
+
+
+def roster_stats(members) -> dict[str, int | None]:
+    """Roster aggregates of loaded team members, in the form stored on the team row.
+
+    The average is rounded half up and the median is the lower middle value, matching
+    what ``team_stats_update`` computes in SQL.
+    """
+    scores = sorted(
+        score for m in members
+        if (score := RANK_ORDER.get((m.player.rank_solo_tier or "").upper())) is not None
+    )
+    return {
+        "roster_size": len(members),
+        "roster_rank_avg": math.floor(sum(scores) / len(scores) + 0.5) if scores else None,
+        "roster_rank_median": scores[(len(scores) - 1) // 2] if scores else None,
+        "roster_rank_max": scores[-1] if scores else None,
+        "roster_role_mask": sum(ROLE_BITS.get(role, 0) for role in {m.role for m in members}),
+    }
+
+
+def apply_roster_stats(team: Team, members=None) -> None:
+    """Store the aggregates of ``members`` (default: the loaded roster) on a team."""
+    for key, value in roster_stats(team.members if members is None else members).items():
+        setattr(team, key, value)
+
+
+def team_stats_update(*, player_id: uuid.UUID | None = None, leaving: bool = False):
+    """Build an UPDATE recomputing roster aggregates in SQL.
+
+    With ``player_id`` only the team that player plays in is touched, and its slug is returned;
+    ``leaving`` leaves the player out of the aggregates, for use just before the membership
+    disappears. Without it, every team is recomputed (backfills).
+    """
+    member_join = TeamMember.team_id == Team.id
+    if leaving:
+        member_join = and_(member_join, TeamMember.player_id != player_id)
+    target = aliased(Team)
+    stats = (
+        select(
+            Team.id.label("team_id"),
+            func.count(TeamMember.id).label("size"),
+            func.round(func.avg(Player.rank_solo_score)).cast(SmallInteger).label("avg"),
+            func.percentile_disc(literal_column("0.5")).within_group(Player.rank_solo_score).label("median"),
+            func.max(Player.rank_solo_score).label("max"),
+            func.coalesce(func.bit_or(case(ROLE_BITS, value=TeamMember.role, else_=0)), 0).label("role_mask"),
+        )
+        .outerjoin(TeamMember, member_join)
+        .outerjoin(Player, Player.id == TeamMember.player_id)
+        .group_by(Team.id)
+    )
+    stmt = update(target)
+    if player_id is not None:
+        team_ids = select(TeamMember.team_id).where(TeamMember.player_id == player_id).scalar_subquery()
+        stats = stats.where(Team.id == team_ids)
+        stmt = stmt.where(target.id == team_ids).returning(target.slug)
+    stats = stats.subquery()
+    return (
+        stmt.where(target.id == stats.c.team_id)
+        .values(
+            roster_size=stats.c.size,
+            roster_rank_avg=stats.c.avg,
+            roster_rank_median=stats.c.median,
+            roster_rank_max=stats.c.max,
+            roster_role_mask=stats.c.role_mask,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def refresh_player_team_stats(
+    db: AsyncSession, player_id: uuid.UUID, *, leaving: bool = False,
+) -> str | None:
+    """Recompute the aggregates of the team a player belongs to; return its slug, or None when they have none."""
+    result = await db.execute(team_stats_update(player_id=player_id, leaving=leaving))
+    return result.scalar_one_or_none()
@@ -1,22 +1,99 @@
-import uuid
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
 from datetime import UTC, datetime, timedelta
+from typing import NamedTuple
 
 from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.action_token import ActionToken
+from app.config import settings
+from app.models.consumed_token import ConsumedToken
 
 TOKEN_TTL = timedelta(minutes=30)
+ONE_TIME_ACTIONS = frozenset({"create", "team_create"})
+SIGNATURE_BYTES = 16
+# Keys anyone could guess: with one of these, any edit token could be forged.
+INSECURE_SECRET_KEYS = frozenset({"", "change-me-in-production"})
 
+_FIELDS = {
+    "a": "action",
+    "u": "discord_user_id",
+    "n": "discord_username",
+    "g": "game_name",
+    "t": "tag_line",
+    "s": "slug",
+    "m": "team_name",
+    "j": "nonce",
+    "x": "expires_at",
+}
 
-async def _cleanup(db: AsyncSession) -> None:
-    """Delete action tokens older than TOKEN_TTL."""
-    cutoff = datetime.now(UTC) - TOKEN_TTL
-    await db.execute(delete(ActionToken).where(ActionToken.created_at < cutoff))
 
+class TokenData(NamedTuple):
+    """Decoded contents of a signed action token."""
 
-async def create_token(
-    db: AsyncSession,
+    token: str
+    action: str
+    discord_user_id: str
+    discord_username: str
+    nonce: str
+    expires_at: int
+    game_name: str | None = None
+    tag_line: str | None = None
+    slug: str | None = None
+    team_name: str | None = None
+
+
+def _b64encode(data: bytes) -> str:
+    """Encode bytes as unpadded URL-safe base64."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    """Decode unpadded URL-safe base64."""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def check_secret_key(key: str) -> None:
+    """Raise if ``key`` is empty or the shipped default, so tokens are never signed with a public key."""
+    if key in INSECURE_SECRET_KEYS:
+        raise RuntimeError("SECRET_KEY is empty or still the default value; set it to a long random string")
+
+
+def _sign(payload: str, key: str) -> str:
+    """Return the truncated HMAC-SHA256 signature of an encoded payload."""
+    check_secret_key(key)
+    digest = hmac.new(key.encode(), payload.encode(), hashlib.sha256).digest()
+    return _b64encode(digest[:SIGNATURE_BYTES])
+
+
+def _encode(claims: dict, key: str) -> str:
+    """Serialize and sign token claims as ``<payload>.<signature>``."""
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    return f"{payload}.{_sign(payload, key)}"
+
+
+def decode_token(token: str, key: str | None = None, now: float | None = None) -> TokenData | None:
+    """Verify a token's signature and expiry without touching the database."""
+    key = settings.secret_key if key is None else key
+    payload, _, signature = token.partition(".")
+    if not signature or not hmac.compare_digest(signature.encode(), _sign(payload, key).encode()):
+        return None
+    try:
+        claims = json.loads(_b64decode(payload))
+        data = TokenData(token=token, **{_FIELDS[k]: v for k, v in claims.items()})
+    except (ValueError, KeyError, TypeError):
+        return None
+    if data.expires_at <= (now if now is not None else time.time()):
+        return None
+    return data
+
+
+def create_token(
     *,
     action: str,
     discord_user_id: str,
@@ -25,40 +102,58 @@ async def create_token(
     tag_line: str | None = None,
     slug: str | None = None,
     team_name: str | None = None,
-) -> ActionToken:
-    """Generate a new action token and persist it after cleaning up expired ones."""
-    await _cleanup(db)
-    token = uuid.uuid4().hex
-    obj = ActionToken(
-        token=token,
-        action=action,
-        discord_user_id=discord_user_id,
-        discord_username=discord_username,
-        game_name=game_name,
-        tag_line=tag_line,
-        slug=slug,
-        team_name=team_name,
-        created_at=datetime.now(UTC),
-    )
-    db.add(obj)
-    await db.commit()
-    return obj
+) -> TokenData:
+    """Issue a signed, expiring action token; nothing is written to the database."""
+    fields = {
+        "action": action,
+        "discord_user_id": discord_user_id,
+        "discord_username": discord_username,
+        "game_name": game_name,
+        "tag_line": tag_line,
+        "slug": slug,
+        "team_name": team_name,
+        "nonce": secrets.token_urlsafe(12),
+        "expires_at": int(time.time() + TOKEN_TTL.total_seconds()),
+    }
+    claims = {short: fields[name] for short, name in _FIELDS.items() if fields[name] is not None}
+    return TokenData(token=_encode(claims, settings.secret_key), **fields)
+
+
+async def _is_consumed(db: AsyncSession, nonce: str) -> bool:
+    """Return True if a one-time token's nonce has already been used."""
+    result = await db.execute(select(ConsumedToken.nonce).where(ConsumedToken.nonce == nonce))
+    return result.scalar_one_or_none() is not None
 
 
-async def validate_token(db: AsyncSession, token: str) -> ActionToken | None:
-    """Return the token if it exists and hasn't expired, else None."""
-    await _cleanup(db)
-    result = await db.execute(select(ActionToken).where(ActionToken.token == token))
-    return result.scalar_one_or_none()
+async def validate_token(db: AsyncSession, token: str) -> TokenData | None:
+    """Return the token's data if it is authentic, unexpired and (for one-time tokens) unused."""
+    data = decode_token(token)
+    if data is None:
+        return None
+    if data.action in ONE_TIME_ACTIONS and await _is_consumed(db, data.nonce):
+        return None
+    return data
 
 
-async def consume_token(db: AsyncSession, token: str, expected_action: str) -> ActionToken | None:
-    """Validate and delete a token in one step, returning it if valid."""
-    await _cleanup(db)
-    result = await db.execute(select(ActionToken).where(ActionToken.token == token))
-    obj = result.scalar_one_or_none()
-    if obj is None or obj.action != expected_action:
+async def consume_token(db: AsyncSession, token: str, expected_action: str) -> TokenData | None:
+    """Validate a one-time token and mark it used within the caller's transaction."""
+    data = decode_token(token)
+    if data is None or data.action != expected_action:
+        return None
+    stmt = (
+        insert(ConsumedToken)
+        .values(nonce=data.nonce, expires_at=datetime.fromtimestamp(data.expires_at, UTC))
+        .on_conflict_do_nothing(index_elements=["nonce"])
+        .returning(ConsumedToken.nonce)
+    )
+    result = await db.execute(stmt)
+    if result.scalar_one_or_none() is None:
         return None
-    await db.delete(obj)
-    await db.flush()
-    return obj
+    return data
+
+
+async def purge_expired_tokens(db: AsyncSession) -> int:
+    """Delete consumed-token records whose tokens have expired anyway."""
+    result = await db.execute(delete(ConsumedToken).where(ConsumedToken.expires_at < datetime.now(UTC)))
+    await db.commit()
+    return result.rowcount
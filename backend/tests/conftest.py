@@ -1,9 +1,21 @@
+import os
+import time
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+# Token signing refuses the shipped default key; tests sign with their own.
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
 
 
 def _make_player(**overrides):
@@ -64,6 +76,10 @@ def _make_team(**overrides):
         "min_rank": "SILVER",
         "max_rank": "DIAMOND",
         "is_lfp": True,
+        "roster_size": 0,
+        "roster_rank_avg": None,
+        "roster_rank_median": None,
+        "roster_rank_max": None,
         "created_at": datetime.now(timezone.utc).isoformat(),
         "updated_at": datetime.now(timezone.utc).isoformat(),
         "members": [],
@@ -92,6 +108,88 @@ def _make_scrim(**overrides):
     return defaults
 
 
+def _make_riot_profile(**overrides):
+    """Return a fetch_full_profile() result with one champion."""
+    defaults = {
+        "puuid": "fake-puuid",
+        "game_name": "TestPlayer",
+        "tag_line": "EUW",
+        "summoner_level": 250,
+        "profile_icon_id": 2,
+        "rank_solo_tier": "PLATINUM",
+        "rank_solo_division": "IV",
+        "rank_solo_lp": 10,
+        "rank_solo_wins": 70,
+        "rank_solo_losses": 50,
+        "rank_flex_tier": None,
+        "rank_flex_division": None,
+        "rank_flex_lp": None,
+        "rank_flex_wins": None,
+        "rank_flex_losses": None,
+        "primary_role": "JUNGLE",
+        "secondary_role": "MIDDLE",
+        "champions": [{
+            "champion_id": 64,
+            "champion_name": "Lee Sin",
+            "mastery_level": 7,
+            "mastery_points": 150000,
+            "games_played": 20,
+            "wins": 12,
+            "losses": 8,
+            "avg_kills": 7.5,
+            "avg_deaths": 4.2,
+            "avg_assists": 8.1,
+        }],
+    }
+    defaults.update(overrides)
+    return defaults
+
+
+def _player_model(**overrides):
+    """Build a transient Player ORM instance from the _make_player defaults."""
+    from app.models.player import Player
+
+    fields = _make_player(**overrides)
+    fields.pop("champions")
+    for key in ("last_riot_sync", "created_at", "updated_at"):
+        fields[key] = datetime.fromisoformat(fields[key])
+    return Player(**{**fields, "id": uuid.UUID(fields["id"]), "champions": []})
+
+
+def _team_model(**overrides):
+    """Build a transient Team ORM instance (with an empty roster) from the _make_team defaults."""
+    from app.models.team import Team
+
+    fields = _make_team(**overrides)
+    fields.pop("members")
+    for key in ("created_at", "updated_at"):
+        fields[key] = datetime.fromisoformat(fields[key])
+    return Team(**{**fields, "id": uuid.UUID(fields["id"]), "members": []})
+
+
+def _apply_defaults_on_flush(session):
+    """Make a mock session's flush/commit fill Python-side column defaults (ids, timestamps) like a real flush."""
+    from sqlalchemy import inspect
+
+    def _fill(obj):
+        mapper = inspect(obj).mapper
+        for column in mapper.columns:
+            if getattr(obj, column.key) is None and column.default is not None:
+                default = column.default
+                setattr(obj, column.key, default.arg(None) if default.is_callable else default.arg)
+        for rel in mapper.relationships:
+            if rel.uselist and rel.key in obj.__dict__:
+                for child in obj.__dict__[rel.key]:
+                    _fill(child)
+
+    async def _flush():
+        for call in session.add.call_args_list:
+            _fill(call.args[0])
+
+    session.flush.side_effect = _flush
+    session.commit.side_effect = _flush
+
+
 @pytest.fixture
 def mock_db():
     session = AsyncMock()
@@ -101,6 +199,7 @@ def mock_db():
     session.refresh = AsyncMock()
     session.delete = AsyncMock()
     session.add = MagicMock()
+    session.add_all = MagicMock()
     return session
 
 
@@ -118,13 +217,123 @@ def mock_riot_client():
 
 @pytest.fixture
 async def app_client(mock_db):
-    from app.database import get_db
+    from app.database import get_db, get_read_db
     from app.main import app
 
     async def _override_get_db():
         yield mock_db
 
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+class QueryCounter:
+    """Record the SQL statements an engine executes and the time spent executing them."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+        self.elapsed = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def db_ms(self) -> float:
+        return self.elapsed * 1000
+
+    def reset(self) -> None:
+        self.statements.clear()
+        self.elapsed = 0.0
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        self.elapsed += time.perf_counter() - conn.info["query_started"].pop()
+        self.statements.append(statement)
+
+    @contextmanager
+    def attach(self, engine):
+        """Count statements executed on ``engine`` while the block runs."""
+        target = engine.sync_engine
+        event.listen(target, "before_cursor_execute", self._before)
+        event.listen(target, "after_cursor_execute", self._after)
+        try:
+            yield self
+        finally:
+            event.remove(target, "before_cursor_execute", self._before)
+            event.remove(target, "after_cursor_execute", self._after)
+
+    def report(self) -> str:
+        return f"{self.count} statements, {self.db_ms:.1f} ms:\n" + "\n".join(self.statements)
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN <statement>``, compiled with the statement's own bind parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement, *, analyze: bool = False) -> None:
+        self.statement = statement
+        self.analyze = analyze
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    prefix = "EXPLAIN (ANALYZE, BUFFERS) " if element.analyze else "EXPLAIN "
+    return prefix + compiler.process(element.statement, **kw)
+
+
+async def explain(engine, statement, *, seqscan: bool = False, analyze: bool = False) -> str:
+    """Return the PostgreSQL plan for a statement; sequential scans are disabled by default.
+
+    Test tables are tiny, so the planner would always pick a sequential scan; turning it off
+    shows whether an index *can* serve the query. With ``analyze`` the statement is executed
+    and the plan carries actual timings and buffer counts.
+    """
+    async with engine.connect() as conn:
+        if not seqscan:
+            await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        result = await conn.execute(_Explain(statement, analyze=analyze))
+        return "\n".join(row[0] for row in result)
+
+
+@pytest.fixture
+async def pg_engine():
+    """Engine on a freshly created PostgreSQL schema (requires TEST_DATABASE_URL)."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+    from app.models import Base
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def pg_client(pg_engine):
+    """App client whose sessions run against the PostgreSQL test database."""
+    from app.database import get_db, get_read_db
+    from app.main import app
+
+    session_factory = async_sessionmaker(pg_engine, expire_on_commit=False)
+
+    async def _override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
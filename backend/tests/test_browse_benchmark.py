@@ -0,0 +1,279 @@
+"""Browse-query benchmark on a synthetic 100k-player dataset (requires TEST_DATABASE_URL).
+
+Every query the bot's browse commands issue is run through EXPLAIN (ANALYZE, BUFFERS) with the
+planner left free to pick a sequential scan, and must be served by one of the partial browse indexes.
+"""
+
+import re
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from app.models import Player, Scrim, Team, TeamMember
+from app.routers.players import _browse_players_query
+from app.routers.scrims import _browse_scrims_query
+from app.routers.teams import _browse_teams_query
+from app.services.name_search import player_search_query, team_search_query
+from app.services.recommendations import recommended_players_query, recommended_teams_query
+from app.services.scrim_archive import archive_batch
+from app.services.scrim_matching import matches_query, new_pairs_query
+from app.services.team_stats import team_stats_update
+from tests.conftest import TEST_DATABASE_URL, _player_model, _team_model, explain
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+PLAYER_COUNT = 100_000
+TEAM_COUNT = 10_000
+SCRIM_COUNT = 20_000
+MAX_EXECUTION_MS = 50.0
+MAX_MATCHING_MS = 100.0
+MAX_RECOMMENDATION_MS = 100.0
+MAX_ARCHIVE_BATCH_MS = 250.0
+
+_SEED_SQL = [
+    f"""
+    INSERT INTO players (
+        id, riot_puuid, riot_game_name, riot_tag_line, slug, primary_role, secondary_role,
+        rank_solo_tier, is_lft, activities, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(), 'bench-' || g, 'Bench' || g, 'EUW', 'bench-' || g,
+        (ARRAY['TOP', 'JUNGLE', 'MIDDLE', 'BOTTOM', 'UTILITY'])[1 + g % 5],
+        (ARRAY['TOP', 'JUNGLE', 'MIDDLE', 'BOTTOM', 'UTILITY'])[1 + (g / 5) % 5],
+        (ARRAY['IRON', 'BRONZE', 'SILVER', 'GOLD', 'PLATINUM', 'EMERALD', 'DIAMOND',
+               'MASTER', 'GRANDMASTER', 'CHALLENGER', NULL])[1 + (g * 7) % 11],
+        g % 3 = 0,
+        ARRAY['SCRIMS'],
+        now() - g * interval '1 minute', now() - g * interval '1 minute'
+    FROM generate_series(1, {PLAYER_COUNT}) AS g
+    """,
+    f"""
+    INSERT INTO teams (
+        id, name, slug, captain_discord_id, wanted_roles, min_rank, max_rank, is_lfp, activities,
+        created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(), 'Bench ' || g, 'bench-' || g, 'bench-' || g,
+        ARRAY[(ARRAY['TOP', 'JUNGLE', 'MIDDLE', 'BOTTOM', 'UTILITY'])[1 + g % 5]],
+        (ARRAY['IRON', 'SILVER', 'PLATINUM', 'DIAMOND', NULL])[1 + g % 5],
+        (ARRAY['GOLD', 'EMERALD', 'MASTER', 'CHALLENGER', NULL])[1 + g % 5],
+        g % 4 = 0,
+        ARRAY['SCRIMS'],
+        now() - g * interval '1 minute', now() - g * interval '1 minute'
+    FROM generate_series(1, {TEAM_COUNT}) AS g
+    """,
+    f"""
+    INSERT INTO team_members (id, team_id, player_id, role)
+    SELECT gen_random_uuid(), t.id, p.id, p.primary_role
+    FROM generate_series(1, {TEAM_COUNT * 5}) AS g
+    JOIN players p ON p.slug = 'bench-' || g
+    JOIN teams t ON t.slug = 'bench-' || (1 + g % {TEAM_COUNT})
+    """,
+    f"""
+    INSERT INTO scrims (
+        id, team_id, captain_discord_id, min_rank, max_rank, scheduled_at, format, game_count,
+        fearless, is_active, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(), t.id, t.captain_discord_id, t.min_rank, t.max_rank,
+        now() + (g % 2000 - 1000) * interval '1 hour',
+        (ARRAY['BO1', 'BO3', 'BO5'])[1 + g % 3], NULL, false,
+        g % 10 = 0,
+        now(), now()
+    FROM generate_series(1, {SCRIM_COUNT}) AS g
+    JOIN teams t ON t.slug = 'bench-' || (1 + g % {TEAM_COUNT})
+    """,
+]
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def bench_engine():
+    """Engine on a PostgreSQL schema seeded once with the synthetic browse dataset."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+    from app.models import Base
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        for sql in _SEED_SQL:
+            await conn.execute(text(sql))
+        await conn.execute(team_stats_update())
+    # VACUUM sets the visibility map so counts can run as index-only scans; it cannot run in a transaction.
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in (Player.__tablename__, Team.__tablename__, TeamMember.__tablename__, Scrim.__tablename__):
+            await conn.execute(text(f"VACUUM ANALYZE {table}"))
+    yield engine
+    await engine.dispose()
+
+
+async def _analyze(engine, statement) -> tuple[str, float]:
+    plan = await explain(engine, statement, seqscan=True, analyze=True)
+    execution_ms = float(re.search(r"Execution Time: ([\d.]+) ms", plan).group(1))
+    return plan, execution_ms
+
+
+class TestPlayerBrowse:
+    async def test_first_page_walks_browse_index(self, bench_engine):
+        stmt, _ = _browse_players_query(is_lft=True)
+        plan, ms = await _analyze(bench_engine, stmt.order_by(Player.updated_at.desc()).limit(20))
+        assert "idx_players_lft_browse" in plan
+        assert "Seq Scan" not in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+    async def test_count_is_index_only(self, bench_engine):
+        _, count_stmt = _browse_players_query(is_lft=True)
+        plan, ms = await _analyze(bench_engine, count_stmt)
+        assert "Index Only Scan using idx_players_lft_browse" in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+    async def test_role_and_rank_range_use_composite_indexes(self, bench_engine):
+        _, count_stmt = _browse_players_query(is_lft=True, role="jungle", min_rank="GOLD", max_rank="DIAMOND")
+        plan, ms = await _analyze(bench_engine, count_stmt)
+        assert "idx_players_lft_primary_rank" in plan
+        assert "idx_players_lft_secondary_rank" in plan
+        assert "Seq Scan" not in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+    async def test_filtered_page_avoids_seq_scan(self, bench_engine):
+        stmt, _ = _browse_players_query(is_lft=True, role="MIDDLE", min_rank="EMERALD")
+        plan, ms = await _analyze(bench_engine, stmt.order_by(Player.updated_at.desc()).limit(20))
+        assert "Seq Scan" not in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+
+class TestTeamBrowse:
+    async def test_first_page_walks_browse_index(self, bench_engine):
+        stmt, _ = _browse_teams_query(is_lfp=True, min_rank="GOLD", max_rank="MASTER")
+        plan, ms = await _analyze(bench_engine, stmt.order_by(Team.updated_at.desc()).limit(20))
+        assert "idx_teams_lfp_browse" in plan
+        assert "Seq Scan" not in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+    async def test_count_is_index_only(self, bench_engine):
+        _, count_stmt = _browse_teams_query(is_lfp=True, min_rank="GOLD")
+        plan, ms = await _analyze(bench_engine, count_stmt)
+        assert "Index Only Scan using idx_teams_lfp_browse" in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+    async def test_roster_filters_use_roster_index(self, bench_engine):
+        _, count_stmt = _browse_teams_query(roster_min_rank="EMERALD", roster_max_rank="EMERALD", open_role="JUNGLE")
+        plan, ms = await _analyze(bench_engine, count_stmt)
+        assert "Index Only Scan using idx_teams_roster_rank" in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+
+class TestScrimBrowse:
+    async def test_upcoming_page_uses_partial_index(self, bench_engine):
+        stmt, _ = _browse_scrims_query(datetime.now(UTC))
+        plan, ms = await _analyze(bench_engine, stmt.order_by(Scrim.scheduled_at.asc()).limit(20))
+        assert "idx_scrims_active_upcoming" in plan
+        assert "Seq Scan" not in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+    async def test_format_filter_uses_format_index(self, bench_engine):
+        _, count_stmt = _browse_scrims_query(datetime.now(UTC), format="bo3")
+        plan, ms = await _analyze(bench_engine, count_stmt)
+        assert "idx_scrims_active_format" in plan
+        assert "Seq Scan" not in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+    async def test_multi_day_evening_window_uses_slot_index(self, bench_engine):
+        now = datetime.now(UTC)
+        saturday = now.date() + timedelta(days=(5 - now.weekday()) % 7)
+        stmt, count_stmt = _browse_scrims_query(
+            now, date_from=saturday.isoformat(), date_to=(saturday + timedelta(days=1)).isoformat(),
+            hour_min=19, hour_max=23,
+        )
+        for statement in (stmt.order_by(Scrim.scheduled_at.asc()).limit(20), count_stmt):
+            plan, ms = await _analyze(bench_engine, statement)
+            assert "idx_scrims_active_paris_slot" in plan
+            assert "Seq Scan" not in plan
+            assert ms < MAX_EXECUTION_MS, plan
+
+
+class TestScrimRosterFilters:
+    async def test_roster_filters_avoid_loading_rosters(self, bench_engine):
+        _, count_stmt = _browse_scrims_query(datetime.now(UTC), roster_min_rank="EMERALD", open_role="JUNGLE")
+        plan, ms = await _analyze(bench_engine, count_stmt)
+        assert "team_members" not in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+
+class TestScrimMatching:
+    async def test_matches_for_one_scrim(self, bench_engine):
+        now = datetime.now(UTC)
+        async with async_sessionmaker(bench_engine)() as db:
+            result = await db.execute(
+                select(Scrim)
+                .options(selectinload(Scrim.team).selectinload(Team.members).selectinload(TeamMember.player))
+                .where(Scrim.is_active.is_(True), Scrim.scheduled_at >= now)
+                .order_by(Scrim.scheduled_at)
+                .limit(1)
+            )
+            scrim = result.scalar_one()
+
+        plan, ms = await _analyze(bench_engine, matches_query(scrim, scrim.team.roster_rank_avg, now=now).limit(10))
+        assert "Seq Scan on scrims" not in plan
+        assert ms < MAX_MATCHING_MS, plan
+
+    async def test_new_pairs_over_all_open_scrims(self, bench_engine):
+        plan, ms = await _analyze(bench_engine, new_pairs_query(now=datetime.now(UTC)))
+        assert ms < MAX_MATCHING_MS, plan
+
+
+class TestScrimArchive:
+    async def test_team_open_scrims_use_partial_index(self, bench_engine):
+        async with async_sessionmaker(bench_engine)() as db:
+            team_id = (await db.execute(select(Scrim.team_id).limit(1))).scalar_one()
+        plan, ms = await _analyze(
+            bench_engine, select(Scrim).where(Scrim.team_id == team_id, Scrim.is_active.is_(True)),
+        )
+        assert "idx_scrims_active_team" in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+    async def test_archive_batch_walks_schedule_index(self, bench_engine):
+        # explain() never commits, so the analyzed batch is rolled back and the dataset stays intact.
+        plan, ms = await _analyze(bench_engine, archive_batch(datetime.now(UTC)))
+        assert "idx_scrims_scheduled" in plan
+        assert "Seq Scan on scrims" not in plan
+        assert ms < MAX_ARCHIVE_BATCH_MS, plan
+
+
+class TestNameSearch:
+    async def test_player_prefix_uses_trigram_index(self, bench_engine):
+        plan, ms = await _analyze(bench_engine, player_search_query("bench4242"))
+        assert "idx_players_search_name_trgm" in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+    async def test_player_typo_uses_trigram_index(self, bench_engine):
+        plan, ms = await _analyze(bench_engine, player_search_query("bnch4242#euw"))
+        assert "idx_players_search_name_trgm" in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+    async def test_team_search_uses_partial_trigram_index(self, bench_engine):
+        plan, ms = await _analyze(bench_engine, team_search_query("bench 424"))
+        assert "idx_teams_search_name_trgm" in plan
+        assert ms < MAX_EXECUTION_MS, plan
+
+
+class TestRecommendations:
+    async def test_players_scored_from_browse_index(self, bench_engine):
+        team = _team_model(wanted_roles=["JUNGLE"], min_rank="GOLD", max_rank="DIAMOND", activities=["SCRIMS"])
+        plan, ms = await _analyze(bench_engine, recommended_players_query(team, limit=10))
+        assert "Index Only Scan using idx_players_lft_browse" in plan
+        assert "Seq Scan on players" not in plan
+        assert ms < MAX_RECOMMENDATION_MS, plan
+
+    async def test_teams_scored_from_browse_index(self, bench_engine):
+        player = _player_model(primary_role="MIDDLE", rank_solo_tier="EMERALD")
+        plan, ms = await _analyze(bench_engine, recommended_teams_query(player, limit=10))
+        assert "Index Only Scan using idx_teams_lfp_browse" in plan
+        assert "Seq Scan on teams" not in plan
+        assert ms < MAX_RECOMMENDATION_MS, plan
@@ -0,0 +1,271 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.database import (
+    DISCORD_USER_HEADER,
+    MeteredQueuePool,
+    _primary_pins,
+    create_engine,
+    get_db,
+    get_read_db,
+    is_pinned,
+    pin_to_primary,
+    pool_stats,
+)
+from app.services.sync import sync_active_ranks
+from app.services.token_store import create_token
+from tests.conftest import TEST_DATABASE_URL, _player_model
+
+
+@pytest.fixture
+async def small_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'load.db'}", pool_size=4, max_overflow=2, pool_timeout=2,
+    )
+    yield engine
+    await engine.dispose()
+
+
+class TestPoolConfiguration:
+    def test_engine_uses_metered_pool(self, small_engine):
+        assert isinstance(small_engine.pool, MeteredQueuePool)
+        assert small_engine.pool.size() == 4
+        assert small_engine.pool._pre_ping is True
+
+    async def test_stats_track_checkouts(self, small_engine):
+        async with small_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert pool_stats(small_engine)["checked_out"] == 1
+        stats = pool_stats(small_engine)
+        assert stats["checked_out"] == 0
+        assert stats["peak_checked_out"] == 1
+        assert stats["avg_wait_ms"] is not None
+
+
+async def _seed_players(engine, count):
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        db.add_all([
+            _player_model(
+                slug=f"Load{i}-EUW", riot_puuid=f"load-puuid-{i}", riot_game_name=f"Load{i}",
+                discord_user_id=str(1000 + i), rank_solo_tier="SILVER",
+                last_riot_sync=(datetime.now(UTC) - timedelta(hours=7 if i == 0 else 1)).isoformat(),
+            )
+            for i in range(count)
+        ])
+        await db.commit()
+
+
+def _riot_client(on_call=None):
+    """Riot client mock with a little API latency on each call."""
+
+    async def summoner(puuid):
+        if on_call:
+            on_call()
+        await asyncio.sleep(0.02)
+        return {"summonerLevel": 100}
+
+    client = AsyncMock()
+    client.get_summoner_by_puuid.side_effect = summoner
+    client.get_league_entries.return_value = [
+        {"queueType": "RANKED_SOLO_5x5", "tier": "GOLD", "rank": "I", "leaguePoints": 10, "wins": 1, "losses": 1},
+    ]
+    return client
+
+
+@pytest.fixture
+async def metered_app(pg_engine):
+    """The app, its rank sync and a client on a small metered pool (4 + 2) over the PostgreSQL test database."""
+    from app.main import app, rate_limiters
+
+    engine = create_engine(TEST_DATABASE_URL, pool_size=4, max_overflow=2, pool_timeout=2)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def _session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _session
+    app.dependency_overrides[get_read_db] = _session
+    for limiter in rate_limiters.values():
+        limiter.clear()
+    with (
+        patch("app.services.sync.async_session", session_factory),
+        patch("app.routers.players.schedule_og_render"),
+    ):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            yield app, engine, client
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+class TestPoolLoad:
+    async def test_mixed_bot_web_sync_load_does_not_exhaust_pool(self, pg_engine, metered_app):
+        app, engine, client = metered_app
+        await _seed_players(pg_engine, 20)
+        bot = {"X-Bot-Secret": settings.bot_api_secret}
+
+        jobs = [client.get("/api/players") for _ in range(100)]
+        jobs += [client.get("/api/teams") for _ in range(50)]
+        jobs += [client.get(f"/api/players/Load{i % 20}-EUW") for i in range(50)]
+        jobs += [client.get(f"/api/players/by-discord/{1000 + i % 20}", headers=bot) for i in range(100)]
+        with patch.object(app.state, "riot_client", _riot_client(), create=True):
+            *responses, synced = await asyncio.gather(*jobs, sync_active_ranks(_riot_client()))
+
+        assert {resp.status_code for resp in responses} == {200}
+        assert synced == 20
+        stats = pool_stats(engine)
+        assert stats["timeouts"] == 0
+        assert stats["peak_checked_out"] <= 6
+        assert stats["checked_out"] == 0
+        assert stats["overflow"] == 0
+
+    async def test_lazy_refresh_holds_no_connection_during_riot_call(self, pg_engine, metered_app):
+        app, engine, client = metered_app
+        await _seed_players(pg_engine, 1)
+        checked_out = []
+        riot_client = _riot_client(on_call=lambda: checked_out.append(pool_stats(engine)["checked_out"]))
+
+        with patch.object(app.state, "riot_client", riot_client, create=True):
+            resp = await client.get("/api/players/Load0-EUW")
+
+        assert resp.status_code == 200
+        assert checked_out == [0]
+        assert (await client.get("/api/players/Load0-EUW")).json()["rank_solo_tier"] == "GOLD"
+
+    async def test_pool_timeouts_are_counted(self, tmp_path):
+        engine = create_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'held.db'}", pool_size=2, max_overflow=0, pool_timeout=0.1,
+        )
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def hold_connection():
+            async with session_factory() as db:
+                await db.execute(text("SELECT 1"))
+                await asyncio.sleep(0.3)
+
+        results = await asyncio.gather(*[hold_connection() for _ in range(6)], return_exceptions=True)
+        assert any(isinstance(r, PoolTimeoutError) for r in results)
+        assert pool_stats(engine)["timeouts"] > 0
+        await engine.dispose()
+
+
+def _factory(name):
+    @asynccontextmanager
+    async def session():
+        yield name
+
+    return session
+
+
+@pytest.fixture
+def routing_client():
+    app = FastAPI()
+
+    @app.get("/read")
+    async def read(db=Depends(get_read_db)):
+        return {"db": db}
+
+    @app.post("/write")
+    async def write(db=Depends(get_db)):
+        return {"db": db}
+
+    with (
+        patch("app.database.async_session", _factory("primary")),
+        patch("app.database.async_read_session", _factory("replica")),
+        patch("app.database.read_engine", MagicMock()),
+    ):
+        yield AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+def _bot_client(client, secret="test-bot-secret"):
+    """One shared client (and cookie jar) for every Discord user, like the bot's aiohttp session."""
+    client.headers["X-Bot-Secret"] = secret
+    return client
+
+
+def _token(user):
+    return create_token(action="edit", discord_user_id=user, discord_username="user").token
+
+
+def _as(user):
+    return {DISCORD_USER_HEADER: user}
+
+
+class TestReadRouting:
+    @pytest.fixture(autouse=True)
+    def _clean(self):
+        _primary_pins.clear()
+        with patch("app.database.settings.bot_api_secret", "test-bot-secret"):
+            yield
+        _primary_pins.clear()
+
+    async def test_reads_go_to_replica(self, routing_client):
+        async with routing_client as client:
+            assert (await client.get("/read")).json() == {"db": "replica"}
+
+    async def test_write_pins_only_its_user(self, routing_client):
+        async with _bot_client(routing_client) as client:
+            assert (await client.post("/write", headers=_as("111"))).json() == {"db": "primary"}
+            assert (await client.get("/read", headers=_as("111"))).json() == {"db": "primary"}
+            assert (await client.get("/read", headers=_as("222"))).json() == {"db": "replica"}
+            assert (await client.get("/read")).json() == {"db": "replica"}
+            assert not client.cookies
+
+    async def test_pin_expires(self, routing_client):
+        async with _bot_client(routing_client) as client:
+            with patch("app.database.settings.read_your_writes_window", 0):
+                await client.post("/write", headers=_as("111"))
+            assert (await client.get("/read", headers=_as("111"))).json() == {"db": "replica"}
+
+    async def test_user_header_needs_bot_secret(self, routing_client):
+        async with _bot_client(routing_client, secret="wrong") as client:
+            await client.post("/write", headers=_as("111"))
+            assert (await client.get("/read", headers=_as("111"))).json() == {"db": "replica"}
+        assert not _primary_pins
+
+    async def test_token_subject_is_pinned(self, routing_client):
+        token = _token("111")
+        async with routing_client as client:
+            await client.post(f"/write?token={token}")
+            assert (await client.get("/read", headers=_as("111"))).json() == {"db": "replica"}
+            assert (await client.get(f"/read?token={_token('111')}")).json() == {"db": "primary"}
+        assert set(_primary_pins) == {"111"}
+
+    async def test_no_pin_without_replica(self, routing_client):
+        with patch("app.database.read_engine", None), patch("app.database.engine", None):
+            async with _bot_client(routing_client) as client:
+                await client.post("/write", headers=_as("111"))
+        assert not _primary_pins
+
+    async def test_multi_worker_backends_read_from_primary(self, routing_client):
+        with patch("app.database.settings.rate_limit_backend", "shm"):
+            async with _bot_client(routing_client) as client:
+                await client.post("/write", headers=_as("111"))
+                assert (await client.get("/read", headers=_as("222"))).json() == {"db": "primary"}
+                assert (await client.get("/read")).json() == {"db": "primary"}
+        assert not _primary_pins
+
+    def test_cap_evicts_oldest_pins(self):
+        with patch("app.database.MAX_PINS", 3):
+            for i, user in enumerate(["1", "2", "3", "1", "4"]):
+                pin_to_primary(user, now=float(i))
+        assert list(_primary_pins) == ["3", "1", "4"]
+        assert not is_pinned("2", now=4.0)
+        assert is_pinned("4", now=4.0)
+
+    def test_expired_pins_are_dropped_on_pin(self):
+        with patch("app.database.settings.read_your_writes_window", 1):
+            pin_to_primary("1", now=0.0)
+            pin_to_primary("2", now=5.0)
+        assert list(_primary_pins) == ["2"]
@@ -0,0 +1,98 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import ChangeEvent
+from app.services.events import EventBroker, format_sse, publish_event, publish_events, stream_events
+
+
+class TestPublish:
+    async def test_one_notify_for_a_batch_without_a_lock(self):
+        db = AsyncMock()
+        db.add_all = MagicMock()
+        await publish_events(db, [("scrim.cancelled", {"id": "a"}), ("scrim.posted", {"id": "b"})])
+        assert db.execute.await_count == 1
+        sql = str(db.execute.call_args.args[0])
+        assert "pg_notify" in sql and "lock" not in sql
+        assert [e.kind for e in db.add_all.call_args.args[0]] == ["scrim.cancelled", "scrim.posted"]
+
+    async def test_nothing_to_publish(self):
+        db = AsyncMock()
+        await publish_events(db, [])
+        db.execute.assert_not_awaited()
+
+
+class TestFormatSse:
+    def test_frame(self):
+        event = ChangeEvent(id=7, kind="team.created", payload={"slug": "t", "is_lfp": True})
+        assert format_sse(event) == 'id: 7\nevent: team.created\ndata: {"slug":"t","is_lfp":true}\n\n'
+
+
+class TestEventBroker:
+    async def test_notification_wakes_ticket_holders(self):
+        broker = EventBroker()
+        ticket = broker.ticket()
+        broker._notify()
+        assert await broker.wait(ticket, 0.01)
+        assert broker.ticket() is not ticket
+
+    async def test_wait_times_out(self):
+        assert not await EventBroker().wait(asyncio.Event(), 0.01)
+
+
+class TestStreamOnPostgres:
+    async def _publish(self, engine, kind, **payload):
+        async with async_sessionmaker(engine)() as db:
+            await publish_event(db, kind, **payload)
+            await db.commit()
+
+    async def test_replays_after_cursor_then_waits(self, pg_engine):
+        await self._publish(pg_engine, "player.lft_on", slug="a")
+        await self._publish(pg_engine, "player.lft_on", slug="b")
+        stream = stream_events(async_sessionmaker(pg_engine), EventBroker(), after=0)
+
+        assert await anext(stream) == "id: 0\nevent: ready\ndata: {}\n\n"
+        first, second = await anext(stream), await anext(stream)
+        assert first.startswith("id: ") and '"slug":"a"' in first
+        assert '"slug":"b"' in second
+        await stream.aclose()
+
+        cursor = int(first.split("\n", 1)[0].removeprefix("id: "))
+        resumed = stream_events(async_sessionmaker(pg_engine), EventBroker(), after=cursor)
+        assert await anext(resumed) == f"id: {cursor}\nevent: ready\ndata: {{}}\n\n"
+        assert '"slug":"b"' in await anext(resumed)
+        await resumed.aclose()
+
+    async def test_waits_for_a_transaction_that_published_first_and_commits_last(self, pg_engine):
+        broker = EventBroker()
+        async with async_sessionmaker(pg_engine)() as slow:
+            await publish_event(slow, "player.lft_on", slug="slow")
+            await slow.flush()
+            await self._publish(pg_engine, "player.lft_on", slug="fast")
+
+            stream = stream_events(async_sessionmaker(pg_engine), broker, after=0)
+            assert "event: ready" in await anext(stream)
+            pending = asyncio.ensure_future(anext(stream))
+            await asyncio.sleep(0.1)
+            assert not pending.done()
+            await slow.commit()
+        broker._notify()
+
+        assert '"slug":"slow"' in await asyncio.wait_for(pending, 5)
+        assert '"slug":"fast"' in await anext(stream)
+        await stream.aclose()
+
+    async def test_new_subscriber_starts_from_now(self, pg_engine):
+        await self._publish(pg_engine, "player.lft_on", slug="old")
+        broker = EventBroker()
+        stream = stream_events(async_sessionmaker(pg_engine), broker, after=None)
+        assert "event: ready" in await anext(stream)
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.1)
+        await self._publish(pg_engine, "player.lft_off", slug="new")
+        broker._notify()
+
+        frame = await asyncio.wait_for(pending, 5)
+        assert "event: player.lft_off" in frame
+        await stream.aclose()
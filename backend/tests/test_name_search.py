@@ -0,0 +1,93 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.services.name_search import player_index_query, player_search_query, team_search_query
+from tests.conftest import _player_model, _team_model
+
+
+def _compiled(stmt):
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return str(compiled), set(compiled.params.values())
+
+
+class TestSearchQueries:
+    def test_prefix_or_word_similarity(self):
+        sql, params = _compiled(player_search_query("  Faker#KR"))
+        assert "WHERE players.search_name LIKE %(search_name_1)s::VARCHAR ESCAPE" in sql
+        assert "OR (players.search_name %%> %(search_name_2)s::VARCHAR)" in sql
+        assert "DESC, word_similarity(" in sql
+        assert {"faker#kr%", "faker#kr"} <= params
+
+    def test_like_wildcards_are_escaped(self):
+        _, params = _compiled(team_search_query("100%_team"))
+        assert "100\\%\\_team%" in params
+
+    def test_index_limited_to_lft(self):
+        sql, _ = _compiled(player_index_query())
+        assert "WHERE players.is_lft IS true" in sql
+
+    def test_teams_limited_to_lfp(self):
+        sql, params = _compiled(team_search_query("bleus", limit=5))
+        assert "teams.is_lfp IS true" in sql
+        assert 5 in params
+
+
+class TestSearchRouter:
+    async def test_players(self, app_client, mock_db):
+        result = MagicMock()
+        result.mappings.return_value.all.return_value = [{
+            "slug": "Faker-KR1", "riot_game_name": "Faker", "riot_tag_line": "KR1",
+            "rank_solo_tier": "CHALLENGER", "primary_role": "MIDDLE", "is_lft": False,
+        }]
+        mock_db.execute = AsyncMock(return_value=result)
+        resp = await app_client.get("/api/search/players", params={"q": "fakr"})
+        assert resp.status_code == 200
+        assert resp.json()["players"][0]["slug"] == "Faker-KR1"
+        assert mock_db.execute.await_count == 1
+
+    async def test_empty_query_rejected(self, app_client):
+        resp = await app_client.get("/api/search/teams", params={"q": ""})
+        assert resp.status_code == 422
+
+    async def test_index_lists_active_names(self, app_client, mock_db):
+        players, teams = MagicMock(), MagicMock()
+        players.mappings.return_value.all.return_value = [{
+            "slug": "Caps-EUW", "riot_game_name": "Caps", "riot_tag_line": "EUW",
+            "rank_solo_tier": None, "primary_role": None, "is_lft": True,
+        }]
+        teams.mappings.return_value.all.return_value = [{"slug": "les-bleus", "name": "Les Bleus"}]
+        mock_db.execute = AsyncMock(side_effect=[players, teams])
+        resp = await app_client.get("/api/search/index", headers={"X-Bot-Secret": settings.bot_api_secret})
+        assert resp.status_code == 200
+        assert resp.json()["players"][0]["slug"] == "Caps-EUW"
+        assert resp.json()["teams"] == [{"slug": "les-bleus", "name": "Les Bleus"}]
+
+    async def test_index_requires_bot_secret(self, app_client):
+        resp = await app_client.get("/api/search/index", headers={"X-Bot-Secret": "wrong"})
+        assert resp.status_code == 403
+
+
+class TestSearchOnPostgres:
+    async def test_prefix_and_typo_tolerance(self, pg_engine):
+        session_factory = async_sessionmaker(pg_engine, expire_on_commit=False)
+        async with session_factory() as db:
+            db.add_all([
+                _player_model(slug="Faker-KR1", riot_puuid="p1", riot_game_name="Faker", riot_tag_line="KR1", discord_user_id="1"),
+                _player_model(slug="Fakeout-EUW", riot_puuid="p2", riot_game_name="Fakeout", riot_tag_line="EUW", discord_user_id="2"),
+                _player_model(slug="Caps-EUW", riot_puuid="p3", riot_game_name="Caps", riot_tag_line="EUW", discord_user_id="3"),
+                _team_model(slug="les-bleus", name="Les Bleus", captain_discord_id="1"),
+                _team_model(slug="bleu-ciel", name="Bleu Ciel", captain_discord_id="2", is_lfp=False),
+            ])
+            await db.commit()
+
+            prefix = (await db.execute(player_search_query("fake"))).all()
+            typo = (await db.execute(player_search_query("fakr"))).all()
+            teams = (await db.execute(team_search_query("bleu"))).all()
+
+        assert [row.slug for row in prefix] == ["Faker-KR1", "Fakeout-EUW"]
+        assert "Faker-KR1" in {row.slug for row in typo}
+        assert "Caps-EUW" not in {row.slug for row in typo}
+        assert [row.slug for row in teams] == ["les-bleus"]
@@ -0,0 +1,111 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+from PIL import Image
+
+from app.services.og_assets import AssetManager, IconLRU
+
+
+def _png(path, size=64, color=(255, 0, 0, 255)):
+    Image.new("RGBA", (size, size), color).save(path, format="PNG")
+
+
+class TestIconLRU:
+    def test_evicts_least_recently_used(self):
+        lru = IconLRU(max_entries=2)
+        img = Image.new("RGBA", (1, 1))
+        lru.put(("a", None), img)
+        lru.put(("b", None), img)
+        lru.get(("a", None))
+        lru.put(("c", None), img)
+        assert ("a", None) in lru
+        assert ("b", None) not in lru
+        assert len(lru) == 2
+
+    def test_filenames(self):
+        lru = IconLRU()
+        img = Image.new("RGBA", (1, 1))
+        lru.put(("rank_gold.png", None), img)
+        lru.put(("rank_gold.png", 70), img)
+        assert lru.filenames() == {"rank_gold.png"}
+
+
+class TestAssetPack:
+    async def test_loads_pack_without_network(self, tmp_path):
+        _png(tmp_path / "rank_gold.png")
+        _png(tmp_path / "champ_Ahri.png")
+        (tmp_path / "manifest.json").write_text(json.dumps({"ddragon_version": "14.1.1"}))
+
+        manager = AssetManager(icon_dir=tmp_path / "cache")
+        manager._download = AsyncMock(return_value=None)
+        assert manager.load_asset_pack(tmp_path) == 2
+        assert manager.ddragon_version == "14.1.1"
+
+        rank = await manager.rank_icon("GOLD", 40)
+        champ = await manager.champion_icon("Ahri", 110)
+        assert rank.size == (40, 40)
+        assert champ.size == (110, 110)
+        manager._download.assert_not_awaited()
+
+    def test_champions_skipped_without_manifest(self, tmp_path):
+        _png(tmp_path / "champ_Ahri.png")
+        manager = AssetManager(icon_dir=tmp_path / "cache")
+        assert manager.load_asset_pack(tmp_path) == 0
+        assert manager.ddragon_version is None
+
+
+class TestIconLoading:
+    async def test_resized_icon_is_reused(self, tmp_path):
+        manager = AssetManager(icon_dir=tmp_path)
+        _png(tmp_path / "role_top.png")
+        first = await manager.role_icon("TOP", 28)
+        second = await manager.role_icon("TOP", 28)
+        assert first is second
+
+    async def test_concurrent_misses_share_one_download(self, tmp_path):
+        manager = AssetManager(icon_dir=tmp_path)
+        src = tmp_path / "src.png"
+        _png(src)
+        data = src.read_bytes()
+
+        async def slow_download(url):
+            await asyncio.sleep(0.01)
+            return data
+
+        manager._download = AsyncMock(side_effect=slow_download)
+        icons = await asyncio.gather(*[manager.rank_icon("DIAMOND") for _ in range(5)])
+        assert manager._download.await_count == 1
+        assert all(icon is not None for icon in icons)
+        assert (tmp_path / "rank_diamond.png").exists()
+
+    async def test_failed_download_returns_none(self, tmp_path):
+        manager = AssetManager(icon_dir=tmp_path)
+        manager._download = AsyncMock(return_value=None)
+        assert await manager.rank_icon("IRON", 40) is None
+
+
+class TestVersionRefresh:
+    async def test_swaps_champion_cache_on_new_version(self, tmp_path):
+        _png(tmp_path / "champ_Ahri.png", color=(255, 0, 0, 255))
+        (tmp_path / "manifest.json").write_text(json.dumps({"ddragon_version": "14.1.1"}))
+        manager = AssetManager(icon_dir=tmp_path / "cache")
+        manager.load_asset_pack(tmp_path)
+
+        new_src = tmp_path / "new.png"
+        _png(new_src, color=(0, 255, 0, 255))
+        manager._fetch_latest_version = AsyncMock(return_value="14.2.1")
+        manager._download = AsyncMock(return_value=new_src.read_bytes())
+
+        assert await manager.refresh_ddragon_version() is True
+        assert manager.ddragon_version == "14.2.1"
+        icon = await manager.champion_icon("Ahri")
+        assert icon.getpixel((0, 0)) == (0, 255, 0, 255)
+        assert "14.2.1" in manager._download.await_args.args[0]
+
+    async def test_same_version_is_noop(self, tmp_path):
+        (tmp_path / "manifest.json").write_text(json.dumps({"ddragon_version": "14.1.1"}))
+        manager = AssetManager(icon_dir=tmp_path / "cache")
+        manager.load_asset_pack(tmp_path)
+        manager._fetch_latest_version = AsyncMock(return_value="14.1.1")
+        assert await manager.refresh_ddragon_version() is False
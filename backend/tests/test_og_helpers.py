@@ -1,6 +1,7 @@
 import time
 
-from app.routers.og import CACHE_MAX_SIZE, CACHE_TTL, _evict_cache, _is_crawler, _og_cache, _theme_color
+from app.routers.og import _is_crawler, _theme_color
+from app.services.og_cache import CACHE_MAX_SIZE, CACHE_TTL, evict_og_cache, og_cache
 
 
 class TestIsCrawler:
@@ -54,29 +55,29 @@ class TestThemeColor:
 
 class TestEvictCache:
     def setup_method(self):
-        _og_cache.clear()
+        og_cache.clear()
 
     def teardown_method(self):
-        _og_cache.clear()
+        og_cache.clear()
 
     def test_evicts_expired(self):
-        _og_cache["old"] = (b"data", time.time() - CACHE_TTL - 1)
-        _og_cache["fresh"] = (b"data", time.time())
-        _evict_cache()
-        assert "old" not in _og_cache
-        assert "fresh" in _og_cache
+        og_cache["old"] = (b"data", time.time() - CACHE_TTL - 1)
+        og_cache["fresh"] = (b"data", time.time())
+        evict_og_cache()
+        assert "old" not in og_cache
+        assert "fresh" in og_cache
 
     def test_evicts_by_size(self):
         now = time.time()
         for i in range(CACHE_MAX_SIZE + 10):
-            _og_cache[f"key{i}"] = (b"data", now + i * 0.001)
-        _evict_cache()
-        assert len(_og_cache) <= CACHE_MAX_SIZE
+            og_cache[f"key{i}"] = (b"data", now + i * 0.001)
+        evict_og_cache()
+        assert len(og_cache) <= CACHE_MAX_SIZE
 
     def test_keeps_fresh_entries(self):
         now = time.time()
-        _og_cache["a"] = (b"data", now)
-        _og_cache["b"] = (b"data", now + 1)
-        _evict_cache()
-        assert "a" in _og_cache
-        assert "b" in _og_cache
+        og_cache["a"] = (b"data", now)
+        og_cache["b"] = (b"data", now + 1)
+        evict_og_cache()
+        assert "a" in og_cache
+        assert "b" in og_cache
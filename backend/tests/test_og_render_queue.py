@@ -0,0 +1,68 @@
+from unittest.mock import AsyncMock
+
+from app.services.og_render_queue import OgRenderQueue
+
+
+class TestEnqueue:
+    def test_unknown_kind_ignored(self):
+        queue = OgRenderQueue(coalesce_delay=0)
+        queue.enqueue("player", "Faker-KR1")
+        assert queue.stats()["depth"] == 0
+
+    def test_deduplicates_same_key(self):
+        queue = OgRenderQueue(coalesce_delay=0)
+        queue.register("player", AsyncMock())
+        queue.enqueue("player", "Faker-KR1")
+        queue.enqueue("player", "Faker-KR1")
+        stats = queue.stats()
+        assert stats["depth"] == 1
+        assert stats["coalesced"] == 1
+
+    def test_distinct_kinds_are_separate_jobs(self):
+        queue = OgRenderQueue(coalesce_delay=0)
+        queue.register("player", AsyncMock())
+        queue.register("team", AsyncMock())
+        queue.enqueue("player", "same")
+        queue.enqueue("team", "same")
+        assert queue.stats()["depth"] == 2
+
+    def test_discard_removes_pending(self):
+        queue = OgRenderQueue(coalesce_delay=0)
+        queue.register("team", AsyncMock())
+        queue.enqueue("team", "old-name")
+        queue.discard("team", "old-name")
+        assert queue.stats()["depth"] == 0
+
+
+class TestDrain:
+    async def test_renders_burst_once(self):
+        renderer = AsyncMock()
+        queue = OgRenderQueue(coalesce_delay=0)
+        queue.register("player", renderer)
+        for _ in range(5):
+            queue.enqueue("player", "Faker-KR1")
+        await queue.drain()
+        renderer.assert_awaited_once_with("Faker-KR1")
+        stats = queue.stats()
+        assert stats["depth"] == 0
+        assert stats["rendered"] == 1
+        assert stats["last_render_ms"] is not None
+
+    async def test_not_due_yet_is_kept(self):
+        renderer = AsyncMock()
+        queue = OgRenderQueue(coalesce_delay=60)
+        queue.register("player", renderer)
+        queue.enqueue("player", "Faker-KR1")
+        await queue.drain()
+        renderer.assert_not_awaited()
+        assert queue.stats()["depth"] == 1
+
+    async def test_failure_counted(self):
+        renderer = AsyncMock(side_effect=RuntimeError("boom"))
+        queue = OgRenderQueue(coalesce_delay=0)
+        queue.register("team", renderer)
+        queue.enqueue("team", "test-team")
+        await queue.drain()
+        stats = queue.stats()
+        assert stats["failed"] == 1
+        assert stats["rendered"] == 0
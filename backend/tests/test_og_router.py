@@ -0,0 +1,186 @@
+import time
+import uuid
+from datetime import UTC, datetime
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from PIL import Image
+
+from app.routers.og import MAX_PAGE_TILES
+from app.services.og_cache import html_cache, invalidate_og_cache, tile_cache
+from app.services.og_generator import TILE_H
+
+
+def _tile_png():
+    buf = BytesIO()
+    Image.new("RGB", (800, TILE_H), (1, 2, 3)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _fake_player(slug):
+    player = MagicMock()
+    player.slug = slug
+    player.champions = []
+    return player
+
+
+class TestPlayersPageImage:
+    def setup_method(self):
+        tile_cache.clear()
+
+    def teardown_method(self):
+        tile_cache.clear()
+
+    async def test_renders_missing_tiles_once(self, app_client, mock_db):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [_fake_player("A-EUW"), _fake_player("B-EUW")]
+        mock_db.execute = AsyncMock(return_value=mock_result)
+
+        with patch("app.routers.og.generate_player_tile", new_callable=AsyncMock, return_value=_tile_png()) as gen:
+            resp = await app_client.get("/api/og/players/page.png", params={"slugs": ["A-EUW", "B-EUW"]})
+            assert resp.status_code == 200
+            assert resp.headers["content-type"] == "image/png"
+            assert gen.await_count == 2
+
+            resp = await app_client.get("/api/og/players/page.png", params={"slugs": ["A-EUW", "B-EUW"]})
+            assert resp.status_code == 200
+            assert gen.await_count == 2
+            assert mock_db.execute.await_count == 1
+
+        page = Image.open(BytesIO(resp.content))
+        assert page.height > TILE_H
+
+    async def test_unknown_slugs_return_404(self, app_client, mock_db):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute = AsyncMock(return_value=mock_result)
+
+        resp = await app_client.get("/api/og/players/page.png", params={"slugs": ["nobody-EUW"]})
+        assert resp.status_code == 404
+
+    async def test_too_many_slugs_returns_400(self, app_client, mock_db):
+        slugs = [f"p{i}-EUW" for i in range(MAX_PAGE_TILES + 1)]
+        resp = await app_client.get("/api/og/players/page.png", params={"slugs": slugs})
+        assert resp.status_code == 400
+
+
+class TestTeamsPageImage:
+    def setup_method(self):
+        tile_cache.clear()
+
+    def teardown_method(self):
+        tile_cache.clear()
+
+    async def test_missing_slugs_param_returns_422(self, app_client, mock_db):
+        resp = await app_client.get("/api/og/teams/page.png")
+        assert resp.status_code == 422
+
+    async def test_only_missing_tiles_loaded(self, app_client, mock_db):
+        tile_cache["t:cached-team"] = (_tile_png(), time.time())
+        team = MagicMock()
+        team.slug = "new-team"
+        team.members = []
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [team]
+        mock_db.execute = AsyncMock(return_value=mock_result)
+
+        with patch("app.routers.og.generate_team_tile", new_callable=AsyncMock, return_value=_tile_png()) as gen:
+            resp = await app_client.get("/api/og/teams/page.png", params={"slugs": ["cached-team", "new-team"]})
+        assert resp.status_code == 200
+        gen.assert_awaited_once()
+        assert "t:new-team" in tile_cache
+
+
+CRAWLER = {"user-agent": "Discordbot/2.0"}
+
+
+def _player_row(updated_at):
+    return SimpleNamespace(
+        id=uuid.uuid4(), slug="Alice-EUW", riot_game_name="Alice", riot_tag_line="EUW",
+        rank_solo_tier="GOLD", rank_solo_division="II", rank_solo_wins=10, rank_solo_losses=5,
+        primary_role="MID", activities=["CLASH"], updated_at=updated_at,
+    )
+
+
+def _row_result(row):
+    result = MagicMock()
+    result.one_or_none.return_value = row
+    return result
+
+
+def _champs_result(names):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = names
+    return result
+
+
+class TestCrawlerPages:
+    def setup_method(self):
+        html_cache.clear()
+
+    def teardown_method(self):
+        html_cache.clear()
+
+    async def test_page_is_reused_while_version_unchanged(self, app_client, mock_db):
+        row = _player_row(datetime(2026, 1, 1, 12, 0, tzinfo=UTC))
+        mock_db.execute = AsyncMock(side_effect=[
+            _row_result(row), _champs_result(["Ahri", "Lux"]), _row_result(row),
+        ])
+
+        first = await app_client.get("/p/Alice-EUW", headers=CRAWLER)
+        assert first.status_code == 200
+        assert "Ahri, Lux" in first.text
+        assert first.headers["last-modified"] == "Thu, 01 Jan 2026 12:00:00 GMT"
+
+        second = await app_client.get("/p/Alice-EUW", headers=CRAWLER)
+        assert second.text == first.text
+        assert second.headers["etag"] == first.headers["etag"]
+        assert mock_db.execute.await_count == 3
+
+    async def test_newer_version_rebuilds_page(self, app_client, mock_db):
+        old = _player_row(datetime(2026, 1, 1, tzinfo=UTC))
+        new = _player_row(datetime(2026, 1, 2, tzinfo=UTC))
+        mock_db.execute = AsyncMock(side_effect=[
+            _row_result(old), _champs_result(["Ahri"]), _row_result(new), _champs_result(["Zed"]),
+        ])
+
+        first = await app_client.get("/p/Alice-EUW", headers=CRAWLER)
+        second = await app_client.get("/p/Alice-EUW", headers=CRAWLER)
+        assert "Zed" in second.text
+        assert second.headers["etag"] != first.headers["etag"]
+
+    async def test_conditional_request_returns_304(self, app_client, mock_db):
+        row = _player_row(datetime(2026, 1, 1, tzinfo=UTC))
+        mock_db.execute = AsyncMock(side_effect=[_row_result(row), _champs_result([]), _row_result(row)])
+
+        first = await app_client.get("/p/Alice-EUW", headers=CRAWLER)
+        resp = await app_client.get(
+            "/p/Alice-EUW", headers={**CRAWLER, "if-none-match": first.headers["etag"]},
+        )
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+    async def test_invalidate_drops_page(self, app_client, mock_db):
+        row = _player_row(datetime(2026, 1, 1, tzinfo=UTC))
+        mock_db.execute = AsyncMock(side_effect=[_row_result(row), _champs_result([])])
+        await app_client.get("/p/Alice-EUW", headers=CRAWLER)
+        assert "p:Alice-EUW" in html_cache
+        invalidate_og_cache("Alice-EUW")
+        assert "p:Alice-EUW" not in html_cache
+
+    async def test_unknown_player_returns_404(self, app_client, mock_db):
+        mock_db.execute = AsyncMock(return_value=_row_result(None))
+        resp = await app_client.get("/p/nobody-EUW", headers=CRAWLER)
+        assert resp.status_code == 404
+
+    async def test_team_page_uses_member_count(self, app_client, mock_db):
+        row = SimpleNamespace(
+            id=uuid.uuid4(), slug="rift-team", name="Rift Team", min_rank="gold", max_rank="diamond",
+            wanted_roles=["JUNGLE"], member_count=3, updated_at=datetime(2026, 1, 1),
+        )
+        mock_db.execute = AsyncMock(return_value=_row_result(row))
+        resp = await app_client.get("/t/rift-team", headers=CRAWLER)
+        assert resp.status_code == 200
+        assert "3/5 joueurs" in resp.text
+        assert mock_db.execute.await_count == 1
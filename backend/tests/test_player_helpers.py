@@ -168,9 +168,9 @@ class TestRefreshChampions:
             },
         ]
         await refresh_champions(db, player, new_champs)
-        db.delete.assert_awaited_once_with(old_champ)
         db.flush.assert_awaited_once()
-        assert len(player.champions) == 2  # old mock still in list + new one appended
+        assert old_champ not in player.champions  # orphaned, deleted on flush
+        assert [c.champion_id for c in player.champions] == [64]
 
     @pytest.mark.asyncio
     async def test_empty_existing_champions(self):
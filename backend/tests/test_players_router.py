@@ -1,8 +1,16 @@
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from tests.conftest import _make_player
+from app.config import settings
+from tests.conftest import _apply_defaults_on_flush, _make_player, _make_riot_profile, _player_model
+
+
+def _result(value):
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = value
+    return result
 
 
 class TestListPlayers:
@@ -44,6 +52,28 @@ class TestCreatePlayer:
             )
             assert resp.status_code == 403
 
+    async def test_builds_response_without_reload(self, app_client, mock_db):
+        token_data = MagicMock(game_name="TestPlayer", tag_line="EUW", discord_user_id="42", discord_username="me")
+        mock_db.execute = AsyncMock(return_value=_result(None))
+        _apply_defaults_on_flush(mock_db)
+        with (
+            patch("app.routers.players.consume_token", new_callable=AsyncMock, return_value=token_data),
+            patch("app.routers.players.get_riot_client"),
+            patch("app.routers.players.fetch_full_profile", new_callable=AsyncMock, return_value=_make_riot_profile()),
+            patch("app.routers.players.schedule_og_render"),
+        ):
+            resp = await app_client.post("/api/players", params={"token": "t"}, json={"ambiance": "FUN"})
+
+        assert resp.status_code == 201
+        data = resp.json()
+        assert data["slug"] == "TestPlayer-EUW"
+        assert data["ambiance"] == "FUN"
+        assert [c["champion_name"] for c in data["champions"]] == ["Lee Sin"]
+        assert mock_db.execute.await_count == 3  # existing-profile lookup, event notify, saved search matching
+        [event] = mock_db.add_all.call_args.args[0]
+        assert (event.kind, event.payload) == ("player.lft_on", {"slug": "TestPlayer-EUW"})
+        mock_db.refresh.assert_not_awaited()
+
 
 class TestUpdatePlayer:
     async def test_no_token_returns_422(self, app_client, mock_db):
@@ -59,6 +89,22 @@ class TestUpdatePlayer:
             )
             assert resp.status_code == 403
 
+    async def test_builds_response_without_reload(self, app_client, mock_db):
+        token_data = MagicMock(action="edit", slug="TestPlayer-EUW")
+        mock_db.execute = AsyncMock(return_value=_result(_player_model()))
+        with (
+            patch("app.routers.players.validate_token", new_callable=AsyncMock, return_value=token_data),
+            patch("app.routers.players.schedule_og_render"),
+        ):
+            resp = await app_client.patch(
+                "/api/players/TestPlayer-EUW", params={"token": "t"}, json={"description": "Nouveau"},
+            )
+
+        assert resp.status_code == 200
+        assert resp.json()["description"] == "Nouveau"
+        assert mock_db.execute.await_count == 2  # player, saved search matching
+        mock_db.refresh.assert_not_awaited()
+
 
 class TestDeletePlayer:
     async def test_no_token_returns_422(self, app_client, mock_db):
@@ -87,6 +133,38 @@ class TestGetPlayerByDiscord:
         assert resp.status_code == 403
 
 
+class TestGetPlayersBatch:
+    async def test_one_query_for_all_keys(self, app_client, mock_db):
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [_player_model()]
+        mock_db.execute = AsyncMock(return_value=result)
+        resp = await app_client.post(
+            "/api/players:batch",
+            json={"slugs": ["Unknown-EUW"], "puuids": ["p"], "discord_user_ids": ["123"]},
+            headers={"X-Bot-Secret": settings.bot_api_secret},
+        )
+        assert resp.status_code == 200
+        assert len(resp.json()["players"]) == 1
+        sql = str(mock_db.execute.call_args.args[0])
+        assert "players.slug IN" in sql and "players.riot_puuid IN" in sql and "players.discord_user_id IN" in sql
+        assert mock_db.execute.await_count == 1
+
+    async def test_empty_request_skips_query(self, app_client, mock_db):
+        resp = await app_client.post("/api/players:batch", json={})
+        assert resp.json() == {"players": []}
+        mock_db.execute.assert_not_awaited()
+
+    @pytest.mark.parametrize("secret", [None, "wrong-secret", "sécret".encode("latin-1")])
+    async def test_discord_ids_require_bot_secret(self, app_client, mock_db, secret):
+        headers = {"X-Bot-Secret": secret} if secret is not None else {}
+        resp = await app_client.post("/api/players:batch", json={"discord_user_ids": ["123"]}, headers=headers)
+        assert resp.status_code == 403
+
+    async def test_too_many_keys_rejected(self, app_client, mock_db):
+        resp = await app_client.post("/api/players:batch", json={"slugs": [f"P{i}-EUW" for i in range(101)]})
+        assert resp.status_code == 422
+
+
 class TestRefreshPlayer:
     async def test_no_bot_secret_returns_422(self, app_client, mock_db):
         resp = await app_client.post("/api/players/some-slug/refresh")
@@ -98,3 +176,49 @@ class TestRefreshPlayer:
             headers={"X-Bot-Secret": "wrong-secret"},
         )
         assert resp.status_code == 403
+
+    async def test_builds_response_without_reload(self, app_client, mock_db):
+        player = _player_model(last_riot_sync="2020-01-01T00:00:00+00:00")
+        mock_db.execute = AsyncMock(side_effect=[_result(player), _result("les-bleus")])
+        with (
+            patch("app.routers.players.get_riot_client"),
+            patch("app.routers.players.fetch_full_profile", new_callable=AsyncMock, return_value=_make_riot_profile()),
+            patch("app.routers.players.schedule_og_render"),
+            patch("app.routers.players.schedule_team_og_render") as schedule_team,
+        ):
+            resp = await app_client.post(
+                "/api/players/TestPlayer-EUW/refresh", headers={"X-Bot-Secret": settings.bot_api_secret},
+            )
+
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["rank_solo_tier"] == "PLATINUM"
+        assert [c["champion_name"] for c in data["champions"]] == ["Lee Sin"]
+        assert mock_db.execute.await_count == 2  # player, team aggregates (tier changed GOLD -> PLATINUM)
+        schedule_team.assert_called_once_with("les-bleus")
+        mock_db.refresh.assert_not_awaited()
+
+
+class TestLazyRankRefresh:
+    async def test_request_connection_is_released_before_riot_call(self, app_client, mock_db):
+        from app.main import app
+        from app.routers.players import _refreshing_players
+
+        stale = _player_model(last_riot_sync=(datetime.now(UTC) - timedelta(hours=7)).isoformat())
+        mock_db.execute = AsyncMock(return_value=_result(stale))
+        closes_at_riot_call = []
+
+        async def sync(player, client):
+            closes_at_riot_call.append(mock_db.close.await_count)
+
+        with (
+            patch.object(app.state, "riot_client", AsyncMock(), create=True),
+            patch("app.routers.players._sync_player_rank", side_effect=sync),
+            patch("app.routers.players.schedule_og_render") as schedule,
+        ):
+            resp = await app_client.get(f"/api/players/{stale.slug}")
+
+        assert resp.status_code == 200
+        assert closes_at_riot_call == [1]
+        schedule.assert_called_once_with(stale.slug)
+        assert stale.id not in _refreshing_players
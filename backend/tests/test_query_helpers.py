@@ -1,7 +1,8 @@
 from sqlalchemy import Column, Integer, String, select
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import DeclarativeBase
 
-from app.services.query_helpers import apply_rank_filters
+from app.services.query_helpers import apply_profile_filters, apply_rank_filters, apply_rank_range
 
 
 class Base(DeclarativeBase):
@@ -12,6 +13,15 @@ class FakeModel(Base):
     __tablename__ = "fake"
     id = Column(Integer, primary_key=True)
     tier = Column(String)
+    score = Column(Integer)
+    activities = Column(postgresql.ARRAY(String))
+    ambiance = Column(String)
+    frequency_min = Column(Integer)
+    frequency_max = Column(Integer)
+
+
+def _pg(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
 
 
 class TestApplyRankFilters:
@@ -55,3 +65,63 @@ class TestApplyRankFilters:
         count_stmt = select(FakeModel.id)
         new_stmt, new_count = apply_rank_filters(stmt, count_stmt, "INVALID", "NOTREAL", FakeModel.tier)
         assert str(new_stmt) == str(stmt)
+
+
+class TestApplyRankRange:
+    def test_no_filters_returns_unchanged(self):
+        stmt, count_stmt = select(FakeModel), select(FakeModel.id)
+        new_stmt, new_count = apply_rank_range(stmt, count_stmt, None, None, FakeModel.score)
+        assert str(new_stmt) == str(stmt)
+        assert str(new_count) == str(count_stmt)
+
+    def test_range_compares_scores(self):
+        new_stmt, new_count = apply_rank_range(
+            select(FakeModel), select(FakeModel.id), "gold", "DIAMOND", FakeModel.score,
+        )
+        compiled = _pg(new_stmt)
+        assert "fake.score >= 3" in compiled
+        assert "fake.score <= 6" in compiled
+        assert "fake.score >= 3" in _pg(new_count)
+
+    def test_allow_null(self):
+        new_stmt, _ = apply_rank_range(
+            select(FakeModel), select(FakeModel.id), "GOLD", None, FakeModel.score, allow_null=True,
+        )
+        assert "fake.score >= 3 OR fake.score IS NULL" in _pg(new_stmt)
+
+    def test_invalid_rank_ignored(self):
+        stmt = select(FakeModel)
+        new_stmt, _ = apply_rank_range(stmt, select(FakeModel.id), "INVALID", "NOTREAL", FakeModel.score)
+        assert str(new_stmt) == str(stmt)
+
+
+class TestApplyProfileFilters:
+    def test_no_filters_returns_unchanged(self):
+        stmt, count_stmt = select(FakeModel), select(FakeModel.id)
+        new_stmt, new_count = apply_profile_filters(stmt, count_stmt, FakeModel)
+        assert str(new_stmt) == str(stmt)
+        assert str(new_count) == str(count_stmt)
+
+    def test_activities_use_array_overlap(self):
+        new_stmt, new_count = apply_profile_filters(
+            select(FakeModel), select(FakeModel.id), FakeModel, activities=["scrims", "lan"],
+        )
+        assert "fake.activities && ARRAY['LAN', 'SCRIMS']" in _pg(new_stmt)
+        assert "&&" in _pg(new_count)
+
+    def test_unknown_values_are_ignored(self):
+        stmt = select(FakeModel)
+        new_stmt, _ = apply_profile_filters(stmt, select(FakeModel.id), FakeModel, activities=["BOGUS"], ambiance="x")
+        assert str(new_stmt) == str(stmt)
+
+    def test_ambiance(self):
+        new_stmt, _ = apply_profile_filters(select(FakeModel), select(FakeModel.id), FakeModel, ambiance="fun")
+        assert "fake.ambiance = 'FUN'" in _pg(new_stmt)
+
+    def test_frequency_range_matches_overlapping_profiles(self):
+        new_stmt, _ = apply_profile_filters(
+            select(FakeModel), select(FakeModel.id), FakeModel, frequency_min=2, frequency_max=4,
+        )
+        compiled = _pg(new_stmt)
+        assert "fake.frequency_max >= 2" in compiled
+        assert "fake.frequency_min <= 4" in compiled
@@ -0,0 +1,42 @@
+"""EXPLAIN checks that browse filters can be served by their indexes (requires TEST_DATABASE_URL)."""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import func, select
+
+from app.models import Player, Scrim, Team
+from app.routers.scrims import _browse_scrims_query
+from app.services.query_helpers import apply_profile_filters
+from tests.conftest import explain
+
+
+def _filtered(model, **filters):
+    stmt, _ = apply_profile_filters(select(model.id), select(func.count(model.id)), model, **filters)
+    return stmt
+
+
+class TestArrayFilterPlans:
+    async def test_player_activities_use_gin_index(self, pg_engine):
+        plan = await explain(pg_engine, _filtered(Player, activities=["SCRIMS", "LAN"]))
+        assert "idx_players_activities" in plan
+
+    async def test_team_activities_use_gin_index(self, pg_engine):
+        plan = await explain(pg_engine, _filtered(Team, activities=["CLASH"]))
+        assert "idx_teams_activities" in plan
+
+    async def test_team_wanted_role_uses_gin_index(self, pg_engine):
+        plan = await explain(pg_engine, select(Team.id).where(Team.wanted_roles.contains(["TOP"])))
+        assert "idx_teams_wanted_roles" in plan
+
+    async def test_any_comparison_cannot_use_gin_index(self, pg_engine):
+        plan = await explain(pg_engine, select(Team.id).where(Team.wanted_roles.any("TOP")))
+        assert "idx_teams_wanted_roles" not in plan
+
+
+class TestScrimSlotPlans:
+    async def test_weekend_evening_window_uses_slot_index(self, pg_engine):
+        stmt, _ = _browse_scrims_query(
+            datetime(2026, 10, 19, tzinfo=UTC), date_from="2026-10-24", date_to="2026-10-25", hour_min=19, hour_max=23,
+        )
+        plan = await explain(pg_engine, stmt.order_by(Scrim.scheduled_at).limit(20))
+        assert "idx_scrims_active_paris_slot" in plan
@@ -1,76 +1,200 @@
 import time
-from unittest.mock import MagicMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
 
 from app.middleware.rate_limit import (
-    CLEANUP_INTERVAL,
+    BOT_BUDGET,
+    BUDGETS,
+    CLEANUP_BATCH,
     MAX_REQUESTS,
+    ROUTE_COSTS,
     WINDOW_SECONDS,
-    _buckets,
-    _cleanup,
+    GcraLimiter,
+    RateLimitMiddleware,
     _get_client_ip,
+    _match_route,
 )
 
 
-class TestCleanup:
-    def setup_method(self):
-        _buckets.clear()
+def _scope(headers=None, client=("192.168.1.1", 1234)):
+    return {"type": "http", "headers": headers or [], "client": client}
+
+
+class TestGcraLimiter:
+    def test_allows_burst_up_to_limit(self):
+        limiter = GcraLimiter(limit=MAX_REQUESTS, window=WINDOW_SECONDS)
+        now = 1000.0
+        assert all(limiter.hit("ip", now=now) == 0 for _ in range(MAX_REQUESTS))
+        assert limiter.hit("ip", now=now) > 0
+
+    def test_refills_one_request_per_interval(self):
+        limiter = GcraLimiter(limit=10, window=10)
+        for _ in range(10):
+            limiter.hit("ip", now=0.0)
+        assert limiter.hit("ip", now=0.5) == 0.5
+        assert limiter.hit("ip", now=1.0) == 0
 
-    def teardown_method(self):
-        _buckets.clear()
+    def test_rejected_hits_are_not_charged(self):
+        limiter = GcraLimiter(limit=2, window=2)
+        limiter.hit("ip", now=0.0)
+        limiter.hit("ip", now=0.0)
+        for _ in range(100):
+            assert limiter.hit("ip", now=0.0) > 0
+        assert limiter.hit("ip", now=1.0) == 0
 
+    def test_keys_are_independent(self):
+        limiter = GcraLimiter(limit=1, window=60)
+        assert limiter.hit("a", now=0.0) == 0
+        assert limiter.hit("a", now=0.0) > 0
+        assert limiter.hit("b", now=0.0) == 0
+
+    def test_cost_consumes_more_budget(self):
+        limiter = GcraLimiter(limit=10, window=10)
+        assert limiter.hit("ip", cost=10, now=0.0) == 0
+        assert limiter.hit("ip", now=0.0) > 0
+
+
+class TestCleanup:
     def test_removes_expired_entries(self):
-        import app.middleware.rate_limit as rl
-        old_last = rl._last_cleanup
-        rl._last_cleanup = time.monotonic() - CLEANUP_INTERVAL - 1
-        try:
-            _buckets["expired_ip"] = [time.monotonic() - WINDOW_SECONDS - 10]
-            _buckets["active_ip"] = [time.monotonic()]
-            _cleanup()
-            assert "expired_ip" not in _buckets
-            assert "active_ip" in _buckets
-        finally:
-            rl._last_cleanup = old_last
+        limiter = GcraLimiter(limit=60, window=60)
+        limiter.hit("expired_ip", now=0.0)
+        limiter.hit("active_ip", now=100.0)
+        assert "expired_ip" not in limiter
+        assert "active_ip" in limiter
+
+    def test_cleanup_work_is_bounded(self):
+        limiter = GcraLimiter(limit=60, window=60)
+        for i in range(50):
+            limiter.hit(f"ip{i}", now=0.0)
+        limiter.hit("late", now=100.0)
+        assert len(limiter) == 50 - CLEANUP_BATCH + 1
+
+    def test_enforces_max_entries(self):
+        limiter = GcraLimiter(limit=60, window=60, max_entries=3)
+        for i in range(5):
+            limiter.hit(f"ip{i}", now=0.0)
+        assert len(limiter) == 3
+        assert "ip0" not in limiter
+        assert "ip4" in limiter
 
 
 class TestGetClientIp:
     def test_x_forwarded_for(self):
-        request = MagicMock()
-        request.headers = {"x-forwarded-for": "1.2.3.4, 5.6.7.8"}
-        assert _get_client_ip(request) == "1.2.3.4"
+        assert _get_client_ip(_scope([(b"x-forwarded-for", b"1.2.3.4, 5.6.7.8")])) == "1.2.3.4"
 
     def test_x_forwarded_for_single(self):
-        request = MagicMock()
-        request.headers = {"x-forwarded-for": "10.0.0.1"}
-        assert _get_client_ip(request) == "10.0.0.1"
+        assert _get_client_ip(_scope([(b"x-forwarded-for", b"10.0.0.1")])) == "10.0.0.1"
 
     def test_direct_client(self):
-        request = MagicMock()
-        request.headers = {}
-        request.client.host = "192.168.1.1"
-        assert _get_client_ip(request) == "192.168.1.1"
+        assert _get_client_ip(_scope()) == "192.168.1.1"
 
     def test_no_client(self):
-        request = MagicMock()
-        request.headers = {}
-        request.client = None
-        assert _get_client_ip(request) == "unknown"
-
-
-class TestRateLimitFunctional:
-    def setup_method(self):
-        _buckets.clear()
-
-    def teardown_method(self):
-        _buckets.clear()
-
-    def test_within_limit(self):
-        ip = "test-ip"
-        now = time.monotonic()
-        _buckets[ip] = [now + i * 0.001 for i in range(MAX_REQUESTS - 1)]
-        assert len(_buckets[ip]) < MAX_REQUESTS
-
-    def test_exceeds_limit(self):
-        ip = "test-ip"
-        now = time.monotonic()
-        _buckets[ip] = [now + i * 0.001 for i in range(MAX_REQUESTS)]
-        assert len(_buckets[ip]) >= MAX_REQUESTS
+        assert _get_client_ip(_scope(client=None)) == "unknown"
+
+
+async def _ok(request):
+    return PlainTextResponse("ok")
+
+
+ROUTES = (
+    Route("/api/things", _ok, methods=["GET", "POST"]),
+    Route("/api/riot/check/{name}/{tag}", _ok),
+    Route("/api/og/{slug}.png", _ok),
+    Route("/api/health", _ok),
+)
+
+
+def _client(budgets=None, bot_secret=None):
+    limiters = {name: GcraLimiter(limit=limit, window=60) for name, limit in (budgets or {}).items()}
+    for name in BUDGETS:
+        limiters.setdefault(name, GcraLimiter(limit=1000, window=60))
+    app = RateLimitMiddleware(Starlette(routes=list(ROUTES)), limiters=limiters, bot_secret=bot_secret)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+class TestMatchRoute:
+    def test_riot_backed_routes(self):
+        assert _match_route("GET", "/api/riot/check/Name/EUW", ROUTE_COSTS).budget == "riot"
+        assert _match_route("POST", "/api/players", ROUTE_COSTS).budget == "riot"
+        assert _match_route("POST", "/api/players/Name-EUW/refresh", ROUTE_COSTS).cost > 1
+
+    def test_render_routes(self):
+        assert _match_route("GET", "/api/og/Name-EUW.png", ROUTE_COSTS).budget == "render"
+        assert _match_route("GET", "/api/og/team/rift.png", ROUTE_COSTS).budget == "render"
+        page = _match_route("GET", "/api/og/players/page.png", ROUTE_COSTS)
+        assert page.budget == "render"
+        assert page.cost > 1
+
+    def test_reads_and_writes(self):
+        assert _match_route("GET", "/api/players/Name-EUW", ROUTE_COSTS).budget == "read"
+        assert _match_route("PATCH", "/api/players/Name-EUW", ROUTE_COSTS).budget == "write"
+        assert _match_route("DELETE", "/api/scrims/abc", ROUTE_COSTS).budget == "write"
+        assert _match_route("POST", "/api/players:batch", ROUTE_COSTS).budget == "read"
+
+
+class TestRateLimitMiddleware:
+    async def test_limits_writes(self):
+        async with _client({"write": 2}) as client:
+            assert (await client.post("/api/things")).status_code == 200
+            assert (await client.post("/api/things")).status_code == 200
+            resp = await client.post("/api/things")
+        assert resp.status_code == 429
+        assert int(resp.headers["retry-after"]) >= 1
+
+    async def test_budgets_are_independent(self):
+        async with _client({"riot": 1, "read": 5}) as client:
+            assert (await client.get("/api/riot/check/a/b")).status_code == 200
+            assert (await client.get("/api/riot/check/a/b")).status_code == 429
+            for _ in range(5):
+                assert (await client.get("/api/things")).status_code == 200
+
+    async def test_render_budget(self):
+        async with _client({"render": 1}) as client:
+            assert (await client.get("/api/og/a.png")).status_code == 200
+            assert (await client.get("/api/og/b.png")).status_code == 429
+
+    async def test_health_is_not_limited(self):
+        async with _client({"read": 1}) as client:
+            for _ in range(3):
+                assert (await client.get("/api/health")).status_code == 200
+
+    async def test_limit_is_per_forwarded_ip(self):
+        async with _client({"write": 1}) as client:
+            assert (await client.post("/api/things", headers={"x-forwarded-for": "1.1.1.1"})).status_code == 200
+            assert (await client.post("/api/things", headers={"x-forwarded-for": "2.2.2.2"})).status_code == 200
+            assert (await client.post("/api/things", headers={"x-forwarded-for": "1.1.1.1"})).status_code == 429
+
+    async def test_bot_traffic_uses_its_own_quota(self):
+        async with _client({"riot": 1, BOT_BUDGET: 3}, bot_secret="s3cret") as client:
+            assert (await client.get("/api/riot/check/a/b")).status_code == 200
+            bot = {"x-bot-secret": "s3cret"}
+            for _ in range(3):
+                assert (await client.get("/api/riot/check/a/b", headers=bot)).status_code == 200
+            assert (await client.get("/api/riot/check/a/b", headers=bot)).status_code == 429
+
+    async def test_wrong_bot_secret_is_treated_as_client(self):
+        async with _client({"riot": 1}, bot_secret="s3cret") as client:
+            assert (await client.get("/api/riot/check/a/b", headers={"x-bot-secret": "nope"})).status_code == 200
+            assert (await client.get("/api/riot/check/a/b", headers={"x-bot-secret": "nope"})).status_code == 429
+
+
+@pytest.mark.benchmark
+class TestOverhead:
+    @staticmethod
+    def _per_hit_us(limiter, keys, n=50_000):
+        start = time.perf_counter()
+        for i in range(n):
+            limiter.hit(keys[i % len(keys)])
+        return (time.perf_counter() - start) / n * 1e6
+
+    def test_hit_cost_is_flat_with_many_keys(self):
+        """Microbenchmark: per-request limiter overhead does not grow with the number of active keys."""
+        one_key = self._per_hit_us(GcraLimiter(limit=10**9, window=WINDOW_SECONDS), ["10.0.0.1"])
+        many_keys = self._per_hit_us(
+            GcraLimiter(limit=MAX_REQUESTS, window=WINDOW_SECONDS), [f"10.0.{i // 200}.{i % 200}" for i in range(50_000)],
+        )
+        assert many_keys < one_key * 3
@@ -0,0 +1,123 @@
+import asyncio
+import multiprocessing
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.middleware.rate_limit import BUDGETS, GcraLimiter
+from app.middleware.rate_limit_backends import PostgresSyncedLimiter, SharedMemoryLimiter, create_limiters
+
+
+@pytest.fixture
+async def shm_name():
+    name = f"rt_test_{uuid.uuid4().hex[:8]}"
+    yield name
+    cleanup = SharedMemoryLimiter(name=name, slots=16)
+    cleanup.unlink()
+    await cleanup.close()
+
+
+def _hammer(name, hits):
+    limiter = SharedMemoryLimiter(name=name, limit=10**9, window=10**9, slots=16)
+    for _ in range(hits):
+        limiter.hit("ip", now=0.0)
+    asyncio.run(limiter.close())
+
+
+class TestSharedMemoryLimiter:
+    async def test_state_is_shared_between_instances(self, shm_name):
+        worker_a = SharedMemoryLimiter(name=shm_name, limit=2, window=60, slots=16)
+        worker_b = SharedMemoryLimiter(name=shm_name, limit=2, window=60, slots=16)
+        assert worker_a.hit("ip", now=100.0) == 0
+        assert worker_b.hit("ip", now=100.0) == 0
+        assert worker_a.hit("ip", now=100.0) > 0
+        await worker_a.close()
+        await worker_b.close()
+
+    async def test_concurrent_workers_lose_no_charges(self, shm_name):
+        limiter = SharedMemoryLimiter(name=shm_name, limit=10**9, window=10**9, slots=16)
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_hammer, args=(shm_name, 20_000)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        # One second of interval per hit: the cell's TAT counts every charge that was recorded.
+        assert limiter._tats[limiter._slot("ip")] == 80_000
+        await limiter.close()
+
+    async def test_state_survives_reattach(self, shm_name):
+        first = SharedMemoryLimiter(name=shm_name, limit=1, window=60, slots=16)
+        first.hit("ip", now=100.0)
+        await first.close()
+        second = SharedMemoryLimiter(name=shm_name, limit=1, window=60, slots=16)
+        assert second.hit("ip", now=100.0) > 0
+        await second.close()
+
+
+def _session_factory(rows):
+    session = MagicMock()
+    result = MagicMock()
+    result.all.return_value = rows
+    session.execute = AsyncMock(return_value=result)
+    session.commit = AsyncMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    return MagicMock(return_value=session), session
+
+
+class TestPostgresSyncedLimiter:
+    async def test_batches_charges_into_one_upsert(self):
+        factory, session = _session_factory([])
+        limiter = PostgresSyncedLimiter(factory, limit=10, window=10)
+        limiter.hit("a", now=0.0)
+        limiter.hit("a", now=0.0)
+        limiter.hit("b", cost=3, now=0.0)
+        session.execute.assert_not_awaited()
+
+        await limiter.flush()
+        session.execute.assert_awaited_once()
+        params = session.execute.await_args.args[1]
+        assert dict(zip(params["keys"], params["costs"], strict=True)) == {"a": 2, "b": 3}
+
+        await limiter.flush()
+        session.execute.assert_awaited_once()
+
+    async def test_adopts_newer_shared_state(self):
+        factory, _ = _session_factory([("a", 10.0)])
+        limiter = PostgresSyncedLimiter(factory, limit=10, window=10)
+        limiter.hit("a", now=0.0)
+        await limiter.flush()
+        assert limiter.hit("a", now=0.0) > 0
+
+    async def test_namespace_prefixes_stored_keys(self):
+        factory, session = _session_factory([("riot:a", 10.0)])
+        limiter = PostgresSyncedLimiter(factory, limit=10, window=10, namespace="riot")
+        limiter.hit("a", now=0.0)
+        await limiter.flush()
+        assert session.execute.await_args.args[1]["keys"] == ["riot:a"]
+        assert limiter.hit("a", now=0.0) > 0
+
+    async def test_failed_flush_keeps_pending_charges(self):
+        factory, session = _session_factory([])
+        session.execute = AsyncMock(side_effect=OSError("db down"))
+        limiter = PostgresSyncedLimiter(factory, limit=10, window=10)
+        limiter.hit("a", now=0.0)
+        await limiter.flush()
+        assert limiter._pending == {"a": 1}
+
+
+class TestCreateLimiters:
+    def test_memory_backend_has_one_limiter_per_budget(self):
+        limiters = create_limiters("memory")
+        assert set(limiters) == set(BUDGETS)
+        assert all(isinstance(limiter, GcraLimiter) for limiter in limiters.values())
+
+    def test_postgres_requires_session_factory(self):
+        with pytest.raises(ValueError):
+            create_limiters("postgres")
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_limiters("redis")
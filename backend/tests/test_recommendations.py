@@ -0,0 +1,124 @@
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import TeamMember
+from app.services.recommendations import (
+    player_role_mask,
+    recommend_players,
+    recommend_teams,
+    recommended_players_query,
+    recommended_teams_query,
+)
+from tests.conftest import _player_model, _team_model
+
+
+def _pg(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class TestPlayerRoleMask:
+    def test_secondary_role_sits_above_primary(self):
+        player = _player_model(primary_role="TOP", secondary_role="UTILITY")
+        assert player_role_mask(player) == 1 + (16 << 5)
+
+    def test_no_roles(self):
+        assert player_role_mask(_player_model(primary_role=None, secondary_role=None)) == 0
+
+
+class TestRecommendedPlayersQuery:
+    def test_scores_from_feature_columns(self):
+        sql = _pg(recommended_players_query(_team_model(wanted_roles=["JUNGLE", "MIDDLE"]), limit=5))
+        assert "players.role_mask & 6 != 0" in sql
+        assert "(players.role_mask >> 5) & 6 != 0" in sql
+        assert "greatest(0, 2 - players.rank_solo_score, players.rank_solo_score - 6)" in sql
+        assert "players.activity_mask" in sql
+        assert "players.is_lft IS true" in sql
+        assert "ORDER BY score DESC, players.updated_at DESC" in sql
+        assert "LIMIT 5" in sql
+
+    def test_skips_rostered_players(self):
+        sql = _pg(recommended_players_query(_team_model()))
+        assert "NOT (EXISTS (SELECT" in sql
+        assert "team_members.player_id = players.id" in sql
+
+    def test_blank_team_criteria_are_constant(self):
+        team = _team_model(wanted_roles=[], min_rank=None, max_rank=None, activities=[], ambiance=None,
+                           frequency_min=None, frequency_max=None)
+        sql = _pg(recommended_players_query(team))
+        assert "role_mask" not in sql
+        assert "rank_solo_score" not in sql
+        assert "players.ambiance" not in sql
+
+
+class TestRecommendedTeamsQuery:
+    def test_scores_from_feature_columns(self):
+        sql = _pg(recommended_teams_query(_player_model(primary_role="JUNGLE", secondary_role="MIDDLE")))
+        assert "teams.wanted_role_mask = 0" in sql
+        assert "teams.wanted_role_mask & 2 != 0" in sql
+        assert "teams.wanted_role_mask & 4 != 0" in sql
+        assert "coalesce(teams.min_rank_score - 3, 0)" in sql
+        assert "teams.is_lfp IS true" in sql
+
+    def test_skips_own_team(self):
+        player = _player_model(discord_user_id="42")
+        sql = _pg(recommended_teams_query(player))
+        assert f"team_members.player_id = '{player.id}'" in sql
+        assert "teams.captain_discord_id != '42'" in sql
+
+
+class TestRecommendationsOnPostgres:
+    async def test_players_ranked_by_compatibility(self, pg_engine):
+        team = _team_model(slug="home", captain_discord_id="cap", wanted_roles=["JUNGLE"], min_rank="GOLD",
+                           max_rank="PLATINUM", activities=["SCRIMS", "CLASH"], ambiance="TRYHARD",
+                           frequency_min=3, frequency_max=4)
+        players = {
+            "perfect": _player_model(primary_role="JUNGLE", rank_solo_tier="GOLD", activities=["SCRIMS", "CLASH"]),
+            "secondary": _player_model(primary_role="TOP", secondary_role="JUNGLE", rank_solo_tier="GOLD",
+                                       activities=["SCRIMS", "CLASH"]),
+            "far": _player_model(primary_role="JUNGLE", rank_solo_tier="SILVER", activities=["CLASH", "SCRIMS"],
+                                 ambiance="FUN"),
+            "wrong-role": _player_model(primary_role="BOTTOM", secondary_role=None, rank_solo_tier="DIAMOND",
+                                        activities=["SCRIMS", "CLASH"], frequency_min=6, frequency_max=7),
+            "rostered": _player_model(primary_role="JUNGLE", rank_solo_tier="GOLD"),
+            "not-lft": _player_model(primary_role="JUNGLE", is_lft=False),
+        }
+        for name, player in players.items():
+            player.slug = player.riot_puuid = name
+            player.discord_user_id = None
+        team.members = [TeamMember(player=players["rostered"], role="JUNGLE")]
+
+        session_factory = async_sessionmaker(pg_engine, expire_on_commit=False)
+        async with session_factory() as db:
+            db.add_all([team, *players.values()])
+            await db.commit()
+        async with session_factory() as db:
+            ranked = await recommend_players(db, team, limit=10)
+
+        assert [(p.slug, score) for p, score in ranked] == [
+            ("perfect", 100), ("secondary", 84), ("far", 80), ("wrong-role", 35),
+        ]
+        assert ranked[0][0].champions == []
+
+    async def test_teams_ranked_by_compatibility(self, pg_engine):
+        player = _player_model(slug="me", riot_puuid="me", discord_user_id="42", primary_role="MIDDLE",
+                               secondary_role=None, rank_solo_tier="EMERALD")
+        teams = {
+            "open": _team_model(wanted_roles=[], min_rank=None, max_rank=None),
+            "wants-mid": _team_model(wanted_roles=["MIDDLE"], max_rank="PLATINUM"),
+            "wants-top": _team_model(wanted_roles=["TOP"]),
+            "mine": _team_model(captain_discord_id="42"),
+            "hidden": _team_model(is_lfp=False),
+        }
+        for name, team in teams.items():
+            team.slug = team.name = name
+            if name != "mine":
+                team.captain_discord_id = f"cap-{name}"
+
+        session_factory = async_sessionmaker(pg_engine, expire_on_commit=False)
+        async with session_factory() as db:
+            db.add_all([player, *teams.values()])
+            await db.commit()
+        async with session_factory() as db:
+            ranked = await recommend_teams(db, player, limit=10)
+
+        assert [(t.slug, score) for t, score in ranked] == [("open", 100), ("wants-mid", 90), ("wants-top", 60)]
@@ -0,0 +1,172 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.models import ChangeEvent, SavedSearch, SavedSearchMatch, Scrim
+from app.schemas.saved_search import SavedSearchCreate
+from app.services.saved_searches import (
+    collect_pending_matches,
+    match_player,
+    match_scrim,
+    match_team,
+    player_keys,
+    scrim_keys,
+    search_keys,
+    team_keys,
+)
+from tests.conftest import _player_model, _team_model
+
+BOT = {"X-Bot-Secret": settings.bot_api_secret}
+
+
+def _hits(entity_keys, target, **filters) -> bool:
+    return bool(set(entity_keys) & set(search_keys(target, **filters)))
+
+
+class TestKeys:
+    def test_player_role_and_rank(self):
+        keys = player_keys(_player_model(primary_role="JUNGLE", secondary_role="MIDDLE", rank_solo_tier="GOLD"))
+        assert _hits(keys, "players")
+        assert _hits(keys, "players", role="MIDDLE", min_rank="SILVER")
+        assert _hits(keys, "players", role="JUNGLE", min_rank="GOLD", max_rank="GOLD")
+        assert not _hits(keys, "players", role="TOP")
+        assert not _hits(keys, "players", min_rank="PLATINUM")
+        assert not _hits(keys, "teams")
+
+    def test_unranked_player_only_matches_searches_without_rank(self):
+        keys = player_keys(_player_model(rank_solo_tier=None))
+        assert _hits(keys, "players", role="JUNGLE")
+        assert not _hits(keys, "players", max_rank="CHALLENGER")
+
+    def test_scrim_rank_window_and_format(self):
+        scrim = Scrim(min_rank="DIAMOND", max_rank="GOLD", format="BO3", game_count=None)
+        keys = scrim_keys(scrim)
+        assert _hits(keys, "scrims", format="BO3", min_rank="EMERALD", max_rank="MASTER")
+        assert not _hits(keys, "scrims", max_rank="SILVER")
+        assert not _hits(keys, "scrims", format="BO5")
+
+    def test_open_scrim_window_spans_every_rank(self):
+        keys = scrim_keys(Scrim(min_rank=None, max_rank=None, format=None, game_count=3))
+        assert _hits(keys, "scrims", min_rank="CHALLENGER", format="G3")
+        assert _hits(keys, "scrims", max_rank="IRON")
+
+    def test_team_searches_are_keyed_on_role_only(self):
+        assert search_keys("teams", role="TOP", min_rank="GOLD") == ["teams:TOP:*:*"]
+        keys = team_keys(_team_model(wanted_roles=["TOP", "UTILITY"]))
+        assert _hits(keys, "teams", role="UTILITY")
+        assert not _hits(keys, "teams", role="JUNGLE")
+
+
+class TestSchema:
+    def test_rejects_filters_that_do_not_apply(self):
+        with pytest.raises(ValidationError):
+            SavedSearchCreate(discord_user_id="1", target="scrims", role="TOP")
+        with pytest.raises(ValidationError):
+            SavedSearchCreate(discord_user_id="1", target="players", format="BO3")
+        with pytest.raises(ValidationError):
+            SavedSearchCreate(discord_user_id="1", target="players", min_rank="DIAMOND", max_rank="GOLD")
+
+
+class TestMatching:
+    async def test_inactive_entities_are_not_matched(self, mock_db):
+        assert await match_player(mock_db, _player_model(is_lft=False)) == 0
+        assert await match_team(mock_db, _team_model(is_lfp=False)) == 0
+        mock_db.execute.assert_not_awaited()
+
+    async def test_event_only_when_something_was_queued(self, mock_db):
+        queued = MagicMock()
+        queued.scalars.return_value.all.return_value = [1, 2]
+        mock_db.execute = AsyncMock(side_effect=[queued, MagicMock()])
+        assert await match_player(mock_db, _player_model()) == 2
+        assert mock_db.execute.await_count == 2
+        (event,), _ = mock_db.add_all.call_args
+        assert event[0].kind == "search.matched"
+
+
+class TestRouter:
+    async def test_create_stores_index_keys(self, app_client, mock_db):
+        count = MagicMock()
+        count.scalar_one.return_value = 0
+        mock_db.execute = AsyncMock(return_value=count)
+
+        async def _commit():
+            search = mock_db.add.call_args.args[0]
+            search.id, search.created_at = 7, datetime.now(UTC)
+
+        mock_db.commit.side_effect = _commit
+        resp = await app_client.post("/api/saved-searches", headers=BOT, json={
+            "discord_user_id": "1", "target": "players", "role": "JUNGLE", "min_rank": "MASTER",
+        })
+
+        assert resp.status_code == 201
+        assert resp.json()["id"] == 7
+        search = mock_db.add.call_args.args[0]
+        assert search.match_keys == ["players:JUNGLE:7:*", "players:JUNGLE:8:*", "players:JUNGLE:9:*"]
+
+    async def test_create_over_limit(self, app_client, mock_db):
+        count = MagicMock()
+        count.scalar_one.return_value = 10
+        mock_db.execute = AsyncMock(return_value=count)
+        resp = await app_client.post("/api/saved-searches", headers=BOT, json={"discord_user_id": "1", "target": "teams"})
+        assert resp.status_code == 409
+        mock_db.add.assert_not_called()
+
+    async def test_delete_someone_elses_search(self, app_client, mock_db):
+        mock_db.execute = AsyncMock(return_value=MagicMock(rowcount=0))
+        resp = await app_client.delete("/api/saved-searches/7", headers=BOT, params={"discord_user_id": "1"})
+        assert resp.status_code == 404
+        mock_db.commit.assert_not_awaited()
+
+    async def test_wrong_bot_secret_returns_403(self, app_client):
+        resp = await app_client.get(
+            "/api/saved-searches", params={"discord_user_id": "1"}, headers={"X-Bot-Secret": "wrong-secret"},
+        )
+        assert resp.status_code == 403
+
+
+class TestMatchingOnPostgres:
+    async def test_queues_and_delivers_matches_once(self, pg_engine):
+        session_factory = async_sessionmaker(pg_engine, expire_on_commit=False)
+
+        def saved(user, target, **filters):
+            return SavedSearch(discord_user_id=user, target=target, match_keys=search_keys(target, **filters), **filters)
+
+        jungle_gold = saved("1", "players", role="JUNGLE", min_rank="GOLD")
+        top_only = saved("2", "players", role="TOP")
+        own = saved("123456789", "players")
+        teams_plat = saved("3", "teams", min_rank="PLATINUM")
+        bo3 = saved("4", "scrims", format="BO3", min_rank="EMERALD")
+        player = _player_model(primary_role="JUNGLE", rank_solo_tier="PLATINUM")
+        team = _team_model(min_rank="SILVER", max_rank="DIAMOND")
+        async with session_factory() as db:
+            db.add_all([jungle_gold, top_only, own, teams_plat, bo3, player, team])
+            await db.flush()
+            scrim = Scrim(
+                team=team, captain_discord_id="111111111", format="BO3", min_rank="DIAMOND",
+                scheduled_at=datetime.now(UTC) + timedelta(days=1),
+            )
+            db.add(scrim)
+            await db.flush()
+            assert await match_player(db, player) == 1
+            assert await match_player(db, player) == 0
+            assert await match_team(db, team) == 0  # team accepts Silver, the search wants Platinum+
+            assert await match_scrim(db, scrim) == 1
+            await db.commit()
+
+        async with session_factory() as db:
+            events = (await db.execute(select(ChangeEvent.kind))).scalars().all()
+            pending = await collect_pending_matches(db, now=datetime.now(UTC))
+            again = await collect_pending_matches(db, now=datetime.now(UTC))
+            queued = (await db.execute(select(SavedSearchMatch.search_id))).scalars().all()
+
+        assert events == ["search.matched", "search.matched"]
+        assert sorted((m["search"].discord_user_id, m["ref"]) for m in pending) == [
+            ("1", player.slug), ("4", str(scrim.id)),
+        ]
+        assert again == []
+        assert sorted(queued) == sorted([jungle_gold.id, bo3.id])
@@ -0,0 +1,47 @@
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import Scrim, ScrimArchive, ScrimMatch
+from app.services.scrim_archive import archive_batch, archive_past_scrims
+from tests.conftest import _team_model
+
+
+class TestArchiveBatch:
+    def test_moves_rows_in_one_statement(self):
+        sql = str(archive_batch(datetime.now(UTC), batch_size=50).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True},
+        ))
+        assert sql.startswith("WITH moved AS \n(DELETE FROM scrims WHERE scrims.id IN (SELECT scrims.id")
+        assert "ORDER BY scrims.scheduled_at \n LIMIT 50 FOR UPDATE SKIP LOCKED" in sql
+        assert "INSERT INTO scrim_archive" in sql
+        assert "CASE WHEN (moved.is_active IS true) THEN 'EXPIRED' ELSE 'CANCELLED' END" in sql
+
+
+class TestArchiveOnPostgres:
+    async def test_sweeps_past_scrims_in_batches(self, pg_engine):
+        now = datetime.now(UTC)
+        team = _team_model(slug="t", name="t")
+        other = _team_model(slug="o", name="o", captain_discord_id="other")
+        expired = Scrim(team=team, captain_discord_id="1", scheduled_at=now - timedelta(days=1))
+        cancelled = Scrim(team=team, captain_discord_id="1", scheduled_at=now - timedelta(hours=1), is_active=False)
+        upcoming = Scrim(team=team, captain_discord_id="1", scheduled_at=now + timedelta(days=1))
+        opponent = Scrim(team=other, captain_discord_id="other", scheduled_at=now - timedelta(days=1))
+        session_factory = async_sessionmaker(pg_engine, expire_on_commit=False)
+        async with session_factory() as db:
+            db.add_all([team, other, expired, cancelled, upcoming, opponent])
+            await db.flush()
+            db.add(ScrimMatch(scrim_id=expired.id, opponent_scrim_id=opponent.id))
+            await db.commit()
+
+        async with session_factory() as db:
+            assert await archive_past_scrims(db, now=now, batch_size=2) == 3
+            remaining = (await db.execute(select(Scrim.id))).scalars().all()
+            archived = dict((await db.execute(select(ScrimArchive.id, ScrimArchive.status))).all())
+            matches = (await db.execute(select(func.count()).select_from(ScrimMatch))).scalar_one()
+
+        assert remaining == [upcoming.id]
+        assert archived == {expired.id: "EXPIRED", cancelled.id: "CANCELLED", opponent.id: "EXPIRED"}
+        assert matches == 0
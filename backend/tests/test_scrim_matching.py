@@ -0,0 +1,143 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import Scrim, TeamMember
+from app.services.scrim_matching import (
+    collect_new_matches,
+    find_matches,
+    matches_query,
+    new_pairs_query,
+    rank_bounds,
+)
+from app.services.team_stats import apply_roster_stats
+from tests.conftest import _player_model, _team_model
+
+NOW = datetime(2030, 3, 1, 12, tzinfo=UTC)
+KICKOFF = NOW + timedelta(days=1)
+
+
+def _pg(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def _scrim(**overrides):
+    fields = {
+        "id": uuid.uuid4(), "team_id": uuid.uuid4(), "captain_discord_id": "1",
+        "scheduled_at": KICKOFF, "format": "BO3", "fearless": False,
+    }
+    return Scrim(**{**fields, **overrides})
+
+
+def _team(slug, tiers, **overrides):
+    """A team whose roster has one player per given solo tier (None = unranked)."""
+    team = _team_model(slug=slug, name=slug, captain_discord_id=f"cap-{slug}", **overrides)
+    team.members = [
+        TeamMember(
+            player=_player_model(
+                slug=f"{slug}-{i}", riot_puuid=f"{slug}-{i}", discord_user_id=None, rank_solo_tier=tier,
+            ),
+            role="TOP",
+        )
+        for i, tier in enumerate(tiers)
+    ]
+    apply_roster_stats(team)
+    return team
+
+
+class TestRankBounds:
+    def test_open_window(self):
+        assert rank_bounds(_scrim()) == (None, None)
+
+    def test_inverted_window_is_swapped(self):
+        assert rank_bounds(_scrim(min_rank="DIAMOND", max_rank="gold")) == (3, 6)
+
+
+class TestMatchesQuery:
+    def test_uses_indexed_range_predicates(self):
+        sql = _pg(matches_query(_scrim(min_rank="GOLD"), 4, now=NOW))
+        assert "scrims.scheduled_at >= '2030-03-02 11:00:00+00:00'" in sql
+        assert "scrims.scheduled_at <= '2030-03-02 13:00:00+00:00'" in sql
+        assert "scrims.rank_window @> 4" in sql
+        assert "int4range(3, NULL, '[]') @>" in sql
+        assert "scrims.format = 'BO3'" in sql
+        assert "scrims.game_count IS NULL" in sql
+        assert "scrims.fearless IS false" in sql
+
+    def test_unranked_team_skips_opponent_window_check(self):
+        sql = _pg(matches_query(_scrim(), None, now=NOW))
+        assert "scrims.rank_window @>" not in sql
+
+    def test_window_never_starts_in_the_past(self):
+        sql = _pg(matches_query(_scrim(scheduled_at=NOW), None, now=NOW))
+        assert "scrims.scheduled_at >= '2030-03-01 12:00:00+00:00'" in sql
+
+    def test_new_pairs_skip_notified(self):
+        sql = str(new_pairs_query(now=NOW).compile(dialect=postgresql.dialect()))
+        assert "NOT (EXISTS (SELECT" in sql
+        assert "scrim_matches.opponent_scrim_id = scrims_2.id" in sql
+
+    def test_opponent_score_reads_stored_roster_average(self):
+        sql = str(new_pairs_query(now=NOW).compile(dialect=postgresql.dialect()))
+        assert "SELECT teams.roster_rank_avg" in sql
+        assert "avg(" not in sql
+
+
+class TestMatchingOnPostgres:
+    async def _seed(self, engine):
+        """A Gold home scrim plus one compatible opponent and one opponent failing each rule."""
+        start = datetime.now(UTC) + timedelta(days=1)
+        home = _team("home", ["GOLD", "GOLD"])
+        teams = {
+            "ok": (_team("ok", ["PLATINUM"]), {"min_rank": "GOLD", "max_rank": "DIAMOND", "offset": 30}),
+            "format": (_team("format", ["GOLD"]), {"format": "BO1"}),
+            "late": (_team("late", ["GOLD"]), {"offset": 180}),
+            "fearless": (_team("fearless", ["GOLD"]), {"fearless": True}),
+            "too-low": (_team("too-low", ["GOLD"]), {"min_rank": "DIAMOND"}),
+            "too-high": (_team("too-high", ["DIAMOND"]), {}),
+            "unranked": (_team("unranked", [None]), {"offset": -20}),
+        }
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as db:
+            scrims = {"home": Scrim(
+                team=home, captain_discord_id=home.captain_discord_id, scheduled_at=start,
+                format="BO3", min_rank="SILVER", max_rank="PLATINUM",
+            )}
+            for name, (team, opts) in teams.items():
+                scrims[name] = Scrim(
+                    team=team, captain_discord_id=team.captain_discord_id,
+                    scheduled_at=start + timedelta(minutes=opts.get("offset", 0)),
+                    format=opts.get("format", "BO3"), fearless=opts.get("fearless", False),
+                    min_rank=opts.get("min_rank"), max_rank=opts.get("max_rank"),
+                )
+            db.add_all(scrims.values())
+            await db.commit()
+        return {name: scrim.id for name, scrim in scrims.items()}
+
+    async def test_find_matches_applies_every_rule(self, pg_engine):
+        ids = await self._seed(pg_engine)
+        session_factory = async_sessionmaker(pg_engine, expire_on_commit=False)
+        async with session_factory() as db:
+            from app.routers.scrims import _get_scrim_or_404
+
+            home = await _get_scrim_or_404(str(ids["home"]), db)
+            matches = await find_matches(db, home, now=datetime.now(UTC))
+
+        assert [m.id for m in matches] == [ids["unranked"], ids["ok"]]
+
+    async def test_collect_new_matches_reports_each_pair_once(self, pg_engine):
+        ids = await self._seed(pg_engine)
+        session_factory = async_sessionmaker(pg_engine, expire_on_commit=False)
+        async with session_factory() as db:
+            pairs = await collect_new_matches(db, now=datetime.now(UTC))
+        async with session_factory() as db:
+            again = await collect_new_matches(db, now=datetime.now(UTC))
+
+        found = {frozenset((a.id, b.id)) for a, b in pairs}
+        assert frozenset((ids["home"], ids["ok"])) in found
+        assert frozenset((ids["home"], ids["unranked"])) in found
+        assert frozenset((ids["home"], ids["format"])) not in found
+        assert all(a.id < b.id for a, b in pairs)
+        assert again == []
@@ -1,6 +1,13 @@
+import uuid
+from datetime import UTC, date, datetime
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.models import Scrim
+from tests.conftest import _apply_defaults_on_flush, _team_model
 
 
 class TestListScrims:
@@ -17,6 +24,100 @@ class TestListScrims:
         assert "scrims" in data
         assert "total" in data
 
+    async def test_window_filters_use_paris_slot_columns(self, app_client, mock_db):
+        from sqlalchemy.dialects import postgresql
+
+        count = MagicMock()
+        count.scalar_one.return_value = 0
+        listing = MagicMock()
+        listing.scalars.return_value.all.return_value = []
+        mock_db.execute = AsyncMock(side_effect=[count, listing])
+
+        resp = await app_client.get("/api/scrims", params={
+            "date_from": "2026-10-24", "date_to": "2026-10-25", "weekdays": [7, 6, 9],
+            "hour_min": 19, "hour_max": 23,
+        })
+        assert resp.status_code == 200
+        sql = str(mock_db.execute.await_args_list[1].args[0].compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True},
+        ))
+        assert "scrims.paris_date >= '2026-10-24'" in sql
+        assert "scrims.paris_date <= '2026-10-25'" in sql
+        assert "scrims.paris_weekday IN (6, 7)" in sql
+        assert "scrims.paris_hour >= 19" in sql
+        assert "scrims.paris_hour <= 23" in sql
+        assert "timezone(" not in sql
+
+    async def test_roster_filters_use_team_aggregates(self, app_client, mock_db):
+        from sqlalchemy.dialects import postgresql
+
+        count = MagicMock()
+        count.scalar_one.return_value = 0
+        listing = MagicMock()
+        listing.scalars.return_value.all.return_value = []
+        mock_db.execute = AsyncMock(side_effect=[count, listing])
+
+        resp = await app_client.get("/api/scrims", params={"roster_min_rank": "EMERALD", "open_role": "JUNGLE"})
+        assert resp.status_code == 200
+        sql = str(mock_db.execute.await_args_list[0].args[0].compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True},
+        ))
+        assert "scrims.team_id IN (SELECT teams.id" in sql
+        assert "teams.roster_rank_avg >= 5" in sql
+        assert "teams.roster_role_mask & 2 = 0" in sql
+
+    async def test_invalid_date_returns_400(self, app_client, mock_db):
+        resp = await app_client.get("/api/scrims", params={"date_from": "24/10"})
+        assert resp.status_code == 400
+
+    async def test_reversed_window_returns_400(self, app_client, mock_db):
+        resp = await app_client.get("/api/scrims", params={"date_from": "2026-10-25", "date_to": "2026-10-24"})
+        assert resp.status_code == 400
+
+
+class TestGetScrim:
+    async def test_unknown_scrim_returns_404(self, app_client, mock_db):
+        missing = MagicMock()
+        missing.scalar_one_or_none.return_value = None
+        mock_db.execute = AsyncMock(return_value=missing)
+
+        resp = await app_client.get(f"/api/scrims/{uuid.uuid4()}")
+        assert resp.status_code == 404
+
+
+class TestScrimMatches:
+    async def test_unknown_scrim_returns_404(self, app_client, mock_db):
+        missing = MagicMock()
+        missing.scalar_one_or_none.return_value = None
+        mock_db.execute = AsyncMock(return_value=missing)
+
+        resp = await app_client.get(f"/api/scrims/{uuid.uuid4()}/matches")
+        assert resp.status_code == 404
+
+    async def test_tolerance_is_bounded(self, app_client, mock_db):
+        resp = await app_client.get(f"/api/scrims/{uuid.uuid4()}/matches", params={"tolerance_minutes": 1000})
+        assert resp.status_code == 422
+
+
+class TestParisSlotColumns:
+    async def test_generated_columns_follow_paris_time_across_dst(self, pg_engine):
+        session_factory = async_sessionmaker(pg_engine, expire_on_commit=False)
+        async with session_factory() as db:
+            team = _team_model()
+            before = Scrim(team=team, captain_discord_id=team.captain_discord_id,
+                           scheduled_at=datetime(2026, 10, 24, 17, 30, tzinfo=UTC))
+            after = Scrim(team=team, captain_discord_id=team.captain_discord_id,
+                          scheduled_at=datetime(2026, 10, 25, 18, 30, tzinfo=UTC))
+            late = Scrim(team=team, captain_discord_id=team.captain_discord_id,
+                         scheduled_at=datetime(2026, 10, 25, 23, 15, tzinfo=UTC))
+            db.add_all([before, after, late])
+            await db.commit()
+
+        # 17:30Z is 19:30 CEST on Saturday; after the DST change 18:30Z is 19:30 CET on Sunday.
+        assert (before.paris_date, before.paris_hour, before.paris_weekday) == (date(2026, 10, 24), 19, 6)
+        assert (after.paris_date, after.paris_hour, after.paris_weekday) == (date(2026, 10, 25), 19, 7)
+        assert (late.paris_date, late.paris_hour, late.paris_weekday) == (date(2026, 10, 26), 0, 1)
+
 
 class TestCreateScrim:
     async def test_no_bot_secret_returns_422(self, app_client, mock_db):
@@ -39,6 +140,35 @@ class TestCreateScrim:
         )
         assert resp.status_code == 403
 
+    async def test_builds_response_without_reload(self, app_client, mock_db):
+        team = _team_model()
+        team_result = MagicMock()
+        team_result.scalar_one_or_none.return_value = team
+        previous_result = MagicMock()
+        previous_result.scalars.return_value.all.return_value = []
+        mock_db.execute = AsyncMock(side_effect=[team_result, previous_result, MagicMock(), MagicMock()])
+        _apply_defaults_on_flush(mock_db)
+
+        resp = await app_client.post(
+            "/api/scrims",
+            json={
+                "team_slug": team.slug,
+                "captain_discord_id": team.captain_discord_id,
+                "scheduled_at": "2026-03-01T20:00:00+01:00",
+                "format": "BO3",
+            },
+            headers={"X-Bot-Secret": settings.bot_api_secret},
+        )
+
+        assert resp.status_code == 201
+        data = resp.json()
+        assert data["team"]["slug"] == team.slug
+        assert data["format"] == "BO3"
+        assert mock_db.execute.await_count == 4  # team, previous active scrims, event notify, saved search matching
+        [event] = mock_db.add_all.call_args.args[0]
+        assert (event.kind, event.payload) == ("scrim.posted", {"id": data["id"], "team_slug": team.slug})
+        mock_db.refresh.assert_not_awaited()
+
 
 class TestCancelScrim:
     async def test_no_bot_secret_returns_422(self, app_client, mock_db):
@@ -51,3 +181,17 @@ class TestCancelScrim:
             headers={"X-Bot-Secret": "wrong-secret"},
         )
         assert resp.status_code == 403
+
+    async def test_publishes_cancellation(self, app_client, mock_db):
+        team = _team_model()
+        scrim = Scrim(id=uuid.uuid4(), team=team, captain_discord_id=team.captain_discord_id, is_active=True)
+        found = MagicMock()
+        found.scalar_one_or_none.return_value = scrim
+        mock_db.execute = AsyncMock(return_value=found)
+
+        resp = await app_client.delete(f"/api/scrims/{scrim.id}", headers={"X-Bot-Secret": settings.bot_api_secret})
+
+        assert resp.status_code == 204
+        assert scrim.is_active is False
+        [event] = mock_db.add_all.call_args.args[0]
+        assert (event.kind, event.payload) == ("scrim.cancelled", {"id": str(scrim.id), "team_slug": team.slug})
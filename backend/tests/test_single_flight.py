@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import single_flight
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_run(self):
+        inflight = {}
+        calls = 0
+
+        async def render():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return b"png"
+
+        results = await asyncio.gather(*[single_flight(inflight, "png:team_x", render) for _ in range(10)])
+        assert calls == 1
+        assert results == [b"png"] * 10
+        assert not inflight
+
+    async def test_sequential_calls_run_again(self):
+        inflight = {}
+        calls = 0
+
+        async def render():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await single_flight(inflight, "k", render) == 1
+        assert await single_flight(inflight, "k", render) == 2
+
+    async def test_distinct_keys_not_shared(self):
+        inflight = {}
+        async def render(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        a, b = await asyncio.gather(
+            single_flight(inflight, "a", lambda: render("a")),
+            single_flight(inflight, "b", lambda: render("b")),
+        )
+        assert (a, b) == ("a", "b")
+
+    async def test_error_propagates_to_waiters(self):
+        inflight = {}
+        async def render():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(*[single_flight(inflight, "err", render) for _ in range(3)], return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert not inflight
+
+    async def test_waiter_retries_when_leader_cancelled(self):
+        inflight = {}
+        started = asyncio.Event()
+        calls = 0
+
+        async def render():
+            nonlocal calls
+            calls += 1
+            started.set()
+            await asyncio.sleep(0.05)
+            return calls
+
+        leader = asyncio.create_task(single_flight(inflight, "c", render))
+        await started.wait()
+        waiter = asyncio.create_task(single_flight(inflight, "c", render))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert await waiter == 2
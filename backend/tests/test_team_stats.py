@@ -0,0 +1,118 @@
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import Team, TeamMember
+from app.services.team_stats import (
+    apply_roster_stats,
+    refresh_player_team_stats,
+    roster_stats,
+    team_stats_update,
+)
+from tests.conftest import _player_model, _team_model
+
+
+def _members(*pairs):
+    """TeamMembers from (role, solo tier) pairs."""
+    return [
+        TeamMember(
+            player=_player_model(slug=f"p{i}", riot_puuid=f"p{i}", discord_user_id=None, rank_solo_tier=tier),
+            role=role,
+        )
+        for i, (role, tier) in enumerate(pairs)
+    ]
+
+
+class TestRosterStats:
+    def test_aggregates(self):
+        stats = roster_stats(_members(("TOP", "GOLD"), ("JUNGLE", "PLATINUM"), ("MIDDLE", "DIAMOND"), ("TOP", None)))
+        assert stats == {
+            "roster_size": 4,
+            "roster_rank_avg": 4,
+            "roster_rank_median": 4,
+            "roster_rank_max": 6,
+            "roster_role_mask": 1 | 2 | 4,
+        }
+
+    def test_average_rounds_half_up_and_median_is_lower_middle(self):
+        stats = roster_stats(_members(("TOP", "GOLD"), ("JUNGLE", "PLATINUM")))
+        assert stats["roster_rank_avg"] == 4
+        assert stats["roster_rank_median"] == 3
+
+    def test_empty_roster(self):
+        assert roster_stats([]) == {
+            "roster_size": 0,
+            "roster_rank_avg": None,
+            "roster_rank_median": None,
+            "roster_rank_max": None,
+            "roster_role_mask": 0,
+        }
+
+    def test_apply_to_subset(self):
+        team = _team_model()
+        team.members = _members(("TOP", "GOLD"), ("BOTTOM", "CHALLENGER"))
+        apply_roster_stats(team, team.members[:1])
+        assert (team.roster_size, team.roster_rank_max, team.roster_role_mask) == (1, 3, 1)
+
+
+class TestTeamStatsUpdate:
+    def test_scoped_to_the_players_team(self):
+        sql = str(team_stats_update(player_id=uuid.uuid4()).compile(dialect=postgresql.dialect()))
+        assert "percentile_disc(0.5) WITHIN GROUP (ORDER BY players.rank_solo_score)" in sql
+        assert "LEFT OUTER JOIN team_members ON team_members.team_id = teams.id LEFT OUTER JOIN" in sql
+        assert "WHERE team_members.player_id = %(player_id_1)s" in sql
+
+    def test_leaving_player_is_left_out(self):
+        sql = str(team_stats_update(player_id=uuid.uuid4(), leaving=True).compile(dialect=postgresql.dialect()))
+        assert "team_members.team_id = teams.id AND team_members.player_id !=" in sql
+
+    def test_backfill_touches_every_team(self):
+        sql = str(team_stats_update().compile(dialect=postgresql.dialect()))
+        assert "team_members.player_id =" not in sql
+
+
+class TestTeamStatsOnPostgres:
+    async def _seed(self, engine):
+        team = _team_model(slug="t", name="t")
+        team.members = _members(("TOP", "GOLD"), ("JUNGLE", "PLATINUM"), ("MIDDLE", None))
+        apply_roster_stats(team)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            db.add(team)
+            await db.commit()
+        return team
+
+    async def _stored(self, engine, team_id):
+        async with async_sessionmaker(engine)() as db:
+            team = (await db.execute(select(Team).where(Team.id == team_id))).scalar_one()
+            return {key: getattr(team, key) for key in roster_stats([])}
+
+    async def test_sql_matches_python_after_rank_change(self, pg_engine):
+        team = await self._seed(pg_engine)
+        changed = team.members[2].player
+        async with async_sessionmaker(pg_engine)() as db:
+            player = await db.get(type(changed), changed.id)
+            player.rank_solo_tier = "CHALLENGER"
+            assert await refresh_player_team_stats(db, player.id) == team.slug
+            await db.commit()
+
+        changed.rank_solo_tier = "CHALLENGER"
+        assert await self._stored(pg_engine, team.id) == roster_stats(team.members)
+
+    async def test_leaving_player(self, pg_engine):
+        team = await self._seed(pg_engine)
+        async with async_sessionmaker(pg_engine)() as db:
+            await refresh_player_team_stats(db, team.members[1].player.id, leaving=True)
+            await db.commit()
+
+        assert await self._stored(pg_engine, team.id) == roster_stats([team.members[0], team.members[2]])
+
+    async def test_backfill(self, pg_engine):
+        team = await self._seed(pg_engine)
+        async with async_sessionmaker(pg_engine)() as db:
+            await db.execute(Team.__table__.update().values(roster_size=0, roster_role_mask=0))
+            await db.execute(team_stats_update())
+            await db.commit()
+
+        assert await self._stored(pg_engine, team.id) == roster_stats(team.members)
@@ -2,6 +2,17 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.config import settings
+from app.routers.teams import _can_edit_team
+from app.services.token_store import create_token
+from tests.conftest import _apply_defaults_on_flush, _player_model, _team_model
+
+
+def _result(value):
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = value
+    return result
+
 
 class TestListTeams:
     async def test_returns_200(self, app_client, mock_db):
@@ -18,6 +29,45 @@ class TestListTeams:
         assert "total" in data
 
 
+    async def test_filters_use_index_friendly_array_operators(self, app_client, mock_db):
+        from sqlalchemy.dialects import postgresql
+
+        count = MagicMock()
+        count.scalar_one.return_value = 0
+        listing = MagicMock()
+        listing.scalars.return_value.all.return_value = []
+        mock_db.execute = AsyncMock(side_effect=[count, listing])
+
+        resp = await app_client.get(
+            "/api/teams", params={"role": "top", "activities": ["SCRIMS", "LAN"], "frequency_min": 2},
+        )
+        assert resp.status_code == 200
+        sql = str(mock_db.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+        assert "teams.wanted_roles @>" in sql
+        assert "teams.activities &&" in sql
+        assert "teams.frequency_max >=" in sql
+
+    async def test_roster_filters_read_stored_aggregates(self, app_client, mock_db):
+        from sqlalchemy.dialects import postgresql
+
+        count = MagicMock()
+        count.scalar_one.return_value = 0
+        listing = MagicMock()
+        listing.scalars.return_value.all.return_value = []
+        mock_db.execute = AsyncMock(side_effect=[count, listing])
+
+        resp = await app_client.get(
+            "/api/teams", params={"roster_min_rank": "platinum", "roster_max_rank": "DIAMOND", "open_role": "jungle"},
+        )
+        assert resp.status_code == 200
+        sql = str(mock_db.execute.await_args_list[0].args[0].compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True},
+        ))
+        assert "teams.roster_rank_avg >= 4" in sql
+        assert "teams.roster_rank_avg <= 6" in sql
+        assert "teams.roster_role_mask & 2 = 0" in sql
+
+
 class TestGetTeam:
     async def test_404_when_not_found(self, app_client, mock_db):
         mock_result = MagicMock()
@@ -28,6 +78,75 @@ class TestGetTeam:
         assert resp.status_code == 404
 
 
+class TestGetTeamsBatch:
+    async def test_public_lookup_sees_lfp_teams_only(self, app_client, mock_db):
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [_team_model()]
+        mock_db.execute = AsyncMock(return_value=result)
+        resp = await app_client.post("/api/teams:batch", json={"slugs": ["a", "b"]})
+        assert resp.status_code == 200
+        assert len(resp.json()["teams"]) == 1
+        assert "teams.is_lfp IS true" in str(mock_db.execute.call_args.args[0])
+
+    async def test_bot_sees_hidden_teams(self, app_client, mock_db):
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = []
+        mock_db.execute = AsyncMock(return_value=result)
+        resp = await app_client.post(
+            "/api/teams:batch", json={"captain_discord_ids": ["1"]}, headers={"X-Bot-Secret": settings.bot_api_secret},
+        )
+        assert resp.status_code == 200
+        assert "is_lfp" not in str(mock_db.execute.call_args.args[0]).split("WHERE")[1]
+
+    async def test_captain_ids_require_bot_secret(self, app_client, mock_db):
+        resp = await app_client.post("/api/teams:batch", json={"captain_discord_ids": ["1"]})
+        assert resp.status_code == 403
+
+
+class TestRecommendedPlayers:
+    async def test_hidden_team_requires_edit_token(self, app_client, mock_db):
+        mock_db.execute = AsyncMock(return_value=_result(_team_model(is_lfp=False)))
+
+        resp = await app_client.get("/api/teams/test-team/recommended-players")
+        assert resp.status_code == 404
+        assert mock_db.execute.await_count == 1
+
+    async def test_returns_scored_players(self, app_client, mock_db):
+        ranked = MagicMock()
+        player = _player_model()
+        ranked.all.return_value = [MagicMock(id=player.id, score=83.6)]
+        loaded = MagicMock()
+        loaded.scalars.return_value.all.return_value = [player]
+        mock_db.execute = AsyncMock(side_effect=[_result(_team_model()), ranked, loaded])
+
+        resp = await app_client.get("/api/teams/test-team/recommended-players", params={"limit": 5})
+        assert resp.status_code == 200
+        [entry] = resp.json()["players"]
+        assert entry["score"] == 84
+        assert entry["player"]["slug"] == player.slug
+
+
+class TestCanEditTeam:
+    def _team(self):
+        team = MagicMock()
+        team.slug = "new-name"
+        team.captain_discord_id = "42"
+        return team
+
+    def test_captain_token_survives_rename(self):
+        token = create_token(action="team_edit", discord_user_id="42", discord_username="cap", slug="old-name")
+        assert _can_edit_team(token, self._team()) is True
+
+    def test_other_user_is_rejected(self):
+        token = create_token(action="team_edit", discord_user_id="7", discord_username="x", slug="new-name")
+        assert _can_edit_team(token, self._team()) is False
+
+    def test_wrong_action_is_rejected(self):
+        token = create_token(action="edit", discord_user_id="42", discord_username="cap", slug="new-name")
+        assert _can_edit_team(token, self._team()) is False
+        assert _can_edit_team(None, self._team()) is False
+
+
 class TestCreateTeam:
     async def test_no_token_returns_422(self, app_client, mock_db):
         resp = await app_client.post("/api/teams", json={})
@@ -42,6 +161,59 @@ class TestCreateTeam:
             )
             assert resp.status_code == 403
 
+    async def test_builds_response_without_reload(self, app_client, mock_db):
+        token_data = MagicMock(team_name="Les Bleus", discord_user_id="111", discord_username="captain")
+        mock_db.execute = AsyncMock(return_value=_result(None))
+        _apply_defaults_on_flush(mock_db)
+        with (
+            patch("app.routers.teams.consume_token", new_callable=AsyncMock, return_value=token_data),
+            patch("app.routers.teams.schedule_team_og_render"),
+        ):
+            resp = await app_client.post("/api/teams", params={"token": "t"}, json={"wanted_roles": ["TOP"]})
+
+        assert resp.status_code == 201
+        data = resp.json()
+        assert data["slug"] == "les-bleus"
+        assert data["members"] == []
+        assert mock_db.execute.await_count == 4  # slug and captain uniqueness checks, event notify, saved search matching
+        [event] = mock_db.add_all.call_args.args[0]
+        assert (event.kind, event.payload) == ("team.created", {"slug": "les-bleus", "is_lfp": True})
+        mock_db.refresh.assert_not_awaited()
+
+
+class TestUpdateTeam:
+    async def test_builds_response_without_reload(self, app_client, mock_db):
+        token_data = MagicMock(action="team_edit", discord_user_id="111111111")
+        mock_db.execute = AsyncMock(return_value=_result(_team_model()))
+        with (
+            patch("app.routers.teams.validate_token", new_callable=AsyncMock, return_value=token_data),
+            patch("app.routers.teams.schedule_team_og_render"),
+        ):
+            resp = await app_client.patch("/api/teams/test-team", params={"token": "t"}, json={"is_lfp": False})
+
+        assert resp.status_code == 200
+        assert resp.json()["is_lfp"] is False
+        assert mock_db.execute.await_count == 2  # team, event notify
+        [event] = mock_db.add_all.call_args.args[0]
+        assert (event.kind, event.payload) == ("team.updated", {"slug": "test-team", "is_lfp": False})
+        mock_db.refresh.assert_not_awaited()
+
+    async def test_rename_event_carries_old_slug(self, app_client, mock_db):
+        token_data = MagicMock(action="team_edit", discord_user_id="111111111")
+        mock_db.execute = AsyncMock(side_effect=[_result(_team_model()), _result(None), MagicMock()])
+        with (
+            patch("app.routers.teams.validate_token", new_callable=AsyncMock, return_value=token_data),
+            patch("app.routers.teams.invalidate_team_og_cache"),
+            patch("app.routers.teams.schedule_team_og_render"),
+        ):
+            resp = await app_client.patch(
+                "/api/teams/test-team", params={"token": "t"}, json={"name": "Les Bleus", "is_lfp": False},
+            )
+
+        assert resp.status_code == 200
+        [event] = mock_db.add_all.call_args.args[0]
+        assert event.payload == {"slug": "les-bleus", "is_lfp": False, "old_slug": "test-team"}
+
 
 class TestAddMember:
     async def test_no_bot_secret_returns_422(self, app_client, mock_db):
@@ -59,6 +231,24 @@ class TestAddMember:
         )
         assert resp.status_code == 403
 
+    async def test_builds_response_without_reload(self, app_client, mock_db):
+        player = _player_model()
+        mock_db.execute = AsyncMock(side_effect=[_result(_team_model()), _result(player), _result(None), MagicMock()])
+        with patch("app.routers.teams.schedule_team_og_render"):
+            resp = await app_client.post(
+                "/api/teams/test-team/members",
+                json={"player_slug": player.slug, "discord_user_id": "111111111", "role": "jungle"},
+                headers={"X-Bot-Secret": settings.bot_api_secret},
+            )
+
+        assert resp.status_code == 200
+        members = resp.json()["members"]
+        assert [(m["player"]["slug"], m["role"]) for m in members] == [(player.slug, "JUNGLE")]
+        assert resp.json()["roster_size"] == 1
+        assert resp.json()["roster_rank_avg"] == 3
+        assert mock_db.execute.await_count == 4  # team, player, existing membership, event notify
+        mock_db.refresh.assert_not_awaited()
+
 
 class TestRemoveMember:
     async def test_no_bot_secret_returns_422(self, app_client, mock_db):
@@ -1,93 +1,139 @@
-from datetime import datetime, timezone
-from unittest.mock import AsyncMock, MagicMock
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from app.services.token_store import consume_token, create_token, validate_token
+from app.services.token_store import (
+    TOKEN_TTL,
+    check_secret_key,
+    consume_token,
+    create_token,
+    decode_token,
+    validate_token,
+)
 
 
-def _make_token_obj(token="abc123", action="create", discord_user_id="999"):
-    obj = MagicMock()
-    obj.token = token
-    obj.action = action
-    obj.discord_user_id = discord_user_id
-    obj.discord_username = "user"
-    obj.game_name = "Player"
-    obj.tag_line = "EUW"
-    obj.slug = None
-    obj.team_name = None
-    obj.created_at = datetime.now(timezone.utc)
-    return obj
+def _token(action="create", **kwargs):
+    return create_token(
+        action=action,
+        discord_user_id="999",
+        discord_username="user",
+        game_name="Player",
+        tag_line="EUW",
+        **kwargs,
+    )
+
+
+def _db(scalar=None):
+    db = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = scalar
+    db.execute.return_value = mock_result
+    return db
 
 
 class TestCreateToken:
-    async def test_creates_token(self):
-        db = AsyncMock()
-        db.add = MagicMock()
-        result = await create_token(
-            db,
-            action="create",
-            discord_user_id="999",
-            discord_username="user",
-            game_name="Player",
-            tag_line="EUW",
-        )
-        db.add.assert_called_once()
-        assert result.action == "create"
-        assert result.discord_user_id == "999"
-        assert len(result.token) == 32
+    def test_creates_signed_token(self):
+        data = _token()
+        assert data.action == "create"
+        assert data.discord_user_id == "999"
+        assert "." in data.token
+        assert data.expires_at > time.time()
+
+    def test_tokens_are_unique(self):
+        assert _token().token != _token().token
+
+
+class TestDecodeToken:
+    def test_round_trip(self):
+        data = _token(action="edit", slug="Player-EUW")
+        decoded = decode_token(data.token)
+        assert decoded == data
+
+    def test_tampered_payload_is_rejected(self):
+        data = _token(action="edit", slug="Player-EUW")
+        payload, signature = data.token.split(".")
+        other = _token(action="edit", slug="Victim-EUW")
+        assert decode_token(f"{other.token.split('.')[0]}.{signature}") is None
+        assert decode_token(f"{payload}.{signature[:-2]}xx") is None
+
+    def test_wrong_key_is_rejected(self):
+        assert decode_token(_token().token, key="another-secret") is None
+
+    def test_expired_token_is_rejected(self):
+        data = _token()
+        assert decode_token(data.token, now=time.time() + TOKEN_TTL.total_seconds() + 1) is None
+
+    def test_garbage_is_rejected(self):
+        assert decode_token("nonexistent") is None
+        assert decode_token("not.base64!") is None
+        assert decode_token("é.è") is None
 
 
 class TestValidateToken:
-    async def test_returns_token(self):
-        db = AsyncMock()
-        token_obj = _make_token_obj()
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = token_obj
-        db.execute.return_value = mock_result
+    async def test_edit_token_needs_no_database(self):
+        db = _db()
+        data = _token(action="edit", slug="Player-EUW")
+        result = await validate_token(db, data.token)
+        assert result.slug == "Player-EUW"
+        db.execute.assert_not_awaited()
 
-        result = await validate_token(db, "abc123")
-        assert result is not None
-        assert result.token == "abc123"
+    async def test_consumed_one_time_token_is_invalid(self):
+        db = _db(scalar="nonce")
+        assert await validate_token(db, _token().token) is None
 
-    async def test_returns_none_for_missing(self):
-        db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        db.execute.return_value = mock_result
+    async def test_unused_one_time_token_is_valid(self):
+        db = _db(scalar=None)
+        assert await validate_token(db, _token().token) is not None
 
-        result = await validate_token(db, "nonexistent")
-        assert result is None
+    async def test_returns_none_for_invalid(self):
+        assert await validate_token(_db(), "nonexistent") is None
 
 
 class TestConsumeToken:
-    async def test_consumes_and_deletes(self):
-        db = AsyncMock()
-        token_obj = _make_token_obj(action="create")
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = token_obj
-        db.execute.return_value = mock_result
-
-        result = await consume_token(db, "abc123", "create")
-        assert result is not None
-        assert result.token == "abc123"
-        db.delete.assert_called_once_with(token_obj)
+    async def test_consumes_once(self):
+        data = _token(action="create")
+        db = _db(scalar=data.nonce)
+        result = await consume_token(db, data.token, "create")
+        assert result == data
+        db.execute.assert_awaited_once()
+
+    async def test_already_consumed_returns_none(self):
+        db = _db(scalar=None)
+        assert await consume_token(db, _token().token, "create") is None
 
     async def test_wrong_action_returns_none(self):
-        db = AsyncMock()
-        token_obj = _make_token_obj(action="create")
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = token_obj
-        db.execute.return_value = mock_result
-
-        result = await consume_token(db, "abc123", "edit")
-        assert result is None
-
-    async def test_missing_token_returns_none(self):
-        db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        db.execute.return_value = mock_result
-
-        result = await consume_token(db, "nonexistent", "create")
-        assert result is None
+        db = _db()
+        assert await consume_token(db, _token(action="create").token, "edit") is None
+        db.execute.assert_not_awaited()
+
+    async def test_invalid_token_returns_none(self):
+        assert await consume_token(_db(), "nonexistent", "create") is None
+
+    async def test_secret_comes_from_settings(self):
+        data = _token()
+        with patch("app.services.token_store.settings") as fake_settings:
+            fake_settings.secret_key = "rotated"
+            assert await consume_token(_db(scalar=data.nonce), data.token, "create") is None
+
+
+class TestSecretKey:
+    @pytest.mark.parametrize("key", ["", "change-me-in-production"])
+    def test_refuses_default_or_empty_key(self, key):
+        with pytest.raises(RuntimeError):
+            check_secret_key(key)
+        with patch("app.services.token_store.settings") as fake_settings:
+            fake_settings.secret_key = key
+            with pytest.raises(RuntimeError):
+                _token()
+        with pytest.raises(RuntimeError):
+            decode_token(_token().token, key=key)
+
+    async def test_startup_fails_with_default_key(self):
+        from app.main import app, lifespan
+
+        with patch("app.main.settings") as fake_settings:
+            fake_settings.secret_key = "change-me-in-production"
+            with pytest.raises(RuntimeError):
+                async with lifespan(app):
+                    pass
@@ -7,9 +7,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 import aiohttp
 import discord
+from discord import app_commands
 from discord.ext import commands
 from dotenv import load_dotenv
 
+from utils import acting_user, send_acting_user
+
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
 TOKEN = os.getenv("DISCORD_BOT_TOKEN", "")
@@ -20,9 +23,19 @@ DEV_GUILD_ID = os.getenv("DEV_GUILD_ID", "")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 log = logging.getLogger("riftteam")
 
-COGS = ["cogs.profile", "cogs.lfp", "cogs.register", "cogs.edit", "cogs.team", "cogs.reactivate", "cogs.matchmaking", "cogs.scrim", "cogs.get_started", "cogs.help"]
+COGS = ["cogs.profile", "cogs.lfp", "cogs.register", "cogs.edit", "cogs.team", "cogs.reactivate", "cogs.matchmaking", "cogs.scrim", "cogs.get_started", "cogs.help", "cogs.announcements", "cogs.saved_search", "cogs.name_index"]
 
 DEACTIVATION_INTERVAL = 12 * 3600
+SCRIM_MATCH_INTERVAL = 10 * 60
+
+
+class RiftCommandTree(app_commands.CommandTree):
+    """Command tree that makes API calls on behalf of the user running the command."""
+
+    async def interaction_check(self, interaction: discord.Interaction, /) -> bool:
+        """Record the invoking user for the rest of the command (or autocomplete) task."""
+        acting_user.set(str(interaction.user.id))
+        return True
 
 
 class RiftBot(commands.Bot):
@@ -30,23 +43,38 @@ class RiftBot(commands.Bot):
 
     def __init__(self) -> None:
         intents = discord.Intents.default()
-        super().__init__(command_prefix="!", intents=intents)
+        super().__init__(command_prefix="!", intents=intents, tree_cls=RiftCommandTree)
         self.http_session: aiohttp.ClientSession | None = None
         self.api_secret: str = BOT_API_SECRET
         self._deactivation_task: asyncio.Task | None = None
+        self._scrim_match_task: asyncio.Task | None = None
+
+    def dispatch(self, event_name: str, /, *args: object, **kwargs: object) -> None:
+        """Run button and modal listeners on behalf of the user who clicked."""
+        if event_name != "interaction":
+            super().dispatch(event_name, *args, **kwargs)
+            return
+        interaction = args[0]
+        assert isinstance(interaction, discord.Interaction)
+        token = acting_user.set(str(interaction.user.id))
+        try:
+            super().dispatch(event_name, *args, **kwargs)
+        finally:
+            acting_user.reset(token)
 
     async def setup_hook(self) -> None:
         """Create the HTTP session and load all cog extensions."""
         self.http_session = aiohttp.ClientSession(
             base_url=API_URL,
             headers={"X-Bot-Secret": BOT_API_SECRET},
+            middlewares=(send_acting_user,),
         )
         for cog in COGS:
             await self.load_extension(cog)
             log.info("Loaded %s", cog)
 
     async def on_ready(self) -> None:
-        """Sync slash commands and start the deactivation loop."""
+        """Sync slash commands and start the deactivation and scrim matching loops."""
         assert self.user is not None
         if DEV_GUILD_ID:
             guild = discord.Object(id=int(DEV_GUILD_ID))
@@ -57,6 +85,8 @@ class RiftBot(commands.Bot):
         log.info("Logged in as %s — synced %d commands", self.user, len(synced))
         if self._deactivation_task is None:
             self._deactivation_task = asyncio.create_task(self._deactivation_loop())
+        if self._scrim_match_task is None:
+            self._scrim_match_task = asyncio.create_task(self._scrim_match_loop())
 
     async def _deactivation_loop(self) -> None:
         """Periodically call the backend to deactivate stale players and teams."""
@@ -113,9 +143,44 @@ class RiftBot(commands.Bot):
         except Exception:
             log.warning("Failed to DM user %s", discord_id)
 
+    async def _scrim_match_loop(self) -> None:
+        """Periodically ask the backend for new compatible scrim pairs."""
+        await self.wait_until_ready()
+        while not self.is_closed():
+            try:
+                await self._run_scrim_matching()
+            except Exception:
+                log.exception("Scrim match loop error")
+            await asyncio.sleep(SCRIM_MATCH_INTERVAL)
+
+    async def _run_scrim_matching(self) -> None:
+        """Fetch scrim pairs not notified yet and DM both captains."""
+        if not self.http_session:
+            return
+        try:
+            async with self.http_session.post(
+                "/api/maintenance/scrim-matches",
+                headers={"X-Bot-Secret": self.api_secret},
+            ) as resp:
+                if resp.status != 200:
+                    log.warning("Scrim matching endpoint returned %d", resp.status)
+                    return
+                data = await resp.json()
+        except Exception:
+            log.exception("Failed to call scrim matching endpoint")
+            return
+
+        from cogs.scrim import send_scrim_match_dm
+
+        for match in data.get("matches", []):
+            await send_scrim_match_dm(self, match["scrim"], match["opponent"])
+            await send_scrim_match_dm(self, match["opponent"], match["scrim"])
+
     async def close(self) -> None:
         if self._deactivation_task:
             self._deactivation_task.cancel()
+        if self._scrim_match_task:
+            self._scrim_match_task.cancel()
         if self.http_session:
             await self.http_session.close()
         await super().close()
@@ -0,0 +1,241 @@
+import asyncio
+import json
+import logging
+import time
+from typing import NamedTuple
+
+import aiohttp
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from cogs.matchmaking import build_team_embed
+from cogs.profile import build_profile_embed
+from cogs.scrim import _build_scrim_embed
+from config import APP_URL
+from utils import format_api_error, get_api_secret, get_session
+
+log = logging.getLogger("riftteam.announcements")
+
+STREAM_PATH = "/api/events/stream"
+# The backend sends a keepalive every 15 s, so a longer silence means the connection is dead.
+STREAM_READ_TIMEOUT = 60
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+CHANNEL_CACHE_TTL = 600
+
+
+class ServerEvent(NamedTuple):
+    """One event from the backend stream; ``id`` is the cursor to resume after."""
+
+    id: int | None
+    kind: str
+    data: dict
+
+
+class SSEParser:
+    """Incremental text/event-stream parser, fed one line at a time."""
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self._id: int | None = None
+        self._kind = "message"
+        self._data: list[str] = []
+
+    def feed(self, line: str) -> ServerEvent | None:
+        """Consume a line; return the event it completes, if any (comments and blank frames yield None)."""
+        line = line.rstrip("\r\n")
+        if not line:
+            event = ServerEvent(self._id, self._kind, json.loads("\n".join(self._data))) if self._data else None
+            self._reset()
+            return event
+        if line.startswith(":"):
+            return None
+        field, _, value = line.partition(":")
+        value = value.removeprefix(" ")
+        if field == "id":
+            self._id = int(value) if value.isdigit() else None
+        elif field == "event":
+            self._kind = value
+        elif field == "data":
+            self._data.append(value)
+        return None
+
+
+def announcement_path(event: ServerEvent) -> str | None:
+    """API path of the entity an event announces, or None for events that are not announced."""
+    if event.kind == "player.lft_on":
+        return f"/api/players/{event.data['slug']}"
+    if event.kind == "team.created" and event.data.get("is_lfp"):
+        return f"/api/teams/{event.data['slug']}"
+    if event.kind == "scrim.posted":
+        return f"/api/scrims/{event.data['id']}"
+    return None
+
+
+def build_announcement(kind: str, entity: dict) -> tuple[str, discord.Embed, discord.ui.View]:
+    """Build the message, embed and buttons announcing a player, team or scrim."""
+    view = discord.ui.View(timeout=None)
+    if kind == "player.lft_on":
+        if entity.get("discord_user_id"):
+            view.add_item(discord.ui.Button(
+                label="Contacter",
+                style=discord.ButtonStyle.secondary,
+                custom_id=f"rt_contact:{entity['discord_user_id']}",
+            ))
+        view.add_item(discord.ui.Button(
+            label="Voir le profil", style=discord.ButtonStyle.link, url=f"{APP_URL}/p/{entity['slug']}",
+        ))
+        content = f"\U0001f50e **{entity['riot_game_name']}#{entity['riot_tag_line']}** cherche une équipe !"
+        return content, build_profile_embed(entity), view
+    if kind == "team.created":
+        view.add_item(discord.ui.Button(
+            label="Postuler", style=discord.ButtonStyle.primary, custom_id=f"rt_apply_btn:{entity['slug']}",
+        ))
+        view.add_item(discord.ui.Button(
+            label="Voir l'équipe", style=discord.ButtonStyle.link, url=f"{APP_URL}/t/{entity['slug']}",
+        ))
+        return f"\U0001f6e1\ufe0f Nouvelle équipe : **{entity['name']}** recrute !", build_team_embed(entity), view
+    view.add_item(discord.ui.Button(
+        label="Contacter", style=discord.ButtonStyle.secondary, custom_id=f"rt_contact:{entity['captain_discord_id']}",
+    ))
+    return f"\u2694\ufe0f **{entity['team']['name']}** cherche un scrim !", _build_scrim_embed(entity), view
+
+
+class AnnouncementsCog(commands.Cog):
+    """Posts new LFT players, LFP teams and scrims to each guild's announcement channel as they happen."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self.cursor: int | None = None
+        self._connected = False
+        self._channels: dict[int, tuple[int | None, float]] = {}
+        self._task: asyncio.Task | None = None
+        self._announcements: set[asyncio.Task] = set()
+
+    async def cog_load(self) -> None:
+        self._task = asyncio.create_task(self._stream_loop())
+
+    async def cog_unload(self) -> None:
+        if self._task:
+            self._task.cancel()
+        for task in self._announcements:
+            task.cancel()
+
+    async def _stream_loop(self) -> None:
+        """Stay subscribed to the backend event stream, reconnecting with backoff and resuming at the cursor."""
+        await self.bot.wait_until_ready()
+        delay = RECONNECT_MIN_DELAY
+        while not self.bot.is_closed():
+            self._connected = False
+            try:
+                await self._consume()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.warning("Event stream disconnected (cursor %s)", self.cursor, exc_info=True)
+            delay = RECONNECT_MIN_DELAY if self._connected else min(delay * 2, RECONNECT_MAX_DELAY)
+            await asyncio.sleep(delay)
+
+    async def _consume(self) -> None:
+        """Read the stream until it closes, handling each event and advancing the cursor."""
+        headers = {"X-Bot-Secret": get_api_secret(self.bot)}
+        if self.cursor is not None:
+            headers["Last-Event-ID"] = str(self.cursor)
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=STREAM_READ_TIMEOUT)
+        async with get_session(self.bot).get(STREAM_PATH, headers=headers, timeout=timeout) as resp:
+            resp.raise_for_status()
+            self._connected = True
+            parser = SSEParser()
+            async for raw in resp.content:
+                event = parser.feed(raw.decode())
+                if event is None:
+                    continue
+                # Other cogs react to backend events through on_rt_event listeners.
+                self.bot.dispatch("rt_event", event)
+                # Posting to every guild is slow; it must not hold up reading the stream.
+                task = asyncio.create_task(self._announce(event))
+                self._announcements.add(task)
+                task.add_done_callback(self._announcements.discard)
+                if event.id is not None:
+                    self.cursor = event.id
+
+    async def _announce(self, event: ServerEvent) -> None:
+        """Fetch the announced entity and post it to every guild with an announcement channel."""
+        path = announcement_path(event)
+        if path is None:
+            return
+        try:
+            async with get_session(self.bot).get(path) as resp:
+                if resp.status == 404:
+                    return
+                resp.raise_for_status()
+                entity = await resp.json()
+        except Exception:
+            log.exception("Failed to fetch %s for announcement", path)
+            return
+
+        content, embed, view = build_announcement(event.kind, entity)
+        for guild in self.bot.guilds:
+            channel_id = await self._announcement_channel(guild.id)
+            channel = self.bot.get_channel(channel_id) if channel_id else None
+            if channel is None:
+                continue
+            try:
+                await channel.send(content, embed=embed, view=view)  # type: ignore[union-attr]
+            except discord.HTTPException:
+                log.warning("Failed to announce %s in guild %s", event.kind, guild.id)
+
+    async def _announcement_channel(self, guild_id: int) -> int | None:
+        """Return a guild's announcement channel ID, cached for a few minutes."""
+        cached = self._channels.get(guild_id)
+        if cached and time.monotonic() - cached[1] < CHANNEL_CACHE_TTL:
+            return cached[0]
+        try:
+            async with get_session(self.bot).get(f"/api/guild-settings/{guild_id}") as resp:
+                if resp.status == 404:
+                    channel_id = None
+                else:
+                    resp.raise_for_status()
+                    channel_id = (await resp.json()).get("announcement_channel_id")
+        except (aiohttp.ClientError, TimeoutError):
+            log.warning("Failed to fetch guild settings for %s", guild_id)
+            return cached[0] if cached else None
+        value = int(channel_id) if channel_id else None
+        self._channels[guild_id] = (value, time.monotonic())
+        return value
+
+    @app_commands.command(name="rt-announce-channel", description="Choisis le channel des annonces RiftTeam")
+    @app_commands.describe(channel="Channel des annonces (laisse vide pour les désactiver)")
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.guild_only()
+    async def rt_announce_channel(
+        self, interaction: discord.Interaction, channel: discord.TextChannel | None = None,
+    ) -> None:
+        await interaction.response.defer(ephemeral=True)
+        try:
+            async with get_session(self.bot).put(
+                f"/api/guild-settings/{interaction.guild_id}",
+                json={"announcement_channel_id": str(channel.id) if channel else None},
+                headers={"X-Bot-Secret": get_api_secret(self.bot)},
+            ) as resp:
+                resp.raise_for_status()
+        except Exception as exc:
+            log.exception("Failed to update guild settings")
+            await interaction.followup.send(format_api_error(exc), ephemeral=True)
+            return
+
+        self._channels[interaction.guild_id] = (channel.id if channel else None, time.monotonic())  # type: ignore[index]
+        if channel:
+            await interaction.followup.send(
+                f"Les nouveaux joueurs LFT, équipes et scrims seront annoncés dans {channel.mention}.",
+                ephemeral=True,
+            )
+        else:
+            await interaction.followup.send("Annonces RiftTeam désactivées sur ce serveur.", ephemeral=True)
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(AnnouncementsCog(bot))
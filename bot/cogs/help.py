@@ -54,7 +54,9 @@ class HelpCog(commands.Cog):
                 "`/rt-lfp` — Joueurs dispo (filtre r\u00f4le, rang)\n"
                 "`/rt-lft` — \u00c9quipes dispo (filtre r\u00f4le, rang)\n"
                 "`/rt-apply` — Postule \u00e0 une \u00e9quipe\n"
-                "`/rt-recruit` — Recrute un joueur"
+                "`/rt-recruit` — Recrute un joueur\n"
+                "`/rt-search-save` — Sauvegarde une recherche (nouveaux résultats en DM)\n"
+                "`/rt-search-list` / `/rt-search-delete` — Gère tes recherches sauvegardées"
             ),
             inline=False,
         )
@@ -69,6 +71,12 @@ class HelpCog(commands.Cog):
             inline=False,
         )
 
+        embed.add_field(
+            name="\u2699\ufe0f Serveur",
+            value="`/rt-announce-channel` — Choisit le channel des annonces (nouveaux LFT, équipes, scrims)",
+            inline=False,
+        )
+
         embed.set_footer(text="RiftTeam \u00b7 riftteam.fr")
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
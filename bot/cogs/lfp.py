@@ -8,7 +8,7 @@ from config import APP_URL
 from constants import RANK_CHOICES, ROLE_CHOICES
 from shared.constants import ROLE_EMOJIS, ROLE_NAMES
 from shared.format import format_rank
-from utils import build_info_parts, build_nav_view, build_no_results_msg, decode_list_filters, encode_list_filters, format_api_error, get_session
+from utils import PAGE_IMAGE_FILENAME, build_info_parts, build_nav_view, build_no_results_msg, decode_list_filters, encode_list_filters, fetch_page_image, format_api_error, get_session
 
 log = logging.getLogger("riftteam.lfp")
 
@@ -105,6 +105,9 @@ class LfpCog(commands.Cog):
             return
 
         embed = _build_embed(players, total, page, role)
+        page_image = await fetch_page_image(session, "players", [p["slug"] for p in players])
+        if page_image:
+            embed.set_image(url=f"attachment://{PAGE_IMAGE_FILENAME}")
         filters_encoded = encode_list_filters(role, min_rank, max_rank)
         view = build_nav_view("rt_lfp_page", page, total, PAGE_SIZE, filters_encoded)
 
@@ -128,10 +131,11 @@ class LfpCog(commands.Cog):
             row=4,
         ))
 
+        attachments = [page_image] if page_image else []
         if edit:
-            await interaction.edit_original_response(embed=embed, view=view)
+            await interaction.edit_original_response(embed=embed, view=view, attachments=attachments)
         else:
-            await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+            await interaction.followup.send(embed=embed, view=view, files=attachments, ephemeral=True)
 
     @app_commands.command(name="rt-lfp", description="Joueurs qui cherchent une équipe")
     @app_commands.describe(
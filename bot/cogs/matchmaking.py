@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 import discord
@@ -8,7 +9,7 @@ from cogs.profile import build_profile_embed
 from config import APP_URL, RANK_ICON_BASE
 from shared.constants import RANK_COLORS, RANK_ORDER, ROLE_EMOJIS, ROLE_NAMES
 from shared.format import format_rank, format_rank_range
-from utils import build_info_parts, format_api_error, get_session, parse_riot_id
+from utils import build_info_parts, fetch_json, format_api_error, get_session, name_choices, parse_riot_id
 
 log = logging.getLogger("riftteam.matchmaking")
 
@@ -127,30 +128,23 @@ class MatchmakingCog(commands.Cog):
         session = get_session(self.bot)
 
         try:
-            async with session.get(f"/api/players/by-discord/{interaction.user.id}") as resp:
-                if resp.status == 404:
-                    await interaction.followup.send(
-                        "Tu n'as pas de profil RiftTeam. Utilise `/rt-profil-create Pseudo#TAG` pour en créer un.",
-                        ephemeral=True,
-                    )
-                    return
-                resp.raise_for_status()
-                player = await resp.json()
+            player, team = await asyncio.gather(
+                fetch_json(session, f"/api/players/by-discord/{interaction.user.id}"),
+                fetch_json(session, f"/api/teams/{team_slug}"),
+            )
         except Exception as exc:
-            log.exception("Failed to fetch player profile")
+            log.exception("Failed to fetch player profile or team %s", team_slug)
             await interaction.followup.send(format_api_error(exc), ephemeral=True)
             return
 
-        try:
-            async with session.get(f"/api/teams/{team_slug}") as resp:
-                if resp.status == 404:
-                    await interaction.followup.send("Équipe introuvable.", ephemeral=True)
-                    return
-                resp.raise_for_status()
-                team = await resp.json()
-        except Exception as exc:
-            log.exception("Failed to fetch team %s", team_slug)
-            await interaction.followup.send(format_api_error(exc), ephemeral=True)
+        if player is None:
+            await interaction.followup.send(
+                "Tu n'as pas de profil RiftTeam. Utilise `/rt-profil-create Pseudo#TAG` pour en créer un.",
+                ephemeral=True,
+            )
+            return
+        if team is None:
+            await interaction.followup.send("Équipe introuvable.", ephemeral=True)
             return
 
         if str(interaction.user.id) == team.get("captain_discord_id"):
@@ -232,30 +226,23 @@ class MatchmakingCog(commands.Cog):
         session = get_session(self.bot)
 
         try:
-            async with session.get(f"/api/teams/by-captain/{interaction.user.id}") as resp:
-                if resp.status == 404:
-                    await interaction.followup.send(
-                        "Tu n'as pas d'équipe. Utilise `/rt-team-create NomEquipe` pour en créer une !",
-                        ephemeral=True,
-                    )
-                    return
-                resp.raise_for_status()
-                team = await resp.json()
+            team, player = await asyncio.gather(
+                fetch_json(session, f"/api/teams/by-captain/{interaction.user.id}"),
+                fetch_json(session, f"/api/players/{player_slug}"),
+            )
         except Exception as exc:
-            log.exception("Failed to fetch team")
+            log.exception("Failed to fetch team or player %s", player_slug)
             await interaction.followup.send(format_api_error(exc), ephemeral=True)
             return
 
-        try:
-            async with session.get(f"/api/players/{player_slug}") as resp:
-                if resp.status == 404:
-                    await interaction.followup.send("Profil introuvable.", ephemeral=True)
-                    return
-                resp.raise_for_status()
-                player = await resp.json()
-        except Exception as exc:
-            log.exception("Failed to fetch player %s", player_slug)
-            await interaction.followup.send(format_api_error(exc), ephemeral=True)
+        if team is None:
+            await interaction.followup.send(
+                "Tu n'as pas d'équipe. Utilise `/rt-team-create NomEquipe` pour en créer une !",
+                ephemeral=True,
+            )
+            return
+        if player is None:
+            await interaction.followup.send("Profil introuvable.", ephemeral=True)
             return
 
         riot_id = f"{player['riot_game_name']}#{player['riot_tag_line']}"
@@ -349,6 +336,12 @@ class MatchmakingCog(commands.Cog):
         slug = team_name.lower().replace(" ", "-")
         await self._do_apply(interaction, slug)
 
+    @rt_apply.autocomplete("team_name")
+    async def _team_name_autocomplete(
+        self, interaction: discord.Interaction, current: str,
+    ) -> list[app_commands.Choice[str]]:
+        return await name_choices(self.bot, "teams", current)
+
     @app_commands.command(name="rt-recruit", description="Recrute un joueur pour ton équipe")
     @app_commands.describe(riot_id="Riot ID du joueur (ex: Pseudo#TAG)")
     async def rt_recruit(self, interaction: discord.Interaction, riot_id: str) -> None:
@@ -365,6 +358,12 @@ class MatchmakingCog(commands.Cog):
         slug = f"{name}-{tag}"
         await self._do_recruit(interaction, slug)
 
+    @rt_recruit.autocomplete("riot_id")
+    async def _recruit_riot_id_autocomplete(
+        self, interaction: discord.Interaction, current: str,
+    ) -> list[app_commands.Choice[str]]:
+        return await name_choices(self.bot, "players", current)
+
     @app_commands.command(name="rt-profil-post", description="Poste ton profil dans le channel")
     async def rt_post_profil(self, interaction: discord.Interaction) -> None:
         await interaction.response.defer(ephemeral=True)
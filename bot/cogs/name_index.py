@@ -0,0 +1,150 @@
+import bisect
+import logging
+import re
+
+import aiohttp
+from discord import app_commands
+from discord.ext import commands
+
+from cogs.announcements import ServerEvent
+from utils import (
+    AUTOCOMPLETE_LIMIT,
+    get_api_secret,
+    get_session,
+    player_choice,
+    team_choice,
+)
+
+log = logging.getLogger("riftteam.name_index")
+
+INDEX_PATH = "/api/search/index"
+# Fields of a player kept in the index: what player_choice needs to label a suggestion.
+PLAYER_FIELDS = ("slug", "riot_game_name", "riot_tag_line", "rank_solo_tier", "primary_role")
+_WORD_START = re.compile(r"(?:^|[\s#\-_.])(?=\w)")
+
+
+def name_keys(name: str) -> list[str]:
+    """Lowercased suffixes of ``name`` starting at each word, so "Les Bleus" is found from "les" or "bleu"."""
+    name = name.lower()
+    return sorted({name[match.end():] for match in _WORD_START.finditer(name)} | {name})
+
+
+class PrefixIndex:
+    """Names kept as sorted ``(key, slug)`` pairs: a prefix lookup is one bisection plus a short scan."""
+
+    def __init__(self) -> None:
+        self._keys: list[tuple[str, str]] = []
+        self._entries: dict[str, tuple[str, dict]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, entries: dict[str, tuple[str, dict]]) -> None:
+        """Replace the whole index with ``{slug: (name, entry)}``."""
+        self._entries = dict(entries)
+        self._keys = sorted((key, slug) for slug, (name, _) in self._entries.items() for key in name_keys(name))
+
+    def put(self, slug: str, name: str, entry: dict) -> None:
+        """Add or update one entry."""
+        self.discard(slug)
+        self._entries[slug] = (name, entry)
+        for key in name_keys(name):
+            bisect.insort(self._keys, (key, slug))
+
+    def discard(self, slug: str) -> None:
+        """Remove one entry if present."""
+        old = self._entries.pop(slug, None)
+        if old is None:
+            return
+        for key in name_keys(old[0]):
+            i = bisect.bisect_left(self._keys, (key, slug))
+            if i < len(self._keys) and self._keys[i] == (key, slug):
+                del self._keys[i]
+
+    def search(self, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> list[dict]:
+        """Entries with a word starting with ``prefix``; names starting with it come first."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        found: dict[str, None] = {}
+        for key, slug in self._keys[bisect.bisect_left(self._keys, (prefix,)):]:
+            if not key.startswith(prefix) or len(found) >= limit:
+                break
+            found[slug] = None
+        names = {slug: self._entries[slug][0].lower() for slug in found}
+        ordered = sorted(found, key=lambda slug: (not names[slug].startswith(prefix), names[slug]))
+        return [self._entries[slug][1] for slug in ordered]
+
+
+def player_name(player: dict) -> str:
+    """Indexed name of a player: the Riot ID."""
+    return f"{player['riot_game_name']}#{player['riot_tag_line']}"
+
+
+class NameIndexCog(commands.Cog):
+    """Keeps LFT player and LFP team names in memory so autocomplete never waits on the backend."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self.players = PrefixIndex()
+        self.teams = PrefixIndex()
+        self.loaded = False
+
+    @commands.Cog.listener()
+    async def on_rt_event(self, event: ServerEvent) -> None:
+        """Reload on every stream (re)connection, then apply each change as it is announced."""
+        if event.kind == "ready":
+            await self._load()
+        elif event.kind == "player.lft_on":
+            player = await self._fetch(f"/api/players/{event.data['slug']}")
+            if player is not None:
+                self.players.put(player["slug"], player_name(player), {f: player.get(f) for f in PLAYER_FIELDS})
+        elif event.kind == "player.lft_off":
+            self.players.discard(event.data["slug"])
+        elif event.kind in ("team.created", "team.updated", "team.deleted"):
+            if "old_slug" in event.data:
+                self.teams.discard(event.data["old_slug"])
+            if event.kind != "team.deleted" and event.data.get("is_lfp"):
+                team = await self._fetch(f"/api/teams/{event.data['slug']}")
+                if team is not None:
+                    self.teams.put(team["slug"], team["name"], {"slug": team["slug"], "name": team["name"]})
+            else:
+                self.teams.discard(event.data["slug"])
+
+    def local_choices(self, kind: str, current: str) -> list[app_commands.Choice[str]]:
+        """Autocomplete choices from the index (``kind`` is ``"players"`` or ``"teams"``); empty until loaded."""
+        if not self.loaded:
+            return []
+        if kind == "players":
+            return [player_choice(p) for p in self.players.search(current)]
+        return [team_choice(t) for t in self.teams.search(current)]
+
+    async def _load(self) -> None:
+        try:
+            async with get_session(self.bot).get(
+                INDEX_PATH, headers={"X-Bot-Secret": get_api_secret(self.bot)},
+            ) as resp:
+                resp.raise_for_status()
+                data = await resp.json()
+        except (aiohttp.ClientError, TimeoutError):
+            log.exception("Failed to load the name index")
+            return
+        self.players.load({p["slug"]: (player_name(p), p) for p in data["players"]})
+        self.teams.load({t["slug"]: (t["name"], t) for t in data["teams"]})
+        self.loaded = True
+        log.info("Name index loaded: %d players, %d teams", len(self.players), len(self.teams))
+
+    async def _fetch(self, path: str) -> dict | None:
+        try:
+            async with get_session(self.bot).get(path) as resp:
+                if resp.status == 404:
+                    return None
+                resp.raise_for_status()
+                return await resp.json()
+        except (aiohttp.ClientError, TimeoutError):
+            log.warning("Failed to fetch %s for the name index", path)
+            return None
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(NameIndexCog(bot))
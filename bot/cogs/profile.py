@@ -8,7 +8,7 @@ from discord.ext import commands
 from config import APP_URL, RANK_ICON_BASE
 from shared.constants import RANK_COLORS, ROLE_EMOJIS, ROLE_NAMES
 from shared.format import format_rank, format_win_rate
-from utils import build_info_parts, format_api_error, get_session, parse_riot_id
+from utils import build_info_parts, format_api_error, get_session, name_choices, parse_riot_id
 
 log = logging.getLogger("riftteam.profile")
 
@@ -155,6 +155,12 @@ class ProfileCog(commands.Cog):
         embed = build_profile_embed(player)
         await interaction.followup.send(embed=embed, ephemeral=True)
 
+    @rt_profil.autocomplete("riot_id")
+    async def _riot_id_autocomplete(
+        self, interaction: discord.Interaction, current: str,
+    ) -> list[app_commands.Choice[str]]:
+        return await name_choices(self.bot, "players", current)
+
 
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(ProfileCog(bot))
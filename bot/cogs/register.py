@@ -4,7 +4,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-from utils import create_link_view, format_api_error, get_api_secret, get_session, parse_riot_id
+from utils import create_link_view, fetch_batch, format_api_error, get_api_secret, get_session, parse_riot_id
 
 log = logging.getLogger("riftteam.register")
 
@@ -33,22 +33,25 @@ class RegisterCog(commands.Cog):
         session = get_session(self.bot)
         api_secret = get_api_secret(self.bot)
 
+        discord_id = str(interaction.user.id)
         try:
-            async with session.get(f"/api/players/by-discord/{interaction.user.id}") as resp:
-                if resp.status == 200:
-                    existing = await resp.json()
-                    existing_name = f"{existing['riot_game_name']}#{existing['riot_tag_line']}"
-                    await interaction.followup.send(
-                        f"Tu as déjà un profil (**{existing_name}**). Utilise `/rt-profil-edit` pour le modifier.",
-                    )
-                    return
+            # The user's own profile and any profile already holding this Riot ID, in one lookup.
+            existing_players = await fetch_batch(session, "players", slugs=[slug], discord_user_ids=[discord_id])
         except discord.NotFound:
             raise
         except Exception as exc:
-            log.exception("Failed to check existing profile by discord ID")
+            log.exception("Failed to check existing profiles for %s", slug)
             await interaction.followup.send(format_api_error(exc))
             return
 
+        existing = next((p for p in existing_players if p.get("discord_user_id") == discord_id), None)
+        if existing:
+            existing_name = f"{existing['riot_game_name']}#{existing['riot_tag_line']}"
+            await interaction.followup.send(
+                f"Tu as déjà un profil (**{existing_name}**). Utilise `/rt-profil-edit` pour le modifier.",
+            )
+            return
+
         try:
             async with session.get(f"/api/riot/check/{name}/{tag}") as resp:
                 if resp.status == 404:
@@ -64,18 +67,10 @@ class RegisterCog(commands.Cog):
             await interaction.followup.send(format_api_error(exc))
             return
 
-        try:
-            async with session.get(f"/api/players/{slug}") as resp:
-                if resp.status == 200:
-                    existing_player = await resp.json()
-                    if existing_player.get("discord_user_id") is not None:
-                        await interaction.followup.send(
-                            f"Un profil existe déjà pour **{riot_id}** et est déjà attribué.",
-                        )
-                        return
-        except Exception as exc:
-            log.exception("Failed to check existing player %s", slug)
-            await interaction.followup.send(format_api_error(exc))
+        if any(p["slug"] == slug and p.get("discord_user_id") is not None for p in existing_players):
+            await interaction.followup.send(
+                f"Un profil existe déjà pour **{riot_id}** et est déjà attribué.",
+            )
             return
 
         try:
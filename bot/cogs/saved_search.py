@@ -0,0 +1,253 @@
+import asyncio
+import logging
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+from shared.constants import ROLE_NAMES
+
+from cogs.announcements import ServerEvent, build_announcement
+from cogs.scrim import FORMAT_CHOICES
+from constants import RANK_CHOICES, ROLE_CHOICES
+from utils import fetch_batch, format_api_error, get_api_secret, get_session
+
+log = logging.getLogger("riftteam.saved_search")
+
+MATCHES_PATH = "/api/maintenance/saved-search-matches"
+DELIVERY_BATCH_SIZE = 100
+
+TARGET_CHOICES = [
+    app_commands.Choice(name="Joueurs LFT", value="players"),
+    app_commands.Choice(name="Équipes LFP", value="teams"),
+    app_commands.Choice(name="Scrims", value="scrims"),
+]
+TARGET_LABELS = {choice.value: choice.name for choice in TARGET_CHOICES}
+FORMAT_LABELS = {choice.value: choice.name for choice in FORMAT_CHOICES}
+# The announcement layout used for each kind of match.
+ANNOUNCEMENT_KINDS = {"players": "player.lft_on", "teams": "team.created", "scrims": "scrim.posted"}
+
+
+def describe_search(search: dict) -> str:
+    """One-line French summary of a saved search's filters."""
+    parts = [TARGET_LABELS.get(search["target"], search["target"])]
+    if search.get("role"):
+        parts.append(ROLE_NAMES.get(search["role"], search["role"]))
+    low, high = search.get("min_rank"), search.get("max_rank")
+    if low and high:
+        parts.append(low.capitalize() if low == high else f"{low.capitalize()} → {high.capitalize()}")
+    elif low:
+        parts.append(f"{low.capitalize()}+")
+    elif high:
+        parts.append(f"≤ {high.capitalize()}")
+    if search.get("format"):
+        parts.append(FORMAT_LABELS.get(search["format"], search["format"]))
+    return " · ".join(parts)
+
+
+def match_path(target: str, ref: str) -> str:
+    """API path of the player, team or scrim a saved search matched."""
+    return f"/api/{target}/{ref}"
+
+
+class SavedSearchCog(commands.Cog):
+    """Saved searches: users are DMed each new player, team or scrim matching one of them."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self._lock = asyncio.Lock()
+        self._dirty = False
+
+    @commands.Cog.listener()
+    async def on_rt_event(self, event: ServerEvent) -> None:
+        """Deliver queued matches when the backend reports new ones, and on every (re)connection."""
+        if event.kind in ("ready", "search.matched"):
+            await self._drain()
+
+    async def _drain(self) -> None:
+        """Deliver queued matches until the queue is empty; a call during a drain makes it go around again."""
+        self._dirty = True
+        if self._lock.locked():
+            return
+        async with self._lock:
+            while self._dirty:
+                self._dirty = False
+                while await self._deliver_batch() == DELIVERY_BATCH_SIZE:
+                    pass
+
+    async def _deliver_batch(self) -> int:
+        """Fetch one batch of queued matches, DM each user and return the batch size."""
+        try:
+            async with get_session(self.bot).post(
+                MATCHES_PATH, headers={"X-Bot-Secret": get_api_secret(self.bot)},
+            ) as resp:
+                resp.raise_for_status()
+                matches = (await resp.json())["matches"]
+        except Exception:
+            log.exception("Failed to fetch saved search matches")
+            return 0
+
+        entities = await self._load_entities(matches)
+        for match in matches:
+            entity = entities.get(match_path(match["search"]["target"], match["ref"]))
+            if entity is not None:
+                await self._send_match_dm(match["search"], entity)
+        return len(matches)
+
+    async def _load_entities(self, matches: list[dict]) -> dict[str, dict]:
+        """Load every matched entity, keyed by API path.
+
+        Players and teams come from one batch request each and scrims from one request
+        apiece, all in flight at once.
+        """
+        refs: dict[str, list[str]] = {target: [] for target in ANNOUNCEMENT_KINDS}
+        for match in matches:
+            if match["ref"] not in refs[match["search"]["target"]]:
+                refs[match["search"]["target"]].append(match["ref"])
+        players, teams, *scrims = await asyncio.gather(
+            self._fetch_batch("players", refs["players"]),
+            self._fetch_batch("teams", refs["teams"]),
+            *(self._fetch(match_path("scrims", ref)) for ref in refs["scrims"]),
+        )
+        entities = {match_path("players", p["slug"]): p for p in players}
+        # The bot also sees teams that stopped recruiting; those are no longer worth a DM.
+        entities.update((match_path("teams", t["slug"]), t) for t in teams if t["is_lfp"])
+        entities.update((match_path("scrims", ref), s) for ref, s in zip(refs["scrims"], scrims) if s is not None)
+        return entities
+
+    async def _fetch_batch(self, kind: str, slugs: list[str]) -> list[dict]:
+        try:
+            return await fetch_batch(get_session(self.bot), kind, slugs=slugs)
+        except Exception:
+            log.exception("Failed to fetch %s for saved search matches", kind)
+            return []
+
+    async def _fetch(self, path: str) -> dict | None:
+        try:
+            async with get_session(self.bot).get(path) as resp:
+                if resp.status == 404:
+                    return None
+                resp.raise_for_status()
+                return await resp.json()
+        except Exception:
+            log.exception("Failed to fetch %s for a saved search match", path)
+            return None
+
+    async def _send_match_dm(self, search: dict, entity: dict) -> None:
+        """DM a user about a new result for one of their saved searches."""
+        content, embed, view = build_announcement(ANNOUNCEMENT_KINDS[search["target"]], entity)
+        try:
+            user = await self.bot.fetch_user(int(search["discord_user_id"]))
+            await user.send(
+                f"\U0001f514 Nouveau résultat pour ta recherche #{search['id']} ({describe_search(search)})\n{content}",
+                embed=embed,
+                view=view,
+            )
+        except discord.HTTPException:
+            log.warning("Failed to DM saved search match to %s", search["discord_user_id"])
+
+    @app_commands.command(name="rt-search-save", description="Sauvegarde une recherche et reçois ses nouveaux résultats en DM")
+    @app_commands.describe(
+        cible="Ce que tu cherches",
+        role="Rôle (joueurs et équipes)",
+        min_rank="Rang minimum",
+        max_rank="Rang maximum",
+        format="Format du match (scrims)",
+    )
+    @app_commands.choices(
+        cible=TARGET_CHOICES, role=ROLE_CHOICES, min_rank=RANK_CHOICES, max_rank=RANK_CHOICES, format=FORMAT_CHOICES,
+    )
+    async def rt_search_save(
+        self,
+        interaction: discord.Interaction,
+        cible: app_commands.Choice[str],
+        role: app_commands.Choice[str] | None = None,
+        min_rank: app_commands.Choice[str] | None = None,
+        max_rank: app_commands.Choice[str] | None = None,
+        format: app_commands.Choice[str] | None = None,
+    ) -> None:
+        await interaction.response.defer(ephemeral=True)
+        if role and cible.value == "scrims":
+            await interaction.followup.send("Le filtre de rôle ne s'applique pas aux scrims.", ephemeral=True)
+            return
+        if format and cible.value != "scrims":
+            await interaction.followup.send("Le filtre de format ne s'applique qu'aux scrims.", ephemeral=True)
+            return
+
+        body = {
+            "discord_user_id": str(interaction.user.id),
+            "target": cible.value,
+            "role": role.value if role else None,
+            "min_rank": min_rank.value if min_rank else None,
+            "max_rank": max_rank.value if max_rank else None,
+            "format": format.value if format else None,
+        }
+        try:
+            async with get_session(self.bot).post(
+                "/api/saved-searches", json=body, headers={"X-Bot-Secret": get_api_secret(self.bot)},
+            ) as resp:
+                if resp.status in (409, 422):
+                    detail = (await resp.json()).get("detail")
+                    message = detail if isinstance(detail, str) else "Filtres invalides (rang minimum au-dessus du maximum ?)."
+                    await interaction.followup.send(message, ephemeral=True)
+                    return
+                resp.raise_for_status()
+                search = await resp.json()
+        except Exception as exc:
+            log.exception("Failed to save search")
+            await interaction.followup.send(format_api_error(exc), ephemeral=True)
+            return
+
+        await interaction.followup.send(
+            f"Recherche #{search['id']} sauvegardée ({describe_search(search)}). "
+            "Tu recevras un DM à chaque nouveau résultat.",
+            ephemeral=True,
+        )
+
+    @app_commands.command(name="rt-search-list", description="Liste tes recherches sauvegardées")
+    async def rt_search_list(self, interaction: discord.Interaction) -> None:
+        await interaction.response.defer(ephemeral=True)
+        try:
+            async with get_session(self.bot).get(
+                "/api/saved-searches",
+                params={"discord_user_id": str(interaction.user.id)},
+                headers={"X-Bot-Secret": get_api_secret(self.bot)},
+            ) as resp:
+                resp.raise_for_status()
+                searches = (await resp.json())["searches"]
+        except Exception as exc:
+            log.exception("Failed to list saved searches")
+            await interaction.followup.send(format_api_error(exc), ephemeral=True)
+            return
+
+        if not searches:
+            await interaction.followup.send(
+                "Aucune recherche sauvegardée. Utilise `/rt-search-save` pour en créer une.", ephemeral=True,
+            )
+            return
+        lines = [f"**#{s['id']}** — {describe_search(s)}" for s in searches]
+        await interaction.followup.send("\n".join(lines), ephemeral=True)
+
+    @app_commands.command(name="rt-search-delete", description="Supprime une recherche sauvegardée")
+    @app_commands.describe(numero="Numéro de la recherche (voir /rt-search-list)")
+    async def rt_search_delete(self, interaction: discord.Interaction, numero: int) -> None:
+        await interaction.response.defer(ephemeral=True)
+        try:
+            async with get_session(self.bot).delete(
+                f"/api/saved-searches/{numero}",
+                params={"discord_user_id": str(interaction.user.id)},
+                headers={"X-Bot-Secret": get_api_secret(self.bot)},
+            ) as resp:
+                if resp.status == 404:
+                    await interaction.followup.send(f"Recherche #{numero} introuvable.", ephemeral=True)
+                    return
+                resp.raise_for_status()
+        except Exception as exc:
+            log.exception("Failed to delete saved search")
+            await interaction.followup.send(format_api_error(exc), ephemeral=True)
+            return
+
+        await interaction.followup.send(f"Recherche #{numero} supprimée.", ephemeral=True)
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(SavedSearchCog(bot))
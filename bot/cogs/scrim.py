@@ -136,6 +136,33 @@ def _build_scrim_embed(scrim: dict) -> discord.Embed:
     return embed
 
 
+def _scrim_slot(scrim: dict) -> str:
+    """Format a scrim's start as Paris-local 'JJ/MM à HHh' (e.g. '24/10 à 20h30')."""
+    dt = datetime.fromisoformat(scrim["scheduled_at"]).astimezone(PARIS_TZ)
+    hour_str = f"{dt.hour}h{dt.minute:02d}" if dt.minute else f"{dt.hour}h"
+    return f"{dt.strftime('%d/%m')} à {hour_str}"
+
+
+async def send_scrim_match_dm(bot: commands.Bot, scrim: dict, opponent: dict) -> None:
+    """DM a scrim's captain about a compatible opponent scrim, with a button to contact its captain."""
+    try:
+        user = await bot.fetch_user(int(scrim["captain_discord_id"]))
+        view = discord.ui.View(timeout=None)
+        label = f"Contacter {opponent['team']['name']}"
+        view.add_item(discord.ui.Button(
+            label=label if len(label) <= 80 else label[:77] + "...",
+            style=discord.ButtonStyle.primary,
+            custom_id=f"rt_contact:{opponent['captain_discord_id']}",
+        ))
+        await user.send(
+            f"Un adversaire compatible a été trouvé pour ton scrim du {_scrim_slot(scrim)} :",
+            embed=_build_scrim_embed(opponent),
+            view=view,
+        )
+    except discord.HTTPException:
+        log.warning("Failed to DM scrim match to captain %s", scrim.get("captain_discord_id"))
+
+
 def _parse_date(date_str: str) -> str:
     """Parse a date string and return an ISO-format date (YYYY-MM-DD)."""
     date_str = date_str.strip()
@@ -164,12 +191,15 @@ def _encode_filters(
     min_rank: str | None, max_rank: str | None,
     scheduled_date: str | None, fmt: str | None,
     hour_min: int | None, hour_max: int | None,
+    date_to: str | None = None,
 ) -> str:
     """Encode scrim search filters into a colon-separated string for custom IDs."""
-    return f"{min_rank or ''}:{max_rank or ''}:{scheduled_date or ''}:{fmt or ''}:{hour_min if hour_min is not None else ''}:{hour_max if hour_max is not None else ''}"
+    return f"{min_rank or ''}:{max_rank or ''}:{scheduled_date or ''}:{fmt or ''}:{hour_min if hour_min is not None else ''}:{hour_max if hour_max is not None else ''}:{date_to or ''}"
 
 
-def _decode_filters(encoded: str) -> tuple[str | None, str | None, str | None, str | None, int | None, int | None]:
+def _decode_filters(
+    encoded: str,
+) -> tuple[str | None, str | None, str | None, str | None, int | None, int | None, str | None]:
     """Decode a colon-separated filter string back into scrim search parameters."""
     parts = encoded.split(":")
     min_rank = parts[0] or None if len(parts) > 0 else None
@@ -178,7 +208,8 @@ def _decode_filters(encoded: str) -> tuple[str | None, str | None, str | None, s
     fmt = parts[3] or None if len(parts) > 3 else None
     hour_min = int(parts[4]) if len(parts) > 4 and parts[4] else None
     hour_max = int(parts[5]) if len(parts) > 5 and parts[5] else None
-    return min_rank, max_rank, scheduled_date, fmt, hour_min, hour_max
+    date_to = parts[6] or None if len(parts) > 6 else None
+    return min_rank, max_rank, scheduled_date, fmt, hour_min, hour_max, date_to
 
 
 class ScrimCog(commands.Cog):
@@ -339,6 +370,7 @@ class ScrimCog(commands.Cog):
     @app_commands.command(name="rt-scrim-search", description="Cherche des scrims disponibles")
     @app_commands.describe(
         date="Date (JJ/MM ou JJ/MM/AAAA)",
+        date_fin="Date de fin pour chercher sur plusieurs jours (JJ/MM ou JJ/MM/AAAA)",
         heure_min="Heure minimum (ex: 20, 20h, 20:00)",
         heure_max="Heure maximum (ex: 22, 22h, 22:00)",
         format="Format du match",
@@ -350,6 +382,7 @@ class ScrimCog(commands.Cog):
         self,
         interaction: discord.Interaction,
         date: str | None = None,
+        date_fin: str | None = None,
         heure_min: str | None = None,
         heure_max: str | None = None,
         format: app_commands.Choice[str] | None = None,
@@ -359,12 +392,18 @@ class ScrimCog(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         scheduled_date: str | None = None
-        if date:
-            try:
+        date_to: str | None = None
+        try:
+            if date:
                 scheduled_date = _parse_date(date)
-            except ValueError as e:
-                await interaction.followup.send(str(e), ephemeral=True)
-                return
+            if date_fin:
+                date_to = _parse_date(date_fin)
+        except ValueError as e:
+            await interaction.followup.send(str(e), ephemeral=True)
+            return
+        if scheduled_date and date_to and date_to < scheduled_date:
+            await interaction.followup.send("La date de fin doit être après la date de début.", ephemeral=True)
+            return
 
         hour_min: int | None = None
         hour_max: int | None = None
@@ -386,6 +425,7 @@ class ScrimCog(commands.Cog):
             fmt=format.value if format else None,
             hour_min=hour_min,
             hour_max=hour_max,
+            date_to=date_to,
         )
 
     async def _fetch_scrims_and_respond(
@@ -398,6 +438,7 @@ class ScrimCog(commands.Cog):
         fmt: str | None = None,
         hour_min: int | None = None,
         hour_max: int | None = None,
+        date_to: str | None = None,
         *,
         edit: bool = False,
     ) -> None:
@@ -410,7 +451,12 @@ class ScrimCog(commands.Cog):
             params["min_rank"] = min_rank
         if max_rank:
             params["max_rank"] = max_rank
-        if scheduled_date:
+        if date_to:
+            # Multi-day window: scheduled_date is the first day (or today when omitted).
+            if scheduled_date:
+                params["date_from"] = scheduled_date
+            params["date_to"] = date_to
+        elif scheduled_date:
             params["scheduled_date"] = scheduled_date
         if fmt:
             params["format"] = fmt
@@ -443,7 +489,11 @@ class ScrimCog(commands.Cog):
                 filters.append(f"rang min **{min_rank.capitalize()}**")
             if max_rank:
                 filters.append(f"rang max **{max_rank.capitalize()}**")
-            if scheduled_date:
+            if scheduled_date and date_to:
+                filters.append(f"du **{scheduled_date}** au **{date_to}**")
+            elif date_to:
+                filters.append(f"jusqu'au **{date_to}**")
+            elif scheduled_date:
                 filters.append(f"date **{scheduled_date}**")
             if fmt:
                 filters.append(f"format **{fmt}**")
@@ -486,7 +536,7 @@ class ScrimCog(commands.Cog):
 
         embed.set_footer(text=f"Page {page + 1}/{total_pages} · {total} scrims au total")
 
-        filters_encoded = _encode_filters(min_rank, max_rank, scheduled_date, fmt, hour_min, hour_max)
+        filters_encoded = _encode_filters(min_rank, max_rank, scheduled_date, fmt, hour_min, hour_max, date_to)
         view = discord.ui.View(timeout=None)
 
         view.add_item(discord.ui.Button(
@@ -530,10 +580,12 @@ class ScrimCog(commands.Cog):
             page = int(parts[0])
         except (ValueError, IndexError):
             return
-        min_rank, max_rank, scheduled_date, fmt, hour_min, hour_max = _decode_filters(parts[1]) if len(parts) > 1 else (None, None, None, None, None, None)
+        min_rank, max_rank, scheduled_date, fmt, hour_min, hour_max, date_to = _decode_filters(parts[1]) if len(parts) > 1 else (None,) * 7
 
         await interaction.response.defer(ephemeral=True)
-        await self._fetch_scrims_and_respond(interaction, page, min_rank, max_rank, scheduled_date, fmt, hour_min, hour_max, edit=True)
+        await self._fetch_scrims_and_respond(
+            interaction, page, min_rank, max_rank, scheduled_date, fmt, hour_min, hour_max, date_to, edit=True,
+        )
 
 
 async def setup(bot: commands.Bot) -> None:
@@ -8,7 +8,7 @@ from config import APP_URL
 from constants import RANK_CHOICES, ROLE_CHOICES
 from shared.constants import RANK_COLORS, ROLE_EMOJIS, ROLE_NAMES
 from shared.format import format_rank
-from utils import build_info_parts, build_nav_view, build_no_results_msg, create_link_view, decode_list_filters, encode_list_filters, format_api_error, get_api_secret, get_session, parse_riot_id
+from utils import PAGE_IMAGE_FILENAME, build_info_parts, build_nav_view, build_no_results_msg, create_link_view, decode_list_filters, encode_list_filters, fetch_page_image, format_api_error, get_api_secret, get_session, name_choices, parse_riot_id
 
 log = logging.getLogger("riftteam.team")
 
@@ -192,6 +192,12 @@ class TeamCog(commands.Cog):
             f"**{riot_id}** ajouté au roster en tant que **{role.name}** !",
         )
 
+    @roster_add.autocomplete("riot_id")
+    async def _roster_add_riot_id_autocomplete(
+        self, interaction: discord.Interaction, current: str,
+    ) -> list[app_commands.Choice[str]]:
+        return await name_choices(self.bot, "players", current)
+
     @team_roster_group.command(name="remove", description="Retirer un joueur du roster")
     @app_commands.describe(riot_id="Riot ID du joueur (ex: Pseudo#TAG)")
     async def roster_remove(self, interaction: discord.Interaction, riot_id: str) -> None:
@@ -330,6 +336,9 @@ class TeamCog(commands.Cog):
             embed.add_field(name=team_name, value="\n".join(lines), inline=False)
 
         embed.set_footer(text=f"Page {page + 1}/{total_pages} · {total} équipes LFP au total")
+        page_image = await fetch_page_image(session, "teams", [t["slug"] for t in teams])
+        if page_image:
+            embed.set_image(url=f"attachment://{PAGE_IMAGE_FILENAME}")
 
         filters_encoded = encode_list_filters(role, min_rank, max_rank)
         view = build_nav_view("rt_lft_page", page, total, PAGE_SIZE, filters_encoded)
@@ -352,10 +361,11 @@ class TeamCog(commands.Cog):
             url=f"{APP_URL}/browse?tab=teams",
         ))
 
+        attachments = [page_image] if page_image else []
         if edit:
-            await interaction.edit_original_response(embed=embed, view=view)
+            await interaction.edit_original_response(embed=embed, view=view, attachments=attachments)
         else:
-            await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+            await interaction.followup.send(embed=embed, view=view, files=attachments, ephemeral=True)
 
     @app_commands.command(name="rt-lft", description="Équipes qui cherchent des joueurs")
     @app_commands.describe(
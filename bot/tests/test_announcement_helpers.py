@@ -0,0 +1,94 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from cogs.announcements import (
+    AnnouncementsCog,
+    ServerEvent,
+    SSEParser,
+    announcement_path,
+    build_announcement,
+)
+
+
+def _feed(frame: str) -> list[ServerEvent]:
+    parser = SSEParser()
+    return [event for line in frame.splitlines(keepends=True) if (event := parser.feed(line))]
+
+
+class TestSSEParser:
+    def test_event_frame(self):
+        events = _feed('id: 7\nevent: team.created\ndata: {"slug":"t","is_lfp":true}\n\n')
+        assert events == [ServerEvent(7, "team.created", {"slug": "t", "is_lfp": True})]
+
+    def test_keepalive_comment_is_ignored(self):
+        assert _feed(": keepalive\n\n") == []
+
+    def test_ready_frame_carries_cursor(self):
+        assert _feed("id: 42\nevent: ready\ndata: {}\n\n") == [ServerEvent(42, "ready", {})]
+
+    def test_consecutive_frames_do_not_leak_fields(self):
+        events = _feed('id: 1\nevent: scrim.posted\ndata: {"id":"a"}\n\ndata: {"x":1}\n\n')
+        assert events[1] == ServerEvent(None, "message", {"x": 1})
+
+    def test_crlf_line_endings(self):
+        assert _feed('id: 3\r\nevent: player.lft_on\r\ndata: {"slug":"s"}\r\n\r\n')[0].id == 3
+
+
+class TestAnnouncementPath:
+    def test_announced_kinds(self):
+        assert announcement_path(ServerEvent(1, "player.lft_on", {"slug": "Foo-EUW"})) == "/api/players/Foo-EUW"
+        assert announcement_path(ServerEvent(2, "team.created", {"slug": "t", "is_lfp": True})) == "/api/teams/t"
+        assert announcement_path(ServerEvent(3, "scrim.posted", {"id": "abc", "team_slug": "t"})) == "/api/scrims/abc"
+
+    def test_silent_kinds(self):
+        assert announcement_path(ServerEvent(1, "player.lft_off", {"slug": "Foo-EUW"})) is None
+        assert announcement_path(ServerEvent(2, "team.created", {"slug": "t", "is_lfp": False})) is None
+        assert announcement_path(ServerEvent(3, "scrim.cancelled", {"id": "abc"})) is None
+        assert announcement_path(ServerEvent(4, "ready", {})) is None
+
+
+class TestBuildAnnouncement:
+    def test_scrim_contact_button(self):
+        scrim = {
+            "captain_discord_id": "200", "scheduled_at": "2030-03-01T20:00:00+01:00", "format": "BO3",
+            "game_count": None, "fearless": False, "min_rank": None, "max_rank": None,
+            "team": {"name": "Seed Team", "members": []},
+        }
+        content, embed, view = build_announcement("scrim.posted", scrim)
+        assert "Seed Team" in content
+        assert embed.title == "Scrim — Seed Team"
+        assert [item.custom_id for item in view.children] == ["rt_contact:200"]
+
+
+class TestStreamConsumer:
+    async def test_slow_announcements_do_not_block_the_stream(self):
+        async def stream(request):
+            body = "".join(f'id: {i}\nevent: player.lft_on\ndata: {{"slug":"p{i}"}}\n\n' for i in (1, 2, 3))
+            return web.Response(text=body, content_type="text/event-stream")
+
+        app = web.Application()
+        app.router.add_get("/api/events/stream", stream)
+        release = asyncio.Event()
+        announced = []
+
+        async def slow_announce(event):
+            await release.wait()
+            announced.append(event.id)
+
+        async with TestServer(app) as server, aiohttp.ClientSession(base_url=str(server.make_url("/"))) as session:
+            bot = MagicMock(http_session=session, api_secret="s")
+            cog = AnnouncementsCog(bot)
+            cog._announce = slow_announce
+            await asyncio.wait_for(cog._consume(), 5)
+
+            assert cog.cursor == 3
+            assert [call.args[1].id for call in bot.dispatch.call_args_list] == [1, 2, 3]
+            assert announced == []
+            release.set()
+            await asyncio.gather(*cog._announcements)
+        assert sorted(announced) == [1, 2, 3]
+        assert not cog._announcements
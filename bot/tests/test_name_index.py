@@ -0,0 +1,104 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from cogs.announcements import ServerEvent
+from cogs.name_index import NameIndexCog, PrefixIndex, name_keys
+
+
+def _index(*names):
+    index = PrefixIndex()
+    index.load({name.lower().replace(" ", "-"): (name, {"name": name}) for name in names})
+    return index
+
+
+def _found(index, prefix):
+    return [entry["name"] for entry in index.search(prefix)]
+
+
+class TestNameKeys:
+    def test_one_key_per_word(self):
+        assert name_keys("Les Bleus") == ["bleus", "les bleus"]
+
+    def test_riot_id_tag_is_a_word(self):
+        assert name_keys("Faker#KR1") == ["faker#kr1", "kr1"]
+
+
+class TestPrefixIndex:
+    def test_prefix_of_any_word(self):
+        index = _index("Les Bleus", "Bleu Ciel", "Karmine")
+        assert _found(index, "BLEU") == ["Bleu Ciel", "Les Bleus"]
+        assert _found(index, "les b") == ["Les Bleus"]
+        assert _found(index, "x") == []
+        assert _found(index, "  ") == []
+
+    def test_name_prefix_ranks_first(self):
+        index = _index("Zen Alpha", "Alpha Zen")
+        assert _found(index, "alp") == ["Alpha Zen", "Zen Alpha"]
+
+    def test_limit(self):
+        index = _index(*(f"Team {i:02}" for i in range(30)))
+        assert len(index.search("team", limit=5)) == 5
+
+    def test_put_replaces_and_discard_removes(self):
+        index = _index("Les Bleus")
+        index.put("les-bleus", "Les Rouges", {"name": "Les Rouges"})
+        assert _found(index, "bleu") == []
+        assert _found(index, "rou") == ["Les Rouges"]
+        index.discard("les-bleus")
+        index.discard("unknown")
+        assert _found(index, "les") == []
+        assert len(index) == 0
+
+
+def _cog(entity=None):
+    cog = NameIndexCog(MagicMock())
+    cog._fetch = AsyncMock(return_value=entity)
+    cog.loaded = True
+    return cog
+
+
+class TestNameIndexEvents:
+    async def test_player_lft_on_fetches_and_indexes(self):
+        cog = _cog({"slug": "Caps-EUW", "riot_game_name": "Caps", "riot_tag_line": "EUW", "description": "long"})
+        await cog.on_rt_event(ServerEvent(1, "player.lft_on", {"slug": "Caps-EUW"}))
+        cog._fetch.assert_awaited_once_with("/api/players/Caps-EUW")
+        assert [c.value for c in cog.local_choices("players", "cap")] == ["Caps#EUW"]
+        assert "description" not in cog.players.search("cap")[0]
+
+        await cog.on_rt_event(ServerEvent(2, "player.lft_off", {"slug": "Caps-EUW"}))
+        assert cog.local_choices("players", "cap") == []
+
+    async def test_team_leaving_lfp_is_dropped_without_fetch(self):
+        cog = _cog()
+        cog.teams.put("les-bleus", "Les Bleus", {"slug": "les-bleus", "name": "Les Bleus"})
+        await cog.on_rt_event(ServerEvent(1, "team.updated", {"slug": "les-bleus", "is_lfp": False}))
+        cog._fetch.assert_not_awaited()
+        assert cog.local_choices("teams", "bleu") == []
+
+    async def test_renamed_team_replaces_old_entry(self):
+        cog = _cog({"slug": "les-rouges", "name": "Les Rouges"})
+        cog.teams.put("les-bleus", "Les Bleus", {"slug": "les-bleus", "name": "Les Bleus"})
+        await cog.on_rt_event(
+            ServerEvent(1, "team.updated", {"slug": "les-rouges", "is_lfp": True, "old_slug": "les-bleus"}),
+        )
+        cog._fetch.assert_awaited_once_with("/api/teams/les-rouges")
+        assert [c.value for c in cog.local_choices("teams", "les")] == ["les-rouges"]
+
+    async def test_renamed_team_leaving_lfp_drops_old_entry(self):
+        cog = _cog()
+        cog.teams.put("les-bleus", "Les Bleus", {"slug": "les-bleus", "name": "Les Bleus"})
+        await cog.on_rt_event(
+            ServerEvent(1, "team.updated", {"slug": "les-rouges", "is_lfp": False, "old_slug": "les-bleus"}),
+        )
+        assert len(cog.teams) == 0
+
+    async def test_team_deleted(self):
+        cog = _cog()
+        cog.teams.put("les-bleus", "Les Bleus", {"slug": "les-bleus", "name": "Les Bleus"})
+        await cog.on_rt_event(ServerEvent(1, "team.deleted", {"slug": "les-bleus"}))
+        assert len(cog.teams) == 0
+
+    def test_no_choices_until_loaded(self):
+        cog = _cog()
+        cog.teams.put("les-bleus", "Les Bleus", {"slug": "les-bleus", "name": "Les Bleus"})
+        cog.loaded = False
+        assert cog.local_choices("teams", "bleu") == []
@@ -0,0 +1,26 @@
+from cogs.saved_search import ANNOUNCEMENT_KINDS, describe_search, match_path
+
+
+class TestDescribeSearch:
+    def test_player_search(self):
+        search = {"target": "players", "role": "JUNGLE", "min_rank": "GOLD", "max_rank": None, "format": None}
+        assert describe_search(search) == "Joueurs LFT · Jungle · Gold+"
+
+    def test_rank_range(self):
+        assert describe_search({"target": "teams", "min_rank": "SILVER", "max_rank": "DIAMOND"}) == (
+            "Équipes LFP · Silver → Diamond"
+        )
+        assert describe_search({"target": "teams", "min_rank": "GOLD", "max_rank": "GOLD"}) == "Équipes LFP · Gold"
+        assert describe_search({"target": "teams", "max_rank": "GOLD"}) == "Équipes LFP · ≤ Gold"
+
+    def test_scrim_format(self):
+        assert describe_search({"target": "scrims", "format": "G3"}) == "Scrims · 3 games"
+
+
+class TestMatchPath:
+    def test_paths(self):
+        assert match_path("players", "Foo-EUW") == "/api/players/Foo-EUW"
+        assert match_path("scrims", "abc") == "/api/scrims/abc"
+
+    def test_every_target_has_an_announcement_layout(self):
+        assert set(ANNOUNCEMENT_KINDS) == {"players", "teams", "scrims"}
@@ -1,7 +1,8 @@
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from zoneinfo import ZoneInfo
 
+import discord
 import pytest
 
 from cogs.scrim import (
@@ -11,6 +12,8 @@ from cogs.scrim import (
     _parse_date,
     _parse_datetime,
     _parse_hour,
+    _scrim_slot,
+    send_scrim_match_dm,
 )
 
 PARIS_TZ = ZoneInfo("Europe/Paris")
@@ -115,16 +118,62 @@ class TestFormatScrimFormat:
 
 class TestEncodeDecodeFilters:
     def test_round_trip_full(self):
-        encoded = _encode_filters("GOLD", "DIAMOND", "2026-03-01", "BO3", 18, 22)
+        encoded = _encode_filters("GOLD", "DIAMOND", "2026-03-01", "BO3", 18, 22, "2026-03-02")
         result = _decode_filters(encoded)
-        assert result == ("GOLD", "DIAMOND", "2026-03-01", "BO3", 18, 22)
+        assert result == ("GOLD", "DIAMOND", "2026-03-01", "BO3", 18, 22, "2026-03-02")
 
     def test_round_trip_empty(self):
         encoded = _encode_filters(None, None, None, None, None, None)
         result = _decode_filters(encoded)
-        assert result == (None, None, None, None, None, None)
+        assert result == (None, None, None, None, None, None, None)
 
     def test_round_trip_partial(self):
         encoded = _encode_filters("GOLD", None, None, "BO1", None, None)
         result = _decode_filters(encoded)
-        assert result == ("GOLD", None, None, "BO1", None, None)
+        assert result == ("GOLD", None, None, "BO1", None, None, None)
+
+    def test_decodes_ids_without_end_date(self):
+        result = _decode_filters("GOLD::2026-03-01:BO3:18:22")
+        assert result == ("GOLD", None, "2026-03-01", "BO3", 18, 22, None)
+
+
+def _match_scrim(captain: str, team_name: str, scheduled_at: str) -> dict:
+    return {
+        "captain_discord_id": captain,
+        "scheduled_at": scheduled_at,
+        "format": "BO3",
+        "game_count": None,
+        "fearless": False,
+        "min_rank": "GOLD",
+        "max_rank": None,
+        "team": {"name": team_name, "members": []},
+    }
+
+
+class TestScrimMatchDm:
+    def test_slot_is_paris_local(self):
+        assert _scrim_slot({"scheduled_at": "2026-10-24T18:30:00+00:00"}) == "24/10 à 20h30"
+        assert _scrim_slot({"scheduled_at": "2026-10-25T19:00:00+00:00"}) == "25/10 à 20h"
+
+    async def test_dm_links_opponent_captain(self):
+        user = MagicMock()
+        user.send = AsyncMock()
+        bot = MagicMock()
+        bot.fetch_user = AsyncMock(return_value=user)
+
+        await send_scrim_match_dm(
+            bot,
+            _match_scrim("111", "Home", "2026-10-24T18:00:00+00:00"),
+            _match_scrim("222", "Away", "2026-10-24T18:30:00+00:00"),
+        )
+
+        bot.fetch_user.assert_awaited_once_with(111)
+        kwargs = user.send.await_args.kwargs
+        assert "24/10 à 20h" in user.send.await_args.args[0]
+        assert kwargs["embed"].title == "Scrim — Away"
+        assert kwargs["view"].children[0].custom_id == "rt_contact:222"
+
+    async def test_dm_failure_is_swallowed(self):
+        bot = MagicMock()
+        bot.fetch_user = AsyncMock(side_effect=discord.NotFound(MagicMock(status=404), "Unknown User"))
+        await send_scrim_match_dm(bot, _match_scrim("1", "A", "2026-10-24T18:00:00+00:00"), _match_scrim("2", "B", "2026-10-24T18:00:00+00:00"))
@@ -1,18 +1,31 @@
-from unittest.mock import MagicMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
 
 import aiohttp
 import discord
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
 from utils import (
+    DISCORD_USER_HEADER,
+    acting_user,
     build_info_parts,
     build_nav_view,
     build_no_results_msg,
     create_link_view,
     decode_list_filters,
     encode_list_filters,
+    fetch_batch,
+    fetch_json,
+    fetch_page_image,
     format_api_error,
+    name_choices,
     parse_riot_id,
+    player_choice,
+    search_choices,
+    send_acting_user,
+    team_choice,
 )
 
 
@@ -217,3 +230,159 @@ class TestBuildNoResultsMsg:
         assert "Top" in msg
         assert "Silver" in msg
         assert "Gold" in msg
+
+
+def _mock_session(status=200, data=b"png", exc=None):
+    resp = MagicMock()
+    resp.status = status
+    resp.read = AsyncMock(return_value=data)
+    ctx = MagicMock()
+    ctx.__aenter__ = AsyncMock(return_value=resp, side_effect=exc)
+    ctx.__aexit__ = AsyncMock(return_value=False)
+    session = MagicMock()
+    session.get = MagicMock(return_value=ctx)
+    return session
+
+
+class TestFetchPageImage:
+    async def test_returns_file(self):
+        session = _mock_session()
+        result = await fetch_page_image(session, "players", ["A-EUW", "B-EUW"])
+        assert isinstance(result, discord.File)
+        assert result.filename == "page.png"
+        args, kwargs = session.get.call_args
+        assert args[0] == "/api/og/players/page.png"
+        assert kwargs["params"] == [("slugs", "A-EUW"), ("slugs", "B-EUW")]
+
+    async def test_empty_slugs_skips_request(self):
+        session = _mock_session()
+        assert await fetch_page_image(session, "teams", []) is None
+        session.get.assert_not_called()
+
+    async def test_error_status_returns_none(self):
+        session = _mock_session(status=404)
+        assert await fetch_page_image(session, "teams", ["t"]) is None
+
+    async def test_network_error_returns_none(self):
+        session = _mock_session(exc=aiohttp.ClientError())
+        assert await fetch_page_image(session, "teams", ["t"]) is None
+
+
+class TestSearchChoices:
+    def test_player_choice_submits_riot_id(self):
+        choice = player_choice({
+            "riot_game_name": "Faker", "riot_tag_line": "KR1", "rank_solo_tier": "CHALLENGER", "primary_role": "MIDDLE",
+        })
+        assert choice.name == "Faker#KR1 · Challenger · Mid"
+        assert choice.value == "Faker#KR1"
+
+    def test_unranked_player_without_role(self):
+        choice = player_choice({"riot_game_name": "New", "riot_tag_line": "EUW"})
+        assert choice.name == "New#EUW"
+
+    def test_team_choice_submits_slug(self):
+        choice = team_choice({"name": "Les Bleus", "slug": "les-bleus"})
+        assert (choice.name, choice.value) == ("Les Bleus", "les-bleus")
+
+    async def test_fetches_matches(self):
+        session = _mock_session()
+        session.get.return_value.__aenter__.return_value.json = AsyncMock(
+            return_value={"teams": [{"name": "Les Bleus", "slug": "les-bleus"}]},
+        )
+        bot = MagicMock(http_session=session)
+        choices = await search_choices(bot, "teams", " bleu ")
+        assert [c.value for c in choices] == ["les-bleus"]
+        args, kwargs = session.get.call_args
+        assert args[0] == "/api/search/teams"
+        assert kwargs["params"]["q"] == "bleu"
+
+    async def test_empty_input_skips_request(self):
+        session = _mock_session()
+        assert await search_choices(MagicMock(http_session=session), "players", "  ") == []
+        session.get.assert_not_called()
+
+    async def test_failure_gives_no_suggestions(self):
+        session = _mock_session(exc=aiohttp.ClientError())
+        assert await search_choices(MagicMock(http_session=session), "players", "fak") == []
+
+    async def test_local_index_answers_without_request(self):
+        session = _mock_session()
+        index = MagicMock()
+        index.local_choices.return_value = ["local"]
+        bot = MagicMock(http_session=session)
+        bot.get_cog.return_value = index
+        assert await name_choices(bot, "teams", "bleu") == ["local"]
+        session.get.assert_not_called()
+
+    async def test_falls_back_to_search_without_local_match(self):
+        session = _mock_session(status=500)
+        bot = MagicMock(http_session=session)
+        bot.get_cog.return_value.local_choices.return_value = []
+        assert await name_choices(bot, "players", "fakr") == []
+        assert session.get.call_args.args[0] == "/api/search/players"
+
+
+def _mock_post(data):
+    resp = MagicMock()
+    resp.raise_for_status = MagicMock()
+    resp.json = AsyncMock(return_value=data)
+    ctx = MagicMock()
+    ctx.__aenter__ = AsyncMock(return_value=resp)
+    ctx.__aexit__ = AsyncMock(return_value=False)
+    session = MagicMock()
+    session.post = MagicMock(return_value=ctx)
+    return session
+
+
+class TestFetchBatch:
+    async def test_posts_keys_in_one_request(self):
+        session = _mock_post({"players": [{"slug": "A-EUW"}]})
+        players = await fetch_batch(session, "players", slugs=["A-EUW"], discord_user_ids=["1"])
+        assert players == [{"slug": "A-EUW"}]
+        args, kwargs = session.post.call_args
+        assert args[0] == "/api/players:batch"
+        assert kwargs["json"] == {"slugs": ["A-EUW"], "discord_user_ids": ["1"]}
+
+    async def test_no_keys_skips_request(self):
+        session = _mock_post({})
+        assert await fetch_batch(session, "teams", slugs=[]) == []
+        session.post.assert_not_called()
+
+
+class TestFetchJson:
+    async def test_not_found_is_none(self):
+        assert await fetch_json(_mock_session(status=404), "/api/teams/x") is None
+
+    async def test_error_status_raises(self):
+        session = _mock_session(status=500)
+        session.get.return_value.__aenter__.return_value.raise_for_status = MagicMock(
+            side_effect=aiohttp.ClientError(),
+        )
+        with pytest.raises(aiohttp.ClientError):
+            await fetch_json(session, "/api/teams/x")
+
+
+class TestActingUser:
+    async def test_shared_session_sends_each_users_id(self):
+        seen = []
+
+        async def handler(request):
+            seen.append(request.headers.get(DISCORD_USER_HEADER))
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_get("/", handler)
+
+        async def call(user):
+            if user is not None:
+                acting_user.set(user)
+            async with session.get("/") as resp:
+                resp.raise_for_status()
+
+        async with TestServer(app) as server, aiohttp.ClientSession(
+            base_url=str(server.make_url("/")), middlewares=(send_acting_user,),
+        ) as session:
+            await asyncio.gather(call("111"), call("222"))
+            await call(None)
+        assert sorted(seen[:2]) == ["111", "222"]
+        assert seen[2] is None
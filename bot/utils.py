@@ -1,9 +1,24 @@
+import io
+import logging
+from contextvars import ContextVar
+
 import aiohttp
 import discord
+from discord import app_commands
 from discord.ext import commands
 
 from shared.constants import ACTIVITY_LABELS, AMBIANCE_LABELS, ROLE_NAMES
 
+log = logging.getLogger("riftteam.utils")
+
+PAGE_IMAGE_FILENAME = "page.png"
+# Discord drops autocomplete answers after 3 seconds.
+AUTOCOMPLETE_TIMEOUT = aiohttp.ClientTimeout(total=2)
+AUTOCOMPLETE_LIMIT = 25
+# Discord user whose interaction is being handled; sent to the API so their reads follow their writes.
+acting_user: ContextVar[str | None] = ContextVar("acting_user", default=None)
+DISCORD_USER_HEADER = "X-Discord-User-Id"
+
 
 def format_api_error(exc: Exception) -> str:
     """Return a user-friendly French error message for API exceptions."""
@@ -48,11 +63,61 @@ def get_session(bot: commands.Bot) -> aiohttp.ClientSession:
     return bot.http_session  # type: ignore[attr-defined]
 
 
+async def send_acting_user(
+    request: aiohttp.ClientRequest, handler: aiohttp.ClientHandlerType,
+) -> aiohttp.ClientResponse:
+    """Client middleware: tag each API call with the Discord user it is made for, if any."""
+    if (user := acting_user.get()) is not None:
+        request.headers[DISCORD_USER_HEADER] = user
+    return await handler(request)
+
+
 def get_api_secret(bot: commands.Bot) -> str:
     """Return the bot API secret from the bot instance."""
     return bot.api_secret  # type: ignore[attr-defined]
 
 
+async def fetch_json(session: aiohttp.ClientSession, path: str) -> dict | None:
+    """GET an API resource: None on 404, raises on any other error status."""
+    async with session.get(path) as resp:
+        if resp.status == 404:
+            return None
+        resp.raise_for_status()
+        return await resp.json()
+
+
+async def fetch_batch(session: aiohttp.ClientSession, kind: str, **keys: list[str]) -> list[dict]:
+    """Load many players or teams in one request via ``/api/{kind}:batch``.
+
+    ``kind`` is ``"players"`` or ``"teams"``; ``keys`` are the lookup lists (``slugs=``,
+    ``discord_user_ids=``...). Entities matching nothing are simply missing from the result.
+    """
+    if not any(keys.values()):
+        return []
+    async with session.post(f"/api/{kind}:batch", json=keys) as resp:
+        resp.raise_for_status()
+        return (await resp.json())[kind]
+
+
+async def fetch_page_image(session: aiohttp.ClientSession, kind: str, slugs: list[str]) -> discord.File | None:
+    """Fetch the composite listing card for a page of players or teams, or None on failure.
+
+    ``kind`` is ``"players"`` or ``"teams"``. The image is optional decoration, so
+    errors are logged and swallowed and the caller keeps its text-only embed.
+    """
+    if not slugs:
+        return None
+    try:
+        async with session.get(f"/api/og/{kind}/page.png", params=[("slugs", s) for s in slugs]) as resp:
+            if resp.status != 200:
+                return None
+            data = await resp.read()
+    except Exception:
+        log.warning("Failed to fetch %s page image", kind, exc_info=True)
+        return None
+    return discord.File(io.BytesIO(data), filename=PAGE_IMAGE_FILENAME)
+
+
 def build_info_parts(entity: dict) -> list[str]:
     """Extract activity, ambiance and frequency info from a player or team dict."""
     parts: list[str] = []
@@ -121,3 +186,53 @@ def build_no_results_msg(
         msg += " pour " + ", ".join(filters)
     msg += "."
     return msg
+
+
+def player_choice(player: dict) -> app_commands.Choice[str]:
+    """Autocomplete choice for a player: shows rank and role, submits the Riot ID."""
+    riot_id = f"{player['riot_game_name']}#{player['riot_tag_line']}"
+    details = [d for d in (
+        (player.get("rank_solo_tier") or "").capitalize(),
+        ROLE_NAMES.get(player.get("primary_role") or "", ""),
+    ) if d]
+    label = " · ".join([riot_id, *details])
+    return app_commands.Choice(name=label[:100], value=riot_id)
+
+
+def team_choice(team: dict) -> app_commands.Choice[str]:
+    """Autocomplete choice for a team: shows the name, submits the slug."""
+    return app_commands.Choice(name=team["name"][:100], value=team["slug"])
+
+
+async def search_choices(bot: commands.Bot, kind: str, current: str) -> list[app_commands.Choice[str]]:
+    """Autocomplete choices from the fuzzy name search (``kind`` is ``"players"`` or ``"teams"``).
+
+    Failures and slow answers yield no suggestions rather than an error, since the
+    user can still type the full name.
+    """
+    current = current.strip()
+    if not current:
+        return []
+    try:
+        async with get_session(bot).get(
+            f"/api/search/{kind}", params={"q": current[:30], "limit": str(AUTOCOMPLETE_LIMIT)}, timeout=AUTOCOMPLETE_TIMEOUT,
+        ) as resp:
+            if resp.status != 200:
+                return []
+            results = (await resp.json())[kind]
+    except Exception:
+        log.warning("Autocomplete search for %s failed", kind, exc_info=True)
+        return []
+    to_choice = player_choice if kind == "players" else team_choice
+    return [to_choice(r) for r in results]
+
+
+async def name_choices(bot: commands.Bot, kind: str, current: str) -> list[app_commands.Choice[str]]:
+    """Autocomplete choices, answered from the bot's local name index when it has matches.
+
+    Falls back to the backend's fuzzy search while the index is loading, or when nothing
+    local matches (typos, players who are not LFT).
+    """
+    index = bot.get_cog("NameIndexCog")
+    choices = index.local_choices(kind, current) if index is not None else []  # type: ignore[attr-defined]
+    return choices or await search_choices(bot, kind, current)